@@ -37,6 +37,24 @@ TRF_DEFAULT_PARAMS = [
 # TRF command flags
 TRF_FLAGS = ["-l", str(TRF_MIN_LENGTH), "-d", "-h"]  # -d: data file, -h: suppress HTML
 
+# Windowed TRF runs: sequences longer than TRF_WINDOW_SIZE + TRF_WINDOW_OVERLAP
+# are split into overlapping windows that run as separate TRF jobs. The overlap
+# holds several copies of the longest period, so arrays cut by a window edge
+# are seen in both windows and can be stitched back together.
+TRF_WINDOW_SIZE = 5000000                 # Window step (5 Mb)
+TRF_WINDOW_OVERLAP = 10 * TRF_MAX_PERIOD  # Overlap between adjacent windows (20 kb)
+
+# TRF job scheduling: small sequences are bin-packed into chunks of about
+# TRF_CHUNK_SIZE bp; job cost is length x (1 + weight x repeat density)
+TRF_CHUNK_SIZE = 100000                   # Target chunk size for small sequences (100 kb)
+TRF_REPEAT_COST_WEIGHT = 4.0              # Extra cost of a fully repeated chunk
+TRF_DENSITY_KMER = 17                     # k of the sampled repeat density (as varprofiler)
+TRF_DENSITY_SAMPLE = 30000                # Bases sampled per chunk for its repeat density
+
+# Opt-in TRF/FasTAN result cache shared across projects (--result-cache DIR);
+# least recently used entries are evicted above this total size
+RESULT_CACHE_MAX_SIZE = 50 * 1024 ** 3    # 50 GB
+
 # ============================================================================
 # Scaffold and Contig Size Thresholds
 # ============================================================================
@@ -103,6 +121,9 @@ START_CUTOFF_MAX = 50                   # Maximum start cutoff for distance calc
 BATCH_SIZE_DEFAULT = 10000              # Default batch size for processing
 PROGRESS_UPDATE_INTERVAL = 10000        # Update progress every N items
 
+# Consensus canonicalization: canonical forms memoized per process (LRU)
+CANONICAL_CACHE_SIZE = 100000
+
 # ============================================================================
 # Classification Categories
 # ============================================================================
@@ -133,6 +154,14 @@ MAX_OUTPUT_CHARS = 30000                # Maximum characters in output before tr
 DEFAULT_TIMEOUT_MS = 120000             # Default command timeout (2 minutes)
 MAX_TIMEOUT_MS = 600000                 # Maximum command timeout (10 minutes)
 
+# Parallel .sat loading: files smaller than this are parsed in one process;
+# larger ones are split into this many newline-aligned byte ranges per worker
+SAT_PARALLEL_MIN_BYTES = 16 * 1024 * 1024
+SAT_RANGES_PER_WORKER = 4
+
+# Write buffer of each output when one .sat pass feeds several files
+SAT_WRITE_BUFFER_BYTES = 1024 * 1024
+
 # ============================================================================
 # Display and Formatting
 # ============================================================================
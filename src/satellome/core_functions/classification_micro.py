@@ -17,18 +17,35 @@ Core functions related to classification of microsatellites tandem repeats.
 - cf_separate_10kb(settings, project)
 - scf_basic_trs_classification(settings, project)
 
+Every category is a ClassificationRule. classify_trs() evaluates all
+rules on each record of one streamed pass over the .sat, so the full
+classification reads the dataset once instead of once per category.
 """
 import logging
+import multiprocessing
 import os
+import shutil
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+from satellome.constants import SAT_PARALLEL_MIN_BYTES, SAT_RANGES_PER_WORKER, SAT_WRITE_BUFFER_BYTES
 from satellome.core_functions.exceptions import SequenceError
 from satellome.core_functions.io.gff_file import sc_gff3_reader
-from satellome.core_functions.io.tab_file import sc_iter_tab_file
+from satellome.core_functions.io.sat_index import split_byte_ranges
+from satellome.core_functions.io.tab_file import (
+    sc_iter_tab_file,
+    sc_iter_tab_file_sorted,
+    sc_iter_tab_file_spans,
+    sc_sorted_line_spans,
+)
 from satellome.core_functions.models.trf_model import TRModel
-from satellome.core_functions.tools.statistics import get_simple_statistics
+from satellome.core_functions.tools.canonical import canonical_monomer
+from satellome.core_functions.tools.statistics import RunningStatistics
 
 
 def save_trs_as_fasta(
@@ -47,42 +64,72 @@ def save_trs_as_fasta(
 
 
 class RepeatCountStatsModel(object):
-    def __init__(self):
+    """Per-family statistics for the family report tables.
+
+    Lengths, pmatch and GC are RunningStatistics accumulators, so memory
+    does not grow with the number of TRs in a family, and the statistics
+    of two parts of a dataset merge into those of the whole.
+
+    Args:
+        relative_accuracy: If set, the accumulators also keep quantile
+            sketches with this relative error (e.g. lengths.median())
+    """
+
+    def __init__(self, relative_accuracy=None):
         self.max_length = 0
         self.min_length = 0
         self.n = 0
-        self.lengths = []
-        self.pmatch = []
-        self.gc = []
+        self.lengths = RunningStatistics(relative_accuracy)
+        self.pmatch = RunningStatistics(relative_accuracy)
+        self.gc = RunningStatistics(relative_accuracy)
         self.name = None
 
+    def add(self, length, pmatch, gc):
+        self.n += 1
+        self.max_length = max(self.max_length, length)
+        # Kept as in the original tables: the length of the last TR added
+        self.min_length = min(self.max_length, length)
+        self.lengths.add(length)
+        self.pmatch.add(pmatch)
+        self.gc.add(gc)
+
+    def merge(self, other):
+        """Add the statistics of the same family from a later part of the data."""
+        if not other.n:
+            return self
+        self.n += other.n
+        self.name = other.name
+        self.max_length = max(self.max_length, other.max_length)
+        self.min_length = other.min_length
+        self.lengths.merge(other.lengths)
+        self.pmatch.merge(other.pmatch)
+        self.gc.merge(other.gc)
+        return self
+
     def __str__(self):
         '''"family\tn\ttotal_length\tmin_length\tmax_length\tmean_length\tstd_length\tmin_pmatch\tmax_pmatch\tmean_pmatch\tstd_pmatch\tmin_gc\tmax_gc\tmean_gc\n"'''
 
         round_2 = lambda x: round(x, 2)
 
-        self.pmatch_stats = get_simple_statistics(self.pmatch)
-        self.lengths_stats = get_simple_statistics(self.lengths)
-        self.gc_stats = get_simple_statistics(self.gc)
         s = "\t".join(
             map(
                 str,
                 [
                     self.name,
                     self.n,
-                    sum(self.lengths),
+                    self.lengths.total,
                     self.min_length,
                     self.max_length,
-                    round_2(self.lengths_stats["mean"]),
-                    round_2(self.lengths_stats["standard_deviation"]),
-                    min(self.pmatch),
-                    max(self.pmatch),
-                    round_2(self.pmatch_stats["mean"]),
-                    round_2(self.pmatch_stats["standard_deviation"]),
-                    round_2(min(self.gc)),
-                    round_2(max(self.gc)),
-                    round_2(self.gc_stats["mean"]),
-                    round_2(self.gc_stats["standard_deviation"]),
+                    round_2(self.lengths.mean),
+                    round_2(self.lengths.standard_deviation),
+                    self.pmatch.min,
+                    self.pmatch.max,
+                    round_2(self.pmatch.mean),
+                    round_2(self.pmatch.standard_deviation),
+                    round_2(self.gc.min),
+                    round_2(self.gc.max),
+                    round_2(self.gc.mean),
+                    round_2(self.gc.standard_deviation),
                 ],
             )
         )
@@ -101,73 +148,343 @@ def _save_families_to_file(stats, family_table_file):
             fh.write(str(count_obj))
 
 
-def _trs_separate_something(
-    input_trf_file,
-    output_trf_file,
-    output_gff_file,
-    filter_func,
-    name_func,
-    family_table_file=None,
-):
-    """Helper function for extracting subset of TRs from full dataset.
-    Additionaly it writes gff and math files (optional).
+def _add_to_stats(stats, trf_obj):
+    """Count one named TR in the family statistics."""
+    family = stats[trf_obj.trf_family]
+    family.name = trf_obj.trf_family
+    family.add(trf_obj.trf_array_length, trf_obj.trf_pmatch, 100 * trf_obj.trf_array_gc)
+
+
+class ClassificationRule(object):
+    """One TR category: a filter, a naming function and the files it writes.
+
+    name_func(trf_obj) returns (family, gff_string, mathstr) and may change
+    the object; classify_trs() restores trf_family and the coordinates
+    before the next rule sees it.
+
+    Args:
+        input_file: .sat to classify
+        filter_func: Predicate selecting the TRs of this category
+        name_func: Naming function, see above
+        trf_file: Output .sat with the selected TRs
+        gff_file: Output GFF3
+        family_table_file: Optional per-family report
+        fasta_file: Optional FASTA of the selected arrays
+        collector: Optional object whose add(trf_obj) is called for each
+            selected TR after naming. With threads, every shard fills an
+            empty type(collector)() that is then merged into collector
+            with merge(other), in shard order.
+        on_done: Optional callable(result) called once the pass is done
     """
-    trf_objs = []
-    for i, trf_obj in enumerate(sc_iter_tab_file(input_trf_file, TRModel)):
-        trf_objs.append(trf_obj)
-    trf_objs.sort(key=lambda x: x.trf_head)
-    N = len(trf_objs)
-
-    stats = defaultdict(RepeatCountStatsModel)
-
-    with open(output_trf_file, "w") as fh:
-        if trf_objs:
-            fh.write(trf_objs[0].get_header_string())
-        with open(output_gff_file, "w") as fh_gff:
-            selected = 0
-            total_length = 0
-            for i, trf_obj in enumerate(trf_objs):
-                if filter_func(trf_obj):
-                    selected += 1
-                    total_length += trf_obj.trf_array_length
-                    trf_obj.trf_family, gff_string, mathstr = name_func(trf_obj)
-                    fh.write(str(trf_obj))
-                    fh_gff.write(gff_string)
-                    
-                    stats[trf_obj.trf_family].n += 1
-                    stats[trf_obj.trf_family].name = trf_obj.trf_family
-                    stats[trf_obj.trf_family].max_length = max(
-                        stats[trf_obj.trf_family].max_length, trf_obj.trf_array_length
-                    )
-                    stats[trf_obj.trf_family].min_length = min(
-                        stats[trf_obj.trf_family].max_length, trf_obj.trf_array_length
-                    )
-                    stats[trf_obj.trf_family].lengths.append(trf_obj.trf_array_length)
-                    stats[trf_obj.trf_family].pmatch.append(trf_obj.trf_pmatch)
-                    stats[trf_obj.trf_family].gc.append(100 * trf_obj.trf_array_gc)
-        
+
+    def __init__(
+        self,
+        input_file,
+        filter_func,
+        name_func,
+        trf_file,
+        gff_file,
+        family_table_file=None,
+        fasta_file=None,
+        collector=None,
+        on_done=None,
+    ):
+        self.input_file = input_file
+        self.filter_func = filter_func
+        self.name_func = name_func
+        self.trf_file = trf_file
+        self.gff_file = gff_file
+        self.family_table_file = family_table_file
+        self.fasta_file = fasta_file
+        self.collector = collector
+        self.on_done = on_done
+
+    def output_files(self):
+        return (self.trf_file, self.gff_file, self.family_table_file, self.fasta_file)
+
+
+def _classify_records(trf_objs, rules, sinks, stats, collectors, write_header=True):
+    """Write the selected TRs of every rule to its sinks.
+
+    Returns:
+        tuple: (records seen, selected per rule, total length per rule)
+    """
+    selected = [0] * len(rules)
+    total_length = [0] * len(rules)
+    N = 0
+    for trf_obj in trf_objs:
+        if not N and write_header:
+            header = trf_obj.get_header_string()
+            for fh, _, _ in sinks:
+                if fh:
+                    fh.write(header)
+        N += 1
+        family, l_ind, r_ind = trf_obj.trf_family, trf_obj.trf_l_ind, trf_obj.trf_r_ind
+        for k, rule in enumerate(rules):
+            if not rule.filter_func(trf_obj):
+                continue
+            selected[k] += 1
+            total_length[k] += trf_obj.trf_array_length
+            trf_obj.trf_family, gff_string, mathstr = rule.name_func(trf_obj)
+            fh, fh_gff, fh_fasta = sinks[k]
+            if fh:
+                fh.write(str(trf_obj))
+            if fh_gff:
+                fh_gff.write(gff_string)
+            if fh_fasta:
+                fh_fasta.write(trf_obj.get_fasta_repr())
+            if stats[k] is not None:
+                _add_to_stats(stats[k], trf_obj)
+            if collectors[k] is not None:
+                collectors[k].add(trf_obj)
+            # get_gff3_string() orders the coordinates in place
+            trf_obj.trf_family, trf_obj.trf_l_ind, trf_obj.trf_r_ind = family, l_ind, r_ind
+    return N, selected, total_length
+
+
+def _open_sinks(stack, outputs):
+    return [
+        tuple(stack.enter_context(open(path, "w")) if path else None for path in (trf, gff, fasta))
+        for trf, gff, _, fasta in outputs
+    ]
+
+
+def _new_stats(outputs):
+    return [defaultdict(RepeatCountStatsModel) if table else None for _, _, table, _ in outputs]
+
+
+def _results(N, selected, total_length):
+    return [
+        {"filtered": selected[k], "dataset": N, "total_length": total_length[k]}
+        for k in range(len(selected))
+    ]
+
+
+def _classify_file(input_file, rules, outputs):
+    """One pass over input_file writing the outputs of every rule.
+
+    Args:
+        outputs: (trf_file, gff_file, family_table_file, fasta_file) per
+            rule, with None for files this pass should not write
+    """
+    with ExitStack() as stack:
+        sinks = _open_sinks(stack, outputs)
+        stats = _new_stats(outputs)
+        # Records come out sorted by trf_head, as the separate loads sorted them
+        trf_objs = sc_iter_tab_file_sorted(input_file, TRModel, "trf_head")
+        N, selected, total_length = _classify_records(
+            trf_objs, rules, sinks, stats, [rule.collector for rule in rules]
+        )
+
+    for k, (_, _, family_table_file, _) in enumerate(outputs):
         if family_table_file:
-            _save_families_to_file(stats, family_table_file)
+            _save_families_to_file(stats[k], family_table_file)
+
+    return _results(N, selected, total_length)
+
+
+# Rules of the running parallel pass; lambdas and closures do not pickle,
+# so forked workers find them here
+_SHARD_RULES = None
+
+
+def _classify_shard(input_file, starts, ends, outputs):
+    """Process pool worker: classify the records of one shard.
+
+    Writes outputs without headers and returns the counts, the family
+    statistics and the filled collectors of the shard.
+    """
+    rules = _SHARD_RULES
+    collectors = [type(rule.collector)() if rule.collector is not None else None for rule in rules]
+    with ExitStack() as stack:
+        sinks = _open_sinks(stack, outputs)
+        stats = _new_stats(outputs)
+        trf_objs = sc_iter_tab_file_spans(input_file, TRModel, starts, ends)
+        N, selected, total_length = _classify_records(
+            trf_objs, rules, sinks, stats, collectors, write_header=False
+        )
+    return N, selected, total_length, stats, collectors
+
+
+def _shard_spans(input_file, n_shards):
+    """Split the records of input_file, in trf_head order, into shards.
+
+    Returns:
+        list of (starts, ends): Byte spans of each shard; a file already
+        sorted by trf_head is split into newline-aligned byte ranges
+    """
+    spans = sc_sorted_line_spans(input_file, TRModel, "trf_head")
+    if spans is None:
+        return [([start], [end]) for start, end in split_byte_ranges(input_file, n_shards)]
+    starts, ends = spans
+    bounds = np.linspace(0, len(starts), n_shards + 1).astype(np.int64)
+    return [(starts[a:b], ends[a:b]) for a, b in zip(bounds, bounds[1:]) if a < b]
+
+
+def _classify_file_parallel(input_file, rules, outputs, threads):
+    """_classify_file() with shards of the sorted records in a process pool.
 
-        return {"filtered": selected, "dataset": N, "total_length": total_length}
+    Every shard writes its part of each output; the parts are joined in
+    shard order and the statistics merged in the same order, so the files
+    are those of the one-process pass.
+    """
+    global _SHARD_RULES
+
+    shards = _shard_spans(input_file, threads * SAT_RANGES_PER_WORKER)
+    # Family tables are only written from the merged statistics
+    shard_outputs = [
+        [
+            tuple(f"{path}.part{i}" if path and j != 2 else path for j, path in enumerate(output))
+            for output in outputs
+        ]
+        for i in range(len(shards))
+    ]
+    try:
+        _SHARD_RULES = rules
+        try:
+            with ProcessPoolExecutor(max_workers=threads, mp_context=multiprocessing.get_context("fork")) as executor:
+                parts = list(
+                    executor.map(
+                        _classify_shard,
+                        [input_file] * len(shards),
+                        [starts for starts, _ in shards],
+                        [ends for _, ends in shards],
+                        shard_outputs,
+                    )
+                )
+        finally:
+            _SHARD_RULES = None
+
+        N = sum(part[0] for part in parts)
+        selected = [sum(part[1][k] for part in parts) for k in range(len(rules))]
+        total_length = [sum(part[2][k] for part in parts) for k in range(len(rules))]
+        header = TRModel().get_header_string()
+        for k, output in enumerate(outputs):
+            for j, path in enumerate(output):
+                if not path or j == 2:
+                    continue
+                with open(path, "w") as fw:
+                    if j == 0 and N:
+                        fw.write(header)
+                    for i in range(len(shards)):
+                        part_file = shard_outputs[i][k][j]
+                        with open(part_file) as fh:
+                            shutil.copyfileobj(fh, fw, SAT_WRITE_BUFFER_BYTES)
+                        os.remove(part_file)
+
+            if output[2]:
+                stats = {}
+                for part in parts:
+                    for family, family_stats in part[3][k].items():
+                        if family in stats:
+                            stats[family].merge(family_stats)
+                        else:
+                            stats[family] = family_stats
+                _save_families_to_file(stats, output[2])
+
+            if rules[k].collector is not None:
+                for part in parts:
+                    rules[k].collector.merge(part[4][k])
+    finally:
+        # Parts left behind by a failed shard or join
+        for shard in shard_outputs:
+            for output in shard:
+                for j, part_file in enumerate(output):
+                    if part_file and j != 2 and os.path.exists(part_file):
+                        os.remove(part_file)
+
+    return _results(N, selected, total_length)
+
+
+def classify_trs(rules, threads=1):
+    """Run classification rules with one pass over each input file.
+
+    The outputs are those of running the rules one by one, each reading
+    and sorting the whole input: when two rules write the same file, the
+    later one's output is kept.
+
+    With threads > 1, inputs of SAT_PARALLEL_MIN_BYTES or more are
+    classified in shards by a process pool (where processes can be
+    forked); the outputs are the same as with one thread.
+
+    Args:
+        rules: ClassificationRule objects; None entries are skipped
+        threads (int): Number of worker processes
+
+    Returns:
+        list: {"filtered", "dataset", "total_length"} per rule (None for
+        None entries)
+    """
+    owners = {}
+    for i, rule in enumerate(rules):
+        if rule:
+            for path in rule.output_files():
+                if path:
+                    owners[path] = i
+
+    by_input = defaultdict(list)
+    for i, rule in enumerate(rules):
+        if rule:
+            by_input[rule.input_file].append(i)
+
+    results = [None] * len(rules)
+    for input_file, indices in by_input.items():
+        outputs = [
+            tuple(path if path and owners[path] == i else None for path in rules[i].output_files())
+            for i in indices
+        ]
+        group_rules = [rules[i] for i in indices]
+        if (
+            threads > 1
+            and os.path.getsize(input_file) >= SAT_PARALLEL_MIN_BYTES
+            and "fork" in multiprocessing.get_all_start_methods()
+        ):
+            group_results = _classify_file_parallel(input_file, group_rules, outputs, threads)
+        else:
+            group_results = _classify_file(input_file, group_rules, outputs)
+        for i, r in zip(indices, group_results):
+            results[i] = r
+
+    for rule, r in zip(rules, results):
+        if rule and rule.on_done:
+            rule.on_done(r)
+    return results
+
+
+def _pgenome(project, r):
+    dataset = project["work_files"]["ref_assembly_name_for_trf"]
+    return round(
+        100.0
+        * float(r["total_length"])
+        / project["work_files"]["assembly_stats"][dataset]["genome_size"],
+        3,
+    )
 
 
 def scf_basic_trs_classification(settings, project):
     """
     Classify TRs into perfect microsatellites, microsatellites, true SSR,
     fuzzy SSR and complex TRs.
+
+    @settings threads: worker processes for classification (default 1)
     """
     # cf_set_ref_trf_file(settings, project)
-    cf_separate_perfect_microsatellites(settings, project)
-    cf_separate_microsatellites(settings, project)
-    cf_separate_true_ssr(settings, project)
-    cf_separate_fuzzy_ssr(settings, project)
-    cf_separate_complex_trs(settings, project)
-    cf_separate_by_size(settings, project, "1kb", 1000)
-    cf_separate_by_size(settings, project, "10kb", 10000)
-    cf_separate_by_size(settings, project, "100kb", 100000)
-    cf_separate_by_size(settings, project, "1000kb", 1000000)
-    cf_get_micro_summary_table(settings, project)
+    summary = MicroSummary()
+    classify_trs(
+        [
+            _perfect_microsatellites_rule(settings, project),
+            _microsatellites_rule(settings, project, summary=summary),
+            _true_ssr_rule(settings, project),
+            _fuzzy_ssr_rule(settings, project),
+            _complex_trs_rule(settings, project),
+            _size_rule(settings, project, "1kb", 1000),
+            _size_rule(settings, project, "10kb", 10000),
+            _size_rule(settings, project, "100kb", 100000),
+            _size_rule(settings, project, "1000kb", 1000000),
+        ],
+        threads=int(settings.get("threads") or 1),
+    )
+    cf_get_micro_summary_table(settings, project, summary=summary)
 
     return settings, project
 
@@ -175,6 +492,14 @@ def scf_basic_trs_classification(settings, project):
 def cf_separate_perfect_microsatellites(settings, project):
     """Split all TRs into perfect microsatellites and other.
 
+    See _perfect_microsatellites_rule() for the settings used.
+    """
+    return classify_trs([_perfect_microsatellites_rule(settings, project)])[0]
+
+
+def _perfect_microsatellites_rule(settings, project):
+    """Rule for perfect microsatellites.
+
     @settings:files trf_parsed_folder: folder with parsed trf_all.trf files
     @project ref_dataset: name of reference dataset
     @settings:files trf_all_file: trf_all_file (if not ref_dataset available)
@@ -201,7 +526,7 @@ def cf_separate_perfect_microsatellites(settings, project):
     filter_func = lambda x: x.trf_period < 6 and x.trf_pmatch == 100
 
     def name_func(trf_obj):
-        name = "(%s)n" % trf_obj.trf_consensus.upper()
+        name = "(%s)n" % canonical_monomer(trf_obj.trf_consensus.upper())
         trf_obj.trf_family = name
         gff = trf_obj.get_gff3_string(
             chromosome=False,
@@ -216,41 +541,41 @@ def cf_separate_perfect_microsatellites(settings, project):
         )
         return name, gff, None
 
-    r = _trs_separate_something(
+    def on_done(r):
+        project["work_files"].setdefault("repeats", {})
+        project["work_files"]["repeats"].setdefault(dataset, {})
+        project["work_files"]["repeats"][dataset].setdefault("trevis", {})
+        project["work_files"]["repeats"][dataset]["trevis"].setdefault("pmicro", {})
+        project["work_files"]["repeats"][dataset]["trevis"]["pmicro"] = {
+            "trf_file": trf_pmicro_file,
+            "gff_file": gff_pmicro_file,
+            "report_file": family_table_file,
+            "n": r["filtered"],
+            "pgenome": _pgenome(project, r),
+        }
+
+    return ClassificationRule(
         trf_all_file,
-        trf_pmicro_file,
-        gff_pmicro_file,
         filter_func,
         name_func,
+        trf_pmicro_file,
+        gff_pmicro_file,
         family_table_file=family_table_file,
-    )
-    dataset = project["work_files"]["ref_assembly_name_for_trf"]
-    n = r["filtered"]
-    pgenome = round(
-        100.0
-        * float(r["total_length"])
-        / project["work_files"]["assembly_stats"][dataset]["genome_size"],
-        3,
+        on_done=on_done,
     )
 
-    project["work_files"].setdefault("repeats", {})
-    project["work_files"]["repeats"].setdefault(dataset, {})
-    project["work_files"]["repeats"][dataset].setdefault("trevis", {})
-    project["work_files"]["repeats"][dataset]["trevis"].setdefault("pmicro", {})
-    project["work_files"]["repeats"][dataset]["trevis"]["pmicro"] = {
-        "trf_file": trf_pmicro_file,
-        "gff_file": gff_pmicro_file,
-        "report_file": family_table_file,
-        "n": n,
-        "pgenome": pgenome,
-    }
-
-    return r
-
 
 def cf_separate_microsatellites(settings, project):
     """Split all TRs into microsatellites and other.
 
+    See _microsatellites_rule() for the settings used.
+    """
+    return classify_trs([_microsatellites_rule(settings, project)])[0]
+
+
+def _microsatellites_rule(settings, project, summary=None):
+    """Rule for microsatellites; summary, a MicroSummary, counts them if given.
+
     @settings:files trf_work_file: file with remaining TRs
     @settings:files trf_micro_file: file with notperfect microsatellites TRs (monomer less than 5bp)
     """
@@ -269,7 +594,7 @@ def cf_separate_microsatellites(settings, project):
     filter_func = lambda x: x.trf_period < 6
 
     def name_func(trf_obj):
-        name = "(%s)n" % trf_obj.trf_consensus.upper()
+        name = "(%s)n" % canonical_monomer(trf_obj.trf_consensus.upper())
         trf_obj.trf_family = name
         gff = trf_obj.get_gff3_string(
             chromosome=False,
@@ -285,40 +610,42 @@ def cf_separate_microsatellites(settings, project):
         )
         return name, gff, None
 
-    r = _trs_separate_something(
+    def on_done(r):
+        dataset = project["work_files"]["ref_assembly_name_for_trf"]
+        project["work_files"]["repeats"][dataset].setdefault("trevis", {})
+        project["work_files"]["repeats"][dataset]["trevis"].setdefault("micro", {})
+        project["work_files"]["repeats"][dataset]["trevis"]["micro"] = {
+            "trf_file": trf_micro_file,
+            "gff_file": gff_micro_file,
+            "n": r["filtered"],
+            "pgenome": _pgenome(project, r),
+            "report_file": family_table_file,
+        }
+
+    return ClassificationRule(
         trf_all_file,
-        trf_micro_file,
-        gff_micro_file,
         filter_func,
         name_func,
+        trf_micro_file,
+        gff_micro_file,
         family_table_file=family_table_file,
-    )
-    dataset = project["work_files"]["ref_assembly_name_for_trf"]
-    n = r["filtered"]
-    pgenome = round(
-        100.0
-        * float(r["total_length"])
-        / project["work_files"]["assembly_stats"][dataset]["genome_size"],
-        3,
+        collector=summary,
+        on_done=on_done,
     )
 
-    project["work_files"]["repeats"][dataset].setdefault("trevis", {})
-    project["work_files"]["repeats"][dataset]["trevis"].setdefault("micro", {})
-    project["work_files"]["repeats"][dataset]["trevis"]["micro"] = {
-        "trf_file": trf_micro_file,
-        "gff_file": gff_micro_file,
-        "n": n,
-        "pgenome": pgenome,
-        "report_file": family_table_file,
-    }
-
-    return r
-
 
 def cf_separate_true_ssr(settings, project):
     """SSR - simple sequence repeat that contains not all nucleotide.
     e.g. aaaaatataa -> SSR-AT
 
+    See _true_ssr_rule() for the settings used.
+    """
+    return classify_trs([_true_ssr_rule(settings, project)])[0]
+
+
+def _true_ssr_rule(settings, project):
+    """Rule for true SSRs.
+
     @settings:files trf_work_file: file with remaining TRs
     @settings:files trf_tssr_file: file with true SSR TRs
     """
@@ -393,39 +720,44 @@ def cf_separate_true_ssr(settings, project):
         )
         return name, gff, None
 
-    r = _trs_separate_something(
+    def on_done(r):
+        dataset = project["work_files"]["ref_assembly_name_for_trf"]
+        project["work_files"]["repeats"][dataset].setdefault("trevis", {})
+        project["work_files"]["repeats"][dataset]["trevis"].setdefault("tSSR", {})
+        project["work_files"]["repeats"][dataset]["trevis"]["tSSR"] = {
+            "trf_file": trf_file,
+            "gff_file": gff_file,
+            "n": r["filtered"],
+            "pgenome": _pgenome(project, r),
+            "report_file": family_table_file,
+        }
+
+    return ClassificationRule(
         trf_all_file,
-        trf_file,
-        gff_file,
         filter_func,
         name_func,
+        trf_file,
+        gff_file,
         family_table_file=family_table_file,
-    )
-    dataset = project["work_files"]["ref_assembly_name_for_trf"]
-    n = r["filtered"]
-    pgenome = round(
-        100.0
-        * float(r["total_length"])
-        / project["work_files"]["assembly_stats"][dataset]["genome_size"],
-        3,
+        on_done=on_done,
     )
 
-    project["work_files"]["repeats"][dataset].setdefault("trevis", {})
-    project["work_files"]["repeats"][dataset]["trevis"].setdefault("tSSR", {})
-    project["work_files"]["repeats"][dataset]["trevis"]["tSSR"] = {
-        "trf_file": trf_file,
-        "gff_file": gff_file,
-        "n": n,
-        "pgenome": pgenome,
-        "report_file": family_table_file,
-    }
-    return r
-
 
 def cf_separate_fuzzy_ssr(settings, project):
     """SSR - simple sequence repeat that contains not all nucleotide.
     e.g. aaaaatataa -> SSR-AT
 
+    See _fuzzy_ssr_rule() for the settings used.
+    """
+    return classify_trs([_fuzzy_ssr_rule(settings, project)])[0]
+
+
+def _fuzzy_ssr_rule(settings, project):
+    """Rule for fuzzy SSRs.
+
+    Its TRs go to trf_micro_file, replacing the microsatellites there when
+    both rules run, and its GFF3 to trf_fssr_file.
+
     @settings:files trf_work_file: file with remaining TRs
     @settings:files trf_fssr_file: file with fuzzy SSR TRs
     """
@@ -514,38 +846,40 @@ def cf_separate_fuzzy_ssr(settings, project):
         )
         return name, gff, None
 
-    r = _trs_separate_something(
+    def on_done(r):
+        dataset = project["work_files"]["ref_assembly_name_for_trf"]
+        project["work_files"]["repeats"][dataset].setdefault("trevis", {})
+        project["work_files"]["repeats"][dataset]["trevis"].setdefault("fSSR", {})
+        project["work_files"]["repeats"][dataset]["trevis"]["fSSR"] = {
+            "trf_file": trf_file,
+            "gff_file": gff_file,
+            "n": r["filtered"],
+            "pgenome": _pgenome(project, r),
+            "report_file": family_table_file,
+        }
+
+    return ClassificationRule(
         trf_all_file,
-        trf_file,
-        gff_file,
         filter_func,
         name_func,
+        trf_file,
+        gff_file,
         family_table_file=family_table_file,
-    )
-    dataset = project["work_files"]["ref_assembly_name_for_trf"]
-    n = r["filtered"]
-    pgenome = round(
-        100.0
-        * float(r["total_length"])
-        / project["work_files"]["assembly_stats"][dataset]["genome_size"],
-        3,
+        on_done=on_done,
     )
 
-    project["work_files"]["repeats"][dataset].setdefault("trevis", {})
-    project["work_files"]["repeats"][dataset]["trevis"].setdefault("fSSR", {})
-    project["work_files"]["repeats"][dataset]["trevis"]["fSSR"] = {
-        "trf_file": trf_file,
-        "gff_file": gff_file,
-        "n": n,
-        "pgenome": pgenome,
-        "report_file": family_table_file,
-    }
-    return r
-
 
 def cf_separate_complex_trs(settings, project):
     """Separate complex tandem repeats types.
 
+    See _complex_trs_rule() for the settings used.
+    """
+    return classify_trs([_complex_trs_rule(settings, project)])[0]
+
+
+def _complex_trs_rule(settings, project):
+    """Rule for complex TRs.
+
     @settings:files trf_work_file: file with remaining TRs
     @settings:files trf_complex_file: file with complex TRs
     """
@@ -595,32 +929,26 @@ def cf_separate_complex_trs(settings, project):
         mathstr = "%s\n" % "\t".join(map(str, d))
         return trf_obj.trf_family, gff, mathstr
 
-    r = _trs_separate_something(
+    def on_done(r):
+        dataset = project["work_files"]["ref_assembly_name_for_trf"]
+        project["work_files"]["repeats"][dataset].setdefault("trevis", {})
+        project["work_files"]["repeats"][dataset]["trevis"].setdefault("compex", {})
+        project["work_files"]["repeats"][dataset]["trevis"]["compex"] = {
+            "trf_file": trf_complex_file,
+            "gff_file": gff_complex_file,
+            "n": r["filtered"],
+            "pgenome": _pgenome(project, r)
+        }
+
+    return ClassificationRule(
         trf_all_file,
+        filter_func,
+        name_func,
         trf_complex_file,
         gff_complex_file,
-        filter_func,
-        name_func
-    )
-    dataset = project["work_files"]["ref_assembly_name_for_trf"]
-    n = r["filtered"]
-    pgenome = round(
-        100.0
-        * float(r["total_length"])
-        / project["work_files"]["assembly_stats"][dataset]["genome_size"],
-        3,
+        on_done=on_done,
     )
 
-    project["work_files"]["repeats"][dataset].setdefault("trevis", {})
-    project["work_files"]["repeats"][dataset]["trevis"].setdefault("compex", {})
-    project["work_files"]["repeats"][dataset]["trevis"]["compex"] = {
-        "trf_file": trf_complex_file,
-        "gff_file": gff_complex_file,
-        "n": n,
-        "pgenome": pgenome
-    }
-    return r
-
 
 def cf_separate_by_size(settings, project, size_label, min_length):
     """Split all TRs by array length greater than min_length.
@@ -631,6 +959,14 @@ def cf_separate_by_size(settings, project, size_label, min_length):
         size_label: Label for this size tier (e.g., "1kb", "10kb", "100kb", "1000kb")
         min_length: Minimum array length in bp
     """
+    rule = _size_rule(settings, project, size_label, min_length)
+    if rule is None:
+        return None
+    return classify_trs([rule])[0]
+
+
+def _size_rule(settings, project, size_label, min_length):
+    """Rule for one size tier, or None if its files are not configured."""
     if "ref_trf_file" in project["work_files"]:
         trf_all_file = project["work_files"]["ref_trf_file"]
     else:
@@ -668,39 +1004,108 @@ def cf_separate_by_size(settings, project, size_label, min_length):
         )
         return trf_obj.trf_family, gff, None
 
-    r = _trs_separate_something(
-        trf_all_file, trf_file, gff_file, filter_func, name_func
+    def on_done(r):
+        dataset = project["work_files"]["ref_assembly_name_for_trf"]
+        project["work_files"]["repeats"][dataset].setdefault("trevis", {})
+        project["work_files"]["repeats"][dataset]["trevis"][size_label] = {
+            "trf_file": trf_file,
+            "gff_file": gff_file,
+            "n": r["filtered"],
+            "pgenome": _pgenome(project, r),
+        }
+        if fasta_file:
+            project["work_files"]["repeats"][dataset]["trevis"][size_label]["fasta_file"] = fasta_file
+
+    # The FASTA gets the arrays as they are written to trf_file, as
+    # save_trs_as_fasta(trf_file, fasta_file, project) would give them
+    return ClassificationRule(
+        trf_all_file,
+        filter_func,
+        name_func,
+        trf_file,
+        gff_file,
+        fasta_file=fasta_file,
+        on_done=on_done,
     )
 
-    if fasta_file:
-        save_trs_as_fasta(trf_file, fasta_file, project)
 
-    dataset = project["work_files"]["ref_assembly_name_for_trf"]
-    n = r["filtered"]
-    pgenome = round(
-        100.0
-        * float(r["total_length"])
-        / project["work_files"]["assembly_stats"][dataset]["genome_size"],
-        3,
-    )
+class MicroSummary(object):
+    """Per-family counts of microsatellites for the summary table.
 
-    project["work_files"]["repeats"][dataset].setdefault("trevis", {})
-    project["work_files"]["repeats"][dataset]["trevis"][size_label] = {
-        "trf_file": trf_file,
-        "gff_file": gff_file,
-        "n": n,
-        "pgenome": pgenome,
-    }
-    if fasta_file:
-        project["work_files"]["repeats"][dataset]["trevis"][size_label]["fasta_file"] = fasta_file
+    Filled either from the microsatellite GFF3 or, during classification,
+    from the named TRs themselves. Rows with equal counts are in order of
+    first appearance.
+    """
 
-    return r
+    def __init__(self):
+        self.micro_s = defaultdict(int)
+        self.pmicro_s = defaultdict(int)
+        self.nmicro_s = defaultdict(int)
+        self.lengths = defaultdict(int)
+        self.keys = {}
+
+    def add_feature(self, name, pmatch, start, end):
+        self.keys.setdefault(name)
+        if pmatch == 100.0:
+            self.pmicro_s[name] += 1
+        else:
+            self.nmicro_s[name] += 1
+        self.micro_s[name] += 1
+        self.lengths[name] += abs(end - start)
+
+    def add(self, trf_obj):
+        """Count one named microsatellite as its GFF3 line would be read."""
+        self.add_feature(
+            str(trf_obj.trf_family),
+            float(trf_obj.trf_pmatch),
+            int(trf_obj.trf_l_ind),
+            int(trf_obj.trf_r_ind),
+        )
 
-    return r
+    def merge(self, other):
+        """Add the counts of a later part of the data."""
+        for name in other.keys:
+            self.keys.setdefault(name)
+            self.micro_s[name] += other.micro_s[name]
+            self.pmicro_s[name] += other.pmicro_s[name]
+            self.nmicro_s[name] += other.nmicro_s[name]
+            self.lengths[name] += other.lengths[name]
+        return self
+
+    @classmethod
+    def from_gff(cls, input_gff):
+        summary = cls()
+        for gff_obj in sc_gff3_reader(input_gff):
+            summary.add_feature(
+                gff_obj.attributes["name"],
+                float(gff_obj.attributes["pmatch"]),
+                int(gff_obj.start),
+                int(gff_obj.end),
+            )
+        return summary
+
+    def rows(self):
+        data = []
+        for name in self.keys:
+            s = (
+                name,
+                self.micro_s[name],
+                self.lengths[name],
+                round(100.0 * self.nmicro_s[name] / self.micro_s[name], 2),
+                round(100.0 * self.pmicro_s[name] / self.micro_s[name], 2),
+            )
+            data.append(s)
+        data.sort(reverse=True, key=lambda x: x[1])
+        return data
 
 
-def cf_get_micro_summary_table(settings, project):
-    """Get summary table for microsatellites"""
+def cf_get_micro_summary_table(settings, project, summary=None):
+    """Get summary table for microsatellites
+
+    Args:
+        summary: MicroSummary collected during classification; read from
+            the microsatellite GFF3 if None
+    """
     dataset = project["work_files"]["ref_assembly_name_for_trf"]
 
     input_gff = project["work_files"]["repeats"][dataset]["trevis"]["micro"]["gff_file"]
@@ -714,43 +1119,12 @@ def cf_get_micro_summary_table(settings, project):
     if not os.path.isdir(report_folder):
         os.makedirs(report_folder)
 
-    micro_s = defaultdict(int)
-    pmicro_s = defaultdict(int)
-    nmicro_s = defaultdict(int)
-
-    lengths = defaultdict(int)
-
-    keys = set()
-
-    for gff_obj in sc_gff3_reader(input_gff):
-
-        name = gff_obj.attributes["name"]
-
-        keys.add(name)
-
-        pmatch = float(gff_obj.attributes["pmatch"])
-        if pmatch == 100.0:
-            pmicro_s[name] += 1
-        else:
-            nmicro_s[name] += 1
-        micro_s[name] += 1
-        lengths[name] += abs(int(gff_obj.end) - int(gff_obj.start))
-
-    data = []
-    for name in keys:
-        s = (
-            name,
-            micro_s[name],
-            lengths[name],
-            round(100.0 * nmicro_s[name] / micro_s[name], 2),
-            round(100.0 * pmicro_s[name] / micro_s[name], 2),
-        )
-        data.append(s)
-    data.sort(reverse=True, key=lambda x: x[1])
+    if summary is None:
+        summary = MicroSummary.from_gff(input_gff)
 
     with open(output_tsv, "w") as fh:
         s = "#Name\t#\tLength (bp)\t%unperfect\t%perfect\n"
         fh.write(s)
-        for d in data:
+        for d in summary.rows():
             s = "%s\t%s\t%s\t%s\t%s\n" % d
             fh.write(s)
@@ -0,0 +1,310 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @created: 16.10.2026
+# @author: Aleksey Komissarov
+# @contact: ad3002@gmail.com
+"""
+Fast reading of gzipped FASTA (BGZF-aware).
+
+NCBI and most assembly pipelines ship genomes as .gz, and single-threaded
+gzip decoding dominates the wall time of every pass over such a file.
+
+BGZF (bgzip, used by samtools/htslib) is a series of independent gzip
+members of at most 64 KB each, so blocks can be inflated in parallel; zlib
+releases the GIL, so a thread pool scales with cores. Plain gzip is a single
+deflate stream that cannot be split; it is decompressed once into a cache
+folder and later passes read the plain copy.
+
+Functions:
+    is_bgzf: Detect a BGZF file from its first block header
+    open_gzip_fasta: Open .gz input as a binary stream (parallel for BGZF)
+    decompress_to_cache: Decompress plain gzip once into a cache folder
+
+Classes:
+    BgzfReader: Read-only binary stream with thread-pool block inflation
+
+Environment:
+    SATELLOME_DECOMPRESS_CACHE: Folder for decompressed copies of plain
+        gzip input. Unset means plain gzip is streamed as before. main()
+        points it at the run's genome cache folder, so pipeline steps
+        started as subprocesses share one copy.
+
+Example:
+    >>> with open_gzip_fasta("genome.fa.gz") as fh:
+    ...     for line in fh:
+    ...         pass
+    INFO:...Read 3100.0 MB from genome.fa.gz in 4.2 s (738.1 MB/s, BGZF, 8 threads)
+
+See Also:
+    satellome.core_functions.io.fasta_file: FASTA iteration
+"""
+
+import gzip
+import io
+import json
+import logging
+import os
+import shutil
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from satellome.core_functions.exceptions import FileFormatError
+
+logger = logging.getLogger(__name__)
+
+DECOMPRESS_CACHE_ENV = "SATELLOME_DECOMPRESS_CACHE"
+
+_BGZF_MAGIC = b"\x1f\x8b\x08\x04"
+_BLOCK_HEADER = struct.Struct("<BBBBIBBH")
+_BLOCKS_PER_TASK = 64
+
+_DECOMPRESS_LOCK = threading.Lock()
+_DECOMPRESS_PATH_LOCKS = {}
+
+
+def _default_threads():
+    return max(1, min(8, os.cpu_count() or 1))
+
+
+def _log_throughput(source, n_bytes, started, how):
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    logger.info(
+        f"Read {n_bytes / 1e6:.1f} MB from {os.path.basename(source)} in {elapsed:.1f} s "
+        f"({n_bytes / 1e6 / elapsed:.1f} MB/s, {how})"
+    )
+
+
+def is_bgzf(file_name):
+    """Return True if file_name starts with a BGZF block (gzip + 'BC' extra field)."""
+    try:
+        with open(file_name, "rb") as fh:
+            header = fh.read(_BLOCK_HEADER.size)
+            if len(header) < _BLOCK_HEADER.size or not header.startswith(_BGZF_MAGIC):
+                return False
+            xlen = _BLOCK_HEADER.unpack(header)[-1]
+            return _find_bsize(fh.read(xlen)) is not None
+    except OSError:
+        return False
+
+
+def _find_bsize(extra):
+    """Return BSIZE from the 'BC' subfield of a gzip extra field, or None."""
+    pos = 0
+    while pos + 4 <= len(extra):
+        si1, si2, slen = extra[pos], extra[pos + 1], struct.unpack_from("<H", extra, pos + 2)[0]
+        if si1 == 66 and si2 == 67 and slen == 2:
+            return struct.unpack_from("<H", extra, pos + 4)[0]
+        pos += 4 + slen
+    return None
+
+
+def _inflate_blocks(blocks):
+    """Inflate a list of (cdata, crc, isize) raw deflate blocks; runs in a worker thread."""
+    out = []
+    for cdata, crc, isize in blocks:
+        data = zlib.decompress(cdata, -15)
+        if len(data) != isize or zlib.crc32(data) != crc:
+            raise FileFormatError("BGZF block failed CRC/size check: the file is corrupted")
+        out.append(data)
+    return b"".join(out)
+
+
+class BgzfReader(io.RawIOBase):
+    """Binary stream over a BGZF file, inflating blocks in a thread pool.
+
+    Blocks are read sequentially, grouped into tasks of _BLOCKS_PER_TASK and
+    inflated by worker threads; up to 2 x threads tasks are kept in flight
+    and results are returned in file order. Wrap it in io.BufferedReader
+    (open_gzip_fasta does that) for fast line iteration.
+    """
+
+    def __init__(self, file_name, threads=None):
+        super().__init__()
+        self.file_name = file_name
+        self.threads = threads or _default_threads()
+        self._fh = open(file_name, "rb")
+        self._pool = ThreadPoolExecutor(max_workers=self.threads)
+        self._pending = deque()
+        self._eof = False
+        self._buffer = b""
+        self._pos = 0
+        self._bytes_out = 0
+        self._started = time.perf_counter()
+
+    def readable(self):
+        return True
+
+    def _read_block(self):
+        header = self._fh.read(_BLOCK_HEADER.size)
+        if not header:
+            return None
+        if len(header) < _BLOCK_HEADER.size or not header.startswith(_BGZF_MAGIC):
+            raise FileFormatError(f"{self.file_name}: not a BGZF block at offset {self._fh.tell() - len(header)}")
+        xlen = _BLOCK_HEADER.unpack(header)[-1]
+        extra = self._fh.read(xlen)
+        if len(extra) < xlen:
+            raise FileFormatError(f"{self.file_name}: truncated BGZF block header")
+        bsize = _find_bsize(extra)
+        if bsize is None:
+            raise FileFormatError(f"{self.file_name}: gzip member without BGZF 'BC' field")
+        rest_size = bsize + 1 - _BLOCK_HEADER.size - xlen
+        if rest_size < 8:
+            raise FileFormatError(f"{self.file_name}: invalid BGZF block size {bsize + 1}")
+        rest = self._fh.read(rest_size)
+        if len(rest) < rest_size:
+            raise FileFormatError(f"{self.file_name}: truncated BGZF block (file ends mid-block)")
+        crc, isize = struct.unpack("<II", rest[-8:])
+        return rest[:-8], crc, isize
+
+    def _submit_next(self):
+        blocks = []
+        while len(blocks) < _BLOCKS_PER_TASK:
+            block = self._read_block()
+            if block is None:
+                self._eof = True
+                break
+            blocks.append(block)
+        if blocks:
+            self._pending.append(self._pool.submit(_inflate_blocks, blocks))
+
+    def _next_chunk(self):
+        while not self._eof and len(self._pending) < 2 * self.threads:
+            self._submit_next()
+        if not self._pending:
+            return None
+        return self._pending.popleft().result()
+
+    def readinto(self, b):
+        while self._pos >= len(self._buffer):
+            chunk = self._next_chunk()
+            if chunk is None:
+                return 0
+            self._buffer = chunk
+            self._pos = 0
+        n = min(len(b), len(self._buffer) - self._pos)
+        b[:n] = self._buffer[self._pos:self._pos + n]
+        self._pos += n
+        self._bytes_out += n
+        return n
+
+    def close(self):
+        if not self.closed:
+            if self._eof and self._pos >= len(self._buffer) and not self._pending:
+                _log_throughput(self.file_name, self._bytes_out, self._started, f"BGZF, {self.threads} threads")
+            for future in self._pending:
+                future.cancel()
+            self._pool.shutdown(wait=True)
+            self._fh.close()
+        super().close()
+
+
+class _ThroughputReader(io.RawIOBase):
+    """Wrap a binary stream and log MB/s when it is fully consumed and closed."""
+
+    def __init__(self, raw, source, how):
+        super().__init__()
+        self._raw = raw
+        self._source = source
+        self._how = how
+        self._bytes_out = 0
+        self._exhausted = False
+        self._started = time.perf_counter()
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        n = self._raw.readinto(b)
+        if not n:
+            self._exhausted = True
+            return 0
+        self._bytes_out += n
+        return n
+
+    def close(self):
+        if not self.closed:
+            if self._exhausted:
+                _log_throughput(self._source, self._bytes_out, self._started, self._how)
+            self._raw.close()
+        super().close()
+
+
+def _source_signature(file_name):
+    stat = os.stat(file_name)
+    return {"source": os.path.abspath(file_name), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def decompress_to_cache(file_name, cache_dir):
+    """Decompress a gzip file once into cache_dir and return the plain path.
+
+    The copy is reused while the source size and mtime are unchanged. It is
+    written under a temporary name and renamed into place, so concurrent
+    readers never see a partial file.
+
+    Args:
+        file_name (str): Path to .gz file
+        cache_dir (str): Folder for the decompressed copy
+
+    Returns:
+        str: Path to the decompressed file
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    plain_path = os.path.join(cache_dir, os.path.basename(file_name)[:-3])
+    meta_path = f"{plain_path}.source.json"
+    key = os.path.abspath(plain_path)
+    with _DECOMPRESS_LOCK:
+        lock = _DECOMPRESS_PATH_LOCKS.setdefault(key, threading.Lock())
+    with lock:
+        signature = _source_signature(file_name)
+        if os.path.isfile(plain_path) and os.path.isfile(meta_path):
+            try:
+                with open(meta_path) as fh:
+                    if json.load(fh) == signature:
+                        return plain_path
+            except (OSError, ValueError):
+                pass
+
+        logger.info(f"Decompressing {file_name} once into {cache_dir}...")
+        started = time.perf_counter()
+        tmp_path = f"{plain_path}.tmp"
+        with gzip.open(file_name, "rb") as src, open(tmp_path, "wb") as dst:
+            shutil.copyfileobj(src, dst, 1 << 22)
+        os.replace(tmp_path, plain_path)
+        with open(meta_path, "w") as fh:
+            json.dump(signature, fh)
+        _log_throughput(file_name, os.path.getsize(plain_path), started, "gzip, decompressed to cache")
+        return plain_path
+
+
+def open_gzip_fasta(file_name, threads=None, use_cache=True):
+    """Open a .gz file as a buffered binary stream using the fastest available path.
+
+    - BGZF: block-parallel inflation in a thread pool (BgzfReader)
+    - plain gzip with SATELLOME_DECOMPRESS_CACHE set and use_cache: the file
+      is decompressed once into that folder and the plain copy is opened
+    - otherwise: single-threaded gzip stream, as before
+
+    Args:
+        file_name (str): Path to .gz file
+        threads (int, optional): Worker threads for BGZF (default: up to 8)
+        use_cache (bool): Allow decompress-once caching of plain gzip.
+            Pass False for callers that only peek at the first lines.
+
+    Returns:
+        io.BufferedReader: Binary stream of decompressed data
+    """
+    if is_bgzf(file_name):
+        return io.BufferedReader(BgzfReader(file_name, threads=threads), buffer_size=1 << 20)
+    cache_dir = os.environ.get(DECOMPRESS_CACHE_ENV)
+    if use_cache and cache_dir:
+        try:
+            plain_path = decompress_to_cache(file_name, cache_dir)
+            return io.BufferedReader(_ThroughputReader(open(plain_path, "rb"), plain_path, "cached copy"), buffer_size=1 << 20)
+        except OSError as e:
+            logger.warning(f"Cannot cache decompressed {file_name} in {cache_dir}: {e}; streaming gzip instead")
+    return io.BufferedReader(_ThroughputReader(gzip.open(file_name, "rb"), file_name, "gzip, 1 thread"), buffer_size=1 << 20)
@@ -12,6 +12,8 @@ Classes:
     
 """
 
+import io
+
 from satellome.core_functions.io.abstract_reader import AbstractFileIO
 
 
@@ -58,15 +60,20 @@ class AbstractBlockFileIO(AbstractFileIO):
 
     def read_from_file(self, input_file):
         """Overrided. Read data from given input_file."""
-        with self.wise_opener(input_file, "r") as fh:
-            for head, body, start, next in self.gen_block_sequences(self.token, fh):
-                self.data.append((head, body, start, next))
+        for item in self.read_online(input_file):
+            self.data.append(item)
 
     def read_online(self, input_file):
-        """Overrided. Yield items from data online from input_file."""
+        """Overrided. Yield items from data online from input_file.
+
+        input_file is a path (plain, .gz or .bz2) or an open file object,
+        e.g. a pipe; the file is read once, front to back.
+        """
+        if hasattr(input_file, "readline"):
+            yield from self.gen_block_sequences(self.token, _as_text(input_file))
+            return
         with self.wise_opener(input_file, "r") as fh:
-            for head, body, start, next in self.gen_block_sequences(self.token, fh):
-                yield (head, body, start, next)
+            yield from self.gen_block_sequences(self.token, _as_text(fh))
 
     def get_block_sequence(self, head_start, next_head, fh):
         """Get a data block (head, seq, head_start, head_end).
@@ -86,22 +93,12 @@ class AbstractBlockFileIO(AbstractFileIO):
         """
         head_start = int(head_start)
         next_head = int(next_head)
-        sequence = ""
         fh.seek(head_start)
-        pos = head_start
+        head = fh.readline()
         if next_head:
-            head = fh.readline()
-            pos = fh.tell()
-            while pos != next_head:
-                temp_seq = fh.readline()
-                pos = fh.tell()
-                if pos != next_head:
-                    sequence += temp_seq
-            sequence += temp_seq
+            sequence = fh.read(next_head - fh.tell())
         else:
-            head = fh.readline()
-            fasta_list = fh.readlines()
-            sequence = "".join(fasta_list)
+            sequence = fh.read()
         return (head, sequence, head_start, next_head)
 
     def get_blocks(self, token, fh):
@@ -137,20 +134,44 @@ class AbstractBlockFileIO(AbstractFileIO):
     def gen_block_sequences(self, token, fh):
         """Yield (head, seq, head_start, head_end) tuplefor given fh for open file.
 
+        Single forward pass: body lines are collected in a list and each
+        block is yielded as soon as the next head is read, so fh may be a
+        non-seekable stream (pipe, gzip). Lines before the first head are
+        skipped.
+
         Arguments:
 
         - token -- the token indicating a block start
-        - fh    -- an open file handler
+        - fh    -- an open file handler or any iterable of lines
 
         Return format:
 
         - head       -- a block head
         - seq        -- a block body
-        - head_start -- a file pointer to block start
-        - head_end   -- a file pointer to next block start or 0
+        - head_start -- offset of the block start (characters read so far)
+        - head_end   -- offset of the next block start or 0
 
         """
-        header_start_list = self.get_blocks(token, fh)
-        for x, y in header_start_list:
-            # yeild sequence by coordinates
-            yield self.get_block_sequence(x, y, fh)
+        head = None
+        body = []
+        head_start = 0
+        pos = 0
+        for line in fh:
+            if line.startswith(token):
+                if head is not None:
+                    yield (head, "".join(body), head_start, pos)
+                head = line
+                body = []
+                head_start = pos
+            elif head is not None:
+                body.append(line)
+            pos += len(line)
+        if head is not None:
+            yield (head, "".join(body), head_start, 0)
+
+
+def _as_text(fh):
+    """Wrap a binary file object (gzip, bz2, pipe) to yield str lines."""
+    if isinstance(fh, io.TextIOBase):
+        return fh
+    return io.TextIOWrapper(fh)
@@ -5,16 +5,26 @@
 # @author: Aleksey Komissarov
 # @contact: ad3002@gmail.com
 
-import gzip
+import logging
+import mmap
+import os
+
+from satellome.core_functions.exceptions import FileFormatError
+from satellome.core_functions.io.bgzf import open_gzip_fasta
+
+logger = logging.getLogger(__name__)
 
 
 def sc_iter_fasta_brute(file_name, inmem=False, lower=False):
-    """Iter over fasta file."""
+    """Iter over fasta file.
+
+    Gzipped input is read through open_gzip_fasta (parallel for BGZF).
+    """
 
     header = None
     seq = []
     if file_name.endswith(".gz"):
-        opener = gzip.open
+        opener = open_gzip_fasta
         decoder = lambda x: x.decode("utf8")
     else:
         opener = open
@@ -43,3 +53,204 @@ def sc_iter_fasta_brute(file_name, inmem=False, lower=False):
             if lower:
                 sequence = sequence.lower()
             yield header, sequence
+
+
+def build_fai_index(file_name):
+    """Scan an uncompressed FASTA and return its .fai-style index.
+
+    Returns:
+        tuple: (index, headers, duplicates) where index maps sequence name to
+        (length, offset, linebases, linewidth) exactly as in a samtools .fai,
+        headers maps name to the full header line without '>', and
+        duplicates lists names seen more than once (first occurrence wins).
+
+    Raises:
+        FileFormatError: If line lengths inside a sequence are not uniform
+    """
+    index = {}
+    headers = {}
+    duplicates = []
+    name = None
+    record = None
+
+    def _close(name, record):
+        if name is None:
+            return
+        if name in index:
+            duplicates.append(name)
+            return
+        index[name] = (record["length"], record["offset"], record["linebases"] or 0, record["linewidth"] or 0)
+
+    offset = 0
+    with open(file_name, "rb") as fh:
+        for line in fh:
+            if line.startswith(b">"):
+                _close(name, record)
+                header = line[1:].rstrip(b"\r\n").decode("utf8")
+                parts = header.split()
+                name = parts[0] if parts else ""
+                if name not in headers:
+                    headers[name] = header
+                record = {
+                    "length": 0,
+                    "offset": offset + len(line),
+                    "linebases": None,
+                    "linewidth": None,
+                    "short": False,
+                }
+            elif record is not None:
+                bases = len(line.rstrip(b"\r\n"))
+                if record["linebases"] is None:
+                    record["linebases"] = bases
+                    record["linewidth"] = len(line)
+                elif bases and (record["short"] or bases > record["linebases"]):
+                    raise FileFormatError(
+                        f"Different line lengths in sequence '{name}' of {file_name}: "
+                        f"cannot index it. Reformat the FASTA (e.g. seqkit seq -w 60)."
+                    )
+                if bases < record["linebases"]:
+                    record["short"] = True
+                record["length"] += bases
+            offset += len(line)
+    _close(name, record)
+    return index, headers, duplicates
+
+
+def read_fai(fai_file):
+    """Return {name: (length, offset, linebases, linewidth)} from a .fai file."""
+    index = {}
+    with open(fai_file) as fh:
+        for line in fh:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) < 5:
+                continue
+            index[fields[0]] = tuple(int(x) for x in fields[1:5])
+    return index
+
+
+def is_fai_current(file_name, fai_file=None):
+    """Return True if the .fai of file_name exists and is not older than it."""
+    fai_file = fai_file or f"{file_name}.fai"
+    return os.path.isfile(fai_file) and os.path.getmtime(fai_file) >= os.path.getmtime(file_name)
+
+
+class IndexedFastaReader:
+    """Random access to an uncompressed FASTA through a .fai index and mmap.
+
+    The index is read from ``<fasta>.fai`` when it is present and not older
+    than the FASTA (samtools faidx output is compatible); otherwise it is
+    built with one scan and saved there if the folder is writable.
+
+    fetch() returns ``bytes`` of just the requested region with line breaks
+    removed, so memory use is bounded by the region size, not the
+    chromosome size. Case is preserved.
+
+    Example:
+        >>> fasta = IndexedFastaReader("genome.fa")
+        >>> fasta.fetch("chr1", 10000, 10010)
+        b'TAACCCTAAC'
+        >>> for start, end, seq in fasta.iter_windows("chr1", 1000000):
+        ...     process(seq)
+    """
+
+    def __init__(self, file_name, fai_file=None):
+        if file_name.endswith(".gz"):
+            raise FileFormatError(
+                f"Cannot random-access gzipped FASTA {file_name}: decompress it first."
+            )
+        self.file_name = file_name
+        self.fai_file = fai_file or f"{file_name}.fai"
+        self.headers = {}
+        self.duplicate_names = []
+
+        if is_fai_current(file_name, self.fai_file):
+            self.index = read_fai(self.fai_file)
+        else:
+            self.index, self.headers, self.duplicate_names = build_fai_index(file_name)
+            self._write_fai()
+
+        self._fh = open(file_name, "rb")
+        if os.path.getsize(file_name):
+            self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._mm = b""
+
+    def _write_fai(self):
+        if self.duplicate_names:
+            # A .fai lists every record; samtools refuses duplicate names too
+            return
+        try:
+            with open(self.fai_file, "w") as fh:
+                for name, (length, offset, linebases, linewidth) in self.index.items():
+                    fh.write(f"{name}\t{length}\t{offset}\t{linebases}\t{linewidth}\n")
+        except OSError as e:
+            logger.warning(f"Cannot save FASTA index {self.fai_file}: {e}")
+
+    def close(self):
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __contains__(self, name):
+        return name in self.index
+
+    @property
+    def names(self):
+        """Sequence names in FASTA order."""
+        return list(self.index)
+
+    @property
+    def lengths(self):
+        """Dict of sequence name to length in FASTA order."""
+        return {name: record[0] for name, record in self.index.items()}
+
+    def length(self, name):
+        return self.index[name][0]
+
+    def header(self, name):
+        """Full header line of sequence name, without '>'."""
+        if name not in self.headers:
+            offset = self.index[name][1]
+            line_start = self._mm.rfind(b"\n", 0, offset - 1) + 1
+            self.headers[name] = self._mm[line_start + 1:offset].rstrip(b"\r\n").decode("utf8")
+        return self.headers[name]
+
+    def fetch(self, name, start=0, end=None):
+        """Return sequence name[start:end] (0-based, half-open) as bytes.
+
+        Raises:
+            KeyError: If name is not in the index
+        """
+        length, offset, linebases, linewidth = self.index[name]
+        end = length if end is None else min(end, length)
+        start = max(0, start)
+        if start >= end:
+            return b""
+        first = offset + (start // linebases) * linewidth + start % linebases
+        last = offset + ((end - 1) // linebases) * linewidth + (end - 1) % linebases + 1
+        region = self._mm[first:last]
+        if last - first != end - start:
+            region = region.replace(b"\n", b"").replace(b"\r", b"")
+        return region
+
+    def iter_windows(self, name, size, step=None):
+        """Yield (start, end, bytes) windows of sequence name.
+
+        Args:
+            name (str): Sequence name
+            size (int): Window size in bp
+            step (int, optional): Step between window starts (default: size)
+        """
+        step = step or size
+        length = self.length(name)
+        for start in range(0, length, step):
+            end = min(start + size, length)
+            yield start, end, self.fetch(name, start, end)
+            if end == length:
+                break
@@ -0,0 +1,435 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @created: 16.10.2026
+# @author: Aleksey Komissarov
+# @contact: ad3002@gmail.com
+"""
+Shared on-disk genome cache built once per output directory.
+
+A single satellome run used to re-parse the input FASTA at almost every
+stage (genome size, duplicate-header guard, scaffold lengths, gap search,
+recompute of failed chromosomes). This module parses the FASTA exactly once
+and stores a compact, query-friendly copy next to the results:
+
+    <cache_dir>/<genome>.2bit   2-bit packed A/C/G/T (4 bases per byte)
+    <cache_dir>/<genome>.mask   runs of non-ACGT bases per record (N-gaps, IUPAC codes)
+    <cache_dir>/<genome>.idx    per-sequence name, length, offset, md5, header
+    <cache_dir>/<genome>.gc     per-window G+C and A/C/G/T counts
+    <cache_dir>/<genome>.json   source file signature (path, size, mtime)
+
+The sequence is stored upper-cased; soft-masking (lower case) is not kept.
+Everything else round-trips: ``fetch()`` restores N-runs and other IUPAC
+codes from the mask.
+
+Classes:
+    GenomeCache: Read-only view over a built cache
+
+Functions:
+    build_genome_cache: Parse FASTA once and write the cache files
+    get_genome_cache: Load a valid cache or build it (thread-safe, memoised)
+
+Example:
+    >>> cache = get_genome_cache("genome.fa.gz", "/out/genome_cache")
+    >>> cache.genome_size
+    3117275501
+    >>> cache.fetch("chr1", 10000, 10010)
+    'TAACCCTAAC'
+    >>> cache.gaps(min_scaffold_length=1000000)[:1]
+    [['chr1', 0, 10000, 10000]]
+
+See Also:
+    satellome.core_functions.io.fasta_file: Sequential FASTA iteration
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import threading
+from bisect import bisect_right
+
+import numpy as np
+
+from satellome.core_functions.io.fasta_file import sc_iter_fasta_brute
+
+logger = logging.getLogger(__name__)
+
+GENOME_CACHE_VERSION = 3
+GENOME_CACHE_DIRNAME = "genome_cache"
+GC_WINDOW = 100000
+
+# Packing works on slices of this many bases to bound numpy temporaries
+# for multi-gigabase chromosomes. Must be a multiple of 4 and of GC_WINDOW
+# so GC windows never straddle two slices.
+_PACK_CHUNK = 16000000
+
+_ENCODE = np.full(256, 255, dtype=np.uint8)
+for _code, _base in enumerate(b"ACGT"):
+    _ENCODE[_base] = _code
+_DECODE = np.frombuffer(b"ACGT", dtype=np.uint8)
+
+_CACHE_LOCK = threading.Lock()
+_PATH_LOCKS = {}
+_OPEN_CACHES = {}
+
+
+def _genome_basename(fasta_file):
+    """Return FASTA basename without .gz and the last extension."""
+    name = os.path.basename(fasta_file)
+    if name.endswith(".gz"):
+        name = name[:-3]
+    return os.path.splitext(name)[0]
+
+
+def _source_signature(fasta_file):
+    stat = os.stat(fasta_file)
+    return {
+        "version": GENOME_CACHE_VERSION,
+        "source": os.path.abspath(fasta_file),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+def _cache_paths(fasta_file, cache_dir):
+    prefix = os.path.join(cache_dir, _genome_basename(fasta_file))
+    return {
+        "pack": f"{prefix}.2bit",
+        "mask": f"{prefix}.mask",
+        "index": f"{prefix}.idx",
+        "gc": f"{prefix}.gc",
+        "meta": f"{prefix}.json",
+    }
+
+
+def _non_acgt_runs(chunk, codes, offset):
+    """Return [start, end, char] runs of identical non-ACGT bytes in chunk."""
+    other = codes == 255
+    if not other.any():
+        return []
+    n = len(chunk)
+    same_prev = np.zeros(n, dtype=bool)
+    same_prev[1:] = other[:-1] & (chunk[1:] == chunk[:-1])
+    same_next = np.zeros(n, dtype=bool)
+    same_next[:-1] = same_prev[1:]
+    starts = np.flatnonzero(other & ~same_prev)
+    ends = np.flatnonzero(other & ~same_next) + 1
+    return [
+        [int(s) + offset, int(e) + offset, chr(chunk[s])]
+        for s, e in zip(starts, ends)
+    ]
+
+
+def _pack_sequence(sequence, pack_fh):
+    """Write one sequence to pack_fh.
+
+    Returns:
+        tuple: (packed_bytes, runs, md5, gc_windows) where gc_windows is a
+        list of (start, end, gc_bases, acgt_bases) per GC_WINDOW
+    """
+    data = sequence.upper().encode("ascii", errors="replace")
+    md5 = hashlib.md5(data).hexdigest()
+    runs = []
+    gc_windows = []
+    packed_bytes = 0
+    for offset in range(0, len(data), _PACK_CHUNK):
+        chunk = np.frombuffer(data, dtype=np.uint8, count=min(_PACK_CHUNK, len(data) - offset), offset=offset)
+        codes = _ENCODE[chunk]
+        for run in _non_acgt_runs(chunk, codes, offset):
+            # Merge runs split by the chunk boundary.
+            if runs and runs[-1][1] == run[0] and runs[-1][2] == run[2]:
+                runs[-1][1] = run[1]
+            else:
+                runs.append(run)
+        acgt = codes != 255
+        gc = (codes == 1) | (codes == 2)
+        window_starts = np.arange(0, len(codes), GC_WINDOW)
+        gc_counts = np.add.reduceat(gc, window_starts, dtype=np.int64) if len(codes) else []
+        acgt_counts = np.add.reduceat(acgt, window_starts, dtype=np.int64) if len(codes) else []
+        for start, gc_count, acgt_count in zip(window_starts, gc_counts, acgt_counts):
+            start = int(start) + offset
+            gc_windows.append((start, min(start + GC_WINDOW, len(data)), int(gc_count), int(acgt_count)))
+        codes[~acgt] = 0
+        pad = (-len(codes)) % 4
+        if pad:
+            codes = np.concatenate([codes, np.zeros(pad, dtype=np.uint8)])
+        packed = (codes[0::4] << 6) | (codes[1::4] << 4) | (codes[2::4] << 2) | codes[3::4]
+        pack_fh.write(packed.tobytes())
+        packed_bytes += len(packed)
+    return packed_bytes, runs, md5, gc_windows
+
+
+def build_genome_cache(fasta_file, cache_dir):
+    """Parse FASTA once and write the genome cache files.
+
+    Files are written under temporary names and renamed into place, with the
+    signature file last, so a concurrent reader never sees a partial cache.
+
+    Args:
+        fasta_file (str): Input FASTA (plain or .gz)
+        cache_dir (str): Directory for cache files (created if missing)
+
+    Returns:
+        GenomeCache: The freshly built cache
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    paths = _cache_paths(fasta_file, cache_dir)
+    tmp = {key: f"{path}.tmp" for key, path in paths.items()}
+
+    logger.info(f"Building genome cache for {fasta_file} in {cache_dir}...")
+    offset = 0
+    total = 0
+    n_seqs = 0
+    seen = set()
+    with open(tmp["pack"], "wb") as pack_fh, open(tmp["mask"], "w") as mask_fh, \
+            open(tmp["index"], "w") as index_fh, open(tmp["gc"], "w") as gc_fh:
+        index_fh.write("#name\tlength\toffset\tpacked_bytes\tother_bases\tmd5\theader\n")
+        for header, sequence in sc_iter_fasta_brute(fasta_file):
+            full_header = header[1:].strip() if header else ""
+            parts = full_header.split()
+            name = parts[0] if parts else ""
+            packed_bytes, runs, md5, gc_windows = _pack_sequence(sequence, pack_fh)
+            other_bases = sum(end - start for start, end, _ in runs)
+            # Mask runs are keyed by record number so records sharing a name
+            # keep their own sequence; GC windows are looked up by name and
+            # only the first occurrence is stored.
+            for start, end, char in runs:
+                mask_fh.write(f"{n_seqs}\t{start}\t{end}\t{char}\n")
+            if name not in seen:
+                for start, end, gc_count, acgt_count in gc_windows:
+                    gc_fh.write(f"{name}\t{start}\t{end}\t{gc_count}\t{acgt_count}\n")
+            seen.add(name)
+            index_fh.write(
+                f"{name}\t{len(sequence)}\t{offset}\t{packed_bytes}\t{other_bases}\t{md5}\t{full_header}\n"
+            )
+            offset += packed_bytes
+            total += len(sequence)
+            n_seqs += 1
+
+    for key in ("pack", "mask", "index", "gc"):
+        os.replace(tmp[key], paths[key])
+    with open(tmp["meta"], "w") as fh:
+        json.dump(_source_signature(fasta_file), fh)
+    os.replace(tmp["meta"], paths["meta"])
+
+    logger.info(f"Genome cache ready: {total:,} bp in {n_seqs} sequences ({offset / 1e6:.1f} MB packed)")
+    return GenomeCache(fasta_file, cache_dir)
+
+
+def is_genome_cache_valid(fasta_file, cache_dir):
+    """Return True if cache_dir holds a cache built from the current fasta_file."""
+    paths = _cache_paths(fasta_file, cache_dir)
+    if not all(os.path.isfile(path) for path in paths.values()):
+        return False
+    try:
+        with open(paths["meta"]) as fh:
+            meta = json.load(fh)
+    except (OSError, ValueError):
+        return False
+    return meta == _source_signature(fasta_file)
+
+
+def get_genome_cache(fasta_file, cache_dir):
+    """Return the GenomeCache for fasta_file, building it on first use.
+
+    Calls are serialised per cache location, so a stage asking for the cache
+    while a background thread is still building it simply waits for that
+    build instead of starting another one. Loaded caches are memoised for the
+    lifetime of the process.
+
+    Args:
+        fasta_file (str): Input FASTA (plain or .gz)
+        cache_dir (str): Cache directory, usually <output_dir>/genome_cache
+
+    Returns:
+        GenomeCache: Ready-to-query cache
+    """
+    key = (os.path.abspath(fasta_file), os.path.abspath(cache_dir))
+    with _CACHE_LOCK:
+        lock = _PATH_LOCKS.setdefault(key, threading.Lock())
+    with lock:
+        cache = _OPEN_CACHES.get(key)
+        if cache is not None and is_genome_cache_valid(fasta_file, cache_dir):
+            return cache
+        if is_genome_cache_valid(fasta_file, cache_dir):
+            logger.info(f"Using existing genome cache: {cache_dir}")
+            cache = GenomeCache(fasta_file, cache_dir)
+        else:
+            cache = build_genome_cache(fasta_file, cache_dir)
+        _OPEN_CACHES[key] = cache
+        return cache
+
+
+class GenomeCache:
+    """Read-only view over a genome cache written by build_genome_cache().
+
+    Sequences are addressed by the first word of their FASTA header. If the
+    FASTA has duplicate first words, lookups by name resolve to the first
+    occurrence and the duplicates are listed in ``duplicate_names``;
+    iter_sequences() and gaps() still report every record on its own.
+    """
+
+    def __init__(self, fasta_file, cache_dir):
+        self.fasta_file = fasta_file
+        self.cache_dir = cache_dir
+        self.paths = _cache_paths(fasta_file, cache_dir)
+        self.records = []
+        self.duplicate_names = []
+        self._by_name = {}
+        self._runs = {}
+        self._run_ends = {}
+        self._pack = None
+
+        with open(self.paths["index"]) as fh:
+            for line in fh:
+                if line.startswith("#"):
+                    continue
+                name, length, offset, packed_bytes, other_bases, md5, header = line.rstrip("\n").split("\t", 6)
+                record = {
+                    "index": len(self.records),
+                    "name": name,
+                    "length": int(length),
+                    "offset": int(offset),
+                    "packed_bytes": int(packed_bytes),
+                    "other_bases": int(other_bases),
+                    "md5": md5,
+                    "header": header,
+                }
+                if name in self._by_name:
+                    self.duplicate_names.append(name)
+                else:
+                    self._by_name[name] = record
+                self.records.append(record)
+
+        with open(self.paths["mask"]) as fh:
+            for line in fh:
+                index, start, end, char = line.rstrip("\n").split("\t")
+                self._runs.setdefault(int(index), []).append((int(start), int(end), char))
+        for index, runs in self._runs.items():
+            self._run_ends[index] = [end for _, end, _ in runs]
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def names(self):
+        """Sequence names (first header word) in FASTA order."""
+        return [record["name"] for record in self.records]
+
+    @property
+    def lengths(self):
+        """Dict of sequence name to length in FASTA order."""
+        return {record["name"]: record["length"] for record in self.records}
+
+    @property
+    def genome_size(self):
+        """Total length of all sequences in bp."""
+        return sum(record["length"] for record in self.records)
+
+    def header(self, name):
+        """Full FASTA header (without '>') of sequence name."""
+        return self._by_name[name]["header"]
+
+    def length(self, name):
+        return self._by_name[name]["length"]
+
+    def checksum(self, name):
+        """MD5 hex digest of the upper-cased sequence."""
+        return self._by_name[name]["md5"]
+
+    def _packed(self):
+        if self._pack is None:
+            if os.path.getsize(self.paths["pack"]) == 0:
+                self._pack = b""
+            else:
+                with open(self.paths["pack"], "rb") as fh:
+                    self._pack = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._pack
+
+    def fetch(self, name, start=0, end=None):
+        """Return sequence[start:end] (0-based, half-open) as an upper-case str.
+
+        Raises:
+            KeyError: If name is not in the cache
+        """
+        return self._fetch_record(self._by_name[name], start, end)
+
+    def _fetch_record(self, record, start=0, end=None):
+        length = record["length"]
+        end = length if end is None else min(end, length)
+        start = max(0, start)
+        if start >= end:
+            return ""
+
+        first_byte = start // 4
+        last_byte = (end + 3) // 4
+        base = record["offset"]
+        raw = np.frombuffer(self._packed()[base + first_byte:base + last_byte], dtype=np.uint8)
+        codes = np.empty(len(raw) * 4, dtype=np.uint8)
+        codes[0::4] = raw >> 6
+        codes[1::4] = (raw >> 4) & 3
+        codes[2::4] = (raw >> 2) & 3
+        codes[3::4] = raw & 3
+        shift = first_byte * 4
+        bases = _DECODE[codes[start - shift:end - shift]]
+
+        runs = self._runs.get(record["index"])
+        if runs:
+            i = bisect_right(self._run_ends[record["index"]], start)
+            while i < len(runs) and runs[i][0] < end:
+                run_start, run_end, char = runs[i]
+                bases[max(run_start, start) - start:min(run_end, end) - start] = ord(char)
+                i += 1
+        return bases.tobytes().decode("ascii")
+
+    def iter_sequences(self, names=None):
+        """Yield (">" + header, sequence) like sc_iter_fasta_brute().
+
+        Args:
+            names (iterable, optional): Restrict to these names, in FASTA order
+        """
+        wanted = set(names) if names is not None else None
+        for record in self.records:
+            if wanted is not None and record["name"] not in wanted:
+                continue
+            yield f">{record['header']}", self._fetch_record(record)
+
+    def gc_windows(self, name=None):
+        """Return per-window GC as [name, start, end, gc_fraction] lists.
+
+        Windows are GC_WINDOW bp (the last one per sequence may be shorter);
+        the fraction is over A/C/G/T bases only and is None for windows that
+        are entirely N.
+        """
+        windows = []
+        with open(self.paths["gc"]) as fh:
+            for line in fh:
+                seq_name, start, end, gc_count, acgt_count = line.rstrip("\n").split("\t")
+                if name is not None and seq_name != name:
+                    continue
+                acgt_count = int(acgt_count)
+                fraction = int(gc_count) / acgt_count if acgt_count else None
+                windows.append([seq_name, int(start), int(end), fraction])
+        return windows
+
+    def gaps(self, name=None, min_scaffold_length=0):
+        """Return N-gaps as [name, start, end, length] lists (0-based, half-open).
+
+        Matches the output of the find-gaps binary: only scaffolds of at least
+        min_scaffold_length bp are reported, in FASTA order.
+        """
+        gaps = []
+        for record in self.records:
+            if name is not None and record["name"] != name:
+                continue
+            if record["length"] < min_scaffold_length:
+                continue
+            for start, end, char in self._runs.get(record["index"], []):
+                if char == "N":
+                    gaps.append([record["name"], start, end, end - start])
+        return gaps
@@ -0,0 +1,435 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @created: 17.10.2026
+# @author: Aleksey Komissarov
+# @contact: ad3002@gmail.com
+"""
+Sidecar offset index and lazy reader for .sat files.
+
+Most .sat consumers only need coordinates, names and lengths. However,
+every record also carries its trf_array, which can be megabases long, so
+splitting full lines reads the whole file. The sidecar
+``<sat>.idx.npz`` holds four byte offsets for every record:
+
+    start       first byte of the line
+    consensus   first byte of the trf_consensus field
+    tail        first byte of the field after trf_array
+    end         one past the last byte of the line (after the newline)
+
+It also stores the size and mtime of the .sat it was built from.
+LazySatReader maps the .sat with mmap and slices out only the metadata
+bytes of each record. The OS therefore never pages in the array
+sequences. Consensus and array sequences are fetched per record on
+request.
+
+The same sidecar holds a region index. Records are sorted by chromosome
+(the first word of trf_head) and start. Each chromosome has a slice of
+that order, a byte range in the .sat, and a running maximum of the end
+coordinates. A region query is then two binary searches in the slice of
+its chromosome.
+
+Classes:
+    LazySatReader: Metadata-only iteration, region queries and on-demand
+        sequences
+
+Functions:
+    build_sat_index: Scan a .sat once and write the sidecar
+    get_sat_index: Load a valid sidecar or build it
+    load_sat_index: Offsets and region index of a .sat
+    parse_region: Parse "chr:start-end" strings
+    split_byte_ranges: Newline-aligned byte ranges for parallel parsing
+    read_range_lines: Text lines of one byte range
+
+Example:
+    >>> reader = LazySatReader("genome.sat")
+    >>> for i, obj in enumerate(reader.iter_models()):
+    ...     if obj.trf_array_length > 100000:
+    ...         print(obj.trf_head, obj.trf_l_ind, reader.consensus(i))
+    >>> for i in reader.query(*parse_region("chr1:1000000-2000000")):
+    ...     print(reader.line(i), end="")
+
+See Also:
+    satellome.core_functions.io.tr_table: Columnar in-memory table
+    satellome.core_functions.models.trf_model: The .sat fields
+"""
+
+import io
+import logging
+import mmap
+import os
+
+import numpy as np
+
+from satellome.core_functions.exceptions import FileFormatError
+from satellome.core_functions.models.trf_model import TRModel
+
+logger = logging.getLogger(__name__)
+
+SAT_INDEX_SUFFIX = ".idx.npz"
+SAT_INDEX_VERSION = 2
+
+# Offsets converted to Python ints at once while iterating
+_ITER_CHUNK = 65536
+
+# Field numbers of trf_consensus, trf_head, trf_l_ind and trf_r_ind in
+# each known .sat layout
+_LAYOUT_FIELDS = {
+    len(attributes): tuple(
+        attributes.index(attr) for attr in ("trf_consensus", "trf_head", "trf_l_ind", "trf_r_ind")
+    )
+    for attributes in (TRModel.dumpable_attributes, TRModel.legacy_dumpable_attributes)
+}
+
+# Ends are far below this, so adding chromosome * _CHROM_STRIDE keeps the
+# running maximum of one chromosome from leaking into the next
+_CHROM_STRIDE = 1 << 40
+
+
+def _signature(sat_file):
+    stat = os.stat(sat_file)
+    return np.array([SAT_INDEX_VERSION, stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+
+def _is_record(line):
+    # isspace() rather than strip(): lines can be megabases long
+    return not line.isspace() and not line.startswith((b"#", b"project\t"))
+
+
+def _nth_tab(line, n, start=0):
+    """Return the position of the n-th tab at or after start, or -1."""
+    pos = start - 1
+    for _ in range(n):
+        pos = line.find(b"\t", pos + 1)
+        if pos < 0:
+            return -1
+    return pos
+
+
+def _region_index(chroms, codes, starts, ends, offsets):
+    """Sort records by chromosome and start and summarize each chromosome."""
+    n_chroms = len(chroms)
+    order = np.lexsort((ends, starts, codes))
+    sorted_codes = codes[order]
+    starts = starts[order]
+    ends = ends[order]
+    max_ends = np.maximum.accumulate(ends + sorted_codes * _CHROM_STRIDE) - sorted_codes * _CHROM_STRIDE
+    chrom_bytes = np.zeros((n_chroms, 2), dtype=np.int64)
+    if n_chroms:
+        chrom_bytes[:, 0] = offsets[-1, 3]
+        np.minimum.at(chrom_bytes[:, 0], codes, offsets[:, 0])
+        np.maximum.at(chrom_bytes[:, 1], codes, offsets[:, 3])
+    return {
+        "chroms": np.array(chroms, dtype=str),
+        "chrom_bounds": np.searchsorted(sorted_codes, np.arange(n_chroms + 1)).astype(np.int64),
+        "chrom_bytes": chrom_bytes,
+        "order": order.astype(np.int64),
+        "starts": starts,
+        "ends": ends,
+        "max_ends": max_ends,
+    }
+
+
+def _scan_sat(sat_file):
+    """Return the offsets and region index arrays of a .sat."""
+    offsets = []
+    chrom_codes = {}
+    codes, starts, ends = [], [], []
+    position = 0
+    with open(sat_file, "rb") as fh:
+        for line_number, line in enumerate(fh, 1):
+            start, position = position, position + len(line)
+            if not _is_record(line):
+                continue
+            n_fields = line.count(b"\t") + 1
+            if n_fields not in _LAYOUT_FIELDS:
+                raise FileFormatError(
+                    f"{sat_file}:{line_number}: expected {' or '.join(map(str, _LAYOUT_FIELDS))} "
+                    f"fields, got {n_fields}"
+                )
+            consensus_field, head_field, l_field, r_field = _LAYOUT_FIELDS[n_fields]
+            consensus = _nth_tab(line, consensus_field) + 1
+            tail = _nth_tab(line, 2, consensus) + 1
+            offsets.append((start, start + consensus, start + tail, position))
+
+            fields = line[: consensus - 1].split(b"\t")
+            if len(fields) <= max(head_field, l_field, r_field):
+                # The legacy layout keeps trf_head after the sequences
+                fields += [b"", b""] + line[tail:].rstrip(b"\r\n").split(b"\t")
+            head = fields[head_field].split(None, 1)
+            chrom = head[0] if head else b""
+            try:
+                l_ind, r_ind = int(fields[l_field]), int(fields[r_field])
+            except ValueError:
+                raise FileFormatError(f"{sat_file}:{line_number}: trf_l_ind and trf_r_ind must be integers")
+            codes.append(chrom_codes.setdefault(chrom, len(chrom_codes)))
+            starts.append(min(l_ind, r_ind))
+            ends.append(max(l_ind, r_ind))
+    offsets = np.array(offsets, dtype=np.int64).reshape(-1, 4)
+    index = _region_index(
+        [chrom.decode() for chrom in chrom_codes],
+        np.array(codes, dtype=np.int64),
+        np.array(starts, dtype=np.int64),
+        np.array(ends, dtype=np.int64),
+        offsets,
+    )
+    index["offsets"] = offsets
+    return index
+
+
+def _build_index(sat_file, index_file=None):
+    signature = _signature(sat_file)
+    index = _scan_sat(sat_file)
+    if index_file is None:
+        index_file = sat_file + SAT_INDEX_SUFFIX
+    if index_file:
+        temp_file = index_file + ".tmp"
+        try:
+            with open(temp_file, "wb") as fw:
+                np.savez(fw, signature=signature, **index)
+            os.replace(temp_file, index_file)
+        except OSError as e:
+            logger.warning(f"Could not write .sat index {index_file}: {e}")
+    return index
+
+
+def build_sat_index(sat_file, index_file=None):
+    """
+    Scan a .sat once and write the offset and region sidecar.
+
+    Args:
+        sat_file (str): Path to the .sat file
+        index_file (str, optional): Sidecar path. Defaults to
+            sat_file + SAT_INDEX_SUFFIX. Pass False to skip writing.
+
+    Returns:
+        numpy.ndarray: int64 array of shape (n_records, 4) with the start,
+        consensus, tail and end offsets of each record
+
+    Raises:
+        FileFormatError: If a record has a field count of no known layout
+            or non-integer coordinates
+    """
+    return _build_index(sat_file, index_file)["offsets"]
+
+
+def load_sat_index(sat_file):
+    """
+    Return all arrays of a valid sidecar, building it when stale or missing.
+
+    Returns:
+        dict: "offsets" as returned by build_sat_index, and the region
+        index: "chroms" (names in file order), "chrom_bounds" (slice of
+        the sorted arrays for each chromosome), "chrom_bytes" (first and
+        past-the-last byte of each chromosome's records), "order" (record
+        numbers sorted by chromosome, start and end), and the "starts",
+        "ends" and "max_ends" (running maximum within a chromosome) of the
+        records in that order
+    """
+    index_file = sat_file + SAT_INDEX_SUFFIX
+    if os.path.isfile(index_file):
+        try:
+            with np.load(index_file) as data:
+                if np.array_equal(data["signature"], _signature(sat_file)):
+                    return {key: data[key] for key in data.files if key != "signature"}
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable .sat index {index_file}: {e}")
+    logger.info(f"Indexing {sat_file}...")
+    return _build_index(sat_file, index_file)
+
+
+def get_sat_index(sat_file):
+    """Return the offsets of a valid sidecar, building it when stale or missing."""
+    return load_sat_index(sat_file)["offsets"]
+
+
+def parse_region(region):
+    """
+    Parse a region string into (chrom, start, end).
+
+    Accepts "chr", "chr:start", "chr:start-end" and thousands separators,
+    as genome browsers and samtools print them. Coordinates are 1-based
+    and inclusive; a missing start or end is None, so "chr:start" runs to
+    the end of the chromosome.
+
+    Raises:
+        ValueError: If the coordinates are not integers or start > end
+    """
+    chrom, sep, coordinates = region.strip().rpartition(":")
+    if not sep:
+        return coordinates, None, None
+    first, _, last = coordinates.replace(",", "").partition("-")
+    try:
+        start = int(first) if first else None
+        end = int(last) if last else None
+    except ValueError:
+        raise ValueError(f"Invalid region: {region!r}")
+    if start is not None and end is not None and start > end:
+        raise ValueError(f"Invalid region: {region!r} (start > end)")
+    return chrom, start, end
+
+
+def split_byte_ranges(file_name, n_ranges):
+    """
+    Split a file into up to n_ranges byte ranges that start at line starts.
+
+    Args:
+        file_name (str): Path to a text file
+        n_ranges (int): Wanted number of ranges
+
+    Returns:
+        list of (int, int): Non-empty (start, end) ranges covering the file
+        in order; every line falls in exactly one range
+    """
+    size = os.path.getsize(file_name)
+    bounds = [0]
+    with open(file_name, "rb") as fh:
+        for i in range(1, max(1, n_ranges)):
+            target = size * i // n_ranges
+            if target <= bounds[-1]:
+                continue
+            fh.seek(target - 1)
+            # A range boundary right after a newline is already a line start
+            fh.readline()
+            position = fh.tell()
+            if bounds[-1] < position < size:
+                bounds.append(position)
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def read_range_lines(file_name, start, end):
+    """Return the text lines of bytes [start, end), as open() would give them."""
+    with open(file_name, "rb") as fh:
+        fh.seek(start)
+        data = fh.read(end - start)
+    return io.StringIO(data.decode(), newline=None).readlines()
+
+
+class LazySatReader:
+    """Read .sat metadata and regions without touching the sequence fields."""
+
+    def __init__(self, sat_file):
+        self.sat_file = sat_file
+        self.index = load_sat_index(sat_file)
+        self.offsets = self.index["offsets"]
+        self._chrom_codes = {chrom: code for code, chrom in enumerate(self.index["chroms"].tolist())}
+        self._fh = open(sat_file, "rb")
+        # mmap of an empty file is an error; such a file has no records
+        self._data = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ) if len(self.offsets) else b""
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def _row(self, start, consensus, tail, end):
+        data = self._data
+        head = data[start : consensus - 1].decode().split("\t")
+        rest = data[tail:end].decode().rstrip("\r\n").split("\t")
+        return head + ["None", "None"] + rest
+
+    def row(self, index):
+        """
+        Return the fields of one record, with "None" for both sequences.
+
+        The row keeps the file's layout (current or legacy), so it can be
+        passed to TRModel.from_row().
+        """
+        return self._row(*self.offsets[index].tolist())
+
+    def iter_rows(self):
+        """Yield row(i) for every record, in file order."""
+        for chunk_start in range(0, len(self), _ITER_CHUNK):
+            for offsets in self.offsets[chunk_start : chunk_start + _ITER_CHUNK].tolist():
+                yield self._row(*offsets)
+
+    def iter_models(self, model=TRModel):
+        """Yield model objects with trf_consensus and trf_array set to None."""
+        for row in self.iter_rows():
+            yield model.from_row(row)
+
+    def consensus(self, index):
+        """Return the trf_consensus of one record."""
+        start, consensus, tail, end = self.offsets[index].tolist()
+        data = self._data
+        return data[consensus : data.find(b"\t", consensus, tail)].decode()
+
+    def array(self, index):
+        """Return the trf_array of one record."""
+        start, consensus, tail, end = self.offsets[index].tolist()
+        data = self._data
+        return data[data.find(b"\t", consensus, tail) + 1 : tail - 1].decode()
+
+    def model(self, index, model=TRModel):
+        """Return one record as a model object with both sequences."""
+        obj = model.from_row(self.row(index))
+        obj.trf_consensus = self.consensus(index)
+        obj.trf_array = self.array(index)
+        return obj
+
+    @property
+    def chromosomes(self):
+        """Chromosome names in the order of their first record."""
+        return self.index["chroms"].tolist()
+
+    def chromosome_bytes(self, chrom):
+        """Return the (first, past-the-last) byte of a chromosome's records, or None."""
+        code = self._chrom_codes.get(chrom)
+        if code is None:
+            return None
+        start, end = self.index["chrom_bytes"][code].tolist()
+        return start, end
+
+    def query(self, chrom, start=None, end=None):
+        """
+        Return the records that overlap a region.
+
+        Args:
+            chrom (str): Chromosome, the first word of trf_head
+            start (int, optional): 1-based first position of the region
+            end (int, optional): 1-based last position, inclusive
+
+        Returns:
+            numpy.ndarray: Record numbers sorted by start, then end; empty
+            for an unknown chromosome
+        """
+        code = self._chrom_codes.get(chrom)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        index = self.index
+        lo, hi = index["chrom_bounds"][code : code + 2].tolist()
+        # Records that start after the region ends are past the upper bound;
+        # max_ends does not decrease, so everything before the lower bound
+        # ends before the region starts
+        if end is not None:
+            hi = lo + int(np.searchsorted(index["starts"][lo:hi], end, side="right"))
+        if start is not None:
+            lo += int(np.searchsorted(index["max_ends"][lo:hi], start, side="left"))
+            return index["order"][lo:hi][index["ends"][lo:hi] >= start]
+        return index["order"][lo:hi]
+
+    def line(self, index):
+        """Return one record as its text line in the .sat."""
+        start, _, _, end = self.offsets[index].tolist()
+        return self._data[start:end].decode()
+
+    def query_models(self, chrom, start=None, end=None, model=TRModel, sequences=True):
+        """Return the records that overlap a region as model objects.
+
+        Without sequences, trf_consensus and trf_array are None and the
+        arrays are never read.
+        """
+        indices = self.query(chrom, start, end).tolist()
+        if sequences:
+            return [self.model(i, model) for i in indices]
+        return [model.from_row(self.row(i)) for i in indices]
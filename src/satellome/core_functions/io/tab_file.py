@@ -19,6 +19,10 @@ Classes:
 Functions:
     sc_iter_tab_file: Iterate over tab file yielding model objects with
                      optional preprocessing and filtering
+    sc_iter_tab_file_sorted: Same objects, stable-sorted by one field,
+                     without holding them in memory
+    sc_sorted_line_spans: Byte spans of the records in one field's order
+    sc_iter_tab_file_spans: Iterate over the records inside byte spans
     sc_iter_simple_tab_file: Simple tab file iterator yielding raw lists
     sc_read_dictionary: Read two-column tab file into dictionary
     sc_write_model_to_tab_file: Write model objects to tab file
@@ -49,11 +53,14 @@ See Also:
     satellome.core_functions.models.abstract_model: Data model base class
 """
 import csv
-import os
-import tempfile
+import mmap
+from array import array
+
+import numpy as np
 
 from satellome.core_functions.exceptions import ConfigurationError
 from satellome.core_functions.io.abstract_reader import AbstractFileIO
+from satellome.core_functions.models.abstract_model import AbstractModel
 
 csv.field_size_limit(1000000000)
 
@@ -294,6 +301,26 @@ def _parse_fields_header(input_file):
     return [name.strip() for name in collected.split(",") if name.strip()]
 
 
+def _verify_columns(input_file, expected_fields):
+    """Raise ValueError if the `# Fields:` header declares other columns."""
+    declared = _parse_fields_header(input_file)
+    if declared is not None and declared != expected_fields:
+        raise ValueError(
+            "Column schema mismatch in {path}.\n"
+            "  expected ({n_exp} columns): {exp}\n"
+            "  declared ({n_got} columns): {got}\n"
+            "This file was likely produced by a different Satellome version "
+            "or a different tool. Regenerate it with this version, or pass "
+            "verify_columns=False to bypass the check.".format(
+                path=input_file,
+                n_exp=len(expected_fields),
+                exp=expected_fields,
+                n_got=len(declared),
+                got=declared,
+            )
+        )
+
+
 def sc_iter_tab_file(
     input_file,
     data_type,
@@ -307,15 +334,15 @@ def sc_iter_tab_file(
     Iterate over tab-delimited file yielding data model objects.
 
     Flexible streaming parser that maps tab-delimited rows to AbstractModel
-    objects with optional preprocessing and filtering pipeline. Uses temporary
-    files for multi-stage processing.
+    objects with optional preprocessing and filtering pipeline. The stages
+    are chained generators over the open file; nothing is staged on disk.
 
     Processing Pipeline:
-        1. Remove lines (remove_starts_with) → temp file
-        2. Preprocess lines (preprocess_function) → temp file
-        3. Filter lines (check_function) → temp file
-        4. Parse to model objects via CSV DictReader
-        5. Skip comment lines (skip_starts_with)
+        1. Remove lines (remove_starts_with)
+        2. Preprocess lines (preprocess_function)
+        3. Filter lines (check_function)
+        4. Split on tabs and skip comment lines (skip_starts_with)
+        5. Map fields by position to model objects (data_type.from_row)
         6. Yield model objects
 
     Args:
@@ -354,73 +381,222 @@ def sc_iter_tab_file(
         ...     print(trf.trf_head)
 
     Note:
-        - Uses temporary files for multi-stage processing (cleaned up automatically)
-        - CSV field size limit: 1 billion characters (module level setting)
         - Field names extracted from data_type().dumpable_attributes
-        - Preprocessing happens line-by-line; each stage creates new temp file
+        - Fields are split on tabs only; quotes are kept as is
+        - Preprocessing happens line-by-line; preprocess_function should keep
+          one record per line
         - All stages are optional (can use just skip_starts_with for simple cases)
     """
 
     expected_fields = data_type().dumpable_attributes
 
     if verify_columns:
-        declared = _parse_fields_header(input_file)
-        if declared is not None and declared != expected_fields:
-            raise ValueError(
-                "Column schema mismatch in {path}.\n"
-                "  expected ({n_exp} columns): {exp}\n"
-                "  declared ({n_got} columns): {got}\n"
-                "This file was likely produced by a different Satellome version "
-                "or a different tool. Regenerate it with this version, or pass "
-                "verify_columns=False to bypass the check.".format(
-                    path=input_file,
-                    n_exp=len(expected_fields),
-                    exp=expected_fields,
-                    n_got=len(declared),
-                    got=declared,
-                )
-            )
+        _verify_columns(input_file, expected_fields)
 
-    temp_file = tempfile.NamedTemporaryFile(delete=False)
-    temp_file_name = temp_file.name
-
-    if remove_starts_with:
-        with open(input_file, "r") as fh:
-            data = fh.readlines()
-        data = [x for x in data if not x.startswith(remove_starts_with)]
-        with open(temp_file_name, "w") as fh:
-            fh.writelines(data)
-        input_file = temp_file_name
-    if preprocess_function:
-        with open(input_file, "r") as fh:
-            data = fh.readlines()
-        data = [preprocess_function(x) for x in data]
-        with open(temp_file_name, "w") as fh:
-            fh.writelines(data)
-        input_file = temp_file_name
-    if check_function:
-        with open(input_file, "r") as fh:
-            data = fh.readlines()
-        data = [x for x in data if check_function(x)]
-        with open(temp_file_name, "w") as fh:
-            fh.writelines(data)
-        input_file = temp_file_name
     with open(input_file) as fh:
-        fields = expected_fields
-        for data in csv.DictReader(
-            fh, fieldnames=fields, delimiter="\t", quoting=csv.QUOTE_NONE
-        ):
-            if skip_starts_with:
-                if data[fields[0]].startswith(skip_starts_with):
-                    continue
-            # Skip header row if present (first field value equals first field name)
-            if data[fields[0]] == fields[0]:
+        lines = fh
+        if remove_starts_with:
+            lines = (line for line in lines if not line.startswith(remove_starts_with))
+        if preprocess_function:
+            lines = (preprocess_function(line) for line in lines)
+        if check_function:
+            lines = (line for line in lines if check_function(line))
+        yield from _iter_rows_as_objects(lines, data_type, expected_fields, skip_starts_with)
+
+
+def _iter_rows_as_objects(lines, data_type, fields, skip_starts_with):
+    """Split lines on tabs and yield data_type objects.
+
+    Rows with one value per field go through data_type.from_row(); other
+    rows are mapped the way csv.DictReader does (missing values are None,
+    extra ones are stored under the None key) and set with set_with_dict().
+    """
+    n_fields = len(fields)
+    # from_row() gives the set_with_dict() result unless a subclass hooks
+    # into the dictionary path or has list fields (kept None when empty)
+    positional = (
+        not data_type.list_attributes
+        and getattr(data_type, "preprocess_pair", None) is AbstractModel.preprocess_pair
+        and getattr(data_type, "set_with_dict", None) is AbstractModel.set_with_dict
+    )
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line:
+            continue
+        values = line.split("\t")
+        first = values[0]
+        if skip_starts_with and first.startswith(skip_starts_with):
+            continue
+        # Skip header row if present (first field value equals first field name)
+        if first == fields[0]:
+            continue
+        if positional and len(values) == n_fields:
+            try:
+                yield data_type.from_row(values)
+                continue
+            except ValueError:
+                pass  # set_with_dict() below logs and re-raises it
+        data = dict(zip(fields, values))
+        if len(values) < n_fields:
+            for field in fields[len(values):]:
+                data[field] = None
+        elif len(values) > n_fields:
+            data[None] = values[n_fields:]
+        obj = data_type()
+        obj.set_with_dict(data)
+        yield obj
+
+
+def _record_keys(input_file, skip_starts_with, first_field, key_index):
+    """
+    Return the byte span and sort key of every line that holds a record.
+
+    The same lines as _iter_rows_as_objects() keeps are selected; the key
+    is the raw bytes of field key_index (b"" if the line is shorter).
+    Sorting UTF-8 bytes gives the order of the decoded strings.
+    """
+    skip = skip_starts_with.encode() if skip_starts_with else None
+    first_field = first_field.encode()
+    keys = {}
+    codes, starts, ends = array("i"), array("q"), array("q")
+    position = 0
+    with open(input_file, "rb") as fh:
+        for line in fh:
+            start, position = position, position + len(line)
+            # Only a line of newlines is empty after rstrip; never copy long ones
+            if line[:1] in (b"\r", b"\n", b"") and not line.strip(b"\r\n"):
                 continue
-            obj = data_type()
-            obj.set_with_dict(data)
-            yield obj
-    if os.path.isfile(temp_file_name):
-        os.unlink(temp_file_name)
+            tab = line.find(b"\t")
+            first = line[:tab] if tab >= 0 else line.rstrip(b"\r\n")
+            if (skip and first.startswith(skip)) or first == first_field:
+                continue
+            for _ in range(key_index - 1):
+                if tab < 0:
+                    break
+                tab = line.find(b"\t", tab + 1)
+            if key_index == 0:
+                key = first
+            elif tab < 0:
+                key = b""
+            else:
+                key_end = line.find(b"\t", tab + 1)
+                key = line[tab + 1 : key_end] if key_end >= 0 else line[tab + 1 :].rstrip(b"\r\n")
+            codes.append(keys.setdefault(key, len(keys)))
+            starts.append(start)
+            ends.append(position)
+    return keys, codes, starts, ends
+
+
+def sc_sorted_line_spans(input_file, data_type, key_field, skip_starts_with="#", verify_columns=True):
+    """
+    Return the byte spans of the records of a tab file in key_field order.
+
+    Args:
+        input_file (str): Path to input tab-delimited file
+        data_type (type): AbstractModel subclass (e.g., TRModel)
+        key_field (str): Text field to sort by, e.g. "trf_head"
+        skip_starts_with (str, optional): Skip lines starting with this
+            string. Defaults to "#".
+        verify_columns (bool, optional): Check the `# Fields:` header.
+            Defaults to True.
+
+    Returns:
+        tuple or None: (starts, ends) int64 arrays of record lines in a
+        stable key order, or None if the file is already in key order
+
+    Note:
+        Per record, the scan keeps a 4-byte key code and two 8-byte offsets.
+    """
+    fields = data_type().dumpable_attributes
+    if verify_columns:
+        _verify_columns(input_file, fields)
+
+    keys, codes, starts, ends = _record_keys(input_file, skip_starts_with, fields[0], fields.index(key_field))
+    # Rank of each key code in sorted key order
+    ranks = np.empty(len(keys), dtype=np.int32)
+    ranks[sorted(range(len(keys)), key=list(keys).__getitem__)] = np.arange(len(keys), dtype=np.int32)
+    record_ranks = ranks[np.frombuffer(codes, dtype=np.int32)] if codes else ranks[:0]
+    if (np.diff(record_ranks) >= 0).all():
+        return None
+    order = np.argsort(record_ranks, kind="stable")
+    return (
+        np.frombuffer(starts, dtype=np.int64)[order],
+        np.frombuffer(ends, dtype=np.int64)[order],
+    )
+
+
+def _iter_span_lines(input_file, starts, ends):
+    """Yield the text lines inside each byte span, spans in the given order."""
+    if not len(starts):
+        return
+    with open(input_file, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for start, end in zip(starts, ends):
+            start, end = int(start), int(end)
+            while start < end:
+                newline = data.find(b"\n", start, end)
+                line_end = end if newline < 0 else newline + 1
+                yield data[start:line_end].decode()
+                start = line_end
+
+
+def sc_iter_tab_file_spans(input_file, data_type, starts, ends, skip_starts_with="#"):
+    """
+    Iterate over the records inside byte spans of a tab file.
+
+    Spans are read in the given order and may hold one line (as returned
+    by sc_sorted_line_spans) or a newline-aligned range of many. Lines are
+    filtered and parsed as sc_iter_tab_file() does; columns are not
+    verified.
+
+    Args:
+        input_file (str): Path to input tab-delimited file
+        data_type (type): AbstractModel subclass (e.g., TRModel)
+        starts, ends: Sequences of span start and end offsets
+        skip_starts_with (str, optional): Skip lines starting with this
+            string. Defaults to "#".
+
+    Yields:
+        AbstractModel: Model objects in span order
+    """
+    fields = data_type().dumpable_attributes
+    yield from _iter_rows_as_objects(_iter_span_lines(input_file, starts, ends), data_type, fields, skip_starts_with)
+
+
+def sc_iter_tab_file_sorted(input_file, data_type, key_field, skip_starts_with="#", verify_columns=True):
+    """
+    Iterate over a tab file in a stable order of one text field.
+
+    Yields the objects of sc_iter_tab_file(input_file, data_type) in the
+    order sorting them by key_field would give, without holding them all:
+    a first pass records the byte span and key of each line, then lines
+    are read back in key order. A file already in key order is simply
+    streamed.
+
+    Args:
+        input_file (str): Path to input tab-delimited file
+        data_type (type): AbstractModel subclass (e.g., TRModel)
+        key_field (str): Text field to sort by, e.g. "trf_head"
+        skip_starts_with (str, optional): Skip lines starting with this
+            string. Defaults to "#".
+        verify_columns (bool, optional): Check the `# Fields:` header.
+            Defaults to True.
+
+    Yields:
+        AbstractModel: Model objects in key order; ties keep file order
+
+    Example:
+        >>> for trf_obj in sc_iter_tab_file_sorted("repeats.sat", TRModel, "trf_head"):
+        ...     print(trf_obj.trf_head, trf_obj.trf_l_ind)
+
+    Note:
+        Lines must end with "\\n" or "\\r\\n". See sc_sorted_line_spans()
+        for the memory used by the first pass.
+    """
+    spans = sc_sorted_line_spans(input_file, data_type, key_field, skip_starts_with, verify_columns)
+    if spans is None:
+        yield from sc_iter_tab_file(input_file, data_type, skip_starts_with=skip_starts_with, verify_columns=False)
+        return
+    yield from sc_iter_tab_file_spans(input_file, data_type, *spans, skip_starts_with=skip_starts_with)
 
 
 def sc_iter_simple_tab_file(input_file):
@@ -0,0 +1,361 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @created: 17.10.2026
+# @author: Aleksey Komissarov
+# @contact: ad3002@gmail.com
+"""
+Columnar in-memory table of tandem repeats backed by NumPy arrays.
+
+A list of TRModel objects costs several hundred bytes per repeat before
+the sequences are counted, and every genome-wide filter is a Python loop.
+TRTable keeps the same .sat fields column by column:
+
+    numeric fields      one int64 or float64 array per field
+    trf_head, family    int32 codes into a list of distinct values
+    (categorical)       (-1 for None)
+    consensus, array    one bytes blob per field, rows point to it with
+                        start/length arrays
+
+Filtering and grouping return new tables that share the sequence blobs,
+so only the per-row arrays are copied. Rows are materialized on demand as
+read-only TRModel views. Unlike TRModel.set_with_list(), trf_id is read as
+an integer.
+
+Classes:
+    TRTable: Columnar tandem repeat table
+    TRRowView: Read-only TRModel API over one table row
+
+Example:
+    >>> table = TRTable.from_sat("genome.sat")
+    >>> large = table.filter(table["trf_array_length"] >= 10000)
+    >>> for chrm, chrm_table in large.groupby("trf_head"):
+    ...     print(chrm, len(chrm_table), chrm_table["trf_pmatch"].mean())
+    >>> print(large.row(0).get_gff3_string())
+
+See Also:
+    satellome.core_functions.models.trf_model: TRModel and the .sat fields
+    satellome.core_functions.io.tr_file: Object-based .sat loaders
+"""
+
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from satellome.constants import SAT_PARALLEL_MIN_BYTES, SAT_RANGES_PER_WORKER
+from satellome.core_functions.exceptions import FileFormatError
+from satellome.core_functions.io.sat_index import read_range_lines, split_byte_ranges
+from satellome.core_functions.models.trf_model import BaseTRModel, TRModel
+
+FIELDS = tuple(TRModel.dumpable_attributes)
+INT_FIELDS = ("trf_id",) + tuple(TRModel.int_attributes)
+FLOAT_FIELDS = tuple(TRModel.float_attributes)
+CATEGORICAL_FIELDS = ("project", "trf_head", "trf_family", "trf_ref_annotation")
+SEQUENCE_FIELDS = ("trf_consensus", "trf_array")
+
+
+def _int_value(value):
+    # Missing numbers read as a fresh TRModel has them
+    return 0 if value is None or value == "None" else int(value)
+
+
+def _float_value(value):
+    return 0.0 if value is None or value == "None" else float(value)
+
+
+class _Builder:
+    """Accumulates rows in compact buffers before the arrays are built."""
+
+    def __init__(self):
+        self.ints = {name: array("q") for name in INT_FIELDS}
+        self.floats = {name: array("d") for name in FLOAT_FIELDS}
+        self.codes = {name: array("i") for name in CATEGORICAL_FIELDS}
+        self.categories = {name: {} for name in CATEGORICAL_FIELDS}
+        self.blobs = {name: bytearray() for name in SEQUENCE_FIELDS}
+        self.starts = {name: array("q") for name in SEQUENCE_FIELDS}
+        self.lengths = {name: array("q") for name in SEQUENCE_FIELDS}
+
+        # (position in FIELDS, buffer) pairs so add() needs no name lookups
+        position = {name: i for i, name in enumerate(FIELDS)}
+        self.int_targets = [(position[name], self.ints[name].append) for name in INT_FIELDS]
+        self.float_targets = [(position[name], self.floats[name].append) for name in FLOAT_FIELDS]
+        self.code_targets = [
+            (position[name], self.codes[name].append, self.categories[name]) for name in CATEGORICAL_FIELDS
+        ]
+        self.sequence_targets = [
+            (position[name], self.blobs[name], self.starts[name].append, self.lengths[name].append)
+            for name in SEQUENCE_FIELDS
+        ]
+
+    def add(self, values):
+        """Add one row of values in FIELDS order (strings or typed values)."""
+        for i, append in self.int_targets:
+            append(_int_value(values[i]))
+        for i, append in self.float_targets:
+            append(_float_value(values[i]))
+        for i, append, categories in self.code_targets:
+            value = values[i]
+            if value is None or value == "None":
+                append(-1)
+            else:
+                append(categories.setdefault(value, len(categories)))
+        for i, blob, append_start, append_length in self.sequence_targets:
+            value = values[i]
+            data = b"" if value is None or value == "None" else value.encode()
+            append_start(len(blob))
+            append_length(len(data))
+            blob += data
+
+    def build(self):
+        columns = {}
+        for name, values in self.ints.items():
+            columns[name] = np.frombuffer(values, dtype=np.int64).copy()
+        for name, values in self.floats.items():
+            columns[name] = np.frombuffer(values, dtype=np.float64).copy()
+        categorical = {
+            name: (np.frombuffer(self.codes[name], dtype=np.int32).copy(), list(self.categories[name]))
+            for name in CATEGORICAL_FIELDS
+        }
+        sequences = {
+            name: (
+                bytes(self.blobs[name]),
+                np.frombuffer(self.starts[name], dtype=np.int64).copy(),
+                np.frombuffer(self.lengths[name], dtype=np.int64).copy(),
+            )
+            for name in SEQUENCE_FIELDS
+        }
+        return TRTable(columns, categorical, sequences)
+
+
+def _parse_sat_lines(sat_file, lines):
+    builder = _Builder()
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip() or line.startswith("#") or line.startswith("project\t"):
+            continue
+        row = line.rstrip("\r\n").split("\t")
+        try:
+            if len(row) == len(FIELDS):
+                builder.add(row)
+            else:
+                obj = TRModel.from_row(row)
+                builder.add([getattr(obj, name) for name in FIELDS])
+        except ValueError as e:
+            raise FileFormatError(f"{sat_file}:{line_number}: not a .sat record ({e})") from e
+    return builder.build()
+
+
+def _parse_sat_range(sat_file, start, end):
+    """Process pool worker: parse the lines of one byte range."""
+    # Line numbers in errors are counted from the start of the range
+    return _parse_sat_lines(f"{sat_file} (bytes {start}-{end})", read_range_lines(sat_file, start, end))
+
+
+class TRTable:
+    """Columnar tandem repeat table; build it with from_sat/from_objects."""
+
+    def __init__(self, columns, categorical, sequences):
+        """
+        Args:
+            columns (dict): Field -> int64/float64 array
+            categorical (dict): Field -> (int32 codes, list of values)
+            sequences (dict): Field -> (blob bytes, starts, lengths)
+        """
+        self.columns = columns
+        self.categorical = categorical
+        self.sequences = sequences
+
+    @classmethod
+    def from_sat(cls, sat_file, threads=1):
+        """Load a .sat file (current or legacy layout) into a table.
+
+        With threads > 1, files of SAT_PARALLEL_MIN_BYTES or more are split
+        into newline-aligned byte ranges parsed in a process pool; the
+        parts are concatenated in file order, so the table is the same as
+        a sequential load.
+
+        Raises:
+            FileFormatError: If a row has a wrong number of fields or a
+                non-numeric value in a numeric field
+        """
+        if threads <= 1 or os.path.getsize(sat_file) < SAT_PARALLEL_MIN_BYTES:
+            with open(sat_file) as fh:
+                return _parse_sat_lines(sat_file, fh)
+        ranges = split_byte_ranges(sat_file, threads * SAT_RANGES_PER_WORKER)
+        with ProcessPoolExecutor(max_workers=threads) as executor:
+            parts = list(executor.map(_parse_sat_range, [sat_file] * len(ranges), *zip(*ranges)))
+        return cls.concat(parts)
+
+    @classmethod
+    def concat(cls, tables):
+        """Concatenate tables in order; categorical codes are remapped."""
+        tables = list(tables)
+        if not tables:
+            return _Builder().build()
+        columns = {name: np.concatenate([t.columns[name] for t in tables]) for name in INT_FIELDS + FLOAT_FIELDS}
+        categorical = {}
+        for name in CATEGORICAL_FIELDS:
+            merged = {}
+            codes = []
+            for t in tables:
+                part_codes, part_categories = t.categorical[name]
+                # Extra last entry maps None (-1) to itself
+                remap = np.array(
+                    [merged.setdefault(value, len(merged)) for value in part_categories] + [-1], dtype=np.int32
+                )
+                codes.append(remap[part_codes])
+            categorical[name] = (np.concatenate(codes).astype(np.int32), list(merged))
+        sequences = {}
+        for name in SEQUENCE_FIELDS:
+            blobs, starts, shift = [], [], 0
+            for t in tables:
+                blob, part_starts, _ = t.sequences[name]
+                blobs.append(blob)
+                starts.append(part_starts + shift)
+                shift += len(blob)
+            sequences[name] = (
+                b"".join(blobs),
+                np.concatenate(starts),
+                np.concatenate([t.sequences[name][2] for t in tables]),
+            )
+        return cls(columns, categorical, sequences)
+
+    @classmethod
+    def from_objects(cls, objs):
+        """Build a table from TRModel-like objects."""
+        builder = _Builder()
+        for obj in objs:
+            builder.add([getattr(obj, name) for name in FIELDS])
+        return builder.build()
+
+    def __len__(self):
+        return len(self.columns["trf_id"])
+
+    def __getitem__(self, name):
+        """Return a column as a NumPy array.
+
+        Numeric fields are returned as stored. Categorical and sequence
+        fields are decoded into object arrays; use codes() and categories()
+        to work with categorical fields without decoding.
+        """
+        if name in self.columns:
+            return self.columns[name]
+        if name in self.categorical:
+            codes, categories = self.categorical[name]
+            values = np.array(categories + [None], dtype=object)
+            return values[codes]
+        if name in self.sequences:
+            return np.array([self.sequence(name, i) for i in range(len(self))], dtype=object)
+        raise KeyError(name)
+
+    def codes(self, name):
+        """Return the int32 codes of a categorical field (-1 is None)."""
+        return self.categorical[name][0]
+
+    def categories(self, name):
+        """Return the distinct values of a categorical field, in code order."""
+        return self.categorical[name][1]
+
+    def isin(self, name, values):
+        """Return a boolean mask of rows whose categorical field is in values."""
+        wanted = set(values)
+        codes, categories = self.categorical[name]
+        selected = [code for code, value in enumerate(categories) if value in wanted]
+        if None in wanted:
+            selected.append(-1)
+        return np.isin(codes, selected)
+
+    def sequence(self, name, index):
+        """Return one consensus or array sequence as a string."""
+        blob, starts, lengths = self.sequences[name]
+        start = starts[index]
+        return blob[start : start + lengths[index]].decode()
+
+    def take(self, indices):
+        """Return a table with the given rows, in the given order."""
+        indices = np.asarray(indices)
+        columns = {name: values[indices] for name, values in self.columns.items()}
+        categorical = {
+            name: (codes[indices], categories) for name, (codes, categories) in self.categorical.items()
+        }
+        sequences = {
+            name: (blob, starts[indices], lengths[indices])
+            for name, (blob, starts, lengths) in self.sequences.items()
+        }
+        return TRTable(columns, categorical, sequences)
+
+    def filter(self, mask):
+        """Return a table with the rows where the boolean mask is True."""
+        return self.take(np.flatnonzero(mask))
+
+    def groupby(self, name):
+        """Yield (value, table) pairs for a categorical field.
+
+        Groups come in order of first appearance, the None group last.
+        Rows keep their order within a group.
+        """
+        codes = self.categorical[name][0]
+        categories = self.categorical[name][1]
+        keys = np.where(codes < 0, len(categories), codes)
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        bounds = np.flatnonzero(np.diff(sorted_keys)) + 1
+        for group in np.split(order, bounds):
+            if len(group) == 0:
+                continue
+            code = keys[group[0]]
+            value = categories[code] if code < len(categories) else None
+            yield value, self.take(group)
+
+    def value(self, name, index):
+        """Return one field of one row as TRModel stores it."""
+        if name in self.columns:
+            return self.columns[name][index].item()
+        if name in self.categorical:
+            codes, categories = self.categorical[name]
+            code = codes[index]
+            return None if code < 0 else categories[code]
+        if name in self.sequences:
+            return self.sequence(name, index)
+        raise AttributeError(name)
+
+    def row(self, index):
+        """Return a read-only TRModel view of one row."""
+        if not -len(self) <= index < len(self):
+            raise IndexError(index)
+        return TRRowView(self, index % len(self))
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield TRRowView(self, index)
+
+    def to_objects(self, model=TRModel):
+        """Materialize every row as a model object."""
+        objs = []
+        for index in range(len(self)):
+            obj = model()
+            for name in FIELDS:
+                setattr(obj, name, self.value(name, index))
+            objs.append(obj)
+        return objs
+
+
+class TRRowView(BaseTRModel):
+    """Read-only TRModel API over one TRTable row.
+
+    Fields are read from the table on access, so str(), get_gff3_string()
+    and the other TRModel methods work without copying the row.
+    """
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table, index):
+        object.__setattr__(self, "_table", table)
+        object.__setattr__(self, "_index", index)
+
+    def __getattr__(self, name):
+        return self._table.value(name, self._index)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"TRRowView is read-only; use to_objects() to get editable rows ({name})")
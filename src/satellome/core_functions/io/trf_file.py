@@ -17,8 +17,6 @@ Classes:
 
 Functions:
     join_overlapped: Merge two overlapping tandem repeats if similar
-    get_int_gc: Calculate GC content as integer percentage
-    get_shifts_variants: Generate all circular rotations of a sequence
     sort_dictionary_by_value: Sort dictionary by values
     remove_consensus_redundancy: Canonicalize consensus sequences to minimal form
     sc_parse_raw_trf_folder: Batch parse all TRF files in a folder
@@ -47,11 +45,11 @@ See Also:
     satellome.core_functions.models.trf_model: TRModel data model
     satellome.core_functions.io.tab_file: Tab-delimited file I/O
 """
+import heapq
 import logging
 import os
 from collections import defaultdict
 
-from satellome.core_functions.exceptions import SequenceError
 from satellome.core_functions.io.abstract_reader import WiseOpener
 
 logger = logging.getLogger(__name__)
@@ -59,13 +57,13 @@ logger = logging.getLogger(__name__)
 from satellome.core_functions.io.block_file import AbstractBlockFileIO
 from satellome.core_functions.io.file_system import iter_filepath_folder
 from satellome.core_functions.io.tab_file import sc_iter_tab_file
-from satellome.core_functions.models.trf_model import TRModel
+from satellome.core_functions.models.trf_model import TRModel, parse_trf_block
+from satellome.core_functions.tools.canonical import canonical_monomer
 from satellome.core_functions.tools.parsers import refine_name
-from satellome.core_functions.tools.processing import get_revcomp, get_gc_content
-from satellome.core_functions.trf_embedings import get_cosine_distance
+from satellome.core_functions.trf_embedings import KmerProfiles, get_cosine_distance
 
 
-def join_overlapped(obj1, obj2, cutoff_distance=0.1):
+def join_overlapped(obj1, obj2, cutoff_distance=0.1, profiles=None):
     """
     Join two overlapping tandem repeat objects if they are similar.
 
@@ -83,6 +81,9 @@ def join_overlapped(obj1, obj2, cutoff_distance=0.1):
         obj2 (TRModel): Second tandem repeat object (right position)
         cutoff_distance (float, optional): Maximum cosine distance for merging.
                                           Defaults to 0.1.
+        profiles (KmerProfiles, optional): Cache of 5-mer profiles, updated
+                                          when the objects are joined.
+                                          Defaults to None (no cache).
 
     Returns:
         bool: True if objects were joined (obj1 extended with obj2 data),
@@ -96,8 +97,12 @@ def join_overlapped(obj1, obj2, cutoff_distance=0.1):
     # a ------
     # b    -----
     if obj1.trf_r_ind > obj2.trf_l_ind and obj1.trf_r_ind < obj2.trf_r_ind:
-        vector1 = obj1.get_vector()
-        vector2 = obj2.get_vector()
+        if profiles is None:
+            vector1 = obj1.get_vector()
+            vector2 = obj2.get_vector()
+        else:
+            vector1 = profiles.get_vector(obj1)
+            vector2 = profiles.get_vector(obj2)
         dist = get_cosine_distance(vector1, vector2)
         left_part = obj2.trf_l_ind - obj1.trf_l_ind
         right_part = obj2.trf_r_ind - obj1.trf_r_ind
@@ -106,54 +111,14 @@ def join_overlapped(obj1, obj2, cutoff_distance=0.1):
         intersect_fraction = middle_part / (left_part + right_part + middle_part)
 
         if dist < cutoff_distance or intersect_fraction > 0.2:
+            left_length = len(obj1.trf_array)
             obj1.set_form_overlap(obj2)
+            if profiles is not None:
+                profiles.merge(obj1, obj2, left_length)
             return True
     return False
 
 
-def get_int_gc(sequence):
-    """
-    Calculate GC content as integer percentage (0-100).
-
-    Args:
-        sequence (str): DNA sequence
-
-    Returns:
-        int: GC content as integer from 0 to 100
-
-    Example:
-        >>> get_int_gc("ATGC")
-        50
-        >>> get_int_gc("AAAA")
-        0
-    """
-    gc = get_gc_content(sequence)
-    return int(100 * round(gc, 2))
-
-
-def get_shifts_variants(sequence):
-    """
-    Generate all circular rotations of a sequence.
-
-    Args:
-        sequence (str): Input sequence (e.g., DNA monomer)
-
-    Returns:
-        list: All unique circular rotations of the sequence
-
-    Raises:
-        SequenceError: If sequence cannot generate shift variants
-
-    Example:
-        >>> get_shifts_variants("ACGT")
-        ['ACGT', 'CGTA', 'GTAC', 'TACG']
-    """
-    shifts = set()
-    for i in range(len(sequence)):
-        shifts.add(sequence[i:] + sequence[:i])
-    return list(shifts)
-
-
 def sort_dictionary_by_value(d, reverse=False):
     """
     Sort dictionary by values in ascending or descending order.
@@ -178,10 +143,10 @@ def remove_consensus_redundancy(trf_objs):
     """
     Canonicalize tandem repeat consensus sequences to minimal lexicographic form.
 
-    For each consensus sequence, generates all circular rotations and reverse
-    complements, then selects the lexicographically minimal variant as the
-    canonical form. Also detects and collapses multimers (e.g., "GTAGTAGTA"
-    becomes "ACT" if ACT is the minimal form).
+    Each consensus is replaced by canonical_monomer(): the lexicographically
+    minimal rotation of its primitive root or of the root's reverse
+    complement. Multimers collapse to their unit (e.g., "GTAGTAGTA" becomes
+    "ACT"), whether or not the unit itself occurs in trf_objs.
 
     Canonicalization ensures that equivalent repeat units (rotations and reverse
     complements) share the same consensus representation, enabling proper
@@ -197,10 +162,6 @@ def remove_consensus_redundancy(trf_objs):
             - consensus_frequencies (list): List of (count, consensus) tuples
                                            sorted by count (descending)
 
-    Raises:
-        SequenceError: If a monomer cannot generate shift variants (indicates
-                      invalid non-ACGT characters or data corruption)
-
     Example:
         >>> # Input: Multiple representations of same repeat
         >>> trf1 = TRModel()
@@ -220,74 +181,17 @@ def remove_consensus_redundancy(trf_objs):
     Note:
         - Modifies trf_consensus attribute of input objects in-place
         - Objects with empty consensus are filtered out (set to None)
-        - Multimer detection works by GC content matching and period division
+        - Multimer detection uses the minimal period of the consensus
+        - Canonical forms are memoized process-wide (see tools/canonical.py)
         - Uses lexicographic ordering: e.g., ACT < AGT < CTA < GTA < TAC < TAG
     """
-    # sort by length
-    consensuses = [x.trf_consensus for x in trf_objs]
-    consensuses = list(set(consensuses))
-    consensuses.sort(key=lambda x: len(x))
-    max_consensus_length = max(len(c) for c in consensuses) if consensuses else 2020
-    length2consensuses = {}
-    for i, monomer in enumerate(consensuses):
-        n = len(monomer)
-        length2consensuses.setdefault(n, {})
-        gc = get_int_gc(monomer)
-        length2consensuses[n].setdefault(gc, [])
-        length2consensuses[n][gc].append(i)
-    result_rules = {}
-    for i, monomer in enumerate(consensuses):
-        if not monomer:
-            continue
-        if monomer in result_rules:
-            continue
-        gc = get_int_gc(monomer)
-        base = len(monomer)
-        n = base
-        variants = set(
-            get_shifts_variants(monomer) + get_shifts_variants(get_revcomp(monomer))
-        )
-        if not variants:
-            raise SequenceError(
-                f"Invalid monomer sequence '{monomer}': cannot generate shift variants. "
-                f"This may indicate non-ACGT characters or issues with sequence rotation/reverse-complement. "
-                f"Valid monomers must contain only A, C, G, T nucleotides. "
-                f"Check TRF output for data corruption or invalid consensus sequences."
-            )
-        lex_consensus = min(variants)
-        result_rules[monomer] = lex_consensus
-        while n <= max_consensus_length:
-            if n in length2consensuses and gc in length2consensuses[n]:
-                for k in length2consensuses[n][gc]:
-                    monomer_b = consensuses[k]
-                    if monomer_b in result_rules:
-                        continue
-                    s = n // base
-                    v = set()
-                    for p in range(s):
-                        v.add(monomer_b[p * base : (p + 1) * base])
-                    if len(v) > 1:
-                        continue
-                    item = v.pop()
-                    if item in variants:
-                        result_rules[consensuses[k]] = lex_consensus
-
-            n += base
     variants2df = defaultdict(int)
     for i, trf_obj in enumerate(trf_objs):
         if not trf_obj.trf_consensus:
             trf_objs[i] = None
             continue
-        if trf_obj.trf_consensus in result_rules:
-            variants2df[result_rules[trf_obj.trf_consensus]] += 1
-        else:
-            variants = set(
-                get_shifts_variants(trf_obj.trf_consensus) + get_shifts_variants(get_revcomp(trf_obj.trf_consensus))
-            )
-            lex_consensus = min(variants) if variants else trf_obj.trf_consensus
-            result_rules[trf_obj.trf_consensus] = lex_consensus
-            variants2df[lex_consensus] += 1
-        trf_obj.trf_consensus = result_rules[trf_obj.trf_consensus]
+        trf_obj.trf_consensus = canonical_monomer(trf_obj.trf_consensus)
+        variants2df[trf_obj.trf_consensus] += 1
     variants2df = sort_dictionary_by_value(variants2df, reverse=True)
     trf_objs = [x for x in trf_objs if x is not None]
     return trf_objs, variants2df
@@ -315,6 +219,8 @@ class TRFFileIO(AbstractBlockFileIO):
 
     Public Methods:
         iter_parse: Iterate over TRF file yielding filtered TRModel objects
+        iter_raw: Iterate over TRF file yielding unfiltered TRModel objects
+        refine_obj_set: Filter, number and canonicalize one sequence's repeats
         parse_to_file: Parse TRF file and write to tab-delimited output
         refine_old_to_file: Legacy parsing method (same as parse_to_file)
 
@@ -389,25 +295,56 @@ class TRFFileIO(AbstractBlockFileIO):
             - All consensus sequences are canonicalized to minimal lexicographic form
         """
         trf_id = 1
-        for ii, (head, body, start, next) in enumerate(self.read_online(trf_file)):
-            head = head.replace("\t", " ")
-            obj_set = []
-            n = body.count("\n")
-            for i, line in enumerate(self._gen_data_line(body)):
-                trf_obj = TRModel()
-                trf_obj.set_raw_trf(head, None, line)
-                obj_set.append(trf_obj)
-            if filter:
-                # Filter object set
-                trf_obj_set = self._filter_obj_set(obj_set)
-                obj_set = [x for x in trf_obj_set if x]
-            ### set trf_id
-            for trf_obj in obj_set:
-                trf_obj.trf_id = trf_id
-                trf_id += 1
-            obj_set, variants2df = remove_consensus_redundancy(obj_set)
+        for head, obj_set in self.iter_raw(trf_file, unique=filter):
+            obj_set, trf_id = self.refine_obj_set(obj_set, trf_id=trf_id, filter=filter)
             yield obj_set
 
+    def refine_obj_set(self, obj_set, trf_id=1, filter=True):
+        """
+        Filter, number and canonicalize the repeats of one sequence.
+
+        Args:
+            obj_set (list of TRModel): Unfiltered repeats of one sequence
+            trf_id (int, optional): First ID to assign. Defaults to 1.
+            filter (bool, optional): Apply overlap/duplicate filtering.
+                                    Defaults to True.
+
+        Returns:
+            tuple: (obj_set, next_trf_id)
+        """
+        if filter:
+            # Filter object set
+            trf_obj_set = self._filter_obj_set(obj_set)
+            obj_set = [x for x in trf_obj_set if x]
+        ### set trf_id
+        for trf_obj in obj_set:
+            trf_obj.trf_id = trf_id
+            trf_id += 1
+        obj_set, variants2df = remove_consensus_redundancy(obj_set)
+        return obj_set, trf_id
+
+    def iter_raw(self, trf_file, unique=False):
+        """
+        Yield unfiltered tandem repeat objects per TRF block.
+
+        Args:
+            trf_file (str): Path to TRF output file (.dat format)
+            unique (bool, optional): Skip data lines identical to an earlier
+                line of the block (dropped by the filter anyway).
+                Defaults to False.
+
+        Yields:
+            tuple: (head, obj_set) where head is the raw "Sequence:" line and
+                   obj_set is a list of TRModel objects in TRF output order
+
+        Note:
+            - No filtering, ID assignment or consensus canonicalization;
+              used to stitch windowed runs before they are filtered together
+        """
+        for head, body, start, next in self.read_online(trf_file):
+            head = head.replace("\t", " ")
+            yield head, parse_trf_block(head, self._gen_data_line(body), unique=unique)
+
     def parse_to_file(
         self, file_path, output_path, trf_id=0, project=None, verbose=True
     ):
@@ -540,9 +477,13 @@ class TRFFileIO(AbstractBlockFileIO):
         - Nested repeats: keeps outer (longer) repeat
         - Partial overlaps: merges if similar (via _join_overlapped)
 
-        Filtering happens in two passes:
-        1. First pass: remove exact duplicates, nested repeats, merge similar overlaps
-        2. Second pass: iteratively merge remaining similar overlaps (disabled)
+        Repeats are swept left to right. Every repeat is compared, in
+        order, with the still active repeats to its left, i.e. those that
+        end at or after its start; a heap of right ends retires the others.
+        This performs exactly the comparisons of the original nested loop
+        over all pairs (a, b), a < b, in an order that does not change any
+        outcome: a pair only reads and updates its own two repeats, and the
+        pairs of every repeat are still visited in increasing order.
 
         Args:
             obj_set (list of TRModel): Unfiltered tandem repeat objects for one
@@ -564,23 +505,29 @@ class TRFFileIO(AbstractBlockFileIO):
                 a ------
                 b    ----- (partial overlap → merge if similar)
 
-            - Second pass is currently disabled (is_overlapping always False)
-              due to "suspicious results" in original implementation
+            - A repeat removed while it is active (duplicate with lower
+              pmatch, or nested in a repeat starting at the same position)
+              keeps absorbing the repeats to its right, as in the nested loop
+            - 5-mer profiles are computed once per repeat and updated on merges
+            - The second pass of the original implementation (iterative
+              merging of remaining overlaps) stays disabled due to
+              "suspicious results"
         """
-        # NB: I removed the overlaping part due to suspicious results.
-        # Complex filter
-        is_overlapping = False
-        n = len(obj_set)
-
         obj_set.sort(key=lambda x: (x.trf_l_ind, x.trf_r_ind))
-        for a in range(0, n):
-            obj1 = obj_set[a]
-            if not obj1:
-                continue
-            for b in range(a + 1, n):
-                obj2 = obj_set[b]
-                if not obj2:
-                    continue
+        profiles = KmerProfiles()
+        # Active repeats in index order and a heap of their right ends
+        active = {}
+        ends = []
+        for b, obj2 in enumerate(obj_set):
+            # a ------
+            # b                -----
+            while ends and ends[0][0] < obj2.trf_l_ind:
+                r_ind, a = heapq.heappop(ends)
+                obj1 = active.get(a)
+                # Entries left from before a merge extended the repeat are stale
+                if obj1 is not None and obj1.trf_r_ind == r_ind:
+                    del active[a]
+            for a, obj1 in active.items():
                 # a ------
                 # b ------
                 if (
@@ -590,8 +537,8 @@ class TRFFileIO(AbstractBlockFileIO):
                     # Check period
                     if obj1.trf_pmatch >= obj2.trf_pmatch:
                         obj_set[b] = None
-                    else:
-                        obj_set[a] = None
+                        break
+                    obj_set[a] = None
                     continue
                 # a ------ ------  -------
                 # b ---       ---    ---
@@ -600,9 +547,9 @@ class TRFFileIO(AbstractBlockFileIO):
                     and obj1.trf_r_ind >= obj2.trf_r_ind
                 ):
                     obj_set[b] = None
-                    continue
-                # a ---       ---    ---
-                # b ------ ------  -------
+                    break
+                # a ---
+                # b ------
                 if (
                     obj2.trf_l_ind <= obj1.trf_l_ind
                     and obj2.trf_r_ind >= obj1.trf_r_ind
@@ -612,96 +559,18 @@ class TRFFileIO(AbstractBlockFileIO):
                 # a ------
                 # b    -----
                 if obj1.trf_r_ind > obj2.trf_l_ind and obj1.trf_r_ind < obj2.trf_r_ind:
-                    if self._join_overlapped(obj1, obj2, cutoff_distance=0.1):
-                        obj_set[b] = None
-                    continue
-                # a ------
-                # b                -----
-                if obj1.trf_r_ind < obj2.trf_l_ind:
-                    break
-                # a               ------
-                # b -----
-                if obj2.trf_r_ind < obj1.trf_l_ind:
-                    break
-        obj_set = [a for a in obj_set if not a is None]
-        n = len(obj_set)
-
-        while is_overlapping:
-            is_overlapping = False
-
-            for a in range(0, n):
-                obj1 = obj_set[a]
-                if not obj1:
-                    continue
-                for b in range(a + 1, n):
-                    obj2 = obj_set[b]
-                    if not obj2:
-                        continue
-                    # a ------
-                    # b               -----
-                    if obj1.trf_r_ind < obj2.trf_l_ind:
-                        break
-                    # a              ------
-                    # b -----
-                    if obj2.trf_r_ind < obj1.trf_l_ind:
-                        break
-                    # a ------
-                    # b    -----
-                    if (
-                        obj1.trf_r_ind > obj2.trf_l_ind
-                        and obj1.trf_r_ind < obj2.trf_r_ind
-                    ):
-
-                        overlap = float(abs(obj1.trf_r_ind - obj2.trf_l_ind))
-                        min_length = min(obj1.trf_array_length, obj2.trf_array_length)
-                        overlap_proc_diff = overlap * 1.0 / min_length
-                        gc_dif = abs(obj1.trf_array_gc - obj2.trf_array_gc)
-
-                        if (
-                            overlap_proc_diff
-                            >= 30
-                            and gc_dif
-                            <= 0.05
-                        ):
-                            is_overlapping = True
-                            if self._join_overlapped(obj1, obj2):
-                                obj2 = None
-                        continue
-                    # a ------
-                    # b ------
-                    if (
-                        obj1.trf_l_ind == obj2.trf_l_ind
-                        and obj1.trf_r_ind == obj2.trf_r_ind
-                    ):
-                        # Check period
-                        if obj1.trf_pmatch >= obj2.trf_pmatch:
-                            obj_set[b] = None
-                            continue
-                        else:
-                            obj_set[a] = None
-                            continue
-                    # a ------ ------  -------
-                    # b ---       ---     ---
-                    if (
-                        obj1.trf_l_ind <= obj2.trf_l_ind
-                        and obj1.trf_r_ind >= obj2.trf_r_ind
+                    if self._join_overlapped(
+                        obj1, obj2, cutoff_distance=0.1, profiles=profiles
                     ):
+                        heapq.heappush(ends, (obj1.trf_r_ind, a))
                         obj_set[b] = None
-                        continue
-                    # a ---       ---            ---
-                    # b ------ ------  -------
-                    if (
-                        obj2.trf_l_ind <= obj1.trf_l_ind
-                        and obj2.trf_r_ind >= obj1.trf_r_ind
-                    ):
-                        obj_set[a] = None
-                        continue
-
-            obj_set = [a for a in obj_set if not a is None]
-
-        return obj_set
+                        break
+            if obj_set[b] is not None:
+                active[b] = obj2
+                heapq.heappush(ends, (obj2.trf_r_ind, b))
+        return [obj for obj in obj_set if obj is not None]
 
-    def _join_overlapped(self, obj1, obj2, cutoff_distance=0.1):
+    def _join_overlapped(self, obj1, obj2, cutoff_distance=0.1, profiles=None):
         """
         Wrapper method for join_overlapped() function.
 
@@ -710,6 +579,8 @@ class TRFFileIO(AbstractBlockFileIO):
             obj2 (TRModel): Second tandem repeat object
             cutoff_distance (float, optional): Maximum cosine distance for merging.
                                               Defaults to 0.1.
+            profiles (KmerProfiles, optional): Cache of 5-mer profiles.
+                                              Defaults to None.
 
         Returns:
             bool: True if objects were joined, False otherwise
@@ -717,7 +588,9 @@ class TRFFileIO(AbstractBlockFileIO):
         See Also:
             join_overlapped: The underlying implementation function
         """
-        return join_overlapped(obj1, obj2, cutoff_distance=cutoff_distance)
+        return join_overlapped(
+            obj1, obj2, cutoff_distance=cutoff_distance, profiles=profiles
+        )
 
 
 def sc_parse_raw_trf_folder(trf_raw_folder, output_trf_file, project=None):
@@ -44,6 +44,10 @@ class AbstractModel(object):
         42
     """
 
+    # No instance __dict__ here: subclasses without __slots__ get one as
+    # usual, subclasses that declare __slots__ stay compact
+    __slots__ = ()
+
     dumpable_attributes = []
     int_attributes = []
     float_attributes = []
@@ -51,6 +55,60 @@ class AbstractModel(object):
     list_attributes_types = {}
     other_attributes = {}
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._build_field_tables()
+
+    @classmethod
+    def _build_field_tables(cls):
+        """Build the per-class field type tables once, at class creation."""
+        kinds = {}
+        for attr in cls.list_attributes:
+            kinds[attr] = "list"
+        for attr in cls.float_attributes:
+            kinds[attr] = "float"
+        for attr in cls.int_attributes:
+            kinds[attr] = "int"
+        cls._field_kinds = kinds
+        converters = {"int": int, "float": float}
+        cls._row_converters = tuple(
+            converters.get(kinds.get(attr)) if kinds.get(attr) != "list" else cls._list_converter(attr)
+            for attr in cls.dumpable_attributes
+        )
+        # from_row() may skip __init__ when every attribute it sets is in a row
+        initialized = set(cls.int_attributes) | set(cls.float_attributes) | set(cls.other_attributes)
+        cls._row_covers_init = initialized <= set(cls.dumpable_attributes)
+        legacy_mapping = getattr(cls, "legacy_to_new_field_mapping", None)
+        cls._legacy_only_fields = (
+            frozenset(legacy_mapping) - frozenset(cls.dumpable_attributes) if legacy_mapping else frozenset()
+        )
+
+    @classmethod
+    def _list_converter(cls, attr):
+        item_type = cls.list_attributes_types[attr]
+        return lambda value: [item_type(x) for x in value.split(",")] if value else []
+
+    @classmethod
+    def from_row(cls, row):
+        """Build an object from a split row in dumpable_attributes order.
+
+        Same result as ``obj = cls(); obj.set_with_list(row)``, with the
+        per-class converter table built at class creation. Rows of another
+        length (legacy formats) go through set_with_list().
+        """
+        if len(row) != len(cls.dumpable_attributes) or not cls._row_covers_init:
+            obj = cls()
+            obj.set_with_list(row)
+            return obj
+        obj = cls.__new__(cls)
+        for key, convert, value in zip(cls.dumpable_attributes, cls._row_converters, row):
+            if value == "None":
+                value = None
+            elif convert is not None:
+                value = convert(value)
+            setattr(obj, key, value)
+        return obj
+
     def __init__(self):
         """Create attributes accordong to
 
@@ -117,21 +175,22 @@ class AbstractModel(object):
         # Auto-detect and convert legacy format if model supports it
         if hasattr(self, 'legacy_to_new_field_mapping'):
             # Check if this looks like legacy format by checking for legacy-only fields
-            legacy_only_fields = set(self.legacy_to_new_field_mapping.keys()) - set(self.dumpable_attributes)
-            if any(field in dictionary for field in legacy_only_fields):
+            if any(field in dictionary for field in self._legacy_only_fields):
                 logger.debug(f"Detected legacy format for {self.__class__.__name__}, converting...")
                 dictionary = self._convert_legacy_dict(dictionary)
 
+        kinds = self._field_kinds
         for key, value in dictionary.items():
             key, value = self.preprocess_pair(key, value)
             try:
+                kind = kinds.get(key)
                 if value == "None" or value is None:
                     value = None
-                elif key in self.int_attributes:
+                elif kind == "int":
                     value = int(value)
-                elif key in self.float_attributes:
+                elif kind == "float":
                     value = float(value)
-                elif key in self.list_attributes:
+                elif kind == "list":
                     if not value:
                         value = []
                         continue
@@ -207,15 +266,16 @@ class AbstractModel(object):
                         f"got {n}. Sample data: {data[:50]}..."
                         )
 
-        for i, value in enumerate(data):
-            key = dumpable_attributes[i]
+        kinds = self._field_kinds
+        for key, value in zip(dumpable_attributes, data):
+            kind = kinds.get(key)
             if value == "None":
                 value = None
-            elif key in self.int_attributes:
+            elif kind == "int":
                 value = int(value)
-            elif key in self.float_attributes:
+            elif kind == "float":
                 value = float(value)
-            elif key in self.list_attributes:
+            elif kind == "list":
                 if value:
                     value = value.split(",")
                     value = [self.list_attributes_types[key](x) for x in value]
@@ -333,3 +393,5 @@ class AbstractModel(object):
     def __setitem__(self, key, value):
         return setattr(self, key, value)
 
+
+AbstractModel._build_field_tables()
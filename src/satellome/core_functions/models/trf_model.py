@@ -48,7 +48,99 @@ def clear_sequence(sequence):
     return re.sub(r"[^actgnuwsmkrybdhvACTGNUWSMKRYBDHV\-]", "", sequence)
 
 
-class TRModel(AbstractModel):
+# Bytes clear_sequence() drops from an upper-cased ASCII sequence
+_NON_SEQUENCE_BYTES = bytes(c for c in range(256) if c not in b"ACTGNUWSMKRYBDHV-")
+
+
+def _clear_sequence_bytes(sequence):
+    """Return clear_sequence(sequence) as bytes for plain sequences, else None.
+
+    One upper() and one translate() instead of two regex passes. Sequences
+    with whitespace, non-ASCII or dropped characters return None, so the
+    caller falls back to the regular parser for them.
+    """
+    if not sequence.isascii():
+        return None
+    cleaned = sequence.encode().upper().translate(None, _NON_SEQUENCE_BYTES)
+    return cleaned if len(cleaned) == len(sequence) else None
+
+
+def _gc_fraction(sequence):
+    """get_gc_content() of a cleaned (upper-case) bytes sequence."""
+    if not sequence:
+        return 0.0
+    return float(len(sequence) - len(sequence.translate(None, b"GC"))) / float(len(sequence))
+
+
+def parse_trf_block(head, lines, unique=False):
+    """
+    Parse the data lines of one TRF block into TRModel objects.
+
+    Gives the same objects as TRModel.set_raw_trf() line by line, but the
+    head is parsed once per block, sequences are cleaned with one
+    bytes.translate() and GC is counted with another. Lines that are not
+    plain 15-field records go through set_raw_trf().
+
+    Args:
+        head (str): TRF "Sequence:" line of the block
+        lines (iterable of str): Stripped TRF data lines
+        unique (bool, optional): Skip lines identical to an earlier line of
+            the block. Only for blocks passed to TRFFileIO._filter_obj_set,
+            which always drops such exact duplicates. Defaults to False.
+
+    Returns:
+        list of TRModel: Objects in line order
+    """
+    parsed_head = trf_parse_head(head)
+    trf_head = parsed_head.strip() if parsed_head else "Unknown"
+    seen = set() if unique else None
+    obj_set = []
+    for line in lines:
+        if seen is not None:
+            if line in seen:
+                continue
+            seen.add(line)
+        trf_obj = TRModel()
+        fields = line.split(" ")
+        consensus = array = None
+        if len(fields) == 15 and len(" ".join(fields[:13]).split()) == 13:
+            consensus = _clear_sequence_bytes(fields[13])
+            array = _clear_sequence_bytes(fields[14])
+        try:
+            if consensus is None or array is None:
+                raise ValueError
+            trf_obj.trf_l_ind = int(fields[0])
+            trf_obj.trf_r_ind = int(fields[1])
+            trf_obj.trf_period = int(fields[2])
+            trf_obj.trf_n_copy = float(fields[3])
+            trf_obj.trf_pmatch = float(fields[5])
+        except ValueError:
+            trf_obj.set_raw_trf(head, None, line)
+            obj_set.append(trf_obj)
+            continue
+        trf_obj.trf_head = trf_head
+        (
+            trf_obj.trf_l_cons,
+            _,
+            trf_obj.trf_indels,
+            trf_obj.trf_score,
+            trf_obj.trf_n_a,
+            trf_obj.trf_n_c,
+            trf_obj.trf_n_g,
+            trf_obj.trf_n_t,
+            trf_obj.trf_entropy,
+        ) = fields[4:13]
+        trf_obj.trf_pvar = int(100 - trf_obj.trf_pmatch)
+        trf_obj.trf_consensus = consensus.decode()
+        trf_obj.trf_array = array.decode()
+        trf_obj.trf_array_gc = _gc_fraction(array)
+        trf_obj.trf_consensus_gc = _gc_fraction(consensus)
+        trf_obj.trf_array_length = len(array)
+        obj_set.append(trf_obj)
+    return obj_set
+
+
+class BaseTRModel(AbstractModel):
     """Class for tandem repeat wrapping.
 
     Core Attributes:
@@ -87,8 +179,12 @@ class TRModel(AbstractModel):
     - trf_chr: Chromosome name (via @property)
     - trf_gi: GI identifier (via @property)
 
+    Instances are created through TRModel (attributes in a __dict__) or
+    CompactTRModel (fixed __slots__); this base class declares no storage.
     """
 
+    __slots__ = ()
+
     dumpable_attributes = [
         "project",
         "trf_id",
@@ -530,13 +626,41 @@ class TRModel(AbstractModel):
         return "%s\n" % "\t".join(map(str, d))
 
 
+class TRModel(BaseTRModel):
+    """Tandem repeat with attributes in a regular instance __dict__.
+
+    Accepts any extra attribute callers attach to it. See BaseTRModel for
+    the fields.
+    """
+
+
+class CompactTRModel(BaseTRModel):
+    """Tandem repeat with a fixed set of __slots__ and no instance __dict__.
+
+    Same API and output as TRModel, for holding many records in memory.
+    Only the .sat fields and the raw TRF line fields can be set.
+
+    Example:
+        >>> row = line.rstrip("\n").split("\t")
+        >>> obj = CompactTRModel.from_row(row)
+    """
+
+    __slots__ = tuple(BaseTRModel.dumpable_attributes) + (
+        "trf_l_cons",
+        "trf_indels",
+        "trf_score",
+        "trf_n_a",
+        "trf_n_c",
+        "trf_n_g",
+        "trf_n_t",
+    )
+
+
 class NetworkSliceModel(TRModel):
     """Class for network slice data."""
 
-    def __init__(self):
-        self.dumpable_attributes = ["gid"] + self.dumpable_attributes
-        self.int_attributes = ["gid"] + self.int_attributes
-        super(TRModel, self).__init__()
+    dumpable_attributes = ["gid"] + TRModel.dumpable_attributes
+    int_attributes = ["gid"] + TRModel.int_attributes
 
 
 class TRsClassificationModel(AbstractModel):
@@ -15,6 +15,9 @@ chromosome name parsing, and creates TRF-compatible output with sequences.
 Functions:
     reverse_complement: Compute DNA reverse complement
     extract_sequences_from_bed: Extract and annotate sequences from BED coordinates
+    split_bed_by_chrom: Group BED lines by chromosome
+    filter_trf_by_size: Keep arrays above one length threshold
+    filter_trf_by_sizes: Split a .sat into several size tiers in one pass
 
 Key Features:
     - Memory-efficient chromosome-by-chromosome processing
@@ -61,7 +64,11 @@ See Also:
 
 import logging
 import os
-from satellome.core_functions.io.fasta_file import sc_iter_fasta_brute
+from contextlib import ExitStack
+from satellome.constants import SAT_WRITE_BUFFER_BYTES
+from satellome.core_functions.io.fasta_file import sc_iter_fasta_brute, IndexedFastaReader
+from satellome.core_functions.io.bgzf import open_gzip_fasta
+from satellome.core_functions.exceptions import FileFormatError
 from satellome.core_functions.tools.processing import get_gc_content
 
 logger = logging.getLogger(__name__)
@@ -193,7 +200,51 @@ def calculate_entropy(sequence):
     return round(entropy, 2)
 
 
-def extract_sequences_from_bed(fasta_file, bed_file, output_file, fasta_output_file=None, project="FasTAN"):
+def _iter_fasta_regions(fasta_file, genome_cache=None, names=None):
+    """Yield (header, length, get_region) per FASTA sequence for BED extraction.
+
+    get_region(start, end) returns the upper-cased slice. Uncompressed FASTA
+    goes through IndexedFastaReader, so only the requested regions (and only
+    sequences listed in names) are ever materialised; gzipped input without a
+    genome cache falls back to sequential parsing of whole sequences.
+    """
+    if genome_cache is not None:
+        for record in genome_cache.records:
+            if names is not None and record["name"] not in names:
+                continue
+            name = record["name"]
+            yield (
+                f">{record['header']}",
+                record["length"],
+                lambda start, end, name=name: genome_cache.fetch(name, start, end),
+            )
+        return
+
+    reader = None
+    if not fasta_file.endswith(".gz"):
+        try:
+            reader = IndexedFastaReader(fasta_file)
+        except FileFormatError as e:
+            logger.warning(f"{e} Falling back to sequential FASTA parsing")
+
+    if reader is not None:
+        with reader:
+            for name in reader.names:
+                if names is not None and name not in names:
+                    continue
+                yield (
+                    f">{reader.header(name)}",
+                    reader.length(name),
+                    lambda start, end, name=name: reader.fetch(name, start, end).decode("ascii").upper(),
+                )
+    else:
+        for header, sequence in sc_iter_fasta_brute(fasta_file):
+            sequence = sequence.upper()
+            yield header, len(sequence), lambda start, end, sequence=sequence: sequence[start:end]
+
+
+def extract_sequences_from_bed(fasta_file, bed_file, output_file, fasta_output_file=None, project="FasTAN",
+                               genome_cache=None):
     """
     Extract sequences from FASTA based on BED coordinates and output TRF-compatible format.
 
@@ -205,12 +256,15 @@ def extract_sequences_from_bed(fasta_file, bed_file, output_file, fasta_output_f
         output_file (str): Path to output TRF-format file (18 tab-separated fields)
         fasta_output_file (str, optional): Path to output FASTA file with extracted sequences
         project (str): Project name for TRF output (default: "FasTAN")
+        genome_cache (GenomeCache, optional): Shared genome cache; when given, the
+            duplicate-header guard and the Python fallback read from it instead
+            of re-parsing the FASTA
 
     Returns:
         int: Number of sequences successfully extracted
     """
     import os
-    import gzip
+    import io
     import shutil
     import subprocess
     from pathlib import Path
@@ -221,19 +275,29 @@ def extract_sequences_from_bed(fasta_file, bed_file, output_file, fasta_output_f
     # pull from the wrong sequence. The Rust bed-extract binary does not check
     # this, so enforce it here (one pass over FASTA headers) — the guard then
     # holds for BOTH the Rust and the Python backends.
-    seen_headers = set()
-    fa_opener = gzip.open if fasta_file.endswith('.gz') else open
-    with fa_opener(fasta_file, 'rt') as fa_fh:
-        for fa_line in fa_fh:
-            if fa_line.startswith('>'):
-                parts = fa_line[1:].split()
-                first_word = parts[0] if parts else ''
-                if first_word in seen_headers:
-                    raise ValueError(
-                        f"Duplicate chromosome name '{first_word}' found in FASTA. "
-                        f"First word of FASTA headers must be unique."
-                    )
-                seen_headers.add(first_word)
+    if genome_cache is not None:
+        if genome_cache.duplicate_names:
+            raise ValueError(
+                f"Duplicate chromosome name '{genome_cache.duplicate_names[0]}' found in FASTA. "
+                f"First word of FASTA headers must be unique."
+            )
+    else:
+        seen_headers = set()
+        if fasta_file.endswith('.gz'):
+            fa_fh = io.TextIOWrapper(open_gzip_fasta(fasta_file), encoding='utf8')
+        else:
+            fa_fh = open(fasta_file, 'r')
+        with fa_fh:
+            for fa_line in fa_fh:
+                if fa_line.startswith('>'):
+                    parts = fa_line[1:].split()
+                    first_word = parts[0] if parts else ''
+                    if first_word in seen_headers:
+                        raise ValueError(
+                            f"Duplicate chromosome name '{first_word}' found in FASTA. "
+                            f"First word of FASTA headers must be unique."
+                        )
+                    seen_headers.add(first_word)
 
     # Try Rust binary first
     bed_extract_bin = None
@@ -351,7 +415,7 @@ def extract_sequences_from_bed(fasta_file, bed_file, output_file, fasta_output_f
 
     try:
         logger.info("Processing FASTA file...")
-        for header, sequence in sc_iter_fasta_brute(fasta_file):
+        for header, chr_len, get_region in _iter_fasta_regions(fasta_file, genome_cache, names=bed_entries):
             # Remove '>' and take first word as chromosome name
             full_header = header.lstrip('>')
             chr_name = full_header.split()[0]
@@ -377,8 +441,6 @@ def extract_sequences_from_bed(fasta_file, bed_file, output_file, fasta_output_f
                 logger.debug(f"No BED entries for {chr_name}, skipping")
                 continue
 
-            sequence = sequence.upper()
-            chr_len = len(sequence)
             logger.debug(f"Processing {chr_name}: {chr_len} bp, {len(bed_entries[chr_name])} entries")
 
             # Process all BED entries for this chromosome
@@ -392,7 +454,7 @@ def extract_sequences_from_bed(fasta_file, bed_file, output_file, fasta_output_f
                     continue
 
                 # Extract sequence (BED coordinates are 0-based, half-open [start, end))
-                extracted_seq = sequence[start:end]
+                extracted_seq = get_region(start, end)
 
                 # Apply reverse complement if on negative strand
                 if strand == '-':
@@ -461,6 +523,25 @@ def extract_sequences_from_bed(fasta_file, bed_file, output_file, fasta_output_f
     return extracted_count
 
 
+def split_bed_by_chrom(bed_file, names=()):
+    """Group the lines of a BED file by chromosome.
+
+    Args:
+        bed_file (str): BED file (comment lines are skipped)
+        names (iterable): Chromosomes to include even without BED lines
+
+    Returns:
+        dict: chromosome -> BED lines as bytes, in order of appearance
+    """
+    lines = {name: [] for name in names}
+    with open(bed_file, "rb") as fh:
+        for line in fh:
+            if not line.strip() or line.startswith(b"#"):
+                continue
+            lines.setdefault(line.split(b"\t", 1)[0].decode(), []).append(line)
+    return {name: b"".join(chrom_lines) for name, chrom_lines in lines.items()}
+
+
 def filter_trf_by_size(input_trf_file, output_trf_file, min_array_length, fasta_output_file=None):
     """
     Filter TRF file by minimum array length.
@@ -479,62 +560,99 @@ def filter_trf_by_size(input_trf_file, output_trf_file, min_array_length, fasta_
         >>> stats = filter_trf_by_size("all.sat", "1kb.sat", 1000)
         >>> print(f"Filtered {stats['filtered']} of {stats['total']} entries")
     """
+    tiers = [(min_array_length, output_trf_file, fasta_output_file)]
+    return filter_trf_by_sizes(input_trf_file, tiers)[min_array_length]
+
+
+def filter_trf_by_sizes(input_trf_file, tiers):
+    """
+    Filter TRF file by several minimum array lengths in one pass.
+
+    Reads the input once and writes each record to every tier it passes.
+    Each tier file is the same as filter_trf_by_size() would write for it.
+
+    Args:
+        input_trf_file (str): Path to input TRF file (18 tab-separated fields)
+        tiers (list): (min_array_length, output_trf_file, fasta_output_file)
+            tuples; fasta_output_file may be None
+
+    Returns:
+        dict: Maps each min_array_length to the statistics filter_trf_by_size()
+        returns for it
+
+    Example:
+        >>> stats = filter_trf_by_sizes("all.sat", [
+        ...     (1000, "1kb.sat", None),
+        ...     (10000, "10kb.sat", "10kb.arrays.fasta"),
+        ... ])
+        >>> print(stats[10000]['filtered'])
+    """
+    # Ascending thresholds: a record passes a prefix of the tiers
+    tiers = sorted(tiers, key=lambda tier: tier[0])
+    cutoffs = [min_array_length for min_array_length, _, _ in tiers]
+    filtered_counts = [0] * len(tiers)
+    total_lengths = [0] * len(tiers)
     total_count = 0
-    filtered_count = 0
-    total_length = 0
 
-    with open(input_trf_file, 'r') as in_fh:
-        with open(output_trf_file, 'w') as out_fh:
-            fasta_fh = open(fasta_output_file, 'w') if fasta_output_file else None
-            try:
-                # Write header for filtered file
-                out_fh.write(f"# Filtered TRF file: array_length > {min_array_length} bp\n")
-                out_fh.write(f"# Source: {os.path.basename(input_trf_file)}\n")
-                out_fh.write(f"# Fields: project, trf_id, trf_head, trf_l_ind, trf_r_ind, trf_period, trf_n_copy,\n")
-                out_fh.write(f"#         trf_pmatch, trf_pvar, trf_entropy, trf_consensus, trf_array,\n")
-                out_fh.write(f"#         trf_array_gc, trf_consensus_gc, trf_array_length, trf_joined, trf_family, trf_ref_annotation\n")
-
-                for line in in_fh:
-                    line = line.strip()
-                    if not line or line.startswith('#'):
-                        continue
-
-                    total_count += 1
-                    fields = line.split('\t')
-
-                    # TRF format: column 15 (index 14) is trf_array_length
-                    if len(fields) < 15:
-                        continue
-
-                    try:
-                        array_length = int(fields[14])
-                    except ValueError:
-                        continue
-
-                    if array_length > min_array_length:
-                        out_fh.write(line + '\n')
-                        filtered_count += 1
-                        total_length += array_length
-
-                        # Write FASTA if requested
-                        if fasta_fh and len(fields) >= 12:
-                            # fields: project, trf_id, trf_head, trf_l_ind, trf_r_ind, trf_period, ...
-                            # fields[2]=chr, fields[3]=start, fields[4]=end, fields[5]=period, fields[11]=sequence
-                            chr_name = fields[2]
-                            start = fields[3]
-                            end = fields[4]
-                            period = fields[5]
-                            sequence = fields[11]
-                            fasta_header = f">{chr_name}_{start}_{end}_{array_length}_{period}"
-                            fasta_fh.write(f"{fasta_header}\n{sequence}\n")
-            finally:
-                if fasta_fh:
-                    fasta_fh.close()
+    with ExitStack() as stack:
+        in_fh = stack.enter_context(open(input_trf_file, 'r'))
+        out_fhs, fasta_fhs = [], []
+        for min_array_length, output_trf_file, fasta_output_file in tiers:
+            out_fh = stack.enter_context(open(output_trf_file, 'w', buffering=SAT_WRITE_BUFFER_BYTES))
+            out_fhs.append(out_fh)
+            fasta_fhs.append(
+                stack.enter_context(open(fasta_output_file, 'w', buffering=SAT_WRITE_BUFFER_BYTES))
+                if fasta_output_file else None
+            )
+
+            # Write header for filtered file
+            out_fh.write(f"# Filtered TRF file: array_length > {min_array_length} bp\n")
+            out_fh.write(f"# Source: {os.path.basename(input_trf_file)}\n")
+            out_fh.write(f"# Fields: project, trf_id, trf_head, trf_l_ind, trf_r_ind, trf_period, trf_n_copy,\n")
+            out_fh.write(f"#         trf_pmatch, trf_pvar, trf_entropy, trf_consensus, trf_array,\n")
+            out_fh.write(f"#         trf_array_gc, trf_consensus_gc, trf_array_length, trf_joined, trf_family, trf_ref_annotation\n")
+
+        for line in in_fh:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
 
-    logger.info(f"Filtered {filtered_count}/{total_count} entries with array_length > {min_array_length} bp")
+            total_count += 1
+            # Fields up to trf_array_length; the rest stays in the last item
+            fields = line.split('\t', 15)
 
-    return {
-        'total': total_count,
-        'filtered': filtered_count,
-        'total_length': total_length
-    }
+            # TRF format: column 15 (index 14) is trf_array_length
+            if len(fields) < 15:
+                continue
+
+            try:
+                array_length = int(fields[14])
+            except ValueError:
+                continue
+
+            record = line + '\n'
+            fasta_record = None
+            for i, cutoff in enumerate(cutoffs):
+                if array_length <= cutoff:
+                    break
+                out_fhs[i].write(record)
+                filtered_counts[i] += 1
+                total_lengths[i] += array_length
+
+                # Write FASTA if requested
+                if fasta_fhs[i]:
+                    if fasta_record is None:
+                        # fields[2]=chr, fields[3]=start, fields[4]=end, fields[5]=period, fields[11]=sequence
+                        fasta_header = f">{fields[2]}_{fields[3]}_{fields[4]}_{array_length}_{fields[5]}"
+                        fasta_record = f"{fasta_header}\n{fields[11]}\n"
+                    fasta_fhs[i].write(fasta_record)
+
+    stats = {}
+    for i, cutoff in enumerate(cutoffs):
+        logger.info(f"Filtered {filtered_counts[i]}/{total_count} entries with array_length > {cutoff} bp")
+        stats[cutoff] = {
+            'total': total_count,
+            'filtered': filtered_counts[i],
+            'total_length': total_lengths[i]
+        }
+    return stats
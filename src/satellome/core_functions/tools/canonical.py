@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @created: 16.10.2026
+# @author: Aleksey Komissarov
+# @contact: ad3002@gmail.com
+"""
+Canonical forms of tandem repeat monomers.
+
+A monomer, any of its rotations, its reverse complement and any exact
+multimer of these describe the same tandem repeat. The canonical form is
+the lexicographically least rotation of the primitive root (the monomer
+cut to its minimal period) or of the root's reverse complement.
+
+Both steps are linear: the minimal period comes from the KMP prefix
+function and the least rotation from Booth's algorithm, instead of
+building all L rotations of the monomer and of its reverse complement.
+Canonical forms are memoized in a process-wide LRU, so monomers shared by
+many chromosomes are canonicalized once.
+
+Functions:
+    least_rotation: Lexicographically least rotation (Booth's algorithm)
+    primitive_root: Shortest unit whose exact repeat is the sequence
+    canonical_monomer: Canonical form of a monomer (memoized)
+
+Example:
+    >>> canonical_monomer("CTA"), canonical_monomer("AGT"), canonical_monomer("ACTACTACT")
+    ('ACT', 'ACT', 'ACT')
+    >>> primitive_root("ACACAC")
+    'AC'
+
+See Also:
+    satellome.core_functions.io.trf_file: remove_consensus_redundancy
+"""
+
+from functools import lru_cache
+
+from satellome.constants import CANONICAL_CACHE_SIZE
+from satellome.core_functions.tools.processing import get_revcomp
+
+
+def least_rotation(sequence):
+    """
+    Return the lexicographically least rotation of a sequence.
+
+    Booth's algorithm, O(L) comparisons.
+
+    Example:
+        >>> least_rotation("TACG")
+        'ACGT'
+    """
+    doubled = sequence + sequence
+    failure = [-1] * len(doubled)
+    k = 0
+    for j in range(1, len(doubled)):
+        c = doubled[j]
+        i = failure[j - k - 1]
+        while i != -1 and c != doubled[k + i + 1]:
+            if c < doubled[k + i + 1]:
+                k = j - i - 1
+            i = failure[i]
+        if c != doubled[k + i + 1]:
+            if c < doubled[k]:
+                k = j
+            failure[j - k] = -1
+        else:
+            failure[j - k] = i + 1
+    return doubled[k:k + len(sequence)]
+
+
+def primitive_root(sequence):
+    """
+    Return the shortest unit whose exact repeat is the sequence.
+
+    Example:
+        >>> primitive_root("ACTACTACT"), primitive_root("ACTAC")
+        ('ACT', 'ACTAC')
+    """
+    n = len(sequence)
+    if n < 2:
+        return sequence
+    prefix = [0] * n
+    for i in range(1, n):
+        j = prefix[i - 1]
+        while j and sequence[i] != sequence[j]:
+            j = prefix[j - 1]
+        if sequence[i] == sequence[j]:
+            j += 1
+        prefix[i] = j
+    period = n - prefix[-1]
+    return sequence[:period] if n % period == 0 else sequence
+
+
+@lru_cache(maxsize=CANONICAL_CACHE_SIZE)
+def canonical_monomer(monomer):
+    """
+    Return the canonical form of a monomer.
+
+    Equal for all rotations, the reverse complement and exact multimers
+    of a monomer: the least rotation of its primitive root or of the
+    root's reverse complement.
+
+    Example:
+        >>> canonical_monomer("TTAGGG")
+        'AACCCT'
+    """
+    if not monomer:
+        return monomer
+    root = primitive_root(monomer)
+    return min(least_rotation(root), least_rotation(get_revcomp(root)))
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @created: 16.10.2026
+# @author: Aleksey Komissarov
+# @contact: ad3002@gmail.com
+"""
+Chunk-level checkpoint journal for resumable TRF searches.
+
+A TRF search over a large genome runs for many hours. Every chunk that
+finishes (TRF run and, for ordinary chunks, parsing) is appended to a
+journal in the work directory as one JSON line: chunk name, hash of the
+chunk input, .dat path, parsed .sat path and record count. A restarted
+run reads the journal and only schedules the chunks that are missing or
+whose input changed.
+
+Lines are flushed and fsync'ed as they are written, so a killed run
+loses at most the chunks that were still running. A torn last line is
+dropped (and truncated away) on load.
+
+Classes:
+    ChunkJournal: Append-only journal of completed chunks
+
+Functions:
+    chunk_input_hash: Hash of a chunk FASTA file and the TRF parameters
+
+Example:
+    >>> journal = ChunkJournal("work/chunks.journal")
+    >>> key = chunk_input_hash("work/0.fa")
+    >>> journal.record("0.fa", key, "0.fa.2.5.7.80.10.50.2000.dat", sat="0.fa.2.5.7.80.10.50.2000.dat.sat", records=12)
+    >>> journal.is_done("0.fa", key)
+    True
+
+See Also:
+    satellome.core_functions.tools.trf_tools: trf_search_by_splitting
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from satellome.constants import TRF_DEFAULT_PARAMS
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_FILE_NAME = "chunks.journal"
+
+
+def chunk_input_hash(fa_file, params=TRF_DEFAULT_PARAMS, block_size=1 << 20):
+    """Return the sha1 of a chunk FASTA file together with the TRF parameters."""
+    digest = hashlib.sha1(" ".join(params).encode())
+    with open(fa_file, "rb") as fh:
+        for block in iter(lambda: fh.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ChunkJournal:
+    """Append-only journal of completed TRF chunks.
+
+    Paths are stored relative to the journal directory, so a work
+    directory can be moved between nodes.
+
+    Args:
+        path (str): Journal file; existing entries are loaded
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.folder = os.path.dirname(os.path.abspath(path))
+        self.entries = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        complete = 0
+        with open(self.path, "rb") as fh:
+            for line_number, line in enumerate(fh, 1):
+                if not line.endswith(b"\n"):
+                    # Torn write of a killed run
+                    logger.warning(f"Dropping torn last line {line_number} of {self.path}")
+                    break
+                complete += len(line)
+                try:
+                    entry = json.loads(line)
+                    self.entries[entry["chunk"]] = entry
+                except (ValueError, KeyError):
+                    logger.warning(f"Skipping damaged line {line_number} of {self.path}")
+        if complete < os.path.getsize(self.path):
+            # New records must not be appended onto the torn line
+            with open(self.path, "r+b") as fw:
+                fw.truncate(complete)
+        if self.entries:
+            logger.info(f"Loaded {len(self.entries)} completed chunks from {self.path}")
+
+    def _abspath(self, path):
+        return os.path.join(self.folder, path) if path else None
+
+    def is_done(self, chunk, input_hash):
+        """Return True if chunk finished with the same input and its files still exist."""
+        entry = self.entries.get(chunk)
+        if not entry or entry["hash"] != input_hash:
+            return False
+        return all(
+            os.path.exists(self._abspath(entry[key])) for key in ("dat", "sat") if entry.get(key)
+        )
+
+    def get(self, chunk):
+        """Return the journal entry of chunk with absolute dat/sat paths, or None."""
+        entry = self.entries.get(chunk)
+        if entry is None:
+            return None
+        return dict(entry, dat=self._abspath(entry["dat"]), sat=self._abspath(entry.get("sat")))
+
+    def record(self, chunk, input_hash, dat, sat=None, records=None):
+        """Append a completed chunk (thread-safe, durable on return).
+
+        Args:
+            chunk (str): Chunk FASTA file name
+            input_hash (str): chunk_input_hash of the chunk
+            dat (str): TRF .dat file
+            sat (str): Parsed .sat file, None when parsed later (windows)
+            records (int): Number of parsed tandem repeats
+        """
+        entry = {
+            "chunk": chunk,
+            "hash": input_hash,
+            "dat": os.path.relpath(dat, self.folder),
+            "sat": os.path.relpath(sat, self.folder) if sat else None,
+            "records": records,
+        }
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            with open(self.path, "a") as fw:
+                fw.write(line)
+                fw.flush()
+                os.fsync(fw.fileno())
+            self.entries[chunk] = entry
@@ -11,6 +11,9 @@ import logging
 import os
 import sys
 
+from satellome.core_functions.io.sat_index import LazySatReader
+from satellome.core_functions.models.trf_model import CompactTRModel
+
 logger = logging.getLogger(__name__)
 
 BIN_SIZE = 500_000       # 500 kb bins for genome/chromosome view
@@ -141,17 +144,6 @@ def bin_families(families, chroms, top_families, bin_size=BIN_SIZE):
     return bins, list(tracked)
 
 
-def _sat_lines(fh):
-    """Yield lines from SAT file, fixing '#project' header."""
-    for line in fh:
-        if line.startswith('#project') or line.startswith('#Project'):
-            yield line[1:]
-        elif line.startswith('#'):
-            continue
-        else:
-            yield line
-
-
 # Categories by array length (matching satellome classification approach)
 CATEGORIES = ["lt1kb", "1-10kb", "10-100kb", "gt100kb"]
 CAT_DISPLAY = ["< 1 kb", "1-10 kb", "10-100 kb", "> 100 kb"]
@@ -197,19 +189,14 @@ def bin_repeats(sat_path, chroms):
         fine[c["name"]] = [{cat: 0 for cat in CATEGORIES} for _ in range(n_fine)]
         chroms_set.add(c["name"])
 
-    csv.field_size_limit(sys.maxsize)
-
-    with open(sat_path, 'r') as f:
-        reader = csv.DictReader(_sat_lines(f), delimiter='\t')
-        for row in reader:
-            chrom = row.get("trf_head", "")
+    # Only coordinates are needed, so the array sequences are never read
+    with LazySatReader(sat_path) as reader:
+        for trf_obj in reader.iter_models(CompactTRModel):
+            chrom = trf_obj.trf_head
             if chrom not in chroms_set:
                 continue
-            try:
-                start = int(row.get("trf_l_ind", 0))
-                end = int(row.get("trf_r_ind", 0))
-            except (ValueError, TypeError):
-                continue
+            start = trf_obj.trf_l_ind
+            end = trf_obj.trf_r_ind
 
             category = _classify_by_array_length(end - start)
             _add_to_bins(coarse[chrom], start, end, category, BIN_SIZE)
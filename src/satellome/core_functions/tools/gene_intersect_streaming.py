@@ -31,7 +31,8 @@ logger = logging.getLogger(__name__)
 
 from satellome.core_functions.io.tr_file import save_trs_dataset
 from satellome.core_functions.io.tab_file import sc_iter_tab_file
-from satellome.core_functions.models.trf_model import TRModel
+from satellome.core_functions.io.sat_index import LazySatReader
+from satellome.core_functions.models.trf_model import CompactTRModel, TRModel
 from satellome.core_functions.io.gff_file import sc_gff3_reader
 from satellome.core_functions.tools.processing import count_lines_large_file
 
@@ -85,9 +86,10 @@ def get_trf_chromosomes(trf_file):
     chrm_counts = Counter()
 
     logger.info("Pre-scanning TRF file to identify chromosomes...")
-    for trf_obj in tqdm(sc_iter_tab_file(trf_file, TRModel), desc="Scan TRF"):
-        chrm = trf_obj.trf_head.split()[0]
-        chrm_counts[chrm] += 1
+    with LazySatReader(trf_file) as reader:
+        for trf_obj in tqdm(reader.iter_models(CompactTRModel), total=len(reader), desc="Scan TRF"):
+            chrm = trf_obj.trf_head.split()[0]
+            chrm_counts[chrm] += 1
 
     logger.info(f"Found {len(chrm_counts)} chromosomes in TRF file")
     return chrm_counts
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @created: 16.10.2026
+# @author: Aleksey Komissarov
+# @contact: ad3002@gmail.com
+"""
+Single-pass genome scan stage.
+
+Genome size, scaffold lengths, N-gaps, GC and the duplicate-header check
+used to be separate passes over the FASTA (get_genome_size_with_progress,
+scaffold_length_sort_length, get_gaps_annotation, the guard in
+extract_sequences_from_bed). The scan reads the genome once by building
+the shared genome cache, whose index already holds every one of them:
+record lengths and md5s, the N-run mask, per-window GC and duplicate
+header names. Consumers read the cache directly (trf_draw.py through
+--genome_cache, run_fastan for its result key) instead of separate
+sidecar files.
+
+main() runs the scan in a background thread alongside FasTAN.
+
+Functions:
+    run_genome_scan: Build (or reuse) the cache and summarize the genome
+
+Example:
+    >>> summary = run_genome_scan("genome.fa.gz", "/out/genome_cache")
+    >>> summary["genome_size"], summary["n_gaps"], summary["duplicate_names"]
+    (3117275501, 349, [])
+
+See Also:
+    satellome.core_functions.io.genome_cache: The underlying cache
+"""
+
+import logging
+
+from satellome.core_functions.io.genome_cache import get_genome_cache
+
+logger = logging.getLogger(__name__)
+
+
+def run_genome_scan(fasta_file, cache_dir):
+    """Scan the genome once into the genome cache and summarize it.
+
+    Reuses an existing cache when the FASTA is unchanged.
+
+    Args:
+        fasta_file (str): Input FASTA (plain or .gz)
+        cache_dir (str): Genome cache folder, usually <output_dir>/genome_cache
+
+    Returns:
+        dict: genome_size, n_sequences, n_gaps, gap_length, duplicate_names
+        and genome_cache
+    """
+    genome_cache = get_genome_cache(fasta_file, cache_dir)
+    gaps = genome_cache.gaps()
+    summary = {
+        "genome_size": genome_cache.genome_size,
+        "n_sequences": len(genome_cache),
+        "n_gaps": len(gaps),
+        "gap_length": sum(gap[3] for gap in gaps),
+        "duplicate_names": list(genome_cache.duplicate_names),
+        "genome_cache": genome_cache,
+    }
+    logger.info(
+        f"Genome scan: {summary['genome_size']:,} bp in {summary['n_sequences']} sequences, "
+        f"{summary['n_gaps']} gaps ({summary['gap_length']:,} bp N)"
+    )
+    if summary["duplicate_names"]:
+        logger.warning(
+            f"Duplicate FASTA header first words: {', '.join(summary['duplicate_names'][:10])} "
+            f"(sequence extraction will refuse this FASTA)"
+        )
+    return summary
+
@@ -15,12 +15,16 @@ import os
 import subprocess
 import tempfile
 from typing import List, Tuple, Dict
+
+import numpy as np
 from tqdm import tqdm
 
 logger = logging.getLogger(__name__)
 
-from satellome.core_functions.io.fasta_file import sc_iter_fasta_brute
-from satellome.constants import KMER_THRESHOLD_DEFAULT
+from satellome.core_functions.io.fasta_file import sc_iter_fasta_brute, IndexedFastaReader
+from satellome.core_functions.exceptions import FileFormatError
+from satellome.core_functions.tools.scheduling import estimate_chunk_cost
+from satellome.constants import KMER_THRESHOLD_DEFAULT, TRF_DENSITY_KMER, TRF_DENSITY_SAMPLE
 
 
 def run_varprofiler(
@@ -171,6 +175,89 @@ def merge_overlapping_regions(
     return merged
 
 
+def region_repeat_density(
+    regions: List[Tuple[int, int, int]],
+    start: int,
+    end: int
+) -> float:
+    """
+    Estimate the fraction of repeated k-mers in a region from varprofiler windows.
+    
+    Args:
+        regions: List of (start, end, unique_kmers) tuples for the chromosome
+        start: Region start
+        end: Region end
+    
+    Returns:
+        Overlap-weighted mean of 1 - unique_kmers / window_length (0.0 if no windows overlap)
+    """
+    covered = 0
+    weighted = 0.0
+    for w_start, w_end, unique_kmers in regions:
+        overlap = min(end, w_end) - max(start, w_start)
+        if overlap <= 0 or w_end <= w_start:
+            continue
+        density = 1.0 - unique_kmers / (w_end - w_start)
+        weighted += overlap * min(max(density, 0.0), 1.0)
+        covered += overlap
+    return weighted / covered if covered else 0.0
+
+
+_BASE_CODES = np.full(256, -1, dtype=np.int64)
+for _code, _base in enumerate(b"ACGT"):
+    _BASE_CODES[_base] = _code
+    _BASE_CODES[ord(chr(_base).lower())] = _code
+
+
+def sequence_repeat_density(
+    seq: str,
+    kmer_size: int = TRF_DENSITY_KMER,
+    sample_size: int = TRF_DENSITY_SAMPLE,
+    n_slices: int = 3
+) -> float:
+    """
+    Estimate the fraction of repeated k-mers of a sequence without varprofiler.
+    
+    The same measure as region_repeat_density (1 - distinct k-mers / k-mers),
+    computed on up to sample_size bases taken from n_slices evenly spaced
+    slices, so a chunk costs a few milliseconds regardless of its length.
+    
+    Args:
+        seq: Sequence
+        kmer_size: K-mer size (at most 31)
+        sample_size: Bases sampled in total
+        n_slices: Number of sampled slices
+    
+    Returns:
+        Repeat density (0.0-1.0); 0.0 for sequences shorter than kmer_size
+    """
+    slice_size = max(kmer_size, sample_size // n_slices)
+    if len(seq) <= sample_size:
+        slices = [seq]
+    else:
+        step = (len(seq) - slice_size) // (n_slices - 1) if n_slices > 1 else 0
+        slices = [seq[i * step : i * step + slice_size] for i in range(n_slices)]
+    kmers = []
+    for part in slices:
+        codes = _BASE_CODES[np.frombuffer(part.encode(), dtype=np.uint8)]
+        n_kmers = len(codes) - kmer_size + 1
+        if n_kmers <= 0:
+            continue
+        kmer = np.zeros(n_kmers, dtype=np.int64)
+        valid = np.ones(n_kmers, dtype=bool)
+        for i in range(kmer_size):
+            window = codes[i : i + n_kmers]
+            kmer = kmer * 4 + window
+            valid &= window >= 0
+        kmers.append(kmer[valid])
+    if not kmers:
+        return 0.0
+    kmers = np.concatenate(kmers)
+    if not len(kmers):
+        return 0.0
+    return 1.0 - len(np.unique(kmers)) / len(kmers)
+
+
 def split_genome_smart(
     fasta_file: str,
     folder_path: str,  # Changed from wdir to folder_path - should be the temp directory
@@ -180,7 +267,8 @@ def split_genome_smart(
     chunk_size: int = None,  # Not used - we process entire repeat-rich regions
     overlap_size: int = 0,   # No overlap needed
     use_kmer_filter: bool = True,
-    kmer_bed_file: str = None
+    kmer_bed_file: str = None,
+    chunk_costs: Dict[str, float] = None
 ) -> List[str]:
     """
     Split genome into chunks using varprofiler to skip repeat-poor regions.
@@ -195,6 +283,8 @@ def split_genome_smart(
         overlap_size: Overlap between chunks in bp
         use_kmer_filter: Whether to use k-mer filtering
         kmer_bed_file: Pre-computed BED file path
+        chunk_costs: Optional dict filled with output file path -> predicted
+            TRF cost (region length scaled by k-mer repeat density)
     
     Returns:
         List of output file paths
@@ -203,6 +293,7 @@ def split_genome_smart(
     
     # Step 1: Run k-mer profiling if enabled
     repeat_regions = {}
+    kmer_data = {}
     if use_kmer_filter:
         # Use provided BED file or generate new one
         if kmer_bed_file and os.path.exists(kmer_bed_file):
@@ -242,12 +333,28 @@ def split_genome_smart(
     # Step 2: Split sequences into chunks
     file_counter = 0
     
-    # First pass to count total base pairs to process
+    # First pass to count total base pairs to process. Uncompressed FASTA is
+    # read through the .fai index so regions are fetched one at a time;
+    # gzipped (or irregularly wrapped) FASTA is loaded into memory.
     total_bp_to_process = 0
     sequences = []
-    # Read sequences without extra output
-    for header, seq in sc_iter_fasta_brute(fasta_file):
-        sequences.append((header, seq))
+    reader = None
+    if not fasta_file.endswith(".gz"):
+        try:
+            reader = IndexedFastaReader(fasta_file)
+        except FileFormatError as e:
+            logger.warning(f"{e} Falling back to in-memory splitting")
+    if reader is not None:
+        for name in reader.names:
+            sequences.append((
+                f">{reader.header(name)}",
+                reader.length(name),
+                lambda start, end, name=name: reader.fetch(name, start, end).decode("ascii"),
+            ))
+    else:
+        for header, seq in sc_iter_fasta_brute(fasta_file):
+            sequences.append((header, len(seq), lambda start, end, seq=seq: seq[start:end]))
+    for header, seq_len, _ in sequences:
         chrom = header.split()[0].replace(">", "")
         if use_kmer_filter and chrom in repeat_regions:
             # Count only repeat-rich regions
@@ -255,7 +362,7 @@ def split_genome_smart(
                 total_bp_to_process += (end - start)
         else:
             # Count entire sequence
-            total_bp_to_process += len(seq)
+            total_bp_to_process += seq_len
     
     # Process sequences with progress bar
     if use_kmer_filter:
@@ -263,9 +370,8 @@ def split_genome_smart(
     else:
         logger.info(f"Processing {len(sequences)} sequences, total {total_bp_to_process:,} bp")
     with tqdm(total=total_bp_to_process, desc="Splitting genome into chunks", unit=" bp", unit_scale=True, unit_divisor=1000, dynamic_ncols=True) as pbar:
-        for header, seq in sequences:
+        for header, seq_len, get_region in sequences:
             chrom = header.split()[0].replace(">", "")
-            seq_len = len(seq)
             
             if use_kmer_filter and chrom in repeat_regions:
                 # Use k-mer guided splitting
@@ -281,7 +387,7 @@ def split_genome_smart(
                     continue
                 
                 # Extract region sequence (entire repeat-rich region, no chunking)
-                region_seq = seq[region_start:region_end]
+                region_seq = get_region(region_start, region_end)
                 
                 # Save to file
                 output_file = os.path.join(folder_path, f"{file_counter:05d}.fa")
@@ -291,9 +397,15 @@ def split_genome_smart(
                     fw.write(f"{new_header}\n{region_seq}\n")
                 
                 output_files.append(output_file)
+                if chunk_costs is not None:
+                    density = region_repeat_density(kmer_data.get(chrom, []), region_start, region_end)
+                    chunk_costs[output_file] = estimate_chunk_cost(region_end - region_start, density)
                 file_counter += 1
                 pbar.update(region_end - region_start)  # Update progress bar
     
+    if reader is not None:
+        reader.close()
+
     logger.info(f"Created {len(output_files)} chunks")
     if use_kmer_filter:
         total_bp = sum(end - start for regions in repeat_regions.values() for start, end in regions)
@@ -184,15 +184,17 @@ def get_genome_size(fasta_file):
     return genome_size
 
 
-def get_genome_size_with_progress(fasta_file):
+def get_genome_size_with_progress(fasta_file, genome_cache=None):
     """
     Calculate total genome size from FASTA file.
 
-    Uses the Rust genome-size binary for fast computation (supports .gz).
-    Falls back to Python if the binary is not available.
+    Reads the size from the shared genome cache index when one is given.
+    Otherwise uses the Rust genome-size binary for fast computation
+    (supports .gz) and falls back to Python if the binary is not available.
 
     Args:
         fasta_file (str): Path to input FASTA file (genome assembly)
+        genome_cache (GenomeCache, optional): Shared genome cache
 
     Returns:
         int: Total genome size in base pairs (sum of all sequence lengths)
@@ -202,6 +204,11 @@ def get_genome_size_with_progress(fasta_file):
     import os
     from pathlib import Path
 
+    if genome_cache is not None:
+        genome_size = genome_cache.genome_size
+        logger.info(f"Total genome size: {genome_size:,} bp in {len(genome_cache)} scaffolds/contigs (genome cache)")
+        return genome_size
+
     logger.info(f"Calculating genome size for: {fasta_file}")
 
     # Try Rust binary first
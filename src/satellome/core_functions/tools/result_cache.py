@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @created: 16.10.2026
+# @author: Aleksey Komissarov
+# @contact: ad3002@gmail.com
+"""
+Content-addressed cache of TRF and FasTAN results shared across projects.
+
+Assemblies that differ in a few scaffolds (patches, re-scaffolded
+versions, haplotypes) share most of their sequence. Results are stored
+under a key built from the input sequence hash, the tool, the tool
+identity (version and binary checksum) and the tool parameters, so an
+identical sequence is never searched twice, whatever project or chunk it
+comes from.
+
+Each entry is a directory of files. Entries are written to a temporary
+directory and renamed into place, so concurrent runs sharing a cache
+never see partial entries. The modification time of an entry records
+its last use; once the cache grows beyond max_size the least recently
+used entries are removed.
+
+Classes:
+    ResultCache: Directory cache with LRU eviction by total size
+
+Functions:
+    make_cache_key: Key of (sequence hash, tool, version, parameters)
+    sequence_hash: sha1 of a sequence
+    file_hash: sha1 of a file
+    records_hash: sha1 of a genome from its per-record names and md5s
+    tool_identity: Version string and checksum of a tool binary
+
+Example:
+    >>> cache = ResultCache("/data/satellome_cache", max_size=10 * 1024 ** 3)
+    >>> key = make_cache_key(sequence_hash(seq), "trf", tool_identity("trf"), ["2", "7", "7"])
+    >>> body = cache.read(key, "dat")
+    >>> if body is None:
+    ...     cache.store(key, {"dat": run_trf_on(seq)})
+
+See Also:
+    satellome.core_functions.tools.trf_tools: trf_search_by_splitting
+    satellome.main: run_fastan
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+
+from satellome.constants import RESULT_CACHE_MAX_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+def sequence_hash(seq):
+    """Return the sha1 of a sequence (str or bytes)."""
+    if isinstance(seq, str):
+        seq = seq.encode()
+    return hashlib.sha1(seq).hexdigest()
+
+
+def file_hash(path, block_size=1 << 20):
+    """Return the sha1 of a file."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def records_hash(records):
+    """Return the sha1 of a genome from its records, without reading it.
+
+    Args:
+        records (list): Dicts with "name" and "md5" in FASTA order, as
+            stored in the genome cache index
+    """
+    digest = hashlib.sha1()
+    for record in records:
+        digest.update(f"{record['name']}\t{record['md5']}\n".encode())
+    return digest.hexdigest()
+
+
+def tool_identity(binary, version=None):
+    """Return "<version>:<sha1 of the binary>" for a tool on disk or PATH.
+
+    The binary checksum changes with every rebuild, so results of a
+    patched tool are never mixed with results of the original one.
+    """
+    path = shutil.which(binary) or binary
+    try:
+        checksum = file_hash(path)
+    except OSError:
+        checksum = "unknown"
+    return f"{version or ''}:{checksum}"
+
+
+def make_cache_key(seq_hash, tool, version, params):
+    """Return the cache key of one tool run on one sequence."""
+    payload = json.dumps([seq_hash, tool, version, [str(p) for p in params]])
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """Directory cache of tool results with LRU eviction by total size.
+
+    Args:
+        cache_dir (str): Cache directory, created if missing
+        max_size (int): Total size in bytes kept after eviction
+    """
+
+    def __init__(self, cache_dir, max_size=RESULT_CACHE_MAX_SIZE):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_size = int(max_size)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._size = None
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def _touch(self, entry_dir):
+        try:
+            os.utime(entry_dir)
+        except OSError:
+            pass
+
+    def lookup(self, key):
+        """Return the entry directory of key (marking it used), or None."""
+        entry_dir = self._entry_dir(key)
+        with self._lock:
+            if os.path.isdir(entry_dir):
+                self.hits += 1
+                self._touch(entry_dir)
+                return entry_dir
+            self.misses += 1
+            return None
+
+    def read(self, key, name):
+        """Return the bytes of file name of an entry, or None on a miss."""
+        entry_dir = self.lookup(key)
+        if entry_dir is None:
+            return None
+        try:
+            with open(os.path.join(entry_dir, name), "rb") as fh:
+                return fh.read()
+        except OSError:
+            # Evicted by a concurrent run between lookup and read
+            return None
+
+    def restore(self, key, destinations):
+        """Copy the files of an entry to destinations (name -> path).
+
+        Returns:
+            bool: True if every file was restored
+        """
+        entry_dir = self.lookup(key)
+        if entry_dir is None:
+            return False
+        try:
+            for name, path in destinations.items():
+                shutil.copyfile(os.path.join(entry_dir, name), path)
+        except OSError as e:
+            logger.warning(f"Failed to restore cached result {key}: {e}")
+            return False
+        return True
+
+    def store(self, key, files):
+        """Store an entry of files (name -> bytes).
+
+        An existing entry with the same key is kept. Stored entries count
+        towards max_size, and least recently used entries are evicted.
+        """
+        def write(name, path):
+            with open(path, "wb") as fw:
+                fw.write(files[name])
+        self._store(key, files, write)
+
+    def store_files(self, key, paths):
+        """Store an entry by copying files (name -> path), like store."""
+        self._store(key, paths, lambda name, path: shutil.copyfile(paths[name], path))
+
+    def _store(self, key, names, write):
+        entry_dir = self._entry_dir(key)
+        if os.path.isdir(entry_dir):
+            return
+        os.makedirs(os.path.dirname(entry_dir), exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(entry_dir), prefix=".tmp_")
+        size = 0
+        try:
+            for name in names:
+                path = os.path.join(tmp_dir, name)
+                write(name, path)
+                size += os.path.getsize(path)
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # Another run stored the same key first, or the disk is full
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+        with self._lock:
+            if self._size is not None:
+                self._size += size
+        if self.size() > self.max_size:
+            # Evict down to 90%, so a full cache is not rescanned on every store
+            self.evict(self.max_size * 9 // 10)
+
+    def _scan(self):
+        """Return (mtime, size, entry_dir) of all entries."""
+        entries = []
+        for prefix in os.listdir(self.cache_dir):
+            prefix_dir = os.path.join(self.cache_dir, prefix)
+            if not os.path.isdir(prefix_dir):
+                continue
+            for key in os.listdir(prefix_dir):
+                if key.startswith(".tmp_"):
+                    continue
+                entry_dir = os.path.join(prefix_dir, key)
+                try:
+                    size = sum(entry.stat().st_size for entry in os.scandir(entry_dir))
+                    entries.append((os.stat(entry_dir).st_mtime, size, entry_dir))
+                except OSError:
+                    continue
+        return entries
+
+    def size(self):
+        """Return the total size of the cache in bytes (scanned once, then tracked)."""
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._scan())
+            return self._size
+
+    def evict(self, max_size=None):
+        """Remove least recently used entries until the cache fits in max_size.
+
+        Returns:
+            int: Number of removed entries
+        """
+        max_size = self.max_size if max_size is None else max_size
+        with self._lock:
+            entries = sorted(self._scan())
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, entry_dir in entries:
+                if total <= max_size:
+                    break
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                total -= size
+                removed += 1
+            self._size = total
+        if removed:
+            logger.info(f"Result cache: evicted {removed} least recently used entries ({total:,} bytes left)")
+        return removed
+
+    def report(self, label="Result cache"):
+        """Log hit and miss counts."""
+        total = self.hits + self.misses
+        if total:
+            logger.info(f"{label}: {self.hits}/{total} hits ({self.hits / total:.1%})")
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# @created: 16.10.2026
+# @author: Aleksey Komissarov
+# @contact: ad3002@gmail.com
+"""
+Size-aware scheduling of per-chunk jobs (TRF runs).
+
+TRF runtime grows with chunk length and, much more steeply, with repeat
+content. When chunks are submitted in directory order, one large or
+repeat-dense chunk picked up last keeps a single worker busy while the
+others sit idle. Jobs are therefore submitted longest-first (LPT list
+scheduling), and small scaffolds are bin-packed into chunks of balanced
+size instead of being filled until a size limit is exceeded.
+
+Functions:
+    estimate_chunk_cost: Predicted relative cost of a chunk
+    pack_into_bins: Balanced bin packing (largest item to lightest bin)
+    order_longest_first: Sort jobs by predicted cost, largest first
+    predict_makespan: Makespan of LPT list scheduling over N workers
+    report_makespan: Log predicted vs actual makespan of a finished run
+
+Example:
+    >>> bins = pack_into_bins([("a", 70), ("b", 50), ("c", 40), ("d", 30)], 2)
+    >>> [sorted(b) for b in bins]
+    [['a', 'd'], ['b', 'c']]
+    >>> predict_makespan([100, 60, 50, 40], 2)
+    140
+
+See Also:
+    satellome.core_functions.tools.trf_tools: trf_search_by_splitting
+    satellome.core_functions.tools.kmer_splitting: k-mer repeat density
+"""
+
+import heapq
+import logging
+
+from satellome.constants import TRF_REPEAT_COST_WEIGHT
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_chunk_cost(length, repeat_density=0.0):
+    """Return the predicted relative cost of a chunk.
+
+    Cost is the chunk length scaled by its repeat content: TRF spends most
+    of its time extending alignments inside repeats, so a repeat-dense
+    region costs up to 1 + TRF_REPEAT_COST_WEIGHT times an equally long
+    unique one.
+
+    Args:
+        length (int): Chunk length in bp
+        repeat_density (float): Fraction of repeated k-mers (0.0-1.0),
+            0.0 when unknown
+
+    Returns:
+        float: Predicted cost in bp-equivalents
+    """
+    repeat_density = min(max(repeat_density, 0.0), 1.0)
+    return length * (1.0 + TRF_REPEAT_COST_WEIGHT * repeat_density)
+
+
+def pack_into_bins(items, n_bins):
+    """Pack (key, size) items into n_bins bins of balanced total size.
+
+    Items are placed largest first into the currently lightest bin, which
+    keeps every bin within the largest item of the mean.
+
+    Args:
+        items (iterable): (key, size) pairs
+        n_bins (int): Number of bins
+
+    Returns:
+        list: n_bins lists of keys; empty bins are dropped
+    """
+    n_bins = max(1, int(n_bins))
+    bins = [[] for _ in range(n_bins)]
+    heap = [(0, i) for i in range(n_bins)]
+    for key, size in sorted(items, key=lambda x: x[1], reverse=True):
+        load, i = heapq.heappop(heap)
+        bins[i].append(key)
+        heapq.heappush(heap, (load + size, i))
+    return [b for b in bins if b]
+
+
+def order_longest_first(jobs, costs):
+    """Return jobs sorted by predicted cost, largest first (stable for ties)."""
+    return sorted(jobs, key=lambda job: costs.get(job, 0), reverse=True)
+
+
+def predict_makespan(costs, workers):
+    """Return the makespan of LPT list scheduling of costs over workers.
+
+    Args:
+        costs (iterable): Job costs
+        workers (int): Number of parallel workers
+
+    Returns:
+        float: Cost of the most loaded worker (0 for no jobs)
+    """
+    workers = max(1, int(workers))
+    loads = [0] * workers
+    for cost in sorted(costs, reverse=True):
+        heapq.heapreplace(loads, loads[0] + cost)
+    return max(loads)
+
+
+def report_makespan(costs, durations, workers, wall_time, label="TRF"):
+    """Log predicted vs actual makespan of a finished parallel run.
+
+    Predicted costs are converted to seconds with the rate observed over
+    the whole run (total job time / total cost), so the prediction shows
+    how well the schedule was balanced, not how fast the machine is.
+
+    Args:
+        costs (dict): Job to predicted cost
+        durations (dict): Job to measured run time in seconds
+        workers (int): Number of parallel workers
+        wall_time (float): Measured wall time of the run in seconds
+        label (str): Name used in the log line
+
+    Returns:
+        dict: predicted, actual, lower_bound (seconds) and jobs
+    """
+    jobs = [job for job in durations if job in costs]
+    total_cost = sum(costs[job] for job in jobs)
+    total_time = sum(durations[job] for job in jobs)
+    rate = total_time / total_cost if total_cost else 0.0
+    workers = max(1, int(workers))
+    report = {
+        "predicted": predict_makespan([costs[job] for job in jobs], workers) * rate,
+        "actual": wall_time,
+        "lower_bound": max(total_time / workers, max(durations.values(), default=0.0)),
+        "jobs": len(jobs),
+    }
+    logger.info(
+        f"{label} makespan: actual {report['actual']:.1f} s, predicted {report['predicted']:.1f} s, "
+        f"lower bound {report['lower_bound']:.1f} s ({report['jobs']} jobs, {workers} workers)"
+    )
+    return report
@@ -20,6 +20,10 @@ Functions:
     get_element_frequencies: Count element occurrences
     get_simple_statistics: Compute all basic statistics at once
 
+Classes:
+    QuantileSketch: Mergeable quantile sketch with bounded relative error
+    RunningStatistics: Constant-memory, mergeable mean/variance/min/max
+
 Key Features:
     - Input validation with informative error messages
     - Efficient frequency counting with defaultdict
@@ -44,6 +48,15 @@ Example:
     >>> variance = 625.0
     >>> N = 30
     >>> t = t_test(sample_mean, dist_mean, variance, N)
+    >>>
+    >>> # Streaming statistics, merged from two parts
+    >>> left, right = RunningStatistics(), RunningStatistics()
+    >>> for x in data[:2]:
+    ...     left.add(x)
+    >>> for x in data[2:]:
+    ...     right.add(x)
+    >>> left.merge(right).mean
+    150.0
 
 See Also:
     satellome.core_functions.exceptions: StatisticsError for validation failures
@@ -268,3 +281,249 @@ def get_simple_statistics(data):
         "standard_deviation": get_standard_deviation(variance),
     }
     return result
+
+
+def _add_exact(partials, x):
+    """Add x to a list of non-overlapping float partials without rounding.
+
+    math.fsum(partials) is then the correctly rounded total, whatever
+    order the values were added or merged in.
+    """
+    i = 0
+    for y in partials:
+        if abs(x) < abs(y):
+            x, y = y, x
+        hi = x + y
+        lo = y - (hi - x)
+        if lo:
+            partials[i] = lo
+            i += 1
+        x = hi
+    partials[i:] = [x]
+
+
+class QuantileSketch(object):
+    """
+    Mergeable quantile sketch with a bounded relative error.
+
+    Values are counted in logarithmic buckets (as in DDSketch), so memory
+    grows with the log of the value range rather than with the number of
+    values. Merging adds bucket counts, which gives the same sketch no
+    matter how the data was split.
+
+    Args:
+        relative_accuracy (float): Maximum relative error of quantile(),
+            between 0 and 1 (default 0.01)
+
+    Raises:
+        StatisticsError: If relative_accuracy is out of range
+
+    Example:
+        >>> sketch = QuantileSketch(0.01)
+        >>> for x in range(1, 1001):
+        ...     sketch.add(x)
+        >>> abs(sketch.quantile(0.5) - 500) <= 5
+        True
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        if not 0 < relative_accuracy < 1:
+            raise StatisticsError(
+                f"Invalid relative accuracy: {relative_accuracy}. "
+                f"Relative accuracy must be between 0 and 1."
+            )
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive = defaultdict(int)
+        self.negative = defaultdict(int)
+        self.zeros = 0
+        self.n = 0
+
+    def _key(self, x):
+        return int(math.ceil(math.log(x) / self._log_gamma))
+
+    def _value(self, key):
+        return 2 * self.gamma**key / (self.gamma + 1)
+
+    def add(self, x):
+        if x > 0:
+            self.positive[self._key(x)] += 1
+        elif x < 0:
+            self.negative[self._key(-x)] += 1
+        else:
+            self.zeros += 1
+        self.n += 1
+
+    def merge(self, other):
+        """
+        Add the counts of another sketch to this one.
+
+        Raises:
+            StatisticsError: If the sketches have different accuracies
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise StatisticsError(
+                f"Cannot merge quantile sketches with relative accuracies "
+                f"{self.relative_accuracy} and {other.relative_accuracy}."
+            )
+        for key, count in other.positive.items():
+            self.positive[key] += count
+        for key, count in other.negative.items():
+            self.negative[key] += count
+        self.zeros += other.zeros
+        self.n += other.n
+        return self
+
+    def quantile(self, q):
+        """
+        Estimate the q-quantile (lower nearest rank).
+
+        Args:
+            q (float): Quantile between 0 and 1 (0.5 for the median)
+
+        Returns:
+            float: Value within relative_accuracy of the true quantile
+
+        Raises:
+            StatisticsError: If q is out of range or the sketch is empty
+        """
+        if not 0 <= q <= 1:
+            raise StatisticsError(f"Invalid quantile: {q}. Quantile must be between 0 and 1.")
+        if not self.n:
+            raise StatisticsError(
+                "Cannot compute quantile: empty data array. "
+                "Ensure the input contains at least one valid data point."
+            )
+        rank = math.floor(q * (self.n - 1))
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zeros
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._value(key)
+
+
+class RunningStatistics(object):
+    """
+    Constant-memory statistics of a stream of numbers.
+
+    Keeps count, exact total, min, max and Welford's running mean and sum
+    of squared deviations instead of the values themselves. Two
+    accumulators over parts of the data merge into the statistics of the
+    whole (Chan et al. pairwise update).
+
+    Args:
+        relative_accuracy (float): If set, also keep a QuantileSketch with
+            this accuracy for median() and quantile()
+
+    Attributes:
+        n (int): Number of values
+        min, max: Smallest and largest value (None while empty)
+
+    Example:
+        >>> stats = RunningStatistics()
+        >>> for x in [100, 150, 200, 180, 120]:
+        ...     stats.add(x)
+        >>> stats.total, stats.mean, round(stats.standard_deviation, 1)
+        (750, 150.0, 36.9)
+
+    Note:
+        - total is exact: integers are summed as integers, floats without
+          intermediate rounding, so it does not depend on merge order
+        - mean is total / n and variance is the population variance, as
+          in get_simple_statistics()
+    """
+
+    def __init__(self, relative_accuracy=None):
+        self.n = 0
+        self.min = None
+        self.max = None
+        self._int_total = 0
+        self._partials = []
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.sketch = QuantileSketch(relative_accuracy) if relative_accuracy else None
+
+    def add(self, x):
+        self.n += 1
+        if isinstance(x, int):
+            self._int_total += x
+        else:
+            _add_exact(self._partials, x)
+        delta = x - self._mean
+        self._mean += delta / self.n
+        self._m2 += delta * (x - self._mean)
+        if self.min is None or x < self.min:
+            self.min = x
+        if self.max is None or x > self.max:
+            self.max = x
+        if self.sketch is not None:
+            self.sketch.add(x)
+
+    def merge(self, other):
+        """Add the statistics of another accumulator to this one."""
+        if not other.n:
+            return self
+        n = self.n + other.n
+        delta = other._mean - self._mean
+        self._m2 += other._m2 + delta * delta * self.n * other.n / n
+        self._mean += delta * other.n / n
+        self.n = n
+        self._int_total += other._int_total
+        for x in other._partials:
+            _add_exact(self._partials, x)
+        if self.min is None or other.min < self.min:
+            self.min = other.min
+        if self.max is None or other.max > self.max:
+            self.max = other.max
+        if self.sketch is not None:
+            if other.sketch is None:
+                raise StatisticsError("Cannot merge statistics without a quantile sketch into one with it.")
+            self.sketch.merge(other.sketch)
+        return self
+
+    @property
+    def total(self):
+        if not self._partials:
+            return self._int_total
+        return math.fsum(self._partials + [self._int_total])
+
+    @property
+    def mean(self):
+        if not self.n:
+            return 0
+        return float(self.total) / self.n
+
+    @property
+    def variance(self):
+        if not self.n:
+            return 0
+        return max(self._m2, 0.0) / self.n
+
+    @property
+    def standard_deviation(self):
+        return math.sqrt(self.variance)
+
+    def quantile(self, q):
+        """
+        Estimate the q-quantile from the sketch, clamped to [min, max].
+
+        Raises:
+            StatisticsError: If no sketch is kept or there is no data
+        """
+        if self.sketch is None:
+            raise StatisticsError(
+                "Quantiles need a sketch: create RunningStatistics with relative_accuracy."
+            )
+        value = self.sketch.quantile(q)
+        return min(max(value, self.min), self.max)
+
+    def median(self):
+        return self.quantile(0.5)
@@ -17,6 +17,8 @@ Key Functions:
     trf_search_by_splitting: Main TRF execution with parallel chunk processing
     run_trf: Execute TRF on single file with retry logic
     restore_coordinates_in_line: Fix coordinates after chunk-based processing
+    stitch_trf_windows: Merge TRF results of overlapping windows of long sequences
+    merge_sorted_sat_files: K-way merge of sorted per-chunk .sat files
     recompute_failed_chromosomes: Rerun TRF only on failed/missing scaffolds
 
 Filter Functions:
@@ -37,10 +39,15 @@ Representation Functions:
 Key Features:
     - Parallel TRF execution with configurable thread count
     - Smart genome splitting (~100kb chunks or k-mer based)
+    - Size-aware scheduling: balanced chunks, largest jobs submitted first
+    - Overlapping windows for long sequences, stitched back after TRF
     - Automatic coordinate restoration after chunking
+    - Parsing overlapped with TRF, k-way merge of sorted chunk results
     - Retry logic for TRF failures
     - Progress bars (tqdm) for long operations
     - k-mer filtering for targeted analysis
+    - Chunk checkpoint journal: interrupted runs resume from completed chunks
+    - Optional per-sequence result cache shared across projects
     - Safe temp directory cleanup
 
 TRF Command Format:
@@ -69,25 +76,43 @@ See Also:
 """
 
 import logging
+import math
 import os
+import re
 import shutil
-import tempfile
 import subprocess
 from tqdm import tqdm
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
 import sys
-import glob
+import heapq
+import time
 import concurrent.futures
 
 logger = logging.getLogger(__name__)
 
 
-from satellome.core_functions.io.fasta_file import sc_iter_fasta_brute
-from satellome.core_functions.io.file_system import iter_filepath_folder
-from satellome.core_functions.io.trf_file import TRFFileIO
+from satellome.core_functions.exceptions import ConfigurationError, FileFormatError
+from satellome.core_functions.io.fasta_file import IndexedFastaReader, is_fai_current, read_fai, sc_iter_fasta_brute
+from satellome.core_functions.io.trf_file import TRFFileIO, join_overlapped
+from satellome.core_functions.io.sat_index import LazySatReader, build_sat_index
+from satellome.core_functions.models.trf_model import CompactTRModel, TRModel
+from satellome.core_functions.tools.checkpoint import JOURNAL_FILE_NAME, ChunkJournal, chunk_input_hash
+from satellome.core_functions.tools.kmer_splitting import sequence_repeat_density
+from satellome.core_functions.tools.parsers import refine_name, trf_parse_head
+from satellome.core_functions.tools.result_cache import make_cache_key, sequence_hash, tool_identity
 from satellome.core_functions.tools.processing import get_genome_size
+from satellome.core_functions.tools.scheduling import (
+    estimate_chunk_cost,
+    order_longest_first,
+    pack_into_bins,
+    predict_makespan,
+    report_makespan,
+)
 from satellome.constants import (
     TRF_DEFAULT_PARAMS, TRF_FLAGS,
+    TRF_MAX_PERIOD, TRF_WINDOW_SIZE, TRF_WINDOW_OVERLAP, TRF_CHUNK_SIZE,
     KMER_THRESHOLD_DEFAULT,
     TR_CUTOFF_LARGE,
     MIN_SCAFFOLD_LENGTH_FILTER
@@ -95,12 +120,28 @@ from satellome.constants import (
 
 trf_reader = TRFFileIO().iter_parse
 
+TRF_WINDOW_PREFIX = "window_"
+SAT_N_FIELDS = len(TRModel.dumpable_attributes)
+# Result cache: file name of a cached .dat block, and the per-chunk file
+# holding the cached blocks of its records
+TRF_CACHE_FILE = "dat"
+CACHED_DAT_SUFFIX = ".cached.dat"
+_DAT_SEQUENCE_RE = re.compile(r"^Sequence: ", re.M)
+# Sorted .sat files merged at once; more are merged in several passes
+SAT_MERGE_FAN_IN = 256
+# Rows sorted in memory at once; larger .sat files are sorted in runs and merged
+SAT_SORT_RUN_LINES = 1_000_000
+
 def restore_coordinates_in_line(trf_line):
     """
     Restore original coordinates from chunk coordinates in TRF output line.
     
     Handles headers like: chr10__127750000_127925000 80932 91887
     Should restore to: chr10 208682932 208693887
+
+    Parsed .sat rows (project, trf_id, trf_head, trf_l_ind, trf_r_ind, ...)
+    are restored in the trf_head column, and trf_id is rebuilt from the
+    restored coordinates as refine_name does.
     
     Args:
         trf_line: TRF output line with modified header
@@ -110,6 +151,24 @@ def restore_coordinates_in_line(trf_line):
     """
     if not trf_line.strip():
         return trf_line
+
+    sat_parts = trf_line.rstrip("\n").split("\t")
+    if len(sat_parts) == SAT_N_FIELDS and "__" in sat_parts[2]:
+        window = parse_window_head(sat_parts[2])
+        if window is None:
+            return trf_line
+        base_head, chunk_start, _ = window
+        try:
+            trf_start = int(sat_parts[3]) + chunk_start
+            trf_end = int(sat_parts[4]) + chunk_start
+        except ValueError as e:
+            logger.warning(f"Failed to parse chunk coordinates in TRF line: {e}. Returning original line.")
+            return trf_line
+        sat_parts[1] = f"{base_head.split()[0]}_{trf_start}_{trf_end}"
+        sat_parts[2] = base_head
+        sat_parts[3] = str(trf_start)
+        sat_parts[4] = str(trf_end)
+        return "\t".join(sat_parts) + "\n"
         
     parts = trf_line.strip().split('\t')
     if len(parts) < 3:
@@ -150,6 +209,349 @@ def restore_coordinates_in_line(trf_line):
 
     return trf_line
 
+def parse_window_head(head):
+    """
+    Split a windowed sequence header into base header and window coordinates.
+
+    Args:
+        head: Header like "chr1 description__5000000_10020000"
+
+    Returns:
+        tuple: (base_head, start, end) or None if head is not a window header
+    """
+    if "__" not in head:
+        return None
+    base_head, coord_info = head.rsplit("__", 1)
+    coords = coord_info.split("_")
+    if len(coords) != 2:
+        return None
+    try:
+        return base_head, int(coords[0]), int(coords[1])
+    except ValueError:
+        return None
+
+
+def iter_trf_windows(length, window_size=TRF_WINDOW_SIZE, overlap=TRF_WINDOW_OVERLAP):
+    """
+    Yield overlapping windows covering a sequence.
+
+    Windows start every window_size bp and are window_size + overlap long
+    (the last one is cut at the sequence end), so any array shorter than
+    the overlap lies completely inside at least one window.
+
+    Args:
+        length: Sequence length
+        window_size: Step between window starts
+        overlap: Overlap between adjacent windows
+
+    Yields:
+        tuple: (start, end) 0-based, half-open
+    """
+    start = 0
+    while True:
+        end = min(start + window_size + overlap, length)
+        yield start, end
+        if end >= length:
+            return
+        start += window_size
+
+
+def _read_sequence_lengths(fasta_file, genome_cache=None):
+    """Return sequence lengths in FASTA order without reading the sequences.
+
+    Lengths come from the shared genome cache or an up-to-date .fai. Only
+    when neither exists is the FASTA scanned: a plain FASTA is indexed
+    (and the .fai saved for later stages), a gzipped one read through.
+    """
+    if genome_cache is not None:
+        return [record["length"] for record in genome_cache.records]
+    if not fasta_file.endswith(".gz"):
+        if is_fai_current(fasta_file):
+            return [record[0] for record in read_fai(f"{fasta_file}.fai").values()]
+        try:
+            with IndexedFastaReader(fasta_file) as reader:
+                if not reader.duplicate_names:
+                    return [record[0] for record in reader.index.values()]
+        except FileFormatError:
+            pass
+    return [len(seq) for _, seq in sc_iter_fasta_brute(fasta_file)]
+
+
+def sat_sort_key(line):
+    """Sort key of a .sat row: (trf_head, trf_l_ind, trf_r_ind)."""
+    parts = line.split("\t", 5)
+    return parts[2], int(parts[3]), int(parts[4])
+
+
+def sort_sat_file(sat_file, restore=False, run_lines=SAT_SORT_RUN_LINES):
+    """
+    Sort a per-chunk .sat file in place by chromosome and position.
+
+    At most run_lines rows are held in memory: a larger file (such as the
+    stitched windows of a genome of long chromosomes) is sorted in runs
+    that are merged with merge_sorted_sat_files.
+
+    Args:
+        sat_file: .sat file without comment lines
+        restore: Restore chunk coordinates (restore_coordinates_in_line) first
+        run_lines: Maximum number of rows sorted in memory at once
+
+    Returns:
+        int: Number of rows
+    """
+    run_files = []
+    n_lines = 0
+    with open(sat_file) as fh:
+        while True:
+            chunk = list(islice(fh, run_lines))
+            if not chunk and run_files:
+                break
+            lines = [line for line in chunk if line.strip()]
+            if restore:
+                lines = [restore_coordinates_in_line(line) for line in lines]
+            lines.sort(key=sat_sort_key)
+            n_lines += len(lines)
+            run_file = f"{sat_file}.run{len(run_files)}"
+            with open(run_file, "w") as fw:
+                fw.writelines(lines)
+            run_files.append(run_file)
+            if len(chunk) < run_lines:
+                break
+    if len(run_files) == 1:
+        os.replace(run_files[0], sat_file)
+        return n_lines
+    tmp_file = f"{sat_file}.sorting"
+    with open(tmp_file, "w") as fw:
+        merge_sorted_sat_files(run_files, fw)
+    os.replace(tmp_file, sat_file)
+    for run_file in run_files:
+        os.remove(run_file)
+    return n_lines
+
+
+def merge_sorted_sat_files(sat_files, fw, fan_in=SAT_MERGE_FAN_IN):
+    """
+    K-way merge of sorted .sat files into an open output file.
+
+    At most fan_in files are open at once: larger inputs are first merged
+    group by group into intermediate files next to the inputs.
+
+    Args:
+        sat_files: .sat files sorted by sat_sort_key
+        fw: Output file handle
+        fan_in: Maximum number of files merged at once
+
+    Returns:
+        int: Number of rows written
+    """
+    sat_files = list(sat_files)
+    fan_in = max(2, int(fan_in))
+    level = 0
+    while len(sat_files) > fan_in:
+        merged = []
+        for k in range(0, len(sat_files), fan_in):
+            group_file = f"{sat_files[k]}.merge{level}"
+            with open(group_file, "w") as group_fw:
+                merge_sorted_sat_files(sat_files[k:k + fan_in], group_fw, fan_in)
+            merged.append(group_file)
+        sat_files = merged
+        level += 1
+
+    handles = [open(sat_file) for sat_file in sat_files]
+    try:
+        n_written = 0
+        for line in heapq.merge(*handles, key=sat_sort_key):
+            fw.write(line)
+            n_written += 1
+        return n_written
+    finally:
+        for fh in handles:
+            fh.close()
+
+
+_DAT_PARSER = None
+
+
+def _init_dat_parser():
+    """Pool initializer: build one parser per worker process."""
+    global _DAT_PARSER
+    _DAT_PARSER = TRFFileIO()
+
+
+def _dat_parser_ready():
+    """No-op task that makes a process pool start its workers."""
+    return _DAT_PARSER is not None
+
+
+def _parse_dat_file(dat_file, project, restore=False):
+    """Parse one .dat file into a sorted <dat_file>.sat like trf_parse_raw.py does."""
+    parser = _DAT_PARSER or TRFFileIO()
+    try:
+        parser.parse_to_file(dat_file, f"{dat_file}.sat", trf_id=1, project=project)
+        sort_sat_file(f"{dat_file}.sat", restore=restore)
+        return dat_file, True, ""
+    except Exception as e:
+        # Reported per file, as a failed parser subprocess was
+        return dat_file, False, f"Error: {type(e).__name__}: {e}"
+
+
+def _parse_dat_file_subprocess(dat_file, project, parser_program, restore=False):
+    """Parse one .dat file with a separate parser_program interpreter."""
+    output_file_path = f"{dat_file}.sat"
+    # Use the current Python interpreter to execute the parser script to avoid permission issues
+    cmd = [
+        sys.executable,
+        parser_program,
+        "-i", dat_file,
+        "-o", output_file_path,
+        "-p", project
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    except subprocess.CalledProcessError as e:
+        return dat_file, False, f"Error: {e.stderr}"
+    try:
+        sort_sat_file(output_file_path, restore=restore)
+    except (OSError, ValueError, IndexError) as e:
+        return dat_file, False, f"Error: {type(e).__name__}: {e}"
+    return dat_file, True, result.stdout
+
+
+def _has_full_array(trf_obj):
+    return trf_obj.trf_array_length == trf_obj.trf_r_ind - trf_obj.trf_l_ind + 1
+
+
+def _stitch_boundary(prev_objs, cur_objs, cur_start, prev_end):
+    """
+    Resolve TRF calls around one window overlap (global 1-based coordinates).
+
+    The overlap is (cur_start, prev_end]. A call within one period of a
+    window edge is treated as cut by that edge.
+
+    - cut at prev_end and starting inside the overlap: dropped, the current
+      window saw the array from its start
+    - cut at cur_start and ending inside the overlap: dropped, the previous
+      window saw the whole array
+    - seen whole by both windows: the previous window's call is kept
+    - cut on both sides (array longer than the overlap): the two pieces are
+      joined into one array
+
+    Returns:
+        tuple: (prev_objs, cur_objs); a joined array moves to cur_objs so
+               the next boundary can extend it further
+    """
+    kept_prev = []
+    left_pieces = []
+    for obj in prev_objs:
+        if obj.trf_r_ind > prev_end - obj.trf_period:
+            if obj.trf_l_ind > cur_start + obj.trf_period:
+                continue
+            left_pieces.append(obj)
+        kept_prev.append(obj)
+
+    prev_in_overlap = [obj for obj in kept_prev if obj.trf_r_ind > cur_start]
+    kept_cur = []
+    right_pieces = []
+    for obj in cur_objs:
+        if obj.trf_l_ind <= cur_start + obj.trf_period:
+            if obj.trf_r_ind <= prev_end - obj.trf_period:
+                continue
+            right_pieces.append(obj)
+        elif obj.trf_r_ind <= prev_end and any(
+            p.trf_l_ind <= obj.trf_r_ind and obj.trf_l_ind <= p.trf_r_ind for p in prev_in_overlap
+        ):
+            continue
+        kept_cur.append(obj)
+
+    joined_ids = set()
+    for left in sorted(left_pieces, key=lambda x: (x.trf_l_ind, x.trf_r_ind)):
+        for right in right_pieces:
+            if id(right) in joined_ids or not (_has_full_array(left) and _has_full_array(right)):
+                continue
+            if left.trf_l_ind < right.trf_l_ind <= left.trf_r_ind < right.trf_r_ind:
+                trf_joined = left.trf_joined
+                if join_overlapped(left, right):
+                    # One array cut by a window edge, not two merged arrays:
+                    # keep the fields in the form TRF itself reports them
+                    left.trf_joined = trf_joined
+                    left.trf_n_copy = round(left.trf_n_copy, 1)
+                    left.trf_pvar = int(100 - left.trf_pmatch)
+                    joined_ids.add(id(right))
+                    joined_ids.add(id(left))
+                    break
+
+    kept_prev = [obj for obj in kept_prev if id(obj) not in joined_ids]
+    kept_cur = [obj for obj in kept_cur if id(obj) not in joined_ids]
+    kept_cur.extend(obj for obj in left_pieces if id(obj) in joined_ids)
+    return kept_prev, kept_cur
+
+
+def stitch_trf_windows(dat_files, output_file, project=None):
+    """
+    Parse TRF output of windowed sequences into whole-sequence results.
+
+    Raw calls of all windows of a sequence are shifted to sequence
+    coordinates, de-duplicated and joined across window boundaries
+    (_stitch_boundary), then filtered, canonicalized and written exactly
+    like TRFFileIO.parse_to_file does for a whole-sequence run.
+
+    Arrays that lie within one window are identical to a whole-sequence
+    run. An array cut by a window edge is rebuilt by join_overlapped, so
+    its coordinates and sequence match but pmatch (and pvar derived from
+    it) are the recomputed identity of the joined pieces, not TRF's own
+    alignment score: the output matches a whole-sequence run only
+    approximately for arrays longer than the window overlap.
+
+    Args:
+        dat_files: TRF .dat files of windowed sequences (headers name__start_end)
+        output_file: Output .sat path
+        project: Project name written to the project column
+
+    Returns:
+        int: Number of tandem repeats written
+    """
+    reader = TRFFileIO()
+    windows = {}
+    for dat_file in dat_files:
+        for head, obj_set in reader.iter_raw(dat_file):
+            window = parse_window_head((trf_parse_head(head) or "").strip())
+            if window is None:
+                raise ValueError(f"Not a windowed TRF sequence in {dat_file}: {head.strip()}")
+            base_head, start, end = window
+            for trf_obj in obj_set:
+                trf_obj.trf_head = base_head
+                trf_obj.trf_l_ind += start
+                trf_obj.trf_r_ind += start
+            windows.setdefault(base_head, []).append((start, end, obj_set))
+
+    n_written = 0
+    trf_id = 1
+    with open(output_file, "w") as fw:
+        for base_head, head_windows in windows.items():
+            head_windows.sort(key=lambda x: x[0])
+            objs_by_window = [objs for _, _, objs in head_windows]
+            for k in range(1, len(head_windows)):
+                cur_start = head_windows[k][0]
+                prev_end = head_windows[k - 1][1]
+                if cur_start >= prev_end:
+                    logger.warning(f"{base_head}: gap between TRF windows at {prev_end}-{cur_start}")
+                    continue
+                objs_by_window[k - 1], objs_by_window[k] = _stitch_boundary(
+                    objs_by_window[k - 1], objs_by_window[k], cur_start, prev_end
+                )
+            obj_set = [obj for objs in objs_by_window for obj in objs]
+            obj_set, _ = reader.refine_obj_set(obj_set)
+            for trf_obj in obj_set:
+                if project:
+                    trf_obj.set_project_data(project)
+                refine_name(trf_id, trf_obj)
+                fw.write(str(trf_obj))
+                trf_id += 1
+                n_written += 1
+            logger.info(f"Stitched {len(head_windows)} TRF windows of {base_head.split()[0]}: {len(obj_set)} repeats")
+    return n_written
+
+
 def run_trf(trf_path, fa_file, max_retries=3):
     """Run TRF on a single file with retry logic.
 
@@ -226,6 +628,95 @@ def run_trf(trf_path, fa_file, max_retries=3):
     logger.error(error_message)
     raise RuntimeError(error_message)
 
+def split_dat_blocks(text):
+    """
+    Split TRF .dat text into per-sequence blocks.
+
+    Args:
+        text: Content of a TRF .dat file
+
+    Returns:
+        tuple: (preamble, [(head, body), ...]) where body is everything
+               after the "Sequence: head" line up to the next block
+    """
+    pieces = _DAT_SEQUENCE_RE.split(text)
+    blocks = []
+    for piece in pieces[1:]:
+        head, _, body = piece.partition("\n")
+        blocks.append((head, body))
+    return pieces[0], blocks
+
+
+def plan_cached_chunk(fa_file, result_cache, trf_identity):
+    """
+    Take records with a cached TRF result out of a chunk.
+
+    Cached .dat blocks are written to <fa_file>.cached.dat and fa_file is
+    rewritten with the remaining records only.
+
+    Args:
+        fa_file: Chunk FASTA file
+        result_cache: ResultCache instance
+        trf_identity: tool_identity of the TRF binary
+
+    Returns:
+        list: (head, cache key, cached) per record, in chunk order
+    """
+    plan = []
+    missing = []
+    params = TRF_DEFAULT_PARAMS + TRF_FLAGS
+    with open(fa_file + CACHED_DAT_SUFFIX, "w") as fw:
+        for header, seq in sc_iter_fasta_brute(fa_file):
+            head = header[1:].strip()
+            key = make_cache_key(sequence_hash(seq), "trf", trf_identity, params)
+            body = result_cache.read(key, TRF_CACHE_FILE)
+            if body is None:
+                missing.append((header, seq))
+            else:
+                fw.write(f"Sequence: {head}\n{body.decode()}")
+            plan.append((head, key, body is not None))
+    if len(missing) < len(plan):
+        with open(fa_file, "w") as fw:
+            for header, seq in missing:
+                fw.write(f"{header}\n{seq}\n")
+    return plan
+
+
+def run_trf_cached(trf_path, fa_file, plan, result_cache):
+    """
+    Run TRF on the uncached records of a chunk planned by plan_cached_chunk.
+
+    New per-record results are stored in the cache, then the cached blocks
+    are appended so the chunk .dat covers all its records. TRF is not run
+    at all when every record was cached.
+
+    Returns:
+        True if successful, raises exception on failure (see run_trf)
+    """
+    dat_file = os.path.abspath(fa_file) + "." + ".".join(TRF_DEFAULT_PARAMS) + ".dat"
+    keys = [key for _, key, cached in plan if not cached]
+    preamble, new_blocks = "Tandem Repeats Finder Program\n\n", []
+    if keys:
+        run_trf(trf_path, fa_file)
+        with open(dat_file) as fh:
+            preamble, new_blocks = split_dat_blocks(fh.read())
+        if len(new_blocks) == len(keys):
+            for key, (_, body) in zip(keys, new_blocks):
+                result_cache.store(key, {TRF_CACHE_FILE: body.encode()})
+        else:
+            logger.warning(f"{fa_file}: {len(new_blocks)} TRF blocks for {len(keys)} sequences, not cached")
+        if len(keys) == len(plan):
+            return True
+    with open(fa_file + CACHED_DAT_SUFFIX) as fh:
+        cached = fh.read()
+    with open(dat_file, "w") as fw:
+        fw.write(preamble)
+        for head, body in new_blocks:
+            fw.write(f"Sequence: {head}\n{body}")
+        fw.write(cached)
+    return True
+
+
 def trf_search_by_splitting(
     fasta_file,
     threads=30,
@@ -239,6 +730,13 @@ def trf_search_by_splitting(
     kmer_threshold=KMER_THRESHOLD_DEFAULT,
     kmer_bed_file=None,
     abort_on_error=True,
+    window_size=TRF_WINDOW_SIZE,
+    window_overlap=TRF_WINDOW_OVERLAP,
+    parser_subprocess=False,
+    parse_workers=None,
+    resume=True,
+    result_cache=None,
+    genome_cache=None,
 ):
     """
     Run TRF on large genome by splitting into chunks and parallel processing.
@@ -246,12 +744,15 @@ def trf_search_by_splitting(
     Main pipeline function that:
     1. Splits genome into ~100kb chunks (or k-mer based regions)
     2. Runs TRF in parallel on all chunks
-    3. Parses TRF .dat output to tab-delimited format
-    4. Aggregates results into single output file
+    3. Parses each chunk's .dat output as soon as its TRF run finishes
+    4. Merges the sorted per-chunk results into a single output file,
+       sorted by chromosome and position
     5. Cleans up temporary files
 
     Supports two splitting strategies:
-    - Standard: Split by sequence length (~100kb chunks)
+    - Standard: Split by sequence length (~100kb chunks); sequences longer
+      than window_size + window_overlap are cut into overlapping windows
+      that run as separate TRF jobs and are stitched back afterwards
     - Smart k-mer based: Target high-repeat regions (requires kmer_splitting module)
 
     Args:
@@ -275,12 +776,37 @@ def trf_search_by_splitting(
         abort_on_error (bool, optional): Abort pipeline if TRF fails for any chunk.
                                         If False, continues with partial results.
                                         Defaults to True.
+        window_size (int, optional): Window step for long sequences (standard
+                                    splitting only); 0 disables windows.
+                                    Defaults to TRF_WINDOW_SIZE.
+        window_overlap (int, optional): Overlap between adjacent windows, at
+                                       least 2 x TRF_MAX_PERIOD.
+                                       Defaults to TRF_WINDOW_OVERLAP.
+        parser_subprocess (bool, optional): Parse each .dat file with a separate
+                                           parser_program interpreter instead of
+                                           the in-process worker pool.
+                                           Defaults to False.
+        parse_workers (int, optional): Parser workers running alongside TRF,
+                                      taken out of threads; 0 parses the
+                                      chunks after TRF is done. Defaults to
+                                      None (threads // 4, at least 1, and 0
+                                      with a single thread).
+        resume (bool, optional): Skip chunks recorded as completed in the
+                                journal of an interrupted run. Defaults to True.
+        result_cache (ResultCache, optional): Shared cache of per-sequence TRF
+                                             results; sequences found there are
+                                             not searched again. Defaults to None.
+        genome_cache (GenomeCache, optional): Shared genome cache of fasta_file;
+                                             sequence lengths and genome size
+                                             are taken from it. Defaults to None.
 
     Returns:
         str: Path to output TRF file (<fasta_name>.trf in wdir)
 
     Raises:
-        RuntimeError: If TRF fails and abort_on_error=True
+        RuntimeError: If TRF fails and abort_on_error=True (completed
+                      chunks are kept for a resumed run)
+        ConfigurationError: If window_overlap is too small for TRF_MAX_PERIOD
         FileNotFoundError: If TRF binary or parser script not found
         OSError: If temp directory operations fail
 
@@ -303,20 +829,44 @@ def trf_search_by_splitting(
         ... )
 
     Note:
-        - Creates temporary directory in wdir with mkdtemp()
+        - Works in <fasta_name>.trf_work in wdir; completed chunks are
+          appended to a journal there (checkpoint.ChunkJournal), so a
+          rerun after a crash or abort only runs the remaining chunks
         - TRF versions <4.10.0 return non-zero exit codes on success!
         - Progress displayed via tqdm bars (splitting, TRF, parsing)
         - Coordinate restoration automatic for k-mer split regions
         - Temp folder removed unless keep_raw=True or path is suspiciously short
-        - Parser runs in parallel using ThreadPoolExecutor
+        - .dat files are parsed by a pool of warm worker processes while
+          TRF is still running; the workers count towards threads and are
+          started before the TRF threads. parser_subprocess=True restores
+          one parser_program interpreter per file
+        - Output rows are sorted by (trf_head, trf_l_ind, trf_r_ind)
     """
-    folder_path = tempfile.mkdtemp(dir=wdir)
+    if window_size and not 2 * TRF_MAX_PERIOD <= window_overlap < window_size:
+        raise ConfigurationError(
+            f"TRF window overlap {window_overlap} must be at least 2 x TRF_MAX_PERIOD "
+            f"({2 * TRF_MAX_PERIOD}) and smaller than the window size {window_size}"
+        )
+
+    fasta_name = ".".join(fasta_file.split("/")[-1].split(".")[:-1])
+    # A fixed work folder keeps the chunk journal of an interrupted run
+    folder_path = os.path.abspath(os.path.join(wdir, f"{fasta_name}.trf_work"))
+    if not resume and os.path.isdir(folder_path):
+        shutil.rmtree(folder_path)
+    os.makedirs(folder_path, exist_ok=True)
+    # Chunks are written again below and matched to the journal by content
+    for file_name in os.listdir(folder_path):
+        if file_name.endswith(".fa"):
+            os.remove(os.path.join(folder_path, file_name))
+    journal = ChunkJournal(os.path.join(folder_path, JOURNAL_FILE_NAME))
 
     if genome_size is None:
-        genome_size = get_genome_size(fasta_file)
+        genome_size = genome_cache.genome_size if genome_cache is not None else get_genome_size(fasta_file)
 
     # Initialize fa_files list
     fa_files = []
+    chunk_costs = {}
+    smart_costs = {}
     used_smart_splitting = False
     
     # Check if we should use smart k-mer based splitting
@@ -331,10 +881,12 @@ def trf_search_by_splitting(
                 threads=int(threads),
                 kmer_threshold=kmer_threshold,
                 use_kmer_filter=use_kmer_filter,
-                kmer_bed_file=kmer_bed_file
+                kmer_bed_file=kmer_bed_file,
+                chunk_costs=smart_costs,
             )
             # Keep full paths for now, will convert to basenames after changing directory
             fa_files = output_files
+            chunk_costs = {os.path.basename(f): cost for f, cost in smart_costs.items()}
             used_smart_splitting = True
         except ImportError:
             logger.warning("kmer_splitting module not available, falling back to standard splitting")
@@ -346,27 +898,52 @@ def trf_search_by_splitting(
     # Fall back to standard splitting if k-mer filtering not used or failed
     if not used_smart_splitting:
         ### 1. Split chromosomes into temp file
-        total_length = 0
-        next_file = 0
+        next_window = 0
+
+        # Bin-pack sequences that are not windowed into chunks of ~TRF_CHUNK_SIZE
+        lengths = _read_sequence_lengths(fasta_file, genome_cache)
+        packed = [
+            (i, length) for i, length in enumerate(lengths)
+            if not (window_size and length > window_size + window_overlap)
+        ]
+        n_chunks = math.ceil(sum(length for _, length in packed) / TRF_CHUNK_SIZE)
+        record2chunk = {
+            i: chunk for chunk, records in enumerate(pack_into_bins(packed, n_chunks)) for i in records
+        }
         
-        logger.info("Splitting genome into ~100kb chunks...")
+        logger.info(f"Splitting genome into {len(set(record2chunk.values()))} balanced ~{TRF_CHUNK_SIZE // 1000}kb chunks...")
         with tqdm(total=genome_size, desc="Splitting fasta file", unit=" bp", unit_scale=True, unit_divisor=1000, dynamic_ncols=True) as pbar:
             for i, (header, seq) in enumerate(sc_iter_fasta_brute(fasta_file)):
-                file_path = os.path.join(folder_path, "%s.fa" % next_file)
-                with open(file_path, "a") as fw:
+                if i >= len(lengths) or len(seq) != lengths[i]:
+                    raise FileFormatError(
+                        f"Sequence {i + 1} of {fasta_file} does not match its index "
+                        f"(.fai or genome cache); remove the stale index and rerun."
+                    )
+                if i not in record2chunk:
+                    # One TRF job per window instead of one per chromosome
+                    for start, end in iter_trf_windows(len(seq), window_size, window_overlap):
+                        file_name = f"{TRF_WINDOW_PREFIX}{next_window}.fa"
+                        with open(os.path.join(folder_path, file_name), "w") as fw:
+                            fw.write(f"{header}__{start}_{end}\n{seq[start:end]}\n")
+                        chunk_costs[file_name] = estimate_chunk_cost(
+                            end - start, sequence_repeat_density(seq[start:end])
+                        )
+                        next_window += 1
+                    pbar.update(len(seq))
+                    continue
+                file_name = "%s.fa" % record2chunk[i]
+                with open(os.path.join(folder_path, file_name), "a") as fw:
                     fw.write("%s\n%s\n" % (header, seq))
-                total_length += len(seq)
-                if total_length > 100000:
-                    next_file += 1
-                    total_length = 0
+                chunk_costs[file_name] = chunk_costs.get(file_name, 0) + estimate_chunk_cost(
+                    len(seq), sequence_repeat_density(seq)
+                )
                 pbar.update(len(seq))
         
         # Get list of created files for processing
         fa_files = [f for f in os.listdir(folder_path) if f.endswith('.fa')]
-        logger.info(f"Created {len(fa_files)} chunks")
+        logger.info(f"Created {len(fa_files)} chunks ({next_window} windows of long sequences)")
 
     ### 2. Run TRF
-    fasta_name = ".".join(fasta_file.split("/")[-1].split(".")[:-1])
     output_file = os.path.join(wdir, fasta_name + ".sat")
 
     current_dir = os.getcwd()
@@ -384,101 +961,187 @@ def trf_search_by_splitting(
     # Track failed files
     failed_files = []
     successful_files = 0
-    
-    # Create a progress bar
-    with tqdm(total=len(fa_files), desc="Running TRF", dynamic_ncols=True) as pbar:
-        # Using a thread pool to run TRF processes in parallel
-        with ThreadPoolExecutor(max_workers=int(threads)) as executor:
-            # Submit all tasks and collect futures
-            futures = {}
-            for fa_file in fa_files:
-                future = executor.submit(run_trf, trf_path, fa_file)
-                futures[future] = fa_file
-            
-            # Process completed futures
-            from concurrent.futures import as_completed
-            for future in as_completed(futures):
-                fa_file = futures[future]
-                try:
-                    # Get result (will raise exception if TRF failed)
-                    result = future.result()
-                    successful_files += 1
-                except (OSError, IOError, subprocess.SubprocessError) as e:
-                    logger.error(f"TRF failed for {fa_file} (subprocess/I/O error): {e}")
-                    failed_files.append(fa_file)
-                except Exception as e:
-                    logger.error(f"TRF failed for {fa_file} (unexpected error: {type(e).__name__}): {e}")
-                    failed_files.append(fa_file)
-                finally:
-                    pbar.update()
-    
-    # Check if any files failed
-    if failed_files:
-        logger.error(f"TRF failed for {len(failed_files)} out of {len(fa_files)} files:")
-        for f in failed_files[:10]:  # Show first 10 failed files
-            logger.error(f"  - {f}")
-        if len(failed_files) > 10:
-            logger.error(f"  ... and {len(failed_files) - 10} more")
-        
-        if abort_on_error:
-            # Abort the pipeline
-            logger.error("Aborting pipeline due to TRF failures. Please investigate the errors and try again.")
-            logger.info("Tip: You can try reducing the number of threads or increasing system resources.")
-            os.chdir(current_dir)
-            if not keep_raw:
-                shutil.rmtree(folder_path)
-            raise RuntimeError(f"TRF failed for {len(failed_files)} files. Pipeline aborted.")
-        else:
-            # Continue with partial results
-            logger.warning(f"Continuing with partial results ({successful_files}/{len(fa_files)} files processed)")
-            logger.warning("The analysis may be incomplete!")
-    
-    logger.info(f"TRF completed successfully for all {successful_files} files")
-
-    os.chdir(current_dir)
 
-    ### 3. Parse TRF
-    
-    # Check if TRF produced any .dat files
-    dat_files = [f for f in os.listdir(folder_path) if f.endswith('.dat')]
-    
-    if len(dat_files) == 0:
-        logger.warning("No .dat files found! TRF may have failed to run properly.")
-
-    # Use the current Python interpreter to execute the parser script to avoid permission issues
-    python_exe = sys.executable
+    # Chunks completed by an interrupted run are taken from the journal
+    chunk_hashes = {fa_file: chunk_input_hash(fa_file) for fa_file in fa_files}
+    done_files = {fa_file for fa_file in fa_files if journal.is_done(fa_file, chunk_hashes[fa_file])}
+    resumed = [journal.get(fa_file) for fa_file in sorted(done_files)]
+    if done_files:
+        logger.info(f"Resuming: {len(done_files)} of {len(fa_files)} chunks already completed")
+        fa_files = [fa_file for fa_file in fa_files if fa_file not in done_files]
+
+    # Submit the most expensive chunks first so no large chunk starts last
+    for fa_file in fa_files:
+        if fa_file not in chunk_costs:
+            chunk_costs[fa_file] = estimate_chunk_cost(os.path.getsize(fa_file))
+    # Sequences with a cached TRF result are taken out of their chunks
+    cache_plans = {}
+    if result_cache is not None:
+        trf_identity = tool_identity(trf_path)
+        for fa_file in fa_files:
+            size = os.path.getsize(fa_file)
+            cache_plans[fa_file] = plan_cached_chunk(fa_file, result_cache, trf_identity)
+            if size:
+                chunk_costs[fa_file] *= os.path.getsize(fa_file) / size
+        result_cache.report("TRF result cache")
+    # Parser workers are taken out of the thread budget; with a single
+    # thread the chunks are parsed once TRF is done
+    threads = int(threads)
+    if parse_workers is None:
+        parse_workers = max(1, threads // 4)
+    parse_workers = max(0, min(int(parse_workers), threads - 1))
+    trf_threads = threads - parse_workers
+
+    fa_files = order_longest_first(fa_files, chunk_costs)
+    job_costs = [chunk_costs[f] for f in fa_files]
+    if job_costs:
+        ideal = sum(job_costs) / trf_threads
+        logger.info(
+            f"Scheduling {len(fa_files)} TRF jobs longest-first on {trf_threads} threads "
+            f"({parse_workers} parser workers): predicted makespan "
+            f"{predict_makespan(job_costs, trf_threads) / max(ideal, 1):.2f}x the ideal "
+            f"(largest job {max(job_costs) / max(sum(job_costs), 1):.1%} of total work)"
+        )
+    durations = {}
 
-    # Process .dat files in parallel using subprocess for better security and error handling
-    
-    dat_files = glob.glob(os.path.join(folder_path, "*.dat"))
-
-    def process_dat_file(dat_file):
-        """Process a single .dat file."""
-        output_file_path = f"{dat_file}.sat"
-        cmd = [
-            python_exe,
-            parser_program,
-            "-i", dat_file,
-            "-o", output_file_path,
-            "-p", project
-        ]
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            return dat_file, True, result.stdout
-        except subprocess.CalledProcessError as e:
-            return dat_file, False, f"Error: {e.stderr}"
-
-    # Process files in parallel
-    with concurrent.futures.ThreadPoolExecutor(max_workers=int(threads)) as executor:
-        futures = [executor.submit(process_dat_file, dat_file) for dat_file in dat_files]
-        for future in concurrent.futures.as_completed(futures):
+    def run_trf_timed(fa_file):
+        started = time.perf_counter()
+        if fa_file in cache_plans:
+            result = run_trf_cached(trf_path, fa_file, cache_plans[fa_file], result_cache)
+        else:
+            result = run_trf(trf_path, fa_file)
+        durations[fa_file] = time.perf_counter() - started
+        return result
+
+    ### 3. Parse each chunk as soon as its TRF run finishes
+    # Parsing is cheap next to TRF: a few workers keep up while TRF runs
+    if parser_subprocess:
+        parse_executor = ThreadPoolExecutor(max_workers=max(1, parse_workers))
+        parse = partial(
+            _parse_dat_file_subprocess, project=project, parser_program=parser_program,
+            restore=used_smart_splitting,
+        )
+    else:
+        parse_executor = ProcessPoolExecutor(
+            max_workers=max(1, parse_workers), initializer=_init_dat_parser
+        )
+        parse = partial(_parse_dat_file, project=project, restore=used_smart_splitting)
+        # Fork the workers now, before the TRF threads start
+        parse_executor.submit(_dat_parser_ready).result()
+    parse_futures = []
+    deferred_parses = []
+    window_dat_files = [entry["dat"] for entry in resumed if entry["sat"] is None]
+    dat_suffix = "." + ".".join(TRF_DEFAULT_PARAMS) + ".dat"
+
+    def record_parsed(fa_file, future):
+        # Runs when a parse finishes, so a killed run keeps every parsed chunk
+        if future.cancelled():
+            return
+        dat_file, success, _ = future.result()
+        if success:
+            sat_file = f"{dat_file}.sat"
+            with open(sat_file) as fh:
+                records = sum(1 for _ in fh)
+            journal.record(fa_file, chunk_hashes[fa_file], dat_file, sat=sat_file, records=records)
+
+    trf_started = time.perf_counter()
+    try:
+        # Create a progress bar
+        with tqdm(total=len(fa_files), desc="Running TRF", dynamic_ncols=True) as pbar:
+            # Using a thread pool to run TRF processes in parallel
+            with ThreadPoolExecutor(max_workers=trf_threads) as executor:
+                # Submit all tasks and collect futures
+                futures = {}
+                for fa_file in fa_files:
+                    future = executor.submit(run_trf_timed, fa_file)
+                    futures[future] = fa_file
+
+                # Process completed futures
+                for future in concurrent.futures.as_completed(futures):
+                    fa_file = futures[future]
+                    try:
+                        # Get result (will raise exception if TRF failed)
+                        result = future.result()
+                        successful_files += 1
+                        dat_file = os.path.join(folder_path, fa_file + dat_suffix)
+                        if fa_file.startswith(TRF_WINDOW_PREFIX):
+                            # Windows are stitched per sequence once all of them are done
+                            window_dat_files.append(dat_file)
+                            journal.record(fa_file, chunk_hashes[fa_file], dat_file)
+                        elif parse_workers:
+                            parse_future = parse_executor.submit(parse, dat_file)
+                            parse_future.add_done_callback(partial(record_parsed, fa_file))
+                            parse_futures.append(parse_future)
+                        else:
+                            deferred_parses.append((fa_file, dat_file))
+                    except (OSError, IOError, subprocess.SubprocessError) as e:
+                        logger.error(f"TRF failed for {fa_file} (subprocess/I/O error): {e}")
+                        failed_files.append(fa_file)
+                    except Exception as e:
+                        logger.error(f"TRF failed for {fa_file} (unexpected error: {type(e).__name__}): {e}")
+                        failed_files.append(fa_file)
+                    finally:
+                        pbar.update()
+
+        report_makespan(chunk_costs, durations, trf_threads, time.perf_counter() - trf_started)
+
+        for fa_file, dat_file in deferred_parses:
+            parse_future = parse_executor.submit(parse, dat_file)
+            parse_future.add_done_callback(partial(record_parsed, fa_file))
+            parse_futures.append(parse_future)
+
+        # Check if any files failed
+        if failed_files:
+            logger.error(f"TRF failed for {len(failed_files)} out of {len(fa_files)} files:")
+            for f in failed_files[:10]:  # Show first 10 failed files
+                logger.error(f"  - {f}")
+            if len(failed_files) > 10:
+                logger.error(f"  ... and {len(failed_files) - 10} more")
+
+            if abort_on_error:
+                # Abort the pipeline
+                logger.error("Aborting pipeline due to TRF failures. Please investigate the errors and try again.")
+                logger.info("Tip: You can try reducing the number of threads or increasing system resources.")
+                os.chdir(current_dir)
+                parse_executor.shutdown(wait=True, cancel_futures=True)
+                logger.info(f"Completed chunks are kept in {folder_path}; rerun to resume from them.")
+                raise RuntimeError(f"TRF failed for {len(failed_files)} files. Pipeline aborted.")
+            else:
+                # Continue with partial results
+                logger.warning(f"Continuing with partial results ({successful_files}/{len(fa_files)} files processed)")
+                logger.warning("The analysis may be incomplete!")
+
+        logger.info(f"TRF completed successfully for all {successful_files} files")
+
+        os.chdir(current_dir)
+
+        if not parse_futures and not window_dat_files and not resumed:
+            logger.warning("No .dat files found! TRF may have failed to run properly.")
+
+        sat_files = [entry["sat"] for entry in resumed if entry["sat"] is not None]
+        if window_dat_files:
+            # Stitched here while the parser workers finish the last chunks;
+            # windows are numbered in FASTA order
+            window_dat_files.sort(key=lambda f: int(os.path.basename(f)[len(TRF_WINDOW_PREFIX):].split(".")[0]))
+            windows_sat = os.path.join(folder_path, "windows.sat")
+            stitch_trf_windows(window_dat_files, windows_sat, project=project)
+            sort_sat_file(windows_sat)
+            sat_files.append(windows_sat)
+
+        for future in parse_futures:
             dat_file, success, output = future.result()
-            if not success:
+            if success:
+                sat_files.append(f"{dat_file}.sat")
+            else:
                 logger.warning(f"Failed to process {dat_file}: {output}")
+    finally:
+        parse_executor.shutdown(wait=True, cancel_futures=True)
 
-    ### 3. Aggregate data
+    ### 4. Merge the sorted per-chunk results
 
-    with open(output_file, "w") as fw:
+    # Written under a temporary name: a killed merge must not look like a finished run
+    partial_output_file = f"{output_file}.partial"
+    with open(partial_output_file, "w") as fw:
         # Write header
         fw.write(f"# TRF (Tandem Repeat Finder) results\n")
         fw.write(f"# Source FASTA: {os.path.basename(fasta_file)}\n")
@@ -487,19 +1150,15 @@ def trf_search_by_splitting(
         fw.write(f"#         trf_pmatch, trf_pvar, trf_entropy, trf_consensus, trf_array,\n")
         fw.write(f"#         trf_array_gc, trf_consensus_gc, trf_array_length, trf_joined, trf_family, trf_ref_annotation\n")
 
-        for file_path in iter_filepath_folder(folder_path):
-            if file_path.endswith(".sat"):
-                with open(file_path) as fh:
-                    # If using smart splitting, restore original coordinates
-                    if used_smart_splitting:
-                        for line in fh:
-                            fw.write(restore_coordinates_in_line(line))
-                    else:
-                        fw.write(fh.read())
+        n_written = merge_sorted_sat_files(sat_files, fw)
+    os.replace(partial_output_file, output_file)
+    logger.info(f"Merged {n_written} tandem repeats from {len(sat_files)} chunks into {output_file}")
+    # Region queries (satellome query) read the sidecar instead of the .sat
+    build_sat_index(output_file)
 
     os.chdir(current_dir)
 
-    ## 4. Remove temp folder
+    ## 5. Remove temp folder
     if not keep_raw:
         # Safety check: ensure we're removing a temp directory with sufficient path depth
         if folder_path.count("/") <= 3:
@@ -661,20 +1320,21 @@ def trf_write_two_field_data(trf_file, file_output, field_a, field_b):
 
 
 def count_trs_per_chrs(all_trf_file):
-    """Function prints chr, all trs, 3000 trs, 10000 trs"""
+    """Function prints chr, all trs, 3000 trs, 10000 trs of a .sat file"""
     chr2n = {}
     chr2n_large = {}
     chr2n_xlarge = {}
-    for trf_obj in trf_reader(all_trf_file):
-        chr = trf_obj.trf_chr
-        chr2n.setdefault(chr, 0)
-        chr2n_large.setdefault(chr, 0)
-        chr2n_xlarge.setdefault(chr, 0)
-        chr2n[chr] += 1
-        if trf_obj.trf_array_length > 3000:
-            chr2n_large[chr] += 1
-        if trf_obj.trf_array_length > TR_CUTOFF_LARGE:
-            chr2n_xlarge[chr] += 1
+    with LazySatReader(all_trf_file) as reader:
+        for trf_obj in reader.iter_models(CompactTRModel):
+            chr = trf_obj.trf_chr
+            chr2n.setdefault(chr, 0)
+            chr2n_large.setdefault(chr, 0)
+            chr2n_xlarge.setdefault(chr, 0)
+            chr2n[chr] += 1
+            if trf_obj.trf_array_length > 3000:
+                chr2n_large[chr] += 1
+            if trf_obj.trf_array_length > TR_CUTOFF_LARGE:
+                chr2n_xlarge[chr] += 1
     for chr in chr2n:
         logger.info(f"{chr} {chr2n[chr]} {chr2n_large[chr]} {chr2n_xlarge[chr]}")
 
@@ -724,6 +1384,7 @@ def recompute_failed_chromosomes(
     parser_program="./trf_parse_raw.py",
     min_scaffold_size=1000000,
     match_first_word=True,
+    genome_cache=None,
 ):
     """Recompute TRF only for chromosomes/contigs that are missing or failed.
 
@@ -743,12 +1404,16 @@ def recompute_failed_chromosomes(
         parser_program: Path to TRF parser script
         min_scaffold_size: Minimum scaffold size to check (default 1Mb)
         match_first_word: Match only first word of scaffold names
+        genome_cache: Optional GenomeCache; lengths come from its index and only
+            the missing scaffolds are decoded, instead of holding every
+            sequence in memory
 
     Returns:
         True if recomputation was successful, False otherwise
     """
     from collections import defaultdict
-    from satellome.core_functions.io.fasta_file import sc_iter_fasta_brute
+    from satellome.core_functions.io.fasta_file import sc_iter_fasta_brute, IndexedFastaReader
+    from satellome.core_functions.exceptions import FileFormatError
     from satellome.core_functions.io.tab_file import sc_iter_tab_file
     from satellome.core_functions.models.trf_model import TRModel
 
@@ -761,15 +1426,34 @@ def recompute_failed_chromosomes(
     scaffold_lengths = {}
     scaffold_sequences = {}
 
-    for header, sequence in sc_iter_fasta_brute(fasta_file):
-        scaffold_name = header.replace(">", "").strip()
-        original_name = scaffold_name
+    # Sequences are only kept in memory for gzipped (or irregularly wrapped)
+    # FASTA without a genome cache; otherwise missing scaffolds are fetched
+    # window by window when the temporary FASTA is written.
+    fasta_reader = None
+    if genome_cache is None and not fasta_file.endswith(".gz"):
+        try:
+            fasta_reader = IndexedFastaReader(fasta_file)
+        except FileFormatError as e:
+            logger.warning(f"{e} Loading sequences into memory instead")
+
+    if genome_cache is not None:
+        for record in genome_cache.records:
+            scaffold_name = record["name"] if match_first_word else record["header"]
+            scaffold_lengths[scaffold_name] = record["length"]
+    elif fasta_reader is not None:
+        for name in fasta_reader.names:
+            scaffold_name = name if match_first_word else fasta_reader.header(name)
+            scaffold_lengths[scaffold_name] = fasta_reader.length(name)
+    else:
+        for header, sequence in sc_iter_fasta_brute(fasta_file):
+            scaffold_name = header.replace(">", "").strip()
+            original_name = scaffold_name
 
-        if match_first_word:
-            scaffold_name = scaffold_name.split()[0] if scaffold_name else scaffold_name
+            if match_first_word:
+                scaffold_name = scaffold_name.split()[0] if scaffold_name else scaffold_name
 
-        scaffold_lengths[scaffold_name] = len(sequence)
-        scaffold_sequences[scaffold_name] = (original_name, sequence)
+            scaffold_lengths[scaffold_name] = len(sequence)
+            scaffold_sequences[scaffold_name] = (original_name, sequence)
 
     logger.info(f"Found {len(scaffold_lengths):,} scaffolds in FASTA")
 
@@ -805,6 +1489,8 @@ def recompute_failed_chromosomes(
 
     if not missing_scaffolds:
         logger.info("✅ All large scaffolds have TRF results! Nothing to recompute.")
+        if fasta_reader is not None:
+            fasta_reader.close()
         return True
 
     logger.warning(f"Found {len(missing_scaffolds)} large scaffold(s) with NO tandem repeats:")
@@ -817,7 +1503,29 @@ def recompute_failed_chromosomes(
     temp_fasta = os.path.join(output_dir, f"{project}_missing_scaffolds.fasta")
     logger.info(f"\nCreating temporary FASTA with missing scaffolds: {temp_fasta}")
 
+    window = 10_000_000
     with open(temp_fasta, 'w') as fw:
+        if genome_cache is not None:
+            missing_set = set(missing_scaffolds)
+            for record in genome_cache.records:
+                scaffold_name = record["name"] if match_first_word else record["header"]
+                if scaffold_name in missing_set:
+                    fw.write(f">{record['header']}\n")
+                    for start in range(0, record["length"], window):
+                        fw.write(genome_cache.fetch(record["name"], start, start + window))
+                    fw.write("\n")
+                    missing_set.discard(scaffold_name)
+        elif fasta_reader is not None:
+            missing_set = set(missing_scaffolds)
+            for name in fasta_reader.names:
+                scaffold_name = name if match_first_word else fasta_reader.header(name)
+                if scaffold_name in missing_set:
+                    fw.write(f">{fasta_reader.header(name)}\n")
+                    for _, _, chunk in fasta_reader.iter_windows(name, window):
+                        fw.write(chunk.decode("ascii"))
+                    fw.write("\n")
+                    missing_set.discard(scaffold_name)
+            fasta_reader.close()
         for scaffold_name in missing_scaffolds:
             if scaffold_name in scaffold_sequences:
                 original_name, sequence = scaffold_sequences[scaffold_name]
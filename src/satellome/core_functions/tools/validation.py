@@ -117,6 +117,8 @@ import logging
 import gzip
 from pathlib import Path
 
+from satellome.core_functions.io.bgzf import is_bgzf
+
 logger = logging.getLogger(__name__)
 
 
@@ -160,7 +162,7 @@ def validate_fasta_file(fasta_path):
             no FASTA header in the inspected prefix.
 
     Returns:
-        dict: {num_sequences, total_length, file_size, warnings}. Note
+        dict: {num_sequences, total_length, file_size, bgzf, warnings}. Note
             total_length is always 0 here (full size is computed downstream);
             num_sequences counts only headers seen in the inspected prefix.
     """
@@ -221,6 +223,7 @@ def validate_fasta_file(fasta_path):
         'num_sequences': num_sequences,
         'total_length': total_length,
         'file_size': file_size,
+        'bgzf': fasta_path.endswith('.gz') and is_bgzf(fasta_path),
         'warnings': warnings
     }
 
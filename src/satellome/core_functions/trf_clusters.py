@@ -18,7 +18,7 @@ from tqdm import tqdm
 # Configure logging
 logger = logging.getLogger(__name__)
 
-from satellome.core_functions.trf_drawing import (get_gaps_annotation, read_trf_file,
+from satellome.core_functions.trf_drawing import (get_gaps_annotation, load_clustering_trs,
                                   scaffold_length_sort_length)
 from satellome.core_functions.trf_embedings import get_disances
 from satellome.constants import (
@@ -26,7 +26,7 @@ from satellome.constants import (
     CHROMOSOME_HEIGHT, VERTICAL_SPACER, BASE_HEIGHT,
     MARGIN_TOP, MARGIN_BOTTOM, MARGIN_LEFT, MARGIN_RIGHT,
     ENHANCE_DEFAULT, ENHANCE_LARGE, GAP_CUTOFF_DEFAULT, GAP_SEARCH_WINDOW,
-    SAMPLE_SIZE_FOR_CLUSTERING, START_CUTOFF_MAX,
+    START_CUTOFF_MAX,
     TR_CUTOFF_LARGE, MIN_SCAFFOLD_LENGTH_FILTER,
     SEPARATOR_LINE, TR_SIZE_RANGES, GAP_SIZE_RANGES,
     RECURSION_LIMIT_DEFAULT
@@ -1050,23 +1050,15 @@ def draw_all(
     enhance=ENHANCE_DEFAULT,
     gap_cutoff=1000,
     force_rerun=False,
+    genome_cache=None,
+    threads=1,
 ):
 
     logger.info("Loading chromosomes...")
-    scaffold_df = scaffold_length_sort_length(fasta_file, lenght_cutoff=lenght_cutoff)
+    scaffold_df = scaffold_length_sort_length(fasta_file, lenght_cutoff=lenght_cutoff, genome_cache=genome_cache)
 
     logger.info("Loading trs...")
-    df_trs = read_trf_file(trf_file)
-    # Filter by period > 5
-    df_trs = [record for record in df_trs if float(record.get("period", 0)) > 5]
-    logger.info(f"Quantity of TRs: {len(df_trs)}")
-
-    if len(df_trs) > SAMPLE_SIZE_FOR_CLUSTERING:
-        logger.warning("Too many TRs")
-        logger.info("Filtering them...")
-        # Sort by length descending and take top 2000
-        df_trs = sorted(df_trs, key=lambda x: float(x.get("length", 0)), reverse=True)[:2000]
-        logger.info(f"Updated quantity of TRs: 2000")
+    df_trs = load_clustering_trs(trf_file, threads=threads)
 
     if not os.path.isdir(output_folder):
         os.makedirs(output_folder)
@@ -1109,13 +1101,17 @@ def draw_all(
         except Exception as e:
             logger.warning(f"Failed to load gaps from BED file: {e}")
             logger.info("Computing gaps annotation...")
-            gaps_data = get_gaps_annotation(fasta_file, genome_size, lenght_cutoff=lenght_cutoff)
+            gaps_data = get_gaps_annotation(
+                fasta_file, genome_size, lenght_cutoff=lenght_cutoff, genome_cache=genome_cache, threads=threads
+            )
     else:
         if force_rerun and os.path.isfile(bed_output_file):
             logger.info("Force rerun: Computing gaps annotation...")
         else:
             logger.info("Computing gaps annotation (this may take a while)...")
-        gaps_data = get_gaps_annotation(fasta_file, genome_size, lenght_cutoff=lenght_cutoff)
+        gaps_data = get_gaps_annotation(
+            fasta_file, genome_size, lenght_cutoff=lenght_cutoff, genome_cache=genome_cache, threads=threads
+        )
 
     # Export/update gaps to BED format in output root directory (not in images/)
     # Only write if we computed new data or force_rerun
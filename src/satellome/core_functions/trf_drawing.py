@@ -11,16 +11,23 @@ import os
 import re
 import csv
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
+import numpy as np
 from tqdm import tqdm
 
+from satellome.constants import SAMPLE_SIZE_FOR_CLUSTERING, SAT_PARALLEL_MIN_BYTES, SAT_RANGES_PER_WORKER
 from satellome.core_functions.io.fasta_file import sc_iter_fasta_brute
+from satellome.core_functions.io.sat_index import read_range_lines, split_byte_ranges
+from satellome.core_functions.io.tr_table import TRTable
 
 logger = logging.getLogger(__name__)
 
 CENPB_REGEXP = re.compile(r".ttcg....a..cggg.")
 TELOMERE_REGEXP = re.compile(r"ttagggttagggttagggttagggttaggg")
 CHRM_REGEXP = re.compile(r"chromosome\: (.*)")
+GAP_REGEXP = re.compile(r"[Nn]+")
 
 
 def _to_int(value, default=0):
@@ -77,6 +84,16 @@ chm2name = {
 }
 
 
+def _iter_scaffold_lengths(fasta_file, genome_cache=None):
+    """Yield (">" + header, length) from the genome cache or by parsing FASTA."""
+    if genome_cache is not None:
+        for record in genome_cache.records:
+            yield f">{record['header']}", record["length"]
+        return
+    for header, seq in sc_iter_fasta_brute(fasta_file):
+        yield header, len(seq)
+
+
 def sort_chrm(name):
     v = name.replace("Chr", "")
     logger.debug(v)
@@ -88,7 +105,7 @@ def sort_chrm(name):
 
 
 def scaffold_length_sort_dict(
-    fasta_file, lenght_cutoff=100000, name_regexp=None, chm2name=None
+    fasta_file, lenght_cutoff=100000, name_regexp=None, chm2name=None, genome_cache=None
 ):
     """
     Calculate scaffold lengths and return sorted scaffold data from FASTA file.
@@ -109,6 +126,9 @@ def scaffold_length_sort_dict(
         chm2name (dict, optional): Dictionary mapping scaffold names to
                                    chromosome names for renaming.
                                    Defaults to None.
+        genome_cache (GenomeCache, optional): Take lengths from the shared
+                                   genome cache instead of parsing FASTA.
+                                   Defaults to None.
 
     Returns:
         dict: Dictionary with three keys, each containing a list:
@@ -128,9 +148,9 @@ def scaffold_length_sort_dict(
     starts = []
     ends = []
 
-    for header, seq in sc_iter_fasta_brute(fasta_file):
+    for header, length in _iter_scaffold_lengths(fasta_file, genome_cache):
         name = header[1:].split()[0]
-        if len(seq) < lenght_cutoff:
+        if length < lenght_cutoff:
             continue
         if name_regexp:
             new_name = re.findall(name_regexp, header)
@@ -140,7 +160,7 @@ def scaffold_length_sort_dict(
             name = chm2name[name]
         scaffolds.append(name)
         starts.append(1)
-        ends.append(len(seq))
+        ends.append(length)
 
     # Sort by chromosome name
     sorted_data = sorted(zip(scaffolds, starts, ends), key=lambda x: sort_chrm(x[0]))
@@ -153,11 +173,14 @@ def scaffold_length_sort_dict(
 
 
 def scaffold_length_sort_length(
-    fasta_file, lenght_cutoff=100000, name_regexp=None, chm2name=None
+    fasta_file, lenght_cutoff=100000, name_regexp=None, chm2name=None, genome_cache=None
 ):
     """Function that calculates length of scaffolds
     and return dict with scaffold data from fasta file, sorted by length
 
+    If genome_cache is given, lengths come from the cache index and the
+    FASTA is not read.
+
     Returns:
         dict with keys: 'scaffold', 'start', 'end' (lists), sorted by end descending
     """
@@ -165,9 +188,9 @@ def scaffold_length_sort_length(
     starts = []
     ends = []
 
-    for header, seq in sc_iter_fasta_brute(fasta_file):
+    for header, length in _iter_scaffold_lengths(fasta_file, genome_cache):
         name = header[1:].split()[0]
-        if len(seq) < lenght_cutoff:
+        if length < lenght_cutoff:
             continue
         if name_regexp:
             new_name = re.findall(name_regexp, header)
@@ -177,7 +200,7 @@ def scaffold_length_sort_length(
             name = chm2name[name]
         scaffolds.append(name)
         starts.append(1)
-        ends.append(len(seq))
+        ends.append(length)
 
     # Sort by length (descending)
     sorted_data = sorted(zip(scaffolds, starts, ends), key=lambda x: x[2], reverse=True)
@@ -189,81 +212,169 @@ def scaffold_length_sort_length(
     }
 
 
-def read_trf_file(trf_file):
+# Define expected field names for backward compatibility with files without header
+TRF_FIELDNAMES = ["project", "trf_id", "trf_head", "trf_l_ind", "trf_r_ind", "trf_period", "trf_n_copy",
+                  "trf_pmatch", "trf_pvar", "trf_entropy", "trf_consensus", "trf_array",
+                  "trf_array_gc", "trf_consensus_gc", "trf_array_length", "trf_joined", "trf_family", "trf_ref_annotation"]
+
+
+def _trf_fieldnames(first_line):
+    """Return (fieldnames, has_header) for the first non-comment line."""
+    if first_line is not None and first_line.strip().startswith("project"):
+        return next(csv.reader([first_line], delimiter='\t')), True
+    return TRF_FIELDNAMES, False
+
+
+def _read_trf_range(trf_file, start, end, fieldnames, skip_header):
+    """Process pool worker: read_trf_file() records of one byte range."""
+    csv.field_size_limit(sys.maxsize)
+    lines = [line for line in read_range_lines(trf_file, start, end) if not line.startswith('#')]
+    if skip_header:
+        lines = lines[1:]
+    return _trf_records(lines, fieldnames)
+
+
+def read_trf_file(trf_file, threads=1):
     """Function that convert Aleksey script's trf table to list of dicts.
 
+    With threads > 1, files of SAT_PARALLEL_MIN_BYTES or more are split into
+    newline-aligned byte ranges read in a process pool; records come back
+    in file order, the same as a sequential read.
+
     Returns:
         list of dicts, each representing one TRF record
     """
     # Increase CSV field size limit for large satellite arrays (can be several megabases)
     csv.field_size_limit(sys.maxsize)
 
-    # Define expected field names for backward compatibility with files without header
-    TRF_FIELDNAMES = ["project", "trf_id", "trf_head", "trf_l_ind", "trf_r_ind", "trf_period", "trf_n_copy",
-                      "trf_pmatch", "trf_pvar", "trf_entropy", "trf_consensus", "trf_array",
-                      "trf_array_gc", "trf_consensus_gc", "trf_array_length", "trf_joined", "trf_family", "trf_ref_annotation"]
-
-    data = []
+    if threads > 1 and os.path.getsize(trf_file) >= SAT_PARALLEL_MIN_BYTES:
+        with open(trf_file, 'r') as f:
+            first_line = next((line for line in f if not line.startswith('#')), None)
+        fieldnames, has_header = _trf_fieldnames(first_line)
+        ranges = split_byte_ranges(trf_file, threads * SAT_RANGES_PER_WORKER)
+        data = []
+        with ProcessPoolExecutor(max_workers=threads) as executor:
+            futures = [
+                executor.submit(_read_trf_range, trf_file, start, end, fieldnames, has_header and i == 0)
+                for i, (start, end) in enumerate(ranges)
+            ]
+            for future in futures:
+                data.extend(future.result())
+        return data
 
     with open(trf_file, 'r') as f:
         # Filter out comment lines starting with '#'
         lines = list(line for line in f if not line.startswith('#'))
 
-        # Check if first line is a header row
-        if lines and lines[0].strip().startswith("project"):
-            # File has header row, use standard DictReader
-            reader = csv.DictReader(iter(lines), delimiter='\t')
-        else:
-            # File has no header row, provide field names
-            reader = csv.DictReader(iter(lines), fieldnames=TRF_FIELDNAMES, delimiter='\t')
-
-        for row in reader:
-            # Create computed fields
-            record = dict(row)  # Copy all original fields
-
-            # Add renamed/computed fields. Coordinate/length/period fields are
-            # coerced to int here (see _to_int) because every value out of
-            # csv.DictReader is a string and downstream numeric ops would
-            # otherwise crash or sort lexicographically.
-            record["start"] = _to_int(row.get("trf_l_ind"))
-            record["end"] = _to_int(row.get("trf_r_ind"))
-            record["period"] = _to_int(row.get("trf_period"))
-            record["pmatch"] = row.get("trf_pmatch")
-            record["mono"] = row.get("trf_consensus")
-            record["array"] = row.get("trf_array")
-            record["gc"] = row.get("trf_array_gc")
-            record["scaffold"] = row.get("trf_head")
-            record["length"] = _to_int(row.get("trf_array_length"))
-            record["seq"] = record["array"]
-            record["mono*3"] = record["mono"] * 3 if record.get("mono") else None
-
-            # Pattern matching
-            array_val = record.get("array") or ""
-            record["centromere"] = 1 if array_val and CENPB_REGEXP.findall(array_val) else 0
-            record["telomere"] = 1 if array_val and TELOMERE_REGEXP.findall(array_val) else 0
-
-            # Computed fields that need other fields first
-            record["final_id"] = f"{record['scaffold']}_{record.get('id', '')}"
-            record["class_name"] = "CENPB" if record["centromere"] else "UNK"
-            record["class_name"] = "TEL" if record["telomere"] else record["class_name"]
-            record["family_name"] = None
-            record["locus_name"] = None
-
-            # Numeric computations
-            length_val = record.get("length")
-            if length_val:
-                try:
-                    record["log_length"] = math.log(float(length_val))
-                except (ValueError, TypeError):
-                    record["log_length"] = None
-            else:
+    # Use the header row if present, otherwise the standard field names
+    fieldnames, has_header = _trf_fieldnames(lines[0] if lines else None)
+    return _trf_records(lines[1:] if has_header else lines, fieldnames)
+
+
+def read_trf_rows(trf_file, rows):
+    """read_trf_file() records of some records of a .sat only.
+
+    Args:
+        rows: Record numbers (0-based, counting record lines only, as
+            TRTable rows do)
+
+    Returns:
+        list of dicts in the order of rows
+    """
+    csv.field_size_limit(sys.maxsize)
+    rows = [int(row) for row in rows]
+    wanted = set(rows)
+    fieldnames = None
+    lines = {}
+    with open(trf_file, 'r') as f:
+        record = 0
+        for line in f:
+            if line.startswith('#') or not line.strip():
+                continue
+            if fieldnames is None:
+                fieldnames, has_header = _trf_fieldnames(line)
+                if has_header:
+                    continue
+            if record in wanted:
+                lines[record] = line
+            record += 1
+    if not lines:
+        return []
+    return _trf_records([lines[row] for row in rows], fieldnames)
+
+
+def load_clustering_trs(trf_file, threads=1):
+    """Load the TRs drawn and clustered by draw_all() as read_trf_file() records.
+
+    TRs with period > 5 are kept; when there are too many, the 2000
+    longest (ties in file order). The selection is made on a columnar
+    TRTable, so only the kept TRs become dicts.
+    """
+    table = TRTable.from_sat(trf_file, threads=threads)
+    rows = np.flatnonzero(table["trf_period"] > 5)
+    logger.info(f"Quantity of TRs: {len(rows)}")
+
+    if len(rows) > SAMPLE_SIZE_FOR_CLUSTERING:
+        logger.warning("Too many TRs")
+        logger.info("Filtering them...")
+        # Sort by length descending and take top 2000
+        order = np.argsort(-table["trf_array_length"][rows], kind="stable")[:2000]
+        rows = rows[order]
+        logger.info(f"Updated quantity of TRs: 2000")
+    return read_trf_rows(trf_file, rows)
+
+
+def _trf_records(lines, fieldnames):
+    """Build read_trf_file() records from data lines."""
+    data = []
+    reader = csv.DictReader(iter(lines), fieldnames=fieldnames, delimiter='\t')
+    for row in reader:
+        # Create computed fields
+        record = dict(row)  # Copy all original fields
+
+        # Add renamed/computed fields. Coordinate/length/period fields are
+        # coerced to int here (see _to_int) because every value out of
+        # csv.DictReader is a string and downstream numeric ops would
+        # otherwise crash or sort lexicographically.
+        record["start"] = _to_int(row.get("trf_l_ind"))
+        record["end"] = _to_int(row.get("trf_r_ind"))
+        record["period"] = _to_int(row.get("trf_period"))
+        record["pmatch"] = row.get("trf_pmatch")
+        record["mono"] = row.get("trf_consensus")
+        record["array"] = row.get("trf_array")
+        record["gc"] = row.get("trf_array_gc")
+        record["scaffold"] = row.get("trf_head")
+        record["length"] = _to_int(row.get("trf_array_length"))
+        record["seq"] = record["array"]
+        record["mono*3"] = record["mono"] * 3 if record.get("mono") else None
+
+        # Pattern matching
+        array_val = record.get("array") or ""
+        record["centromere"] = 1 if array_val and CENPB_REGEXP.findall(array_val) else 0
+        record["telomere"] = 1 if array_val and TELOMERE_REGEXP.findall(array_val) else 0
+
+        # Computed fields that need other fields first
+        record["final_id"] = f"{record['scaffold']}_{record.get('id', '')}"
+        record["class_name"] = "CENPB" if record["centromere"] else "UNK"
+        record["class_name"] = "TEL" if record["telomere"] else record["class_name"]
+        record["family_name"] = None
+        record["locus_name"] = None
+
+        # Numeric computations
+        length_val = record.get("length")
+        if length_val:
+            try:
+                record["log_length"] = math.log(float(length_val))
+            except (ValueError, TypeError):
                 record["log_length"] = None
+        else:
+            record["log_length"] = None
 
-            # Clean scaffold name
-            if record.get("scaffold"):
-                record["scaffold"] = record["scaffold"].split()[0]
+        # Clean scaffold name
+        if record.get("scaffold"):
+            record["scaffold"] = record["scaffold"].split()[0]
 
-            data.append(record)
+        data.append(record)
 
     return data
 
@@ -282,13 +393,23 @@ def check_patterns(data):
     return (centromers, telomers)
 
 
-def get_gaps_annotation(fasta_file, genome_size, lenght_cutoff=100000):
-    """Find all N-gaps in FASTA. Uses Rust find-gaps binary if available."""
+def get_gaps_annotation(fasta_file, genome_size, lenght_cutoff=100000, genome_cache=None, threads=1):
+    """Find all N-gaps in FASTA.
+
+    Reads gaps from the genome cache N-run mask when genome_cache is given,
+    otherwise uses the Rust find-gaps binary if available and falls back to
+    find_gaps_numpy() (threads worker processes).
+    """
     import shutil
     import subprocess
     import tempfile
     from pathlib import Path
 
+    if genome_cache is not None:
+        gaps = genome_cache.gaps(min_scaffold_length=lenght_cutoff)
+        logger.info(f"Found {len(gaps)} gaps (genome cache)")
+        return gaps
+
     # Try Rust binary
     find_gaps_bin = None
     bin_dir = Path(__file__).parent.parent / "bin"
@@ -322,34 +443,73 @@ def get_gaps_annotation(fasta_file, genome_size, lenght_cutoff=100000):
         except (subprocess.TimeoutExpired, FileNotFoundError, OSError) as e:
             logger.warning(f"find-gaps error: {e}")
 
-    # Python fallback
-    logger.info("Using Python gap finder (slow for large genomes)")
+    # Python fallback (vectorized)
+    logger.info("Using NumPy gap finder")
+    return find_gaps_numpy(fasta_file, genome_size, lenght_cutoff=lenght_cutoff, threads=threads)
+
+
+def find_n_runs(seq):
+    """Return (starts, ends) arrays of N/n runs in seq (0-based, half-open).
+
+    The sequence is viewed as a uint8 array and run boundaries are taken from
+    np.diff of the N mask, so there is no per-base Python loop.
+    """
+    data = seq.encode("ascii", errors="replace") if isinstance(seq, str) else seq
+    arr = np.frombuffer(data, dtype=np.uint8)
+    is_n = (arr == 78) | (arr == 110)
+    pad = np.zeros(1, dtype=np.int8)
+    edges = np.diff(np.concatenate((pad, is_n.view(np.int8), pad)))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def _find_gaps_in_sequence(name, seq):
+    starts, ends = find_n_runs(seq)
+    return [[name, int(start), int(end), int(end - start)] for start, end in zip(starts, ends)]
+
+
+def find_gaps_numpy(fasta_file, genome_size, lenght_cutoff=100000, threads=1):
+    """Find N-gaps with NumPy; output is identical to the find-gaps binary.
+
+    Returns [name, start, end, length] lists (0-based, half-open) for runs of
+    N/n in scaffolds of at least lenght_cutoff bp, in FASTA order. With
+    threads > 1 chromosomes are scanned in a process pool while the parent
+    keeps reading the FASTA; at most 2 x threads chromosomes are in flight.
+    """
     gaps = []
     with tqdm(total=genome_size, desc="Find gaps") as pbar:
-        for header, seq in sc_iter_fasta_brute(fasta_file):
-            name = header[1:].split()[0]
-            if len(seq) < lenght_cutoff:
+        records = (
+            (header[1:].split()[0], seq) for header, seq in sc_iter_fasta_brute(fasta_file)
+        )
+        if threads <= 1:
+            for name, seq in records:
+                if len(seq) >= lenght_cutoff:
+                    gaps.extend(_find_gaps_in_sequence(name, seq))
                 pbar.update(len(seq))
-                continue
-            in_gap = False
-            gap_start = None
-            for i in range(len(seq)):
-                if seq[i] == "N":
-                    if not in_gap:
-                        in_gap = True
-                        gap_start = i
-                    continue
-                if in_gap:
-                    in_gap = False
-                    gaps.append([name, gap_start, i, abs(gap_start - i)])
-            if in_gap:
-                gaps.append([name, gap_start, i, abs(gap_start - i)])
-            pbar.update(len(seq))
+            return gaps
+
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=threads) as executor:
+            for name, seq in records:
+                if len(seq) >= lenght_cutoff:
+                    pending.append((executor.submit(_find_gaps_in_sequence, name, seq), len(seq)))
+                else:
+                    pbar.update(len(seq))
+                while len(pending) > 2 * threads:
+                    future, length = pending.popleft()
+                    gaps.extend(future.result())
+                    pbar.update(length)
+            while pending:
+                future, length = pending.popleft()
+                gaps.extend(future.result())
+                pbar.update(length)
     return gaps
 
 
 def get_gaps_annotation_re(fasta_file, genome_size, lenght_cutoff=100000):
-    """Function that finding all gaps."""
+    """Find all N-gaps with a regular expression.
+
+    Returns the same [name, start, end, length] lists as get_gaps_annotation.
+    """
     gaps = []
     with tqdm(total=genome_size, desc="Find gaps") as pbar:
         for header, seq in sc_iter_fasta_brute(fasta_file):
@@ -357,9 +517,6 @@ def get_gaps_annotation_re(fasta_file, genome_size, lenght_cutoff=100000):
             name = header[1:].split()[0]
             if len(seq) < lenght_cutoff:
                 continue
-            logger.debug(name)
-            hits = re.findall("N+", seq)
-            logger.debug(hits)
-            for pos, item in hits:
-                gaps.append((name, pos, pos + len(item)))
+            for hit in GAP_REGEXP.finditer(seq):
+                gaps.append([name, hit.start(), hit.end(), hit.end() - hit.start()])
     return gaps
@@ -58,6 +58,92 @@ def create_vector(token2id, token2revtoken, seq, k=5):
     return vector
 
 
+_NUCLEOTIDE_CODES = np.full(256, -2, dtype=np.int64)
+for _code, _nucleotide in enumerate("ACGT"):
+    _NUCLEOTIDE_CODES[ord(_nucleotide)] = _code
+    _NUCLEOTIDE_CODES[ord(_nucleotide.lower())] = _code
+_NUCLEOTIDE_CODES[ord("N")] = _NUCLEOTIDE_CODES[ord("n")] = -1
+
+
+def count_kmers(seq, k=5):
+    """Return k-mer counts of seq and its reverse complement as an int array.
+
+    Same counts as create_vector before normalization (tokens with N are
+    skipped), computed with NumPy. Returns None for sequences with other
+    characters, which create_vector does not accept either.
+    """
+    codes = _NUCLEOTIDE_CODES[np.frombuffer(seq.encode(), dtype=np.uint8)]
+    if (codes == -2).any():
+        return None
+    n_kmers = len(codes) - k + 1
+    if n_kmers <= 0:
+        return np.zeros(4**k, dtype=np.int64)
+    forward = np.zeros(n_kmers, dtype=np.int64)
+    reverse = np.zeros(n_kmers, dtype=np.int64)
+    has_n = np.zeros(n_kmers, dtype=bool)
+    for i in range(k):
+        window = codes[i : i + n_kmers]
+        forward = forward * 4 + window
+        reverse += (3 - window) * 4**i
+        has_n |= window < 0
+    forward = forward[~has_n]
+    reverse = reverse[~has_n]
+    return np.bincount(forward, minlength=4**k) + np.bincount(reverse, minlength=4**k)
+
+
+class KmerProfiles:
+    """Cache of 5-mer profiles of tandem repeat arrays, keyed by object.
+
+    Overlap resolution compares the same arrays over and over, and a
+    merged array is the left array plus the tail of the right one, so the
+    profile of a merged object is updated from the two cached profiles
+    instead of being recounted from the full array.
+    """
+
+    def __init__(self, k=5):
+        self.k = k
+        self.counts = {}
+
+    def get_vector(self, obj):
+        """Return the same vector as obj.get_vector()."""
+        entry = self.counts.get(id(obj))
+        if entry is None:
+            counts = count_kmers(obj.trf_array, self.k)
+            if counts is None:
+                return obj.get_vector()
+            # Keep obj alive so its id is not reused
+            self.counts[id(obj)] = (obj, counts)
+        else:
+            counts = entry[1]
+        vector = counts.astype(float).reshape(1, -1)
+        vector /= 2 * (len(obj.trf_array) - self.k + 1)
+        return vector
+
+    def merge(self, obj1, obj2, left_length):
+        """Update the profile of obj1 after obj1.set_form_overlap(obj2).
+
+        Args:
+            left_length (int): Length of obj1.trf_array before the merge
+        """
+        entry1 = self.counts.pop(id(obj1), None)
+        entry2 = self.counts.get(id(obj2))
+        if entry1 is None or entry2 is None or left_length < self.k:
+            return
+        counts1, counts2 = entry1[1], entry2[1]
+        k = self.k
+        array = obj1.trf_array
+        # Tail of obj2 appended to obj1 and the k-mers across the junction
+        tail_length = len(array) - left_length
+        skipped = len(obj2.trf_array) - tail_length
+        if skipped + k - 1 < tail_length and tail_length >= k - 1:
+            junction = count_kmers(array[left_length - k + 1 : left_length + k - 1], k)
+            head = count_kmers(obj2.trf_array[: skipped + k - 1], k)
+            counts1 = counts1 + junction + counts2 - head
+        else:
+            counts1 = counts1 + count_kmers(array[left_length - k + 1 :], k)
+        self.counts[id(obj1)] = (obj1, counts1)
+
+
 def fill_vectors(df_trs, token2id, token2revtoken, k=5):
     tr2vector = {}
     for id1, x in enumerate(df_trs):
@@ -19,6 +19,13 @@ from satellome.core_functions.tools.reports import create_html_report
 from satellome.core_functions.tools.processing import get_genome_size_with_progress
 from satellome.core_functions.tools.ncbi import get_taxon_name
 from satellome.core_functions.tools.bed_tools import extract_sequences_from_bed
+from satellome.core_functions.io.bgzf import DECOMPRESS_CACHE_ENV
+from satellome.core_functions.io.sat_index import LazySatReader, build_sat_index, parse_region
+from satellome.core_functions.exceptions import FileFormatError
+from satellome.core_functions.tools.genome_scan import run_genome_scan
+from satellome.core_functions.io.genome_cache import (
+    get_genome_cache, is_genome_cache_valid, GENOME_CACHE_DIRNAME
+)
 from satellome.core_functions.tools.version_check import notify_if_update_available
 from satellome.core_functions.tools.validation import (
     validate_input_files, validate_fasta_file, validate_gff_file,
@@ -37,7 +44,7 @@ from satellome.constants import (
     MIN_SCAFFOLD_LENGTH_DEFAULT, TR_CUTOFF_DEFAULT,
     KMER_THRESHOLD_DEFAULT, DRAWING_ENHANCING_DEFAULT,
     SEPARATOR_LINE, SEPARATOR_LINE_DOUBLE,
-    DEFAULT_TAXON_NAME
+    DEFAULT_TAXON_NAME, TRF_WINDOW_SIZE, TRF_WINDOW_OVERLAP, RESULT_CACHE_MAX_SIZE
 )
 
 # Configure logging
@@ -112,10 +119,15 @@ def parse_arguments():
     parser.add_argument("--kmer_threshold", help=f"Unique k-mer threshold for repeat detection [{KMER_THRESHOLD_DEFAULT}]", required=False, default=KMER_THRESHOLD_DEFAULT, type=int)
     parser.add_argument("--kmer_bed", help="Pre-computed k-mer profile BED file from varprofiler", required=False, default=None)
     parser.add_argument("--continue-on-error", help="Continue pipeline even if some TRF runs fail (results may be incomplete)", action='store_true', default=False)
+    parser.add_argument("--trf-parser-subprocess", dest="trf_parser_subprocess", help="Parse TRF .dat files with one Python process per file (legacy, slower)", action='store_true', default=False)
+    parser.add_argument("--trf-window", dest="trf_window", help=f"Run TRF on overlapping windows of this step for sequences longer than the step plus the {TRF_WINDOW_OVERLAP} bp overlap, 0 runs whole sequences [{TRF_WINDOW_SIZE}]", required=False, default=TRF_WINDOW_SIZE, type=int)
+    parser.add_argument("--result-cache", dest="result_cache", help="Shared cache directory of TRF/FasTAN results, reused across projects (opt-in)", required=False, default=None)
+    parser.add_argument("--result-cache-size", dest="result_cache_size", help=f"Result cache size limit in GB, least recently used results are evicted [{RESULT_CACHE_MAX_SIZE // 1024 ** 3}]", required=False, default=RESULT_CACHE_MAX_SIZE / 1024 ** 3, type=float)
     parser.add_argument("--keep-trf", help="Keep original TRF files before filtering (saved with .original suffix)", action='store_true', default=False)
     parser.add_argument("--nofastan", help="Skip FasTAN analysis", action='store_true', default=False)
     parser.add_argument("--run-trf", help="Run TRF analysis (disabled by default, FasTAN is the default tool)", action='store_true', default=False)
     parser.add_argument("--notrf", help="[DEPRECATED] TRF is now disabled by default. Use --run-trf to enable.", action='store_true', default=False)
+    parser.add_argument("--no-genome-cache", dest="no_genome_cache", help="Do not build the shared genome cache (every stage re-reads the FASTA)", action='store_true', default=False)
     parser.add_argument("--no-version-check", dest="no_version_check", help="Do not check GitHub for a newer Satellome release (also: SATELLOME_NO_VERSION_CHECK=1)", action='store_true', default=False)
 
     # Installation commands
@@ -161,6 +173,13 @@ def validate_and_prepare_environment(args):
     try:
         fasta_stats = validate_fasta_file(fasta_file)
         logger.info(f"✓ FASTA: valid format ({os.path.basename(fasta_file)}, {os.path.getsize(fasta_file) / 1e9:.1f} GB)")
+        if fasta_stats.get("bgzf"):
+            logger.info("✓ FASTA is BGZF-compressed: using parallel block decompression")
+        elif fasta_file.endswith(".gz"):
+            if args.get("no_genome_cache"):
+                logger.info("FASTA is plain gzip: every stage decompresses it again (--no-genome-cache)")
+            else:
+                logger.info("FASTA is plain gzip: it will be decompressed once into the genome cache folder")
     except FastaValidationError as e:
         logger.error(f"✗ FASTA validation failed: {e}")
         sys.exit(1)
@@ -321,9 +340,27 @@ def build_settings(args, fasta_file, output_dir, project, threads, trf_path, gen
         "large_file_suffix": args["large_file"],
         "repeatmasker_file": args["rm"],
         "html_report_file": html_report_file,
+        "genome_cache_dir": None if args.get("no_genome_cache") else os.path.join(output_dir, GENOME_CACHE_DIRNAME),
+        "result_cache": os.path.abspath(args["result_cache"]) if args.get("result_cache") else None,
+        "result_cache_size": args.get("result_cache_size", RESULT_CACHE_MAX_SIZE / 1024 ** 3),
     }
 
 
+def load_genome_cache(settings):
+    """Return the run's shared GenomeCache, or None if disabled or unavailable.
+
+    Blocks while the background build started in main() is still running.
+    """
+    cache_dir = settings.get("genome_cache_dir")
+    if not cache_dir:
+        return None
+    try:
+        return get_genome_cache(settings["fasta_file"], cache_dir)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Genome cache unavailable, reading FASTA directly: {e}")
+        return None
+
+
 def run_trf_search(settings, args, force_rerun):
     """Run TRF search step."""
     from satellome.core_functions.tools.trf_tools import recompute_failed_chromosomes
@@ -346,6 +383,7 @@ def run_trf_search(settings, args, force_rerun):
                 parser_program=settings['trf_parse_raw_path'],
                 min_scaffold_size=1000000,
                 match_first_word=True,
+                genome_cache=load_genome_cache(settings),
             )
 
             if success:
@@ -388,6 +426,15 @@ def run_trf_search(settings, args, force_rerun):
     if args["continue_on_error"]:
         command += " --continue-on-error"
 
+    command += f" --window_size {args.get('trf_window', TRF_WINDOW_SIZE)}"
+    if args.get("trf_parser_subprocess"):
+        command += " --parser_subprocess"
+    if settings.get("result_cache"):
+        command += f" --result_cache {settings['result_cache']} --result_cache_size {settings['result_cache_size']}"
+    cache_dir = settings.get("genome_cache_dir")
+    if cache_dir and is_genome_cache_valid(settings["fasta_file"], cache_dir):
+        command += f" --genome_cache {cache_dir}"
+
     logger.debug(f"Command: {command}")
     completed_process = subprocess.run(command, shell=True)
 
@@ -459,7 +506,7 @@ def run_trf_classification(settings, args, force_rerun):
     else:
         logger.info("Running classification...")
 
-    command = f"{sys.executable} {settings['trf_classify_path']} -i {trf_prefix} -o {classify_output_dir} -l {settings['genome_size']}"
+    command = f"{sys.executable} {settings['trf_classify_path']} -i {trf_prefix} -o {classify_output_dir} -l {settings['genome_size']} -t {settings['threads']}"
     if args["keep_trf"]:
         command += " --keep-trf"
 
@@ -505,7 +552,10 @@ def run_trf_drawing(settings, force_rerun):
 
     # Add --force flag if force_rerun is True
     force_flag = " --force" if force_rerun else ""
-    command = f"{sys.executable} {settings['trf_draw_path']} -f {settings['fasta_file']} -i {trf_file} -o {settings['output_image_dir']} -c {settings['minimal_scaffold_length']} -e {settings['drawing_enhancing']} -t '{settings['taxon_name']}' -s {settings['genome_size']}{force_flag}"
+    cache_dir = settings.get("genome_cache_dir")
+    if cache_dir and is_genome_cache_valid(settings["fasta_file"], cache_dir):
+        force_flag += f" --genome_cache {cache_dir}"
+    command = f"{sys.executable} {settings['trf_draw_path']} -f {settings['fasta_file']} -i {trf_file} -o {settings['output_image_dir']} -c {settings['minimal_scaffold_length']} -e {settings['drawing_enhancing']} -t '{settings['taxon_name']}' -s {settings['genome_size']} --threads {settings['threads']}{force_flag}"
 
     logger.debug(f"Command: {command}")
     completed_process = subprocess.run(command, shell=True)
@@ -641,6 +691,77 @@ def build_fastan_command(fastan_bin, fasta_file, aln_file, threads):
     return f"{fastan_bin} -a -T{threads} -o{aln_root} {fasta_file}"
 
 
+def _write_fastan_bed(bed_file, names, beds):
+    """Write per-record BED lines (name -> bytes) in FASTA order."""
+    with open(bed_file, "wb") as fw:
+        for name in names:
+            fw.write(beds[name])
+
+
+def _store_fastan_results(result_cache, cache_key, aln_file, bed_file, record_keys=None, cached_beds=None):
+    """Store FasTAN results in the result cache.
+
+    After a whole-genome search the .1aln/.bed entry and, given record_keys,
+    the BED lines of every record are stored. When only the records missing
+    from cached_beds were searched (their BED is bed_file + ".uncached"),
+    those records are stored and merged with cached_beds into bed_file.
+    """
+    from satellome.core_functions.tools.bed_tools import split_bed_by_chrom
+
+    if cached_beds is None:
+        result_cache.store_files(cache_key, {"1aln": aln_file, "bed": bed_file})
+        search_bed = bed_file
+        searched = list(record_keys or ())
+    else:
+        search_bed = f"{bed_file}.uncached"
+        searched = [name for name, body in cached_beds.items() if body is None]
+    beds = split_bed_by_chrom(search_bed, searched)
+    for name in searched:
+        result_cache.store(record_keys[name], {"bed": beds[name]})
+    if cached_beds is not None:
+        _write_fastan_bed(bed_file, list(cached_beds), {**cached_beds, **beds})
+        os.remove(search_bed)
+
+
+def _run_fastan_search(fastan_bin, tanbed_bin, fasta_file, aln_file, bed_file, threads, force_rerun):
+    """Run FasTAN on fasta_file, then tanbed on its .1aln.
+
+    Returns:
+        subprocess.CompletedProcess: The tanbed run, or None if FasTAN or
+        tanbed could not be run
+    """
+    if force_rerun and os.path.exists(aln_file):
+        logger.info("Force rerun: Running FasTAN...")
+    else:
+        logger.info("Running FasTAN...")
+
+    fastan_command = build_fastan_command(fastan_bin, fasta_file, aln_file, threads)
+    logger.debug(f"Command: {fastan_command}")
+
+    try:
+        # Don't capture output so progress is visible
+        fastan_process = subprocess.run(fastan_command, shell=True)
+
+        if fastan_process.returncode == 0:
+            logger.info("FasTAN executed successfully!")
+        else:
+            logger.error(f"FasTAN failed with return code {fastan_process.returncode}")
+            return None
+    except Exception as e:
+        logger.error(f"FasTAN execution failed: {e}")
+        return None
+
+    # Run tanbed to convert to BED format
+    logger.info("Converting FasTAN output to BED format...")
+    tanbed_command = f"{tanbed_bin} {aln_file} > {bed_file}"
+    logger.debug(f"Command: {tanbed_command}")
+    try:
+        return subprocess.run(tanbed_command, shell=True, capture_output=True, text=True)
+    except Exception as e:
+        logger.error(f"tanbed execution failed: {e}")
+        return None
+
+
 def run_fastan(settings, force_rerun):
     """Run FasTAN analysis step."""
     from satellome.installers.base import (
@@ -702,16 +823,20 @@ def run_fastan(settings, force_rerun):
     # Intermediate files in fastan/
     aln_file = os.path.join(fastan_dir, f"{genome_basename}.1aln")
     bed_file = os.path.join(fastan_dir, f"{genome_basename}.bed")
+    # .1aln of a search over only the records missing from the result cache
+    partial_aln_file = os.path.join(fastan_dir, f"{genome_basename}.uncached.1aln")
 
     # Output files at output_dir level or in dedicated subdirs
     trf_file = os.path.join(output_dir, f"{genome_basename}.sat")
     fasta_output = os.path.join(fasta_dir, f"{genome_basename}.arrays.fasta")
 
-    # Check if already completed (all main output files exist)
+    # Check if already completed (all main output files exist). The .1aln
+    # is not required: results restored per record from the result cache
+    # have none, and the BED holds everything later steps use.
     if not force_rerun:
         existing_files = []
         missing_files = []
-        for f in [aln_file, bed_file, trf_file, fasta_output]:
+        for f in [bed_file, trf_file, fasta_output]:
             if os.path.exists(f):
                 existing_files.append(os.path.basename(f))
             else:
@@ -801,38 +926,89 @@ def run_fastan(settings, force_rerun):
     if not check_binary_provenance(tanbed_bin, "tanbed"):
         return False
 
-    # Run FasTAN
-    if force_rerun and os.path.exists(aln_file):
-        logger.info("Force rerun: Running FasTAN...")
-    else:
-        logger.info("Running FasTAN...")
-
-    fastan_command = build_fastan_command(
-        fastan_bin, fasta_file, aln_file, settings["threads"]
-    )
-    logger.debug(f"Command: {fastan_command}")
+    # FasTAN runs once on the whole genome: the shared result cache is keyed
+    # by the genome content and both tool binaries, and holds .1aln and .bed.
+    # With the genome cache the content key is built from the per-record
+    # md5s it already stores, and each record's BED lines are cached on their
+    # own, so an assembly that differs in a few records only searches those.
+    result_cache = None
+    cache_key = None
+    record_keys = None
+    cached_beds = None
+    restored = False
+    search_fasta = fasta_file
+    search_aln = aln_file
+    search_bed = bed_file
+    if settings.get("result_cache"):
+        from satellome.core_functions.tools.result_cache import (
+            ResultCache, file_hash, make_cache_key, records_hash, tool_identity,
+        )
+        result_cache = ResultCache(settings["result_cache"], max_size=int(settings["result_cache_size"] * 1024 ** 3))
+        tools = [tool_identity(fastan_bin, _fastan_version), tool_identity(tanbed_bin)]
+        genome_cache = load_genome_cache(settings)
+        if genome_cache is not None:
+            genome_hash = records_hash(genome_cache.records)
+            if not genome_cache.duplicate_names:
+                record_keys = {
+                    record["name"]: make_cache_key(f"{record['name']}:{record['md5']}", "fastan-record", tools, ["-a"])
+                    for record in genome_cache.records
+                }
+        else:
+            genome_hash = file_hash(fasta_file)
+        cache_key = make_cache_key(genome_hash, "fastan", tools, ["-a"])
+        restored = result_cache.restore(cache_key, {"1aln": aln_file, "bed": bed_file})
+        if restored:
+            logger.info(f"FasTAN results restored from the result cache ({settings['result_cache']})")
+        elif record_keys:
+            cached_beds = {name: result_cache.read(key, "bed") for name, key in record_keys.items()}
+            missing = [name for name, body in cached_beds.items() if body is None]
+            if not missing:
+                _write_fastan_bed(bed_file, list(cached_beds), cached_beds)
+                restored = True
+                logger.info(f"FasTAN results of all {len(cached_beds)} records restored from the result cache")
+            elif len(missing) == len(cached_beds):
+                cached_beds = None
+            else:
+                search_fasta = os.path.join(fastan_dir, f"{genome_basename}.uncached.fa")
+                search_aln = partial_aln_file
+                search_bed = f"{bed_file}.uncached"
+                with open(search_fasta, "w") as fw:
+                    for header, seq in genome_cache.iter_sequences(missing):
+                        fw.write(f"{header}\n{seq}\n")
+                logger.info(
+                    f"FasTAN results of {len(cached_beds) - len(missing)} records restored from the result cache, "
+                    f"searching the other {len(missing)} (into {os.path.basename(partial_aln_file)})"
+                )
 
-    try:
-        # Don't capture output so progress is visible
-        fastan_process = subprocess.run(fastan_command, shell=True)
+    # Only the .1aln that matches the new BED stays on disk: the whole-genome
+    # one after a search or a whole-genome restore, the .uncached.1aln after
+    # a search of the uncached records only, none after a per-record restore
+    if restored:
+        kept_aln = aln_file if cached_beds is None else None
+    else:
+        kept_aln = search_aln
+    for stale_aln in (aln_file, partial_aln_file):
+        if stale_aln != kept_aln and os.path.exists(stale_aln):
+            os.remove(stale_aln)
 
-        if fastan_process.returncode == 0:
-            logger.info("FasTAN executed successfully!")
-        else:
-            logger.error(f"FasTAN failed with return code {fastan_process.returncode}")
+    # Run FasTAN and tanbed
+    if not restored:
+        try:
+            tanbed_process = _run_fastan_search(
+                fastan_bin, tanbed_bin, search_fasta, search_aln, search_bed, settings["threads"], force_rerun
+            )
+        finally:
+            # The FASTA of uncached records is only FasTAN's input
+            if search_fasta != fasta_file and os.path.exists(search_fasta):
+                os.remove(search_fasta)
+        if tanbed_process is None:
             return False
-    except Exception as e:
-        logger.error(f"FasTAN execution failed: {e}")
-        return False
-
-    # Run tanbed to convert to BED format
-    logger.info("Converting FasTAN output to BED format...")
-    tanbed_command = f"{tanbed_bin} {aln_file} > {bed_file}"
-    logger.debug(f"Command: {tanbed_command}")
+    else:
+        tanbed_process = subprocess.CompletedProcess("tanbed", 0, "", "")
 
     try:
-        tanbed_process = subprocess.run(tanbed_command, shell=True, capture_output=True, text=True)
-
+        if not restored and tanbed_process.returncode == 0 and result_cache is not None:
+            _store_fastan_results(result_cache, cache_key, aln_file, bed_file, record_keys, cached_beds)
         if tanbed_process.returncode == 0:
             logger.info(f"✓ BED file created: {bed_file}")
 
@@ -845,7 +1021,8 @@ def run_fastan(settings, force_rerun):
                 extracted_count = extract_sequences_from_bed(
                     fasta_file, bed_file, trf_file,
                     fasta_output_file=fasta_output,
-                    project=project
+                    project=project,
+                    genome_cache=load_genome_cache(settings),
                 )
             except Exception as e:
                 logger.error(f"Sequence extraction failed: {e}")
@@ -865,8 +1042,14 @@ def run_fastan(settings, force_rerun):
                 )
                 return False
 
+            # Region queries (satellome query) read the sidecar instead of the .sat
+            try:
+                build_sat_index(trf_file)
+            except FileFormatError as e:
+                logger.warning(f"Could not index {trf_file}: {e}")
+
             # Create size-filtered TRF files (1kb, 10kb, 100kb, 1000kb).
-            from satellome.core_functions.tools.bed_tools import filter_trf_by_size
+            from satellome.core_functions.tools.bed_tools import filter_trf_by_sizes
 
             size_cutoffs = [
                 (1000, "1kb"),
@@ -877,12 +1060,19 @@ def run_fastan(settings, force_rerun):
 
             logger.info("Creating size-filtered TRF files...")
             try:
+                # One pass over the .sat writes every tier;
+                # .sat files at output_dir level, .fasta files in fasta/ subdir
+                tiers = [
+                    (
+                        cutoff,
+                        os.path.join(output_dir, f"{genome_basename}.{suffix}.sat"),
+                        os.path.join(fasta_dir, f"{genome_basename}.{suffix}.arrays.fasta"),
+                    )
+                    for cutoff, suffix in size_cutoffs
+                ]
+                tier_stats = filter_trf_by_sizes(trf_file, tiers)
                 for cutoff, suffix in size_cutoffs:
-                    # .sat files at output_dir level, .fasta files in fasta/ subdir
-                    filtered_trf = os.path.join(output_dir, f"{genome_basename}.{suffix}.sat")
-                    filtered_fasta = os.path.join(fasta_dir, f"{genome_basename}.{suffix}.arrays.fasta")
-                    stats = filter_trf_by_size(trf_file, filtered_trf, cutoff, fasta_output_file=filtered_fasta)
-                    logger.info(f"✓ {suffix}: {stats['filtered']} arrays > {cutoff} bp")
+                    logger.info(f"✓ {suffix}: {tier_stats[cutoff]['filtered']} arrays > {cutoff} bp")
             except Exception as e:
                 logger.error(f"Size-filtering of TRF arrays failed: {e}")
                 return False
@@ -1083,7 +1273,48 @@ def print_summary(project, taxon_name, output_dir, html_report_file):
     logger.info(SEPARATOR_LINE_DOUBLE)
 
 
+def run_query(argv):
+    """Print the .sat records that overlap genomic regions (satellome query)."""
+    parser = argparse.ArgumentParser(
+        prog="satellome query",
+        description="Print the .sat records that overlap genomic regions, using the .sat index",
+    )
+    parser.add_argument("sat_file", help="Satellome .sat file")
+    parser.add_argument(
+        "regions", nargs="+",
+        help="Regions as chr, chr:start or chr:start-end (1-based, inclusive)",
+    )
+    parser.add_argument(
+        "--no-arrays", action="store_true",
+        help="Print None instead of trf_consensus and trf_array",
+    )
+    args = parser.parse_args(argv)
+
+    if not os.path.isfile(args.sat_file):
+        parser.error(f"file not found: {args.sat_file}")
+    try:
+        regions = [parse_region(region) for region in args.regions]
+    except ValueError as e:
+        parser.error(str(e))
+
+    try:
+        with LazySatReader(args.sat_file) as reader:
+            for chrom, start, end in regions:
+                for i in reader.query(chrom, start, end).tolist():
+                    if args.no_arrays:
+                        sys.stdout.write("\t".join(reader.row(i)) + "\n")
+                    else:
+                        sys.stdout.write(reader.line(i).rstrip("\r\n") + "\n")
+    except FileFormatError as e:
+        logger.error(str(e))
+        return 1
+    return 0
+
+
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "query":
+        sys.exit(run_query(sys.argv[2:]))
+
     args = parse_arguments()
 
     # Handle installation commands first (exits if installation was performed)
@@ -1103,6 +1334,7 @@ def main():
         logger.info("")
         logger.info("Usage:")
         logger.info("  satellome -i genome.fasta -o output_dir -t 8")
+        logger.info("  satellome query output_dir/genome.sat chr1:1000000-2000000")
         logger.info("")
         logger.info("Key options:")
         logger.info("  -i, --input     Input FASTA file (required)")
@@ -1200,20 +1432,31 @@ def main():
                 logger.info(f"Taxon name: {taxon_name}")
     taxon_name = taxon_name.replace(" ", "_")
 
-    # Start genome size computation in background thread (runs in parallel with FasTAN)
-    genome_size_future = None
-    if not genome_size:
-        from concurrent.futures import ThreadPoolExecutor
-        _genome_size_executor = ThreadPoolExecutor(max_workers=1)
-        genome_size_future = _genome_size_executor.submit(get_genome_size_with_progress, fasta_file)
-        logger.info("Genome size computation started in background...")
-
     # Build settings with genome_size=0 initially (updated later)
     settings = build_settings(
         args, fasta_file, output_dir, project, threads, trf_path,
         genome_size, taxon_name, taxid, html_report_file, output_image_dir
     )
 
+    # Plain gzip input is decompressed once into the cache folder; the
+    # variable is inherited by the pipeline steps started as subprocesses.
+    if settings["genome_cache_dir"]:
+        os.environ[DECOMPRESS_CACHE_ENV] = settings["genome_cache_dir"]
+
+    # Start the single-pass genome scan (sizes, gaps, GC, header check; or
+    # only genome size computation when the cache is disabled) in background
+    # thread (runs in parallel with FasTAN)
+    genome_size_future = None
+    genome_scan_future = None
+    from concurrent.futures import ThreadPoolExecutor
+    _genome_size_executor = ThreadPoolExecutor(max_workers=1)
+    if settings["genome_cache_dir"]:
+        genome_scan_future = _genome_size_executor.submit(run_genome_scan, fasta_file, settings["genome_cache_dir"])
+        logger.info("Genome scan started in background...")
+    elif not genome_size:
+        genome_size_future = _genome_size_executor.submit(get_genome_size_with_progress, fasta_file)
+        logger.info("Genome size computation started in background...")
+
     #TODO: use large_cutoff in code
 
     # Extract run mode flags
@@ -1308,6 +1551,20 @@ def main():
         logger.info(SEPARATOR_LINE)
 
     # Collect genome size from background computation before downstream steps
+    if genome_scan_future is not None:
+        logger.info("Waiting for genome scan...")
+        try:
+            genome_scan = genome_scan_future.result()
+            if not genome_size:
+                genome_size = genome_scan["genome_size"]
+                settings["genome_size"] = genome_size
+            logger.info(f"Genome size: {genome_size:,} bp")
+        except (OSError, ValueError, FileFormatError) as e:
+            logger.warning(f"Genome scan failed ({e}), computing genome size directly")
+            settings["genome_cache_dir"] = None
+            if not genome_size:
+                genome_size_future = _genome_size_executor.submit(get_genome_size_with_progress, fasta_file)
+
     if genome_size_future is not None:
         logger.info("Waiting for genome size computation...")
         genome_size = genome_size_future.result()
@@ -21,7 +21,7 @@ sys.path.insert(0, parent_dir)
 from satellome.core_functions.classification_micro import \
     scf_basic_trs_classification
 
-def classify_trf_data(trf_prefix, output_dir, genome_size, keep_trf=False):
+def classify_trf_data(trf_prefix, output_dir, genome_size, keep_trf=False, threads=1):
 
     base_prefix = trf_prefix
     base_file = os.path.basename(trf_prefix)
@@ -34,6 +34,7 @@ def classify_trf_data(trf_prefix, output_dir, genome_size, keep_trf=False):
             "fasta": os.path.join(output_dir, "fasta"),
         },
         "files": {},
+        "threads": threads,
     }
 
     for folder_path in settings["folders"].values():
@@ -112,7 +113,7 @@ def main():
     keep_trf = args.keep_trf
 
     logger.info("Refining names...")
-    classify_trf_data(trf_prefix, output_dir, genome_size, keep_trf)
+    classify_trf_data(trf_prefix, output_dir, genome_size, keep_trf, threads=args.threads)
 
 
 def get_args():
@@ -142,6 +143,13 @@ def get_args():
         help="Keep original TRF file before filtering (saved with .original suffix)",
         default=False
     )
+    parser.add_argument(
+        "-t",
+        "--threads",
+        type=int,
+        help="Worker processes for large .sat files (default: 1)",
+        default=1,
+    )
     args = parser.parse_args()
     return args
 
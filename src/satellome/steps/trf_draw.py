@@ -15,6 +15,7 @@ parent_dir = os.path.dirname(os.path.dirname(current_dir))
 sys.path.insert(0, parent_dir)
 
 from satellome.core_functions.trf_clusters import draw_all
+from satellome.core_functions.io.genome_cache import get_genome_cache
 
 def main():
     """Main function."""
@@ -30,6 +31,10 @@ def main():
 
     chm2name = None
 
+    genome_cache = None
+    if args.genome_cache:
+        genome_cache = get_genome_cache(fasta_file, args.genome_cache)
+
     draw_all(
         trf_file,
         fasta_file,
@@ -40,6 +45,8 @@ def main():
         lenght_cutoff=lenght_cutoff,
         enhance=enhance,
         force_rerun=force_rerun,
+        genome_cache=genome_cache,
+        threads=args.threads,
     )
 
 
@@ -62,6 +69,12 @@ def get_args():
     parser.add_argument(
         "-s", "--genome_size", type=int, help="Genome size"
     )
+    parser.add_argument(
+        "--genome_cache", type=str, default=None, help="Genome cache folder (lengths and gaps are read from it)"
+    )
+    parser.add_argument(
+        "--threads", type=int, default=1, help="Worker processes for the Python gap finder"
+    )
     parser.add_argument("--force", help="Force rerun gaps calculation even if cache exists", action='store_true', default=False)
     args = parser.parse_args()
     return args
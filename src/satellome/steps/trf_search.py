@@ -18,7 +18,10 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(os.path.dirname(current_dir))
 sys.path.insert(0, parent_dir)
 
+from satellome.constants import RESULT_CACHE_MAX_SIZE, TRF_WINDOW_OVERLAP, TRF_WINDOW_SIZE
+from satellome.core_functions.io.genome_cache import get_genome_cache
 from satellome.core_functions.tools.processing import get_genome_size
+from satellome.core_functions.tools.result_cache import ResultCache
 from satellome.core_functions.tools.trf_tools import trf_search_by_splitting
 
 
@@ -51,6 +54,34 @@ if __name__ == "__main__":
         "--continue-on-error", help="Continue pipeline even if some TRF runs fail", 
         action='store_true', default=False
     )
+    parser.add_argument(
+        "--parser_subprocess", help="Parse each TRF .dat file in a separate Python process (slower, legacy)",
+        action='store_true', default=False
+    )
+    parser.add_argument(
+        "--parse_workers", help="Parser workers running alongside TRF, taken out of --threads [threads / 4]",
+        required=False, default=None, type=int
+    )
+    parser.add_argument(
+        "--no_resume", help="Ignore completed chunks of an interrupted run and start over",
+        action='store_true', default=False
+    )
+    parser.add_argument(
+        "--result_cache", help="Shared TRF result cache directory (opt-in)",
+        required=False, default=None
+    )
+    parser.add_argument(
+        "--result_cache_size", help=f"Result cache size limit in GB [{RESULT_CACHE_MAX_SIZE // 1024 ** 3}]",
+        required=False, default=RESULT_CACHE_MAX_SIZE / 1024 ** 3, type=float
+    )
+    parser.add_argument(
+        "--genome_cache", help="Genome cache folder (sequence lengths are read from it)",
+        required=False, default=None
+    )
+    parser.add_argument(
+        "--window_size", help=f"Window step for TRF; sequences longer than the step plus the {TRF_WINDOW_OVERLAP} bp overlap are split into overlapping windows, 0 to disable [{TRF_WINDOW_SIZE}]",
+        required=False, default=TRF_WINDOW_SIZE, type=int
+    )
     args = vars(parser.parse_args())
 
     fasta_file = args["input"]
@@ -63,6 +94,16 @@ if __name__ == "__main__":
     kmer_threshold = args["kmer_threshold"]
     kmer_bed_file = args["kmer_bed"]
     continue_on_error = args["continue_on_error"]
+    window_size = args["window_size"]
+    parser_subprocess = args["parser_subprocess"]
+    parse_workers = args["parse_workers"]
+    resume = not args["no_resume"]
+    genome_cache = None
+    if args["genome_cache"]:
+        genome_cache = get_genome_cache(fasta_file, args["genome_cache"])
+    result_cache = None
+    if args["result_cache"]:
+        result_cache = ResultCache(args["result_cache"], max_size=int(args["result_cache_size"] * 1024 ** 3))
 
     # Check if output directory is an absolute path FIRST
     if not os.path.isabs(output_dir):
@@ -83,7 +124,7 @@ if __name__ == "__main__":
         os.makedirs(output_dir)
 
     if genome_size == 0:
-        genome_size = get_genome_size(fasta_file)
+        genome_size = genome_cache.genome_size if genome_cache is not None else get_genome_size(fasta_file)
 
     code_dir = pathlib.Path(__file__).parent.resolve()
     parser_program = os.path.join(code_dir, "trf_parse_raw.py")
@@ -108,4 +149,10 @@ if __name__ == "__main__":
             kmer_threshold=kmer_threshold,
             kmer_bed_file=kmer_bed_file,
             abort_on_error=not continue_on_error,
+            window_size=window_size,
+            parser_subprocess=parser_subprocess,
+            parse_workers=parse_workers,
+            resume=resume,
+            result_cache=result_cache,
+            genome_cache=genome_cache,
         )
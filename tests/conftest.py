@@ -1,11 +1,34 @@
 """Pytest configuration and shared fixtures for Satellome tests."""
 
+import gzip
 import os
 import tempfile
 import pytest
 from pathlib import Path
 
 
+def write_fasta(path, records, width=10, newline="\n", gz=False):
+    """Write (header, sequence) records to a FASTA file.
+
+    Args:
+        path: Output path (gzip-compressed if gz is True)
+        records (list): (header without '>', sequence) tuples
+        width (int): Bases per sequence line
+        newline (str): Line terminator, e.g. "\r\n" for Windows files
+        gz (bool): Write a .gz file
+
+    Example:
+        from tests.conftest import write_fasta
+        write_fasta(tmp_path / "genome.fa", [("chr1 desc", "ACGTNNNN")])
+    """
+    opener = gzip.open if gz else open
+    with opener(path, "wt", newline="") as fh:
+        for header, seq in records:
+            fh.write(f">{header}{newline}")
+            for i in range(0, len(seq), width):
+                fh.write(seq[i:i + width] + newline)
+
+
 @pytest.fixture
 def temp_output_dir():
     """Create a temporary directory for test outputs.
@@ -5,8 +5,12 @@
 
 import pytest
 import os
+import random
 import tempfile
-from satellome.core_functions.tools.bed_tools import reverse_complement, extract_sequences_from_bed
+import time
+from satellome.core_functions.tools.bed_tools import (
+    reverse_complement, extract_sequences_from_bed, filter_trf_by_size, filter_trf_by_sizes
+)
 
 
 class TestReverseComplement:
@@ -335,3 +339,115 @@ GGGGGGGGGGCCCCCCCCCCAAAAAAAAAATTTTTTTTTT
         # Check first entry header format: >chr_start_end_length_period
         assert lines[0] == ">chr1_0_10_10_5"
         assert lines[1] == "ATCGATCGAT"
+
+
+def filter_one_size(input_trf_file, output_trf_file, min_array_length, fasta_output_file=None):
+    """The original one-threshold filter_trf_by_size, kept as the reference."""
+    total_count = 0
+    filtered_count = 0
+    total_length = 0
+    with open(input_trf_file, 'r') as in_fh, open(output_trf_file, 'w') as out_fh:
+        fasta_fh = open(fasta_output_file, 'w') if fasta_output_file else None
+        try:
+            out_fh.write(f"# Filtered TRF file: array_length > {min_array_length} bp\n")
+            out_fh.write(f"# Source: {os.path.basename(input_trf_file)}\n")
+            out_fh.write(f"# Fields: project, trf_id, trf_head, trf_l_ind, trf_r_ind, trf_period, trf_n_copy,\n")
+            out_fh.write(f"#         trf_pmatch, trf_pvar, trf_entropy, trf_consensus, trf_array,\n")
+            out_fh.write(f"#         trf_array_gc, trf_consensus_gc, trf_array_length, trf_joined, trf_family, trf_ref_annotation\n")
+            for line in in_fh:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                total_count += 1
+                fields = line.split('\t')
+                if len(fields) < 15:
+                    continue
+                try:
+                    array_length = int(fields[14])
+                except ValueError:
+                    continue
+                if array_length > min_array_length:
+                    out_fh.write(line + '\n')
+                    filtered_count += 1
+                    total_length += array_length
+                    if fasta_fh and len(fields) >= 12:
+                        fasta_header = f">{fields[2]}_{fields[3]}_{fields[4]}_{array_length}_{fields[5]}"
+                        fasta_fh.write(f"{fasta_header}\n{fields[11]}\n")
+        finally:
+            if fasta_fh:
+                fasta_fh.close()
+    return {'total': total_count, 'filtered': filtered_count, 'total_length': total_length}
+
+
+def write_sized_sat(path, seed, n_records, max_length):
+    rng = random.Random(seed)
+    with open(path, "w") as fw:
+        fw.write("# FasTAN results converted to TRF format\n")
+        fw.write("project\ttrf_id\ttrf_head\ttrf_l_ind\ttrf_r_ind\ttrf_period\ttrf_n_copy\ttrf_pmatch\t"
+                 "trf_pvar\ttrf_entropy\ttrf_consensus\ttrf_array\ttrf_array_gc\ttrf_consensus_gc\t"
+                 "trf_array_length\ttrf_joined\ttrf_family\ttrf_ref_annotation\n")
+        for i in range(n_records):
+            length = rng.choice([rng.randint(1, 2000), rng.randint(1, max_length), 1000, 10000])
+            array = "ACGT" * (length // 4) + "A" * (length % 4)
+            fields = ["FasTAN", str(i), f"chr{rng.randint(1, 3)}", "1", str(length), "4", "2.0", "0.0",
+                      "0", "0.0", "ACGT", array, "0.5", "0.5", str(length), "0", "None", "None"]
+            fw.write("\t".join(fields) + "\n")
+            if i % 97 == 0:
+                fw.write("\n# comment\nshort\tline\n")
+                fw.write("\t".join(fields[:14] + ["NA"] + fields[15:]) + "\n")
+    return str(path)
+
+
+class TestFilterTrfBySizes:
+    """One pass writes every tier as the one-threshold filter would."""
+
+    TIERS = [(1000, "1kb"), (10000, "10kb"), (100000, "100kb"), (1000000, "1000kb")]
+
+    def test_tiers_match_one_size_filter(self, tmp_path):
+        sat_file = write_sized_sat(tmp_path / "genome.sat", 5, 600, 200000)
+        tiers = [
+            (cutoff, str(tmp_path / f"fan.{suffix}.sat"), str(tmp_path / f"fan.{suffix}.fasta"))
+            for cutoff, suffix in reversed(self.TIERS)
+        ]
+        stats = filter_trf_by_sizes(sat_file, tiers)
+        assert sorted(stats) == [cutoff for cutoff, _ in self.TIERS]
+        for cutoff, suffix in self.TIERS:
+            expected = filter_one_size(
+                sat_file, str(tmp_path / f"ref.{suffix}.sat"), cutoff, str(tmp_path / f"ref.{suffix}.fasta")
+            )
+            assert stats[cutoff] == expected
+            for ext in ("sat", "fasta"):
+                assert (tmp_path / f"fan.{suffix}.{ext}").read_bytes() == (tmp_path / f"ref.{suffix}.{ext}").read_bytes()
+        assert stats[1000]['filtered'] > stats[10000]['filtered'] > stats[100000]['filtered'] > 0
+
+    def test_single_size_and_no_fasta(self, tmp_path):
+        sat_file = write_sized_sat(tmp_path / "genome.sat", 6, 200, 20000)
+        stats = filter_trf_by_size(sat_file, str(tmp_path / "fan.sat"), 1000)
+        assert stats == filter_one_size(sat_file, str(tmp_path / "ref.sat"), 1000)
+        assert (tmp_path / "fan.sat").read_bytes() == (tmp_path / "ref.sat").read_bytes()
+        assert not list(tmp_path.glob("*.fasta"))
+
+
+@pytest.mark.slow
+class TestFilterTrfBySizesBenchmark:
+    """Four size tiers of a .sat with long arrays."""
+
+    def test_four_tiers(self, tmp_path):
+        sat_file = write_sized_sat(tmp_path / "genome.sat", 7, 3000, 2000000)
+        megabytes = os.path.getsize(sat_file) / 1e6
+        tiers = TestFilterTrfBySizes.TIERS
+
+        started = time.perf_counter()
+        for cutoff, suffix in tiers:
+            filter_one_size(sat_file, str(tmp_path / f"ref.{suffix}.sat"), cutoff, str(tmp_path / f"ref.{suffix}.fasta"))
+        separate_elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        filter_trf_by_sizes(sat_file, [
+            (cutoff, str(tmp_path / f"fan.{suffix}.sat"), str(tmp_path / f"fan.{suffix}.fasta"))
+            for cutoff, suffix in tiers
+        ])
+        fan_out_elapsed = time.perf_counter() - started
+
+        print(f"{megabytes:,.0f} MB: four passes {separate_elapsed:.2f}s, one pass {fan_out_elapsed:.2f}s")
+        assert fan_out_elapsed < separate_elapsed
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Unit tests for BGZF-aware gzip reading (core_functions/io/bgzf.py)
+
+import gzip
+import os
+import struct
+import zlib
+
+import pytest
+
+from satellome.core_functions.exceptions import FileFormatError
+from satellome.core_functions.io.bgzf import (
+    DECOMPRESS_CACHE_ENV,
+    BgzfReader,
+    decompress_to_cache,
+    is_bgzf,
+    open_gzip_fasta,
+)
+from satellome.core_functions.io.fasta_file import sc_iter_fasta_brute
+
+
+def bgzf_block(data):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    cdata = compressor.compress(data) + compressor.flush()
+    bsize = 12 + 6 + len(cdata) + 8 - 1
+    header = b"\x1f\x8b\x08\x04" + struct.pack("<IBBH", 0, 0, 255, 6) + b"BC" + struct.pack("<HH", 2, bsize)
+    return header + cdata + struct.pack("<II", zlib.crc32(data), len(data))
+
+
+def write_bgzf(path, data, block_size=1000):
+    with open(path, "wb") as fh:
+        for i in range(0, len(data), block_size):
+            fh.write(bgzf_block(data[i:i + block_size]))
+        fh.write(bgzf_block(b""))
+
+
+def fasta_bytes(n_records=20, length=3000):
+    lines = []
+    for i in range(n_records):
+        seq = ("ACGTTGCA" * (length // 8 + 1))[:length]
+        lines.append(f">seq{i} test\n")
+        lines.extend(seq[j:j + 60] + "\n" for j in range(0, length, 60))
+    return "".join(lines).encode()
+
+
+class TestBgzf:
+    """Test BGZF detection and parallel decompression."""
+
+    def test_detection(self, tmp_path):
+        data = fasta_bytes(2)
+        write_bgzf(tmp_path / "a.fa.gz", data)
+        with gzip.open(tmp_path / "b.fa.gz", "wb") as fh:
+            fh.write(data)
+        assert is_bgzf(str(tmp_path / "a.fa.gz"))
+        assert not is_bgzf(str(tmp_path / "b.fa.gz"))
+        assert not is_bgzf(str(tmp_path / "missing.gz"))
+
+    def test_bgzf_is_valid_gzip(self, tmp_path):
+        data = fasta_bytes()
+        write_bgzf(tmp_path / "a.fa.gz", data)
+        with gzip.open(tmp_path / "a.fa.gz", "rb") as fh:
+            assert fh.read() == data
+
+    @pytest.mark.parametrize("threads", [1, 4])
+    def test_reader_round_trip(self, tmp_path, threads):
+        data = fasta_bytes()
+        write_bgzf(tmp_path / "a.fa.gz", data, block_size=777)
+        with BgzfReader(str(tmp_path / "a.fa.gz"), threads=threads) as reader:
+            assert reader.read() == data
+
+    def test_corrupted_block(self, tmp_path):
+        path = tmp_path / "a.fa.gz"
+        write_bgzf(path, fasta_bytes(2))
+        raw = bytearray(path.read_bytes())
+        raw[-40] ^= 0xFF
+        path.write_bytes(bytes(raw))
+        with pytest.raises((FileFormatError, zlib.error)):
+            with BgzfReader(str(path)) as reader:
+                reader.read()
+
+    @pytest.mark.parametrize("cut", [-4, -20, 14, 17])
+    def test_truncated_block(self, tmp_path, cut):
+        path = tmp_path / "a.fa.gz"
+        write_bgzf(path, fasta_bytes(2))
+        raw = path.read_bytes()
+        # Cut in the trailer, the compressed data, the extra field and its length
+        first_block = raw[:struct.unpack("<H", raw[16:18])[0] + 1]
+        path.write_bytes(first_block[:cut])
+        with pytest.raises(FileFormatError):
+            with BgzfReader(str(path)) as reader:
+                reader.read()
+
+    def test_fasta_iteration_matches_plain(self, tmp_path):
+        data = fasta_bytes()
+        (tmp_path / "a.fa").write_bytes(data)
+        write_bgzf(tmp_path / "a.fa.gz", data)
+        plain = list(sc_iter_fasta_brute(str(tmp_path / "a.fa")))
+        assert list(sc_iter_fasta_brute(str(tmp_path / "a.fa.gz"))) == plain
+
+
+class TestPlainGzipCache:
+    """Test decompress-once caching of plain gzip."""
+
+    def test_decompress_once(self, tmp_path):
+        data = fasta_bytes(3)
+        src = tmp_path / "b.fa.gz"
+        with gzip.open(src, "wb") as fh:
+            fh.write(data)
+        cache_dir = str(tmp_path / "cache")
+        plain = decompress_to_cache(str(src), cache_dir)
+        assert open(plain, "rb").read() == data
+        mtime = os.path.getmtime(plain)
+        assert decompress_to_cache(str(src), cache_dir) == plain
+        assert os.path.getmtime(plain) == mtime
+
+    def test_open_uses_cache_from_env(self, tmp_path, monkeypatch):
+        data = fasta_bytes(3)
+        src = tmp_path / "b.fa.gz"
+        with gzip.open(src, "wb") as fh:
+            fh.write(data)
+        monkeypatch.setenv(DECOMPRESS_CACHE_ENV, str(tmp_path / "cache"))
+        with open_gzip_fasta(str(src)) as fh:
+            assert fh.read() == data
+        assert os.path.isfile(tmp_path / "cache" / "b.fa")
+
+    def test_open_streams_without_cache(self, tmp_path, monkeypatch):
+        data = fasta_bytes(1)
+        src = tmp_path / "b.fa.gz"
+        with gzip.open(src, "wb") as fh:
+            fh.write(data)
+        monkeypatch.delenv(DECOMPRESS_CACHE_ENV, raising=False)
+        with open_gzip_fasta(str(src)) as fh:
+            assert fh.read() == data
+        assert not os.path.exists(tmp_path / "cache")
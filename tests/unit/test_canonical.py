@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Unit tests for canonical monomer forms (core_functions/tools/canonical.py)
+
+import random
+
+import pytest
+
+from satellome.core_functions.io.trf_file import remove_consensus_redundancy
+from satellome.core_functions.models.trf_model import TRModel
+from satellome.core_functions.tools.canonical import canonical_monomer, least_rotation, primitive_root
+from satellome.core_functions.tools.processing import get_revcomp
+
+
+def rotations(sequence):
+    return [sequence[i:] + sequence[:i] for i in range(len(sequence))]
+
+
+def brute_canonical(monomer):
+    """All rotations of the primitive unit and its reverse complement."""
+    unit = next(
+        monomer[:p] for p in range(1, len(monomer) + 1)
+        if len(monomer) % p == 0 and monomer[:p] * (len(monomer) // p) == monomer
+    )
+    return min(rotations(unit) + rotations(get_revcomp(unit)))
+
+
+class TestCanonical:
+    """Test Booth rotations, minimal periods and canonical forms."""
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_brute_force(self, seed):
+        rng = random.Random(seed)
+        for _ in range(300):
+            unit = "".join(rng.choice("ACGT"[: rng.randint(1, 4)]) for _ in range(rng.randint(1, 12)))
+            monomer = unit * rng.randint(1, 4)
+            assert least_rotation(monomer) == min(rotations(monomer))
+            assert canonical_monomer(monomer) == brute_canonical(monomer)
+
+    def test_primitive_root(self):
+        assert primitive_root("ACTACTACT") == "ACT"
+        assert primitive_root("ACTAC") == "ACTAC"
+        assert primitive_root("AAAA") == "A"
+        assert primitive_root("A") == "A"
+
+    def test_canonical_forms(self):
+        for monomer in ["ACT", "CTA", "TAC", "AGT", "GTA", "ACTACTACT", "GTAGTA"]:
+            assert canonical_monomer(monomer) == "ACT"
+        assert canonical_monomer("") == ""
+
+
+class TestRemoveConsensusRedundancy:
+    """Test consensus canonicalization of parsed TRF calls."""
+
+    def test_frequencies(self):
+        objs = []
+        for consensus in ["ACT", "CTA", "AGT", "ACTACTACT", "", "ACACAC"]:
+            obj = TRModel()
+            obj.trf_consensus = consensus
+            objs.append(obj)
+        objs, frequencies = remove_consensus_redundancy(objs)
+        assert [obj.trf_consensus for obj in objs] == ["ACT", "ACT", "ACT", "ACT", "AC"]
+        assert frequencies == [(4, "ACT"), (1, "AC")]
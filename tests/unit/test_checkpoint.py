@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Unit tests for the chunk checkpoint journal (core_functions/tools/checkpoint.py)
+
+from satellome.core_functions.tools.checkpoint import ChunkJournal, chunk_input_hash
+
+
+def make_chunk(folder, name, seq):
+    fa_file = folder / name
+    fa_file.write_text(f">chr1\n{seq}\n")
+    dat_file = folder / f"{name}.dat"
+    dat_file.write_text("dat")
+    sat_file = folder / f"{name}.dat.sat"
+    sat_file.write_text("row\n")
+    return str(fa_file), str(dat_file), str(sat_file)
+
+
+class TestChunkJournal:
+    """Test recording, reloading and validating completed chunks."""
+
+    def test_record_and_reload(self, tmp_path):
+        fa_file, dat_file, sat_file = make_chunk(tmp_path, "0.fa", "ACGT")
+        key = chunk_input_hash(fa_file)
+        journal = ChunkJournal(str(tmp_path / "chunks.journal"))
+        journal.record("0.fa", key, dat_file, sat=sat_file, records=1)
+
+        reloaded = ChunkJournal(str(tmp_path / "chunks.journal"))
+        assert reloaded.is_done("0.fa", key)
+        assert reloaded.get("0.fa")["sat"] == sat_file
+        assert reloaded.get("0.fa")["records"] == 1
+        assert not reloaded.is_done("1.fa", key)
+
+    def test_changed_input_or_missing_output(self, tmp_path):
+        fa_file, dat_file, sat_file = make_chunk(tmp_path, "0.fa", "ACGT")
+        journal = ChunkJournal(str(tmp_path / "chunks.journal"))
+        journal.record("0.fa", chunk_input_hash(fa_file), dat_file, sat=sat_file, records=1)
+
+        make_chunk(tmp_path, "0.fa", "ACGA")
+        assert not journal.is_done("0.fa", chunk_input_hash(fa_file))
+        make_chunk(tmp_path, "0.fa", "ACGT")
+        assert journal.is_done("0.fa", chunk_input_hash(fa_file))
+        (tmp_path / "0.fa.dat.sat").unlink()
+        assert not journal.is_done("0.fa", chunk_input_hash(fa_file))
+
+    def test_torn_last_line(self, tmp_path):
+        fa_file, dat_file, _ = make_chunk(tmp_path, "window_0.fa", "ACGT")
+        key = chunk_input_hash(fa_file)
+        journal_file = tmp_path / "chunks.journal"
+        ChunkJournal(str(journal_file)).record("window_0.fa", key, dat_file)
+        with open(journal_file, "a") as fw:
+            fw.write('{"chunk": "1.fa", "ha')
+
+        journal = ChunkJournal(str(journal_file))
+        assert journal.is_done("window_0.fa", key)
+        assert journal.get("window_0.fa")["sat"] is None
+        assert list(journal.entries) == ["window_0.fa"]
+
+    def test_record_after_torn_line(self, tmp_path):
+        fa_file, dat_file, _ = make_chunk(tmp_path, "0.fa", "ACGT")
+        key = chunk_input_hash(fa_file)
+        journal_file = tmp_path / "chunks.journal"
+        ChunkJournal(str(journal_file)).record("a.fa", key, dat_file)
+        with open(journal_file, "a") as fw:
+            fw.write('{"chunk": "1.fa", "ha')
+
+        ChunkJournal(str(journal_file)).record("b.fa", key, dat_file)
+        assert list(ChunkJournal(str(journal_file)).entries) == ["a.fa", "b.fa"]
+
+    def test_hash_includes_params(self, tmp_path):
+        fa_file, _, _ = make_chunk(tmp_path, "0.fa", "ACGT")
+        assert chunk_input_hash(fa_file) != chunk_input_hash(fa_file, params=["2", "7", "7"])
@@ -1,8 +1,24 @@
 """Unit tests for satellome.core_functions.classification_micro module."""
 
+import filecmp
+import os
+import random
+import shutil
+from collections import defaultdict
+
 import pytest
-from satellome.core_functions.classification_micro import RepeatCountStatsModel
+import yaml
+
+from satellome.core_functions import classification_micro
+from satellome.core_functions.classification_micro import (
+    RepeatCountStatsModel, _add_to_stats, _save_families_to_file, classify_trs, save_trs_as_fasta
+)
+from satellome.core_functions.io.tab_file import sc_iter_tab_file
+from satellome.core_functions.models.trf_model import TRModel
+from satellome.core_functions.tools.statistics import get_simple_statistics
+from satellome.steps import trf_classify
 from tests.fixtures.sample_data import CLASSIFICATION_TEST_CASES
+from tests.unit.test_tr_table import random_objects
 
 
 class MockTRModel:
@@ -30,21 +46,20 @@ class TestRepeatCountStatsModel:
         assert model.max_length == 0
         assert model.min_length == 0
         assert model.n == 0
-        assert model.lengths == []
-        assert model.pmatch == []
-        assert model.gc == []
+        assert model.lengths.n == 0
+        assert model.pmatch.n == 0
+        assert model.gc.n == 0
         assert model.name is None
 
     def test_model_with_data(self):
         """Test RepeatCountStatsModel with sample data."""
         model = RepeatCountStatsModel()
         model.name = "test_repeat"
-        model.n = 10
-        model.min_length = 50
-        model.max_length = 200
-        model.lengths = [50, 100, 150, 200, 75, 125, 80, 90, 110, 120]
-        model.pmatch = [95.0, 96.0, 97.0, 98.0, 95.5, 96.5, 97.5, 98.5, 99.0, 99.5]
-        model.gc = [50.0, 51.0, 52.0, 53.0, 54.0, 55.0, 56.0, 57.0, 58.0, 59.0]
+        lengths = [50, 100, 150, 200, 75, 125, 80, 90, 110, 120]
+        pmatch = [95.0, 96.0, 97.0, 98.0, 95.5, 96.5, 97.5, 98.5, 99.0, 99.5]
+        gc = [50.0, 51.0, 52.0, 53.0, 54.0, 55.0, 56.0, 57.0, 58.0, 59.0]
+        for values in zip(lengths, pmatch, gc):
+            model.add(*values)
 
         # Test __str__ method
         result = str(model)
@@ -53,23 +68,58 @@ class TestRepeatCountStatsModel:
         assert "\t" in result
         assert "test_repeat" in result
         assert "10" in result  # n
+        assert model.n == 10 and model.max_length == 200
+        # min_length is the length of the last TR, as in the original tables
+        assert model.min_length == 120
 
     def test_model_str_format(self):
         """Test that __str__ returns correct format."""
         model = RepeatCountStatsModel()
         model.name = "AT_repeat"
-        model.n = 5
-        model.min_length = 100
-        model.max_length = 200
-        model.lengths = [100, 120, 140, 160, 200]
-        model.pmatch = [95.0, 96.0, 97.0, 98.0, 99.0]
-        model.gc = [40.0, 45.0, 50.0, 55.0, 60.0]
+        for values in zip([100, 120, 140, 160, 200], [95.0, 96.0, 97.0, 98.0, 99.0], [40.0, 45.0, 50.0, 55.0, 60.0]):
+            model.add(*values)
 
         result = str(model)
         parts = result.strip().split("\t")
         # Should have 15 fields as per __str__ docstring
         assert len(parts) == 15
 
+    def test_same_row_as_value_lists(self):
+        """Accumulated rows equal rows computed from the full value lists."""
+        rng = random.Random(4)
+        model = RepeatCountStatsModel()
+        model.name = "ACT"
+        lengths, pmatch, gc = [], [], []
+        for _ in range(500):
+            lengths.append(rng.randint(10, 5000))
+            pmatch.append(float(rng.randint(60, 100)))
+            gc.append(100 * rng.random())
+            model.add(lengths[-1], pmatch[-1], gc[-1])
+        round_2 = lambda x: round(x, 2)
+        length_stats, pmatch_stats, gc_stats = map(get_simple_statistics, (lengths, pmatch, gc))
+        expected = [
+            "ACT", 500, sum(lengths), lengths[-1], max(lengths),
+            round_2(length_stats["mean"]), round_2(length_stats["standard_deviation"]),
+            min(pmatch), max(pmatch), round_2(pmatch_stats["mean"]), round_2(pmatch_stats["standard_deviation"]),
+            round_2(min(gc)), round_2(max(gc)), round_2(gc_stats["mean"]), round_2(gc_stats["standard_deviation"]),
+        ]
+        assert str(model) == "\t".join(map(str, expected)) + "\n"
+
+    def test_merge_equals_one_pass(self):
+        """Families counted in parts and merged give the same row."""
+        rng = random.Random(5)
+        values = [(rng.randint(10, 5000), float(rng.randint(60, 100)), 100 * rng.random()) for _ in range(300)]
+        whole = RepeatCountStatsModel()
+        whole.name = "AG"
+        parts = [RepeatCountStatsModel() for _ in range(3)]
+        for part in parts:
+            part.name = "AG"
+        for i, value in enumerate(values):
+            whole.add(*value)
+            parts[i * 3 // len(values)].add(*value)
+        merged = RepeatCountStatsModel().merge(parts[0]).merge(RepeatCountStatsModel()).merge(parts[1]).merge(parts[2])
+        assert str(merged) == str(whole)
+
 
 class TestPerfectMicrosatelliteFilter:
     """Tests for perfect microsatellite filter logic."""
@@ -541,3 +591,192 @@ class TestEdgeCases:
         # Both should have same counts after upper()
         assert mock_tr_lower.trf_array.upper().count("A") == mock_tr_upper.trf_array.count("A")
         assert mock_tr_lower.trf_array.upper().count("T") == mock_tr_upper.trf_array.count("T")
+
+
+def write_classification_sat(path, seed, n_lines=600):
+    """A .sat with unsorted heads, perfect and reversed calls and long arrays."""
+    rng = random.Random(seed)
+    objs = random_objects(seed=seed, n_lines=n_lines)
+    rng.shuffle(objs)
+    for obj in objs:
+        if len(obj.trf_array) < 16:
+            # fSSR naming needs at least 4 copies of one nucleotide
+            obj.trf_array *= 16
+        if rng.random() < 0.05:
+            obj.trf_array *= 30
+        obj.trf_array_length = len(obj.trf_array)
+        if rng.random() < 0.2:
+            obj.trf_pmatch = 100.0
+        if rng.random() < 0.1:
+            obj.trf_l_ind, obj.trf_r_ind = obj.trf_r_ind, obj.trf_l_ind
+        obj.trf_head = rng.choice(["chr1", "chr10", "chr2", "chrX", "scaffold_7"])
+    with open(path, "w") as fw:
+        fw.write(objs[0].get_header_string())
+        fw.writelines(str(obj) for obj in objs)
+
+
+def classify_one_by_one(settings, project):
+    """The categories run one after another, as classification used to."""
+    classification_micro.cf_separate_perfect_microsatellites(settings, project)
+    classification_micro.cf_separate_microsatellites(settings, project)
+    classification_micro.cf_separate_true_ssr(settings, project)
+    classification_micro.cf_separate_fuzzy_ssr(settings, project)
+    classification_micro.cf_separate_complex_trs(settings, project)
+    for size_label, min_length in (("1kb", 1000), ("10kb", 10000), ("100kb", 100000), ("1000kb", 1000000)):
+        classification_micro.cf_separate_by_size(settings, project, size_label, min_length)
+    classification_micro.cf_get_micro_summary_table(settings, project)
+    return settings, project
+
+
+def separate_something(input_trf_file, output_trf_file, output_gff_file, filter_func, name_func, family_table_file=None):
+    """The original per-category load, sort and write, kept as the reference."""
+    trf_objs = list(sc_iter_tab_file(input_trf_file, TRModel))
+    trf_objs.sort(key=lambda x: x.trf_head)
+    stats = defaultdict(RepeatCountStatsModel)
+    selected = total_length = 0
+    with open(output_trf_file, "w") as fh, open(output_gff_file, "w") as fh_gff:
+        if trf_objs:
+            fh.write(trf_objs[0].get_header_string())
+        for trf_obj in trf_objs:
+            if filter_func(trf_obj):
+                selected += 1
+                total_length += trf_obj.trf_array_length
+                trf_obj.trf_family, gff_string, mathstr = name_func(trf_obj)
+                fh.write(str(trf_obj))
+                fh_gff.write(gff_string)
+                _add_to_stats(stats, trf_obj)
+    if family_table_file:
+        _save_families_to_file(stats, family_table_file)
+    return {"filtered": selected, "dataset": len(trf_objs), "total_length": total_length}
+
+
+def run_classification(out_dir, sat_file, threads=1):
+    os.makedirs(out_dir)
+    shutil.copy(sat_file, os.path.join(out_dir, "genome.sat"))
+    trf_classify.classify_trf_data(os.path.join(out_dir, "genome"), out_dir, 10**8, threads=threads)
+    with open(os.path.join(out_dir, "results.yaml")) as fh:
+        return yaml.safe_load(fh.read().replace(out_dir, "OUT"))
+
+
+def assert_same_files(reference_dir, other_dir):
+    listing = lambda top: sorted(
+        os.path.relpath(os.path.join(root, name), top) for root, _, files in os.walk(top) for name in files
+    )
+    files = listing(reference_dir)
+    assert files == listing(other_dir) and len(files) > 20
+    for name in files:
+        if name != "results.yaml":
+            assert filecmp.cmp(reference_dir / name, other_dir / name, shallow=False), name
+
+
+class TestClassificationEngine:
+    """One pass over the .sat writes what the separate passes wrote."""
+
+    @pytest.mark.parametrize("seed", [1, 2])
+    def test_same_outputs_as_one_by_one(self, tmp_path, monkeypatch, seed):
+        sat_file = str(tmp_path / "input.sat")
+        write_classification_sat(sat_file, seed)
+        engine = run_classification(str(tmp_path / "engine"), sat_file)
+        monkeypatch.setattr(trf_classify, "scf_basic_trs_classification", classify_one_by_one)
+        reference = run_classification(str(tmp_path / "reference"), sat_file)
+
+        assert engine == reference
+        trevis = engine["work_files"]["repeats"]["dataset"]["trevis"]
+        assert trevis["micro"]["n"] > trevis["pmicro"]["n"] > 0 and trevis["100kb"]["n"] > 0
+        assert_same_files(tmp_path / "reference", tmp_path / "engine")
+
+    def test_rule_matches_separate_load(self, tmp_path):
+        sat_file = str(tmp_path / "input.sat")
+        write_classification_sat(sat_file, 3, n_lines=300)
+        settings = {
+            "folders": {"data_gff3": str(tmp_path), "reports": str(tmp_path), "trf_parsed_folder": str(tmp_path)},
+            "files": {
+                "trf_all_file": sat_file,
+                "trf_perfect_micro_file": str(tmp_path / "pmicro.sat"),
+                "gff_pmicro_file": str(tmp_path / "pmicro.gff"),
+                "report_pmicro_file": str(tmp_path / "pmicro.report"),
+                "trf_1kb_file": str(tmp_path / "1kb.sat"),
+                "gff_1kb_file": str(tmp_path / "1kb.gff"),
+                "trf_1kb_fasta_file": str(tmp_path / "1kb.fasta"),
+            },
+        }
+        project = {"work_files": {"ref_assembly_name_for_trf": "dataset", "assembly_stats": {"dataset": {"genome_size": 10**8}}}}
+        pmicro = classification_micro._perfect_microsatellites_rule(settings, project)
+        size = classification_micro._size_rule(settings, project, "1kb", 1000)
+        results = classify_trs([pmicro, size])
+
+        expected = [
+            separate_something(sat_file, str(tmp_path / "ref.pmicro.sat"), str(tmp_path / "ref.pmicro.gff"),
+                               pmicro.filter_func, pmicro.name_func, str(tmp_path / "ref.pmicro.report")),
+            separate_something(sat_file, str(tmp_path / "ref.1kb.sat"), str(tmp_path / "ref.1kb.gff"),
+                               size.filter_func, size.name_func),
+        ]
+        save_trs_as_fasta(str(tmp_path / "ref.1kb.sat"), str(tmp_path / "ref.1kb.fasta"), project)
+        assert results == expected
+        for name in ("pmicro.sat", "pmicro.gff", "pmicro.report", "1kb.sat", "1kb.gff", "1kb.fasta"):
+            assert (tmp_path / name).read_bytes() == (tmp_path / f"ref.{name}").read_bytes(), name
+        assert project["work_files"]["repeats"]["dataset"]["trevis"]["1kb"]["n"] == results[1]["filtered"]
+
+
+class TestParallelClassification:
+    """Shards classified in a process pool give the files of a serial run."""
+
+    @pytest.fixture(autouse=True)
+    def small_files_in_parallel(self, monkeypatch):
+        monkeypatch.setattr(classification_micro, "SAT_PARALLEL_MIN_BYTES", 0)
+
+    @pytest.mark.parametrize("sort_heads", [False, True])
+    def test_same_outputs_as_serial(self, tmp_path, monkeypatch, sort_heads):
+        sat_file = tmp_path / "input.sat"
+        write_classification_sat(str(sat_file), 7, n_lines=2000)
+        if sort_heads:
+            # Sorted input is split into byte ranges instead of record spans
+            header, *lines = sat_file.read_text().splitlines(keepends=True)
+            lines.sort(key=lambda line: line.split("\t")[1])
+            sat_file.write_text(header + "".join(lines))
+        serial = run_classification(str(tmp_path / "serial"), str(sat_file))
+        calls = []
+        parallel_pass = classification_micro._classify_file_parallel
+        monkeypatch.setattr(
+            classification_micro, "_classify_file_parallel", lambda *args: calls.append(args) or parallel_pass(*args)
+        )
+        parallel = run_classification(str(tmp_path / "parallel"), str(sat_file), threads=3)
+
+        assert len(calls) == 1
+        assert parallel == serial
+        assert_same_files(tmp_path / "serial", tmp_path / "parallel")
+        assert not list((tmp_path / "parallel").rglob("*.part*"))
+
+    def test_failed_shard_leaves_no_parts(self, tmp_path):
+        sat_file = tmp_path / "input.sat"
+        write_classification_sat(str(sat_file), 7, n_lines=2000)
+
+        def name_func(trf_obj):
+            # scaffold_7 sorts last, so the other shards write their parts
+            if trf_obj.trf_head == "scaffold_7":
+                raise ValueError("naming failed")
+            return "family", "", ""
+
+        rule = classification_micro.ClassificationRule(
+            str(sat_file), lambda x: True, name_func,
+            str(tmp_path / "all.sat"), str(tmp_path / "all.gff"), str(tmp_path / "all.report"),
+        )
+        with pytest.raises(ValueError, match="naming failed"):
+            classify_trs([rule], threads=2)
+        assert not list(tmp_path.glob("*.part*"))
+
+    def test_header_only(self, tmp_path):
+        sat_file = tmp_path / "input.sat"
+        sat_file.write_text(TRModel().get_header_string())
+        serial = run_classification(str(tmp_path / "serial"), str(sat_file))
+        parallel = run_classification(str(tmp_path / "parallel"), str(sat_file), threads=2)
+        assert parallel == serial
+        assert (tmp_path / "parallel" / "genome.micro.sat").read_text() == ""
+
+    def test_micro_summary_merge(self):
+        features = [("AC", 100.0, 1, 30), ("AG", 90.0, 40, 10), ("AC", 95.0, 5, 50), ("T", 100.0, 1, 12)]
+        whole, left, right = (classification_micro.MicroSummary() for _ in range(3))
+        for i, feature in enumerate(features):
+            whole.add_feature(*feature)
+            (left if i < 2 else right).add_feature(*feature)
+        assert left.merge(right).rows() == whole.rows()
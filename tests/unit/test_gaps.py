@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Unit tests for N-gap finding (core_functions/trf_drawing.py)
+
+import random
+import shutil
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+from satellome.core_functions import trf_drawing
+from satellome.core_functions.trf_drawing import (
+    find_gaps_numpy,
+    find_n_runs,
+    get_gaps_annotation_re,
+)
+from tests.conftest import write_fasta
+
+
+SEQUENCES = [
+    ("chr1 first", "NNACGTnnnNACGTACGTNN"),
+    ("chr2", "ACGTACGTACGTACGTACGTACGTACGTNNNNNNNNNNACGTN"),
+    ("chr3 short", "NNNN"),
+    ("chr4", "ACGT" * 10),
+]
+
+
+def reference_gaps(records, min_length=0):
+    """Per-base reference with find-gaps semantics (half-open, N/n)."""
+    gaps = []
+    for header, seq in records:
+        if len(seq) < min_length:
+            continue
+        start = None
+        for i, base in enumerate(seq + "A"):
+            if base in "Nn" and start is None:
+                start = i
+            elif base not in "Nn" and start is not None:
+                gaps.append([header.split()[0], start, i, i - start])
+                start = None
+    return gaps
+
+
+@pytest.fixture
+def fasta(tmp_path):
+    path = tmp_path / "genome.fa"
+    write_fasta(path, SEQUENCES, width=7)
+    return str(path)
+
+
+class TestFindGaps:
+    """NumPy and regex gap finders agree with find-gaps semantics."""
+
+    def test_find_n_runs(self):
+        starts, ends = find_n_runs("NNACnNGTN")
+        assert starts.tolist() == [0, 4, 8]
+        assert ends.tolist() == [2, 6, 9]
+        starts, ends = find_n_runs("")
+        assert starts.tolist() == [] and ends.tolist() == []
+
+    @pytest.mark.parametrize("cutoff", [0, 5, 21, 1000])
+    def test_numpy_matches_reference(self, fasta, cutoff):
+        assert find_gaps_numpy(fasta, None, lenght_cutoff=cutoff) == reference_gaps(SEQUENCES, cutoff)
+
+    def test_process_pool_keeps_order(self, fasta):
+        assert find_gaps_numpy(fasta, None, lenght_cutoff=0, threads=2) == reference_gaps(SEQUENCES)
+
+    def test_regex_matches_reference(self, fasta):
+        assert get_gaps_annotation_re(fasta, None, lenght_cutoff=5) == reference_gaps(SEQUENCES, 5)
+
+    def test_random_sequences(self, tmp_path):
+        rng = random.Random(7)
+        records = [
+            (f"s{i}", "".join(rng.choice("ACGTNn") for _ in range(rng.randint(1, 300))))
+            for i in range(30)
+        ]
+        path = tmp_path / "random.fa"
+        write_fasta(path, records, width=60)
+        assert find_gaps_numpy(str(path), None, lenght_cutoff=50) == reference_gaps(records, 50)
+
+
+def find_gaps_binary():
+    candidate = Path(trf_drawing.__file__).parent.parent / "bin" / "find-gaps"
+    return str(candidate) if candidate.exists() else shutil.which("find-gaps")
+
+
+@pytest.mark.slow
+class TestFindGapsBenchmark:
+    """Gap finding on a synthetic 100 Mb chromosome, against find-gaps."""
+
+    def test_100mb_chromosome(self, tmp_path):
+        find_gaps_bin = find_gaps_binary()
+        if not find_gaps_bin:
+            pytest.skip("find-gaps binary is not installed")
+
+        size = 100_000_000
+        unit = "ACGT" * 24_990 + "N" * 40
+        seq = (unit * (size // len(unit) + 1))[:size]
+        path = tmp_path / "chr100m.fa"
+        with open(path, "w") as fh:
+            fh.write(">chr100m\n")
+            for i in range(0, size, 10_000_000):
+                block = seq[i:i + 10_000_000]
+                fh.write("\n".join(block[j:j + 80] for j in range(0, len(block), 80)) + "\n")
+
+        started = time.perf_counter()
+        gaps = find_gaps_numpy(str(path), size, lenght_cutoff=1000)
+        python_elapsed = time.perf_counter() - started
+
+        out = tmp_path / "gaps.bed"
+        started = time.perf_counter()
+        subprocess.run([find_gaps_bin, str(path), str(out), "1000"], check=True)
+        rust_elapsed = time.perf_counter() - started
+
+        expected = [
+            [p[0], int(p[1]), int(p[2]), int(p[3])]
+            for p in (line.split("\t") for line in out.read_text().splitlines())
+        ]
+        assert gaps == expected
+        assert len(gaps) == size // len(unit)
+        # FASTA parsing dominates; the per-base loop was ~100x slower than find-gaps
+        assert python_elapsed < 10 * rust_elapsed
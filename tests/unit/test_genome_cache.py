@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Unit tests for the shared genome cache (core_functions/io/genome_cache.py)
+
+import os
+import time
+
+import pytest
+
+from satellome.core_functions.io.fasta_file import sc_iter_fasta_brute
+from satellome.core_functions.io.genome_cache import (
+    build_genome_cache,
+    get_genome_cache,
+    is_genome_cache_valid,
+)
+from satellome.core_functions.tools.processing import get_genome_size_with_progress
+from satellome.core_functions.trf_drawing import scaffold_length_sort_length
+from tests.conftest import write_fasta
+
+
+SEQUENCES = [
+    ("chr1 first chromosome", "ACGTNNNNACGTacgtRYACGTNN"),
+    ("chr2", "NNNACGTACGTACG"),
+    ("chr3 empty-ish", "A"),
+    ("chr4", "GATTACA" * 50 + "N" * 13 + "TTAGGG" * 20),
+]
+
+
+def python_gaps(records, min_length=0):
+    """Reference gap finder with find-gaps semantics (half-open, N/n)."""
+    gaps = []
+    for header, seq in records:
+        if len(seq) < min_length:
+            continue
+        name = header.split()[0]
+        i = 0
+        while i < len(seq):
+            if seq[i] in "Nn":
+                j = i
+                while j < len(seq) and seq[j] in "Nn":
+                    j += 1
+                gaps.append([name, i, j, j - i])
+                i = j
+            else:
+                i += 1
+    return gaps
+
+
+@pytest.fixture
+def genome(tmp_path):
+    fasta = tmp_path / "genome.fa"
+    write_fasta(fasta, SEQUENCES)
+    return str(fasta)
+
+
+class TestGenomeCache:
+    """Test building and querying the genome cache."""
+
+    def test_lengths_and_size(self, genome, tmp_path):
+        cache = build_genome_cache(genome, str(tmp_path / "cache"))
+        assert cache.names == ["chr1", "chr2", "chr3", "chr4"]
+        assert cache.lengths == {h.split()[0]: len(s) for h, s in SEQUENCES}
+        assert cache.genome_size == sum(len(s) for _, s in SEQUENCES)
+        assert cache.header("chr1") == "chr1 first chromosome"
+
+    def test_fetch_round_trip(self, genome, tmp_path):
+        cache = build_genome_cache(genome, str(tmp_path / "cache"))
+        for header, seq in SEQUENCES:
+            name = header.split()[0]
+            assert cache.fetch(name) == seq.upper()
+            for start, end in [(0, 1), (1, 7), (3, 9), (5, len(seq)), (len(seq) - 2, len(seq) + 5)]:
+                assert cache.fetch(name, start, end) == seq.upper()[start:end]
+
+    def test_iter_sequences_matches_fasta(self, genome, tmp_path):
+        cache = build_genome_cache(genome, str(tmp_path / "cache"))
+        expected = [(h, s.upper()) for h, s in sc_iter_fasta_brute(genome)]
+        assert list(cache.iter_sequences()) == expected
+        assert [h for h, _ in cache.iter_sequences(names={"chr2"})] == [">chr2"]
+
+    def test_gaps_match_find_gaps(self, genome, tmp_path):
+        cache = build_genome_cache(genome, str(tmp_path / "cache"))
+        assert cache.gaps() == python_gaps(SEQUENCES)
+        assert cache.gaps(min_scaffold_length=20) == python_gaps(SEQUENCES, 20)
+
+    def test_checksums_differ(self, genome, tmp_path):
+        cache = build_genome_cache(genome, str(tmp_path / "cache"))
+        checksums = {cache.checksum(name) for name in cache.names}
+        assert len(checksums) == len(SEQUENCES)
+
+    def test_gzip_input(self, tmp_path):
+        fasta = tmp_path / "genome.fa.gz"
+        write_fasta(fasta, SEQUENCES, gz=True)
+        cache = build_genome_cache(str(fasta), str(tmp_path / "cache"))
+        assert cache.fetch("chr4") == SEQUENCES[3][1]
+        assert os.path.exists(tmp_path / "cache" / "genome.2bit")
+
+    def test_duplicate_names_reported(self, tmp_path):
+        fasta = tmp_path / "dup.fa"
+        write_fasta(fasta, [("chr1 a", "ACGT"), ("chr1 b", "NNNN")])
+        cache = build_genome_cache(str(fasta), str(tmp_path / "cache"))
+        assert cache.duplicate_names == ["chr1"]
+        assert cache.fetch("chr1") == "ACGT"
+
+    def test_duplicate_names_keep_own_sequence(self, tmp_path):
+        fasta = tmp_path / "dup.fa"
+        records = [("chr1 a", "ACGTNNAC"), ("chr2", "GGCC"), ("chr1 b", "NNNNACRT")]
+        write_fasta(fasta, records)
+        cache = build_genome_cache(str(fasta), str(tmp_path / "cache"))
+        assert list(cache.iter_sequences()) == list(sc_iter_fasta_brute(str(fasta)))
+        assert cache.gaps() == [["chr1", 4, 6, 2], ["chr1", 0, 4, 4]]
+        assert cache.gaps(min_scaffold_length=8) == [["chr1", 4, 6, 2], ["chr1", 0, 4, 4]]
+
+
+class TestGetGenomeCache:
+    """Test cache reuse and invalidation."""
+
+    def test_reuses_valid_cache(self, genome, tmp_path):
+        cache_dir = str(tmp_path / "cache")
+        first = get_genome_cache(genome, cache_dir)
+        assert is_genome_cache_valid(genome, cache_dir)
+        assert get_genome_cache(genome, cache_dir) is first
+
+    def test_rebuilds_when_fasta_changes(self, genome, tmp_path):
+        cache_dir = str(tmp_path / "cache")
+        get_genome_cache(genome, cache_dir)
+        time.sleep(0.01)
+        write_fasta(genome, [("chrX", "ACGTACGT")])
+        os.utime(genome, ns=(time.time_ns(), time.time_ns() + 10**9))
+        assert not is_genome_cache_valid(genome, cache_dir)
+        assert get_genome_cache(genome, cache_dir).names == ["chrX"]
+
+
+class TestGenomeCacheConsumers:
+    """Stages give the same answers from the cache as from the FASTA."""
+
+    def test_genome_size(self, genome, tmp_path):
+        cache = build_genome_cache(genome, str(tmp_path / "cache"))
+        assert get_genome_size_with_progress(genome, genome_cache=cache) == get_genome_size_with_progress(genome)
+
+    def test_scaffold_lengths(self, genome, tmp_path):
+        cache = build_genome_cache(genome, str(tmp_path / "cache"))
+        assert scaffold_length_sort_length(genome, lenght_cutoff=5, genome_cache=cache) == \
+            scaffold_length_sort_length(genome, lenght_cutoff=5)
+
+
+class TestGcWindows:
+    """Test per-window GC recorded during the cache build."""
+
+    def test_gc_windows(self, tmp_path, monkeypatch):
+        import satellome.core_functions.io.genome_cache as genome_cache
+
+        monkeypatch.setattr(genome_cache, "GC_WINDOW", 10)
+        fasta = tmp_path / "gc.fa"
+        write_fasta(fasta, [("chrA", "GGGGGCCCCC" + "AAAAATTTTT" + "NNNNNNNNNN" + "GCAT")])
+        cache = build_genome_cache(str(fasta), str(tmp_path / "cache"))
+        assert cache.gc_windows() == [
+            ["chrA", 0, 10, 1.0],
+            ["chrA", 10, 20, 0.0],
+            ["chrA", 20, 30, None],
+            ["chrA", 30, 34, 0.5],
+        ]
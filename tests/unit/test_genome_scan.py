@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Unit tests for the single-pass genome scan stage (tools/genome_scan.py)
+
+import os
+
+from satellome.core_functions.tools.genome_scan import run_genome_scan
+from tests.conftest import write_fasta
+
+
+class TestRunGenomeScan:
+    """Test the summary and cache built by run_genome_scan."""
+
+    def test_summary(self, tmp_path):
+        fasta = tmp_path / "genome.fa"
+        write_fasta(fasta, [("chr1 desc", "ACGTNNNNACGT"), ("chr2", "NNGGCC")])
+        summary = run_genome_scan(str(fasta), str(tmp_path / "cache"))
+
+        assert summary["genome_size"] == 18
+        assert summary["n_sequences"] == 2
+        assert summary["n_gaps"] == 2
+        assert summary["gap_length"] == 6
+        assert summary["duplicate_names"] == []
+
+        genome_cache = summary["genome_cache"]
+        assert [(r["name"], r["length"]) for r in genome_cache.records] == [("chr1", 12), ("chr2", 6)]
+        assert genome_cache.gaps() == [["chr1", 4, 8, 4], ["chr2", 0, 2, 2]]
+        assert [tuple(w) for w in genome_cache.gc_windows()] == [("chr1", 0, 12, 0.5), ("chr2", 0, 6, 1.0)]
+
+    def test_duplicates_reported(self, tmp_path):
+        fasta = tmp_path / "dup.fa"
+        write_fasta(fasta, [("chr1 a", "ACGT"), ("chr1 b", "ACGT")])
+        summary = run_genome_scan(str(fasta), str(tmp_path / "cache"))
+        assert summary["duplicate_names"] == ["chr1"]
+
+    def test_cache_reused(self, tmp_path):
+        fasta = tmp_path / "genome.fa"
+        write_fasta(fasta, [("chr1", "ACGT")])
+        first = run_genome_scan(str(fasta), str(tmp_path / "cache"))
+        mtime = os.path.getmtime(first["genome_cache"].paths["meta"])
+        second = run_genome_scan(str(fasta), str(tmp_path / "cache"))
+        assert os.path.getmtime(second["genome_cache"].paths["meta"]) == mtime
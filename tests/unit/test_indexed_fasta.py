@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Unit tests for IndexedFastaReader (core_functions/io/fasta_file.py)
+
+import os
+
+import pytest
+
+from satellome.core_functions.exceptions import FileFormatError
+from satellome.core_functions.io.fasta_file import (
+    IndexedFastaReader,
+    build_fai_index,
+    sc_iter_fasta_brute,
+)
+from satellome.core_functions.tools.kmer_splitting import split_genome_smart
+from tests.conftest import write_fasta
+
+
+SEQUENCES = [
+    ("chr1 first", "ACGTACGTacgtNNNNACGTTTGGCCAA"),
+    ("chr2", "GATTACA" * 9),
+    ("chr3 short", "AC"),
+]
+
+
+@pytest.fixture
+def fasta(tmp_path):
+    path = tmp_path / "genome.fa"
+    write_fasta(path, SEQUENCES, width=8)
+    return str(path)
+
+
+class TestIndexedFastaReader:
+    """Test .fai indexing and random access."""
+
+    def test_index_matches_samtools_layout(self, fasta):
+        index, headers, duplicates = build_fai_index(fasta)
+        assert index["chr1"] == (28, len(">chr1 first\n"), 8, 9)
+        assert headers["chr1"] == "chr1 first"
+        assert duplicates == []
+
+    def test_fetch_any_region(self, fasta):
+        with IndexedFastaReader(fasta) as reader:
+            for header, seq in SEQUENCES:
+                name = header.split()[0]
+                assert reader.fetch(name) == seq.encode()
+                for start in range(len(seq)):
+                    for end in range(start, len(seq) + 2):
+                        assert reader.fetch(name, start, end) == seq[start:end].encode()
+
+    def test_crlf_line_endings(self, tmp_path):
+        path = tmp_path / "crlf.fa"
+        write_fasta(path, SEQUENCES, width=8, newline="\r\n")
+        with IndexedFastaReader(str(path)) as reader:
+            assert reader.fetch("chr2", 3, 30) == SEQUENCES[1][1][3:30].encode()
+            assert reader.header("chr1") == "chr1 first"
+
+    def test_fai_written_and_reused(self, fasta):
+        IndexedFastaReader(fasta).close()
+        assert os.path.isfile(fasta + ".fai")
+        with IndexedFastaReader(fasta) as reader:
+            assert reader.headers == {}
+            assert reader.header("chr3") == "chr3 short"
+            assert reader.lengths == {h.split()[0]: len(s) for h, s in SEQUENCES}
+
+    def test_iter_windows(self, fasta):
+        seq = SEQUENCES[1][1]
+        with IndexedFastaReader(fasta) as reader:
+            windows = list(reader.iter_windows("chr2", 10, 7))
+        assert windows[0] == (0, 10, seq[:10].encode())
+        assert windows[-1][1] == len(seq)
+        assert all(w[2] == seq[w[0]:w[1]].encode() for w in windows)
+
+    def test_irregular_lines_rejected(self, tmp_path):
+        path = tmp_path / "bad.fa"
+        path.write_text(">chr1\nACGT\nAC\nACGT\n")
+        with pytest.raises(FileFormatError):
+            build_fai_index(str(path))
+
+    def test_gzip_rejected(self, tmp_path):
+        with pytest.raises(FileFormatError):
+            IndexedFastaReader(str(tmp_path / "genome.fa.gz"))
+
+
+class TestSplitGenomeSmartIndexed:
+    """split_genome_smart gives the same chunks from the index as from memory."""
+
+    def test_chunks_match_sequences(self, tmp_path):
+        path = tmp_path / "genome.fa"
+        records = [("chrA desc", "ACGT" * 700), ("chrB", "TTAGGG" * 300)]
+        write_fasta(path, records, width=60)
+        out = tmp_path / "chunks"
+        out.mkdir()
+        files = split_genome_smart(str(path), str(out), "test", use_kmer_filter=False)
+        chunks = [rec for f in files for rec in sc_iter_fasta_brute(f)]
+        assert chunks == [
+            (">chrA desc__0_2800", records[0][1]),
+            (">chrB__0_1800", records[1][1]),
+        ]
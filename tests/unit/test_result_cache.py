@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Unit tests for the shared result cache (core_functions/tools/result_cache.py)
+
+import os
+import stat
+import sys
+
+from satellome import main as satellome_main
+from satellome.installers import base as installers_base
+from satellome.core_functions.tools.result_cache import (
+    ResultCache,
+    make_cache_key,
+    records_hash,
+    sequence_hash,
+    tool_identity,
+)
+from satellome.core_functions.tools.trf_tools import split_dat_blocks
+from satellome.main import _store_fastan_results
+
+
+class TestResultCache:
+    """Test storing, restoring and evicting cached results."""
+
+    def test_store_and_read(self, tmp_path):
+        cache = ResultCache(str(tmp_path / "cache"))
+        key = make_cache_key(sequence_hash("ACGT"), "trf", "4.09:abc", ["2", "7", "7"])
+        assert cache.read(key, "dat") is None
+        cache.store(key, {"dat": b"1 10 2\n"})
+        assert cache.read(key, "dat") == b"1 10 2\n"
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_restore_files(self, tmp_path):
+        cache = ResultCache(str(tmp_path / "cache"))
+        source = tmp_path / "genome.bed"
+        source.write_text("chr1\t0\t10\n")
+        cache.store_files("ab" * 20, {"bed": str(source)})
+        target = tmp_path / "restored.bed"
+        assert cache.restore("ab" * 20, {"bed": str(target)})
+        assert target.read_text() == "chr1\t0\t10\n"
+        assert not cache.restore("cd" * 20, {"bed": str(target)})
+
+    def test_key_depends_on_everything(self, tmp_path):
+        base = make_cache_key(sequence_hash("ACGT"), "trf", "v1", ["2", "7"])
+        assert base != make_cache_key(sequence_hash("ACGA"), "trf", "v1", ["2", "7"])
+        assert base != make_cache_key(sequence_hash("ACGT"), "fastan", "v1", ["2", "7"])
+        assert base != make_cache_key(sequence_hash("ACGT"), "trf", "v2", ["2", "7"])
+        assert base != make_cache_key(sequence_hash("ACGT"), "trf", "v1", ["2", "5"])
+
+    def test_records_hash(self):
+        records = [{"name": "chr1", "md5": "a" * 32}, {"name": "chr2", "md5": "b" * 32}]
+        assert records_hash(records) == records_hash([dict(r) for r in records])
+        assert records_hash(records) != records_hash(records[::-1])
+        assert records_hash(records) != records_hash([records[0], {"name": "chr2", "md5": "c" * 32}])
+
+    def test_tool_identity_tracks_binary(self, tmp_path):
+        binary = tmp_path / "trf"
+        binary.write_bytes(b"build 1")
+        first = tool_identity(str(binary), "4.09")
+        binary.write_bytes(b"build 2")
+        assert tool_identity(str(binary), "4.09") != first
+        assert first.startswith("4.09:")
+
+    def test_lru_eviction(self, tmp_path):
+        cache = ResultCache(str(tmp_path / "cache"), max_size=3500)
+        keys = [f"{i:02d}" * 20 for i in range(3)]
+        for age, key in enumerate(keys):
+            cache.store(key, {"dat": b"x" * 1000})
+            os.utime(cache.lookup(key), (1000 + age, 1000 + age))
+        # Reading the oldest entry makes it the most recently used
+        assert cache.read(keys[0], "dat") is not None
+        cache.store("99" * 20, {"dat": b"x" * 1000})
+        assert cache.lookup(keys[1]) is None
+        assert cache.lookup(keys[0]) is not None
+        assert cache.size() <= 3500
+
+
+class TestSplitDatBlocks:
+    """Test splitting TRF .dat files into per-sequence blocks."""
+
+    def test_split(self):
+        text = (
+            "Tandem Repeats Finder Program\n\n"
+            "Sequence: chr1 desc\n\n\n\nParameters: 2 7 7\n\n\n1 10 2 5.0\n"
+            "Sequence: chr2\n\n\n\nParameters: 2 7 7\n\n\n"
+        )
+        preamble, blocks = split_dat_blocks(text)
+        assert preamble == "Tandem Repeats Finder Program\n\n"
+        assert [head for head, _ in blocks] == ["chr1 desc", "chr2"]
+        assert blocks[0][1].endswith("1 10 2 5.0\n")
+        assert preamble + "".join(f"Sequence: {h}\n{b}" for h, b in blocks) == text
+
+
+class TestFastanRecordCache:
+    """Test per-record caching of FasTAN BED results."""
+
+    def test_only_uncached_records_are_merged(self, tmp_path):
+        cache = ResultCache(str(tmp_path / "cache"))
+        record_keys = {name: make_cache_key(name, "fastan-record", "v1", ["-a"]) for name in ("chr1", "chr2", "chr3")}
+        aln = tmp_path / "genome.1aln"
+        aln.write_bytes(b"aln")
+        bed = tmp_path / "genome.bed"
+        bed.write_text("chr1\t0\t10\n# comment\nchr3\t5\t50\nchr3\t60\t90\n")
+        _store_fastan_results(cache, "ab" * 20, str(aln), str(bed), record_keys)
+        assert cache.lookup("ab" * 20) is not None
+        assert cache.read(record_keys["chr2"], "bed") == b""
+        assert cache.read(record_keys["chr3"], "bed") == b"chr3\t5\t50\nchr3\t60\t90\n"
+
+        # chr2 changed: only it was searched again
+        record_keys["chr2"] = make_cache_key("chr2-new", "fastan-record", "v1", ["-a"])
+        cached_beds = {name: cache.read(key, "bed") for name, key in record_keys.items()}
+        (tmp_path / "genome.bed.uncached").write_text("chr2\t1\t20\n")
+        _store_fastan_results(cache, "cd" * 20, str(aln), str(bed), record_keys, cached_beds)
+        assert bed.read_text() == "chr1\t0\t10\nchr2\t1\t20\nchr3\t5\t50\nchr3\t60\t90\n"
+        assert cache.read(record_keys["chr2"], "bed") == b"chr2\t1\t20\n"
+        assert cache.lookup("cd" * 20) is None
+        assert not (tmp_path / "genome.bed.uncached").exists()
+
+
+FAKE_FASTAN = """#!{python}
+import sys
+root = [a[2:] for a in sys.argv[1:] if a.startswith("-o")][0]
+with open(sys.argv[-1]) as fh, open(root + ".1aln", "w") as fw:
+    fw.writelines(line[1:] for line in fh if line.startswith(">"))
+with open({calls!r}, "a") as fw:
+    fw.write(open(root + ".1aln").read().replace("\\n", " ") + "\\n")
+"""
+
+FAKE_TANBED = """#!{python}
+import sys
+for line in open(sys.argv[1]):
+    print(line.split()[0], 0, 12, sep="\\t")
+"""
+
+
+class TestRunFastanCache:
+    """Only the .1aln matching the BED is kept, and temporary files go."""
+
+    def write_tools(self, tmp_path, monkeypatch):
+        tools = {}
+        for name, source in (("fastan", FAKE_FASTAN), ("tanbed", FAKE_TANBED)):
+            path = tmp_path / name
+            path.write_text(source.format(python=sys.executable, calls=str(tmp_path / "calls.txt")))
+            path.chmod(path.stat().st_mode | stat.S_IEXEC)
+            tools[name] = str(path)
+        monkeypatch.setattr(installers_base, "resolve_binary", tools.get)
+        monkeypatch.setattr(installers_base, "verify_binary_manifest", lambda path: ("ok", "test binary"))
+        monkeypatch.setattr(satellome_main, "ensure_fastan_version", lambda path: (True, path, "0.8"))
+        monkeypatch.setattr(satellome_main, "run_arraysplitter", lambda *args, **kwargs: True)
+
+    def test_record_restores(self, tmp_path, monkeypatch):
+        self.write_tools(tmp_path, monkeypatch)
+        genome = tmp_path / "genome.fa"
+        out = tmp_path / "out"
+        settings = {
+            "fasta_file": str(genome),
+            "output_dir": str(out),
+            "project": "test",
+            "threads": 1,
+            "genome_cache_dir": str(tmp_path / "genome_cache"),
+            "result_cache": str(tmp_path / "result_cache"),
+            "result_cache_size": 1,
+        }
+        fastan_dir = out / "fastan"
+        records = {"chr1": "ACGT" * 10, "chr2": "AATT" * 10, "chr3": "GGCC" * 10}
+
+        def run(force_rerun=True, **changed):
+            genome.write_text("".join(f">{name}\n{seq}\n" for name, seq in {**records, **changed}.items()))
+            assert satellome_main.run_fastan(settings, force_rerun)
+            assert not (fastan_dir / "genome.uncached.fa").exists()
+            return sorted(path.name for path in fastan_dir.glob("*.1aln"))
+
+        assert run() == ["genome.1aln"]
+        # chr2 changed: only it is searched, into a separate .1aln
+        assert run(chr2="TTAA" * 10) == ["genome.uncached.1aln"]
+        assert (fastan_dir / "genome.uncached.1aln").read_text() == "chr2\n"
+        assert (fastan_dir / "genome.bed").read_text() == "chr1\t0\t12\nchr2\t0\t12\nchr3\t0\t12\n"
+        # Every record cached on its own: no .1aln matches the BED
+        assert run(chr2="TTAA" * 10) == []
+        calls = (tmp_path / "calls.txt").read_text()
+        assert calls == "chr1 chr2 chr3 \nchr2 \n"
+        # Complete without a .1aln; nothing is searched again
+        assert run(force_rerun=False, chr2="TTAA" * 10) == []
+        assert (tmp_path / "calls.txt").read_text() == calls
+        # The whole-genome entry restores its .1aln
+        assert run() == ["genome.1aln"]
+        assert (tmp_path / "calls.txt").read_text() == calls
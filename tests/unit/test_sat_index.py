@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Unit tests for the .sat offset index and lazy reader (core_functions/io/sat_index.py)
+
+import os
+import random
+import time
+
+import numpy as np
+import pytest
+
+from satellome.core_functions.exceptions import FileFormatError
+from satellome.core_functions.io.sat_index import (SAT_INDEX_SUFFIX,
+                                                   LazySatReader,
+                                                   build_sat_index,
+                                                   get_sat_index,
+                                                   parse_region,
+                                                   read_range_lines,
+                                                   split_byte_ranges)
+from satellome.core_functions.models.trf_model import CompactTRModel, TRModel
+from satellome.main import run_query
+
+from .test_tr_table import random_objects
+
+
+def write_sat(path, objs, header=True):
+    with open(path, "w") as fw:
+        if header:
+            fw.write("#" + "\t".join(TRModel.dumpable_attributes) + "\n")
+        fw.writelines(str(obj) for obj in objs)
+    return str(path)
+
+
+def sat_metadata(obj):
+    return [getattr(obj, attr) for attr in TRModel.dumpable_attributes if attr not in ("trf_consensus", "trf_array")]
+
+
+class TestLazySatReader:
+    """Metadata and on-demand sequences match a full parse."""
+
+    def test_metadata_and_sequences(self, tmp_path):
+        objs = random_objects()
+        reader = LazySatReader(write_sat(tmp_path / "test.sat", objs))
+        assert len(reader) == len(objs)
+        lazy = list(reader.iter_models())
+        assert [sat_metadata(obj) for obj in lazy] == [sat_metadata(obj) for obj in objs]
+        assert all(obj.trf_array is None for obj in lazy)
+        for i in (0, 17, len(objs) - 1):
+            assert reader.consensus(i) == objs[i].trf_consensus
+            assert reader.array(i) == objs[i].trf_array
+            assert str(reader.model(i, CompactTRModel)) == str(objs[i])
+        reader.close()
+
+    def test_sidecar_reused_and_rebuilt(self, tmp_path):
+        objs = random_objects(n_lines=30)
+        sat_file = write_sat(tmp_path / "test.sat", objs)
+        offsets = get_sat_index(sat_file)
+        assert os.path.isfile(sat_file + SAT_INDEX_SUFFIX)
+        assert (get_sat_index(sat_file) == offsets).all()
+
+        write_sat(sat_file, objs[:10])
+        with LazySatReader(sat_file) as reader:
+            assert len(reader) == 10
+            assert reader.array(9) == objs[9].trf_array
+
+    def test_legacy_layout(self, tmp_path):
+        obj = random_objects(n_lines=3)[1]
+        values = {attr: getattr(obj, attr) for attr in TRModel.dumpable_attributes}
+        path = tmp_path / "legacy.sat"
+        path.write_text("\t".join(str(values.get(attr)) for attr in TRModel.legacy_dumpable_attributes) + "\n")
+        with LazySatReader(str(path)) as reader:
+            assert sat_metadata(next(reader.iter_models())) == sat_metadata(obj)
+            assert reader.array(0) == obj.trf_array
+
+    def test_empty_and_bad_files(self, tmp_path):
+        empty = tmp_path / "empty.sat"
+        empty.write_text("")
+        with LazySatReader(str(empty)) as reader:
+            assert list(reader.iter_rows()) == []
+        bad = tmp_path / "bad.sat"
+        bad.write_text("a\tb\n")
+        with pytest.raises(FileFormatError):
+            build_sat_index(str(bad), False)
+
+
+def overlapping(objs, chrom, start=None, end=None):
+    """Record numbers a full scan finds, sorted like LazySatReader.query()."""
+    hits = [
+        (obj.trf_l_ind, obj.trf_r_ind, i)
+        for i, obj in enumerate(objs)
+        if obj.trf_head.split()[0] == chrom
+        and (start is None or obj.trf_r_ind >= start)
+        and (end is None or obj.trf_l_ind <= end)
+    ]
+    return [i for _, _, i in sorted(hits)]
+
+
+class TestRegionQuery:
+    """Region queries return what a full scan finds."""
+
+    def test_random_regions(self, tmp_path):
+        objs = random_objects(seed=11, n_lines=600)
+        # A long array spanning most of chr2 exercises the running max end
+        objs[250].trf_l_ind, objs[250].trf_r_ind = 5, 9_000_000
+        rng = random.Random(11)
+        with LazySatReader(write_sat(tmp_path / "test.sat", objs)) as reader:
+            assert reader.chromosomes == ["chr1", "chr2", "chrX"]
+            for _ in range(300):
+                chrom = rng.choice(["chr1", "chr2", "chrX"])
+                start = rng.randint(1, 10**7)
+                end = start + rng.choice([0, 10, 10**4, 10**6])
+                assert reader.query(chrom, start, end).tolist() == overlapping(objs, chrom, start, end)
+            for chrom in reader.chromosomes:
+                assert reader.query(chrom).tolist() == overlapping(objs, chrom)
+                assert reader.query(chrom, 5 * 10**6).tolist() == overlapping(objs, chrom, 5 * 10**6)
+                assert reader.query(chrom, None, 10**5).tolist() == overlapping(objs, chrom, None, 10**5)
+            assert len(reader.query("chrY", 1, 10**9)) == 0
+
+    def test_boundaries_and_byte_ranges(self, tmp_path):
+        objs = random_objects(n_lines=30)
+        sat_file = write_sat(tmp_path / "test.sat", objs)
+        with LazySatReader(sat_file) as reader:
+            obj = objs[12]
+            chrom = obj.trf_head
+            assert 12 in reader.query(chrom, obj.trf_r_ind, obj.trf_r_ind + 5)
+            assert 12 in reader.query(chrom, obj.trf_l_ind - 5, obj.trf_l_ind)
+            assert 12 not in reader.query(chrom, obj.trf_r_ind + 1, obj.trf_r_ind + 1)
+            assert reader.line(12) == str(obj)
+            first, last = reader.chromosome_bytes(chrom)
+            with open(sat_file) as fh:
+                fh.seek(first)
+                lines = fh.read(last - first).splitlines(keepends=True)
+            assert lines == [str(o) for o in objs if o.trf_head == chrom]
+            assert reader.chromosome_bytes("chrY") is None
+            models = reader.query_models(chrom, 1, 10**8, sequences=False)
+            assert [sat_metadata(o) for o in models] == [sat_metadata(objs[i]) for i in overlapping(objs, chrom)]
+            assert [str(o) for o in reader.query_models(chrom, obj.trf_l_ind, obj.trf_l_ind)] == [
+                str(objs[i]) for i in overlapping(objs, chrom, obj.trf_l_ind, obj.trf_l_ind)
+            ]
+
+    def test_legacy_layout(self, tmp_path):
+        objs = random_objects(n_lines=9)
+        path = tmp_path / "legacy.sat"
+        with open(path, "w") as fw:
+            for obj in objs:
+                values = {attr: getattr(obj, attr) for attr in TRModel.dumpable_attributes}
+                fw.write("\t".join(str(values.get(attr)) for attr in TRModel.legacy_dumpable_attributes) + "\n")
+        with LazySatReader(str(path)) as reader:
+            assert reader.query("chrX").tolist() == overlapping(objs, "chrX")
+
+    def test_version_1_sidecar_rebuilt(self, tmp_path):
+        objs = random_objects(n_lines=30)
+        sat_file = write_sat(tmp_path / "test.sat", objs)
+        offsets = build_sat_index(sat_file, False)
+        with open(sat_file + SAT_INDEX_SUFFIX, "wb") as fw:
+            stat = os.stat(sat_file)
+            np.savez(fw, offsets=offsets, signature=np.array([1, stat.st_size, stat.st_mtime_ns]))
+        with LazySatReader(sat_file) as reader:
+            assert reader.query("chr1").tolist() == overlapping(objs, "chr1")
+
+    def test_parse_region(self):
+        assert parse_region("chr1:1,000-2,000") == ("chr1", 1000, 2000)
+        assert parse_region("chr1:500") == ("chr1", 500, None)
+        assert parse_region("chr1") == ("chr1", None, None)
+        assert parse_region("HLA-A*01:01:1-10") == ("HLA-A*01:01", 1, 10)
+        for region in ("chr1:a-b", "chr1:20-10"):
+            with pytest.raises(ValueError):
+                parse_region(region)
+
+    def test_query_command(self, tmp_path, capsys):
+        objs = random_objects(n_lines=30)
+        sat_file = write_sat(tmp_path / "test.sat", objs)
+        assert run_query([sat_file, "chr2", "chr1:1-5,000,000"]) == 0
+        expected = overlapping(objs, "chr2") + overlapping(objs, "chr1", 1, 5 * 10**6)
+        assert capsys.readouterr().out == "".join(str(objs[i]) for i in expected)
+        hits = overlapping(objs, "chrX", 1, 2 * 10**6)
+        assert run_query([sat_file, "--no-arrays", "chrX:1-2000000"]) == 0
+        with LazySatReader(sat_file) as reader:
+            assert capsys.readouterr().out == "".join("\t".join(reader.row(i)) + "\n" for i in hits)
+
+
+class TestSplitByteRanges:
+    """Byte ranges start at line starts and cover every line once."""
+
+    @pytest.mark.parametrize("n_ranges", [1, 2, 7, 50, 1000])
+    def test_lines_covered(self, tmp_path, n_ranges):
+        path = tmp_path / "lines.txt"
+        lines = [f"{i}\t" + "A" * (i % 37) + "\n" for i in range(300)]
+        lines[5] = "\n"
+        path.write_text("".join(lines))
+        ranges = split_byte_ranges(str(path), n_ranges)
+        assert len(ranges) <= n_ranges
+        assert ranges[0][0] == 0 and ranges[-1][1] == path.stat().st_size
+        assert all(end == next_start for (_, end), (next_start, _) in zip(ranges, ranges[1:]))
+        assert [line for start, end in ranges for line in read_range_lines(str(path), start, end)] == lines
+
+    def test_crlf_and_last_line(self, tmp_path):
+        path = tmp_path / "crlf.txt"
+        path.write_bytes(b"a\tb\r\nc\td\r\ne")
+        ranges = split_byte_ranges(str(path), 3)
+        assert [line for r in ranges for line in read_range_lines(str(path), *r)] == ["a\tb\n", "c\td\n", "e"]
+
+
+@pytest.mark.slow
+class TestLazySatReaderBenchmark:
+    """A metadata scan of a .sat with long arrays against a full parse."""
+
+    def test_metadata_scan(self, tmp_path):
+        objs = random_objects(n_lines=300)
+        for obj in objs:
+            obj.trf_array = obj.trf_array * (200000 // len(obj.trf_array) + 1)
+        sat_file = write_sat(tmp_path / "long.sat", objs)
+        megabytes = os.path.getsize(sat_file) / 1e6
+
+        started = time.perf_counter()
+        with open(sat_file) as fh:
+            next(fh)
+            heads = [TRModel.from_row(line.rstrip("\n").split("\t")).trf_head for line in fh]
+        full_elapsed = time.perf_counter() - started
+
+        get_sat_index(sat_file)
+        started = time.perf_counter()
+        with LazySatReader(sat_file) as reader:
+            lazy_heads = [obj.trf_head for obj in reader.iter_models(CompactTRModel)]
+        lazy_elapsed = time.perf_counter() - started
+
+        assert lazy_heads == heads
+        print(f"{megabytes:,.0f} MB: full parse {full_elapsed:.3f}s, indexed metadata scan {lazy_elapsed:.4f}s")
+        # Files here sit in the page cache; on disk the full parse is I/O bound
+        assert lazy_elapsed < full_elapsed / 4
+
+
+@pytest.mark.slow
+class TestRegionQueryBenchmark:
+    """Region lookups in a .sat of 300k records."""
+
+    def test_query_latency(self, tmp_path):
+        objs = random_objects(n_lines=3000)
+        rng = random.Random(3)
+        path = tmp_path / "big.sat"
+        with open(path, "w") as fw:
+            for copy in range(100):
+                for obj in objs:
+                    obj.trf_l_ind = rng.randint(1, 2 * 10**8)
+                    obj.trf_r_ind = obj.trf_l_ind + obj.trf_array_length - 1
+                    fw.write(str(obj))
+        sat_file = str(path)
+
+        started = time.perf_counter()
+        build_sat_index(sat_file)
+        build_elapsed = time.perf_counter() - started
+
+        regions = [("chr1", start, start + 10**5) for start in range(1, 2 * 10**8, 10**6)]
+        with LazySatReader(sat_file) as reader:
+            started = time.perf_counter()
+            n_found = sum(len(reader.query_models(*region)) for region in regions)
+            query_elapsed = (time.perf_counter() - started) / len(regions)
+
+        started = time.perf_counter()
+        with open(sat_file) as fh:
+            for line in fh:
+                row = line.split("\t")
+                if row[2] == "chr1" and int(row[4]) >= 1 and int(row[3]) <= 10**5:
+                    pass
+        scan_elapsed = time.perf_counter() - started
+
+        print(
+            f"{len(objs) * 100:,} records: index built in {build_elapsed:.2f}s, "
+            f"{query_elapsed * 1000:.2f} ms per 100 kb query ({n_found} hits), full scan {scan_elapsed:.2f}s"
+        )
+        assert n_found > 0
+        assert query_elapsed < 0.05
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Unit tests for size-aware job scheduling (core_functions/tools/scheduling.py)
+
+import logging
+import random
+
+import pytest
+
+from satellome.constants import TRF_REPEAT_COST_WEIGHT
+from satellome.core_functions.io.genome_cache import build_genome_cache
+from satellome.core_functions.tools.kmer_splitting import region_repeat_density, sequence_repeat_density
+from satellome.core_functions.tools.scheduling import (
+    estimate_chunk_cost,
+    order_longest_first,
+    pack_into_bins,
+    predict_makespan,
+    report_makespan,
+)
+from satellome.core_functions.tools.trf_tools import _read_sequence_lengths
+
+
+class TestScheduling:
+    """Test cost estimates, bin packing and makespan prediction."""
+
+    def test_cost_grows_with_repeat_density(self):
+        assert estimate_chunk_cost(1000) == 1000
+        assert estimate_chunk_cost(1000, 1.0) == 1000 * (1 + TRF_REPEAT_COST_WEIGHT)
+        assert estimate_chunk_cost(1000, 2.0) == estimate_chunk_cost(1000, 1.0)
+
+    def test_bins_are_balanced(self):
+        rng = random.Random(3)
+        items = [(i, rng.randint(100, 90000)) for i in range(500)]
+        bins = pack_into_bins(items, 40)
+        sizes = dict(items)
+        loads = [sum(sizes[key] for key in b) for b in bins]
+        assert sorted(key for b in bins for key in b) == list(range(500))
+        assert max(loads) - min(loads) <= max(sizes.values())
+
+    def test_fill_until_exceeded_is_worse(self):
+        # Old rule: start a new chunk once the current one exceeds the limit
+        sizes = [60000, 50000, 90000, 5000, 5000, 70000, 30000, 40000]
+        old, current = [], 0
+        for size in sizes:
+            current += size
+            if current > 100000:
+                old.append(current)
+                current = 0
+        if current:
+            old.append(current)
+        new = [
+            sum(sizes[i] for i in b)
+            for b in pack_into_bins(list(enumerate(sizes)), len(old))
+        ]
+        assert max(new) < max(old)
+
+    def test_longest_first_and_makespan(self):
+        costs = {"a": 10, "b": 100, "c": 50}
+        assert order_longest_first(["a", "b", "c"], costs) == ["b", "c", "a"]
+        assert predict_makespan([100, 60, 50, 40], 2) == 140
+        assert predict_makespan([], 4) == 0
+
+    def test_report_makespan(self, caplog):
+        with caplog.at_level(logging.INFO):
+            report = report_makespan({"a": 2, "b": 1, "c": 1}, {"a": 4.0, "b": 2.0, "c": 2.0}, 2, 4.5)
+        assert report["predicted"] == pytest.approx(4.0)
+        assert report["lower_bound"] == pytest.approx(4.0)
+        assert report["actual"] == 4.5
+        assert "makespan" in caplog.text
+
+    def test_region_repeat_density(self):
+        windows = [(0, 100, 100), (100, 200, 0), (200, 300, 50)]
+        assert region_repeat_density(windows, 0, 100) == 0.0
+        assert region_repeat_density(windows, 50, 150) == pytest.approx(0.5)
+        assert region_repeat_density(windows, 150, 250) == pytest.approx(0.75)
+        assert region_repeat_density(windows, 500, 600) == 0.0
+
+    def test_sequence_repeat_density(self):
+        rng = random.Random(5)
+        unique = "".join(rng.choice("ACGT") for _ in range(100000))
+        satellite = "".join(rng.choice("ACGT") for _ in range(171)) * 600
+        assert sequence_repeat_density(unique) < 0.01
+        assert sequence_repeat_density(satellite) > 0.9
+        assert sequence_repeat_density("ACGTN" * 3) == 0.0
+        assert estimate_chunk_cost(len(satellite), sequence_repeat_density(satellite)) > 4 * len(satellite)
+
+
+class TestSequenceLengths:
+    """Chunk planning takes lengths from an index instead of the sequences."""
+
+    def test_lengths_from_fai_and_cache(self, tmp_path):
+        fasta = tmp_path / "genome.fa"
+        fasta.write_text(">chr1\nACGTACGT\nAC\n>chr2\nAAA\n")
+        assert _read_sequence_lengths(str(fasta)) == [10, 3]
+        # The .fai saved by the first call is read on the next one
+        fai = tmp_path / "genome.fa.fai"
+        assert fai.exists()
+        fai.write_text("chr1\t7\t6\t8\t9\nchr2\t3\t22\t3\t4\n")
+        assert _read_sequence_lengths(str(fasta)) == [7, 3]
+
+        cache = build_genome_cache(str(fasta), str(tmp_path / "cache"))
+        assert _read_sequence_lengths(str(fasta), cache) == [10, 3]
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Unit tests for streaming statistics (core_functions/tools/statistics.py)
+
+import random
+import statistics
+
+import pytest
+
+from satellome.core_functions.exceptions import StatisticsError
+from satellome.core_functions.tools.statistics import QuantileSketch, RunningStatistics, get_simple_statistics
+
+
+def accumulate(values, relative_accuracy=None):
+    stats = RunningStatistics(relative_accuracy)
+    for x in values:
+        stats.add(x)
+    return stats
+
+
+class TestRunningStatistics:
+    """Streaming statistics equal the statistics of the full value list."""
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_simple_statistics(self, seed):
+        rng = random.Random(seed)
+        values = [rng.randint(1, 10**6) for _ in range(1000)] if seed % 2 else [rng.gauss(1e6, 3) for _ in range(1000)]
+        stats = accumulate(values)
+        expected = get_simple_statistics(values)
+        assert stats.n == len(values)
+        assert (stats.min, stats.max) == (min(values), max(values))
+        assert stats.mean == pytest.approx(expected["mean"], rel=1e-12)
+        assert stats.variance == pytest.approx(expected["variance"], rel=1e-9)
+        assert stats.standard_deviation == pytest.approx(expected["standard_deviation"], rel=1e-9)
+
+    def test_integer_total_is_exact(self):
+        stats = accumulate([10**18, 1, -(10**18)])
+        assert stats.total == 1 and isinstance(stats.total, int)
+
+    def test_float_total_does_not_depend_on_order(self):
+        rng = random.Random(1)
+        values = [rng.uniform(-1, 1) * 10 ** rng.randint(-8, 8) for _ in range(2000)]
+        shuffled = values[:]
+        rng.shuffle(shuffled)
+        assert accumulate(values).total == accumulate(shuffled).total == pytest.approx(sum(values))
+
+    @pytest.mark.parametrize("n_parts", [2, 3, 7])
+    def test_merge(self, n_parts):
+        rng = random.Random(n_parts)
+        values = [rng.expovariate(0.01) for _ in range(3000)]
+        cuts = sorted(rng.sample(range(1, len(values)), n_parts - 1))
+        parts = [accumulate(values[a:b], 0.01) for a, b in zip([0] + cuts, cuts + [len(values)])]
+        merged = RunningStatistics(0.01)
+        for part in parts:
+            merged.merge(part)
+        whole = accumulate(values, 0.01)
+        assert (merged.n, merged.total, merged.mean, merged.min, merged.max) == (
+            whole.n, whole.total, whole.mean, whole.min, whole.max
+        )
+        assert merged.variance == pytest.approx(whole.variance, rel=1e-12)
+        assert merged.sketch.positive == whole.sketch.positive
+        assert merged.median() == whole.median()
+
+    def test_empty(self):
+        stats = RunningStatistics()
+        assert (stats.n, stats.total, stats.mean, stats.variance, stats.min) == (0, 0, 0, 0, None)
+        assert accumulate([1, 2]).merge(stats).n == 2
+        with pytest.raises(StatisticsError):
+            stats.median()
+
+
+class TestQuantileSketch:
+    """Quantiles stay within the relative accuracy of the exact ones."""
+
+    @pytest.mark.parametrize("relative_accuracy", [0.01, 0.05])
+    def test_relative_error(self, relative_accuracy):
+        rng = random.Random(2)
+        values = [rng.lognormvariate(5, 2) for _ in range(5000)] + [0.0] * 10 + [-rng.expovariate(1) for _ in range(50)]
+        sketch = QuantileSketch(relative_accuracy)
+        for x in values:
+            sketch.add(x)
+        ordered = sorted(values)
+        for q in (0, 0.01, 0.25, 0.5, 0.9, 0.99, 1):
+            exact = ordered[int(q * (len(values) - 1))]
+            assert abs(sketch.quantile(q) - exact) <= relative_accuracy * abs(exact) + 1e-12
+
+    def test_median_of_lengths(self):
+        stats = accumulate(range(1, 1002), 0.01)
+        assert stats.median() == pytest.approx(statistics.median(range(1, 1002)), rel=0.01)
+        assert stats.quantile(0) == 1 and stats.quantile(1) == 1001
+
+    def test_invalid(self):
+        with pytest.raises(StatisticsError):
+            QuantileSketch(0)
+        with pytest.raises(StatisticsError):
+            QuantileSketch(0.01).merge(QuantileSketch(0.02))
+        with pytest.raises(StatisticsError):
+            accumulate([1.0], 0.01).quantile(1.5)
+        with pytest.raises(StatisticsError):
+            RunningStatistics(0.01).merge(accumulate([1.0]))
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Unit tests for tab-delimited model iteration (core_functions/io/tab_file.py)
+
+import csv
+import os
+import random
+import time
+
+import pytest
+
+from satellome.core_functions.io.tab_file import (
+    sc_iter_tab_file,
+    sc_iter_tab_file_sorted,
+    sc_iter_tab_file_spans,
+    sc_sorted_line_spans,
+)
+from satellome.core_functions.models.trf_model import TRModel, TRsClassificationModel
+
+from .test_tr_table import random_objects
+
+
+def dict_reader_objects(input_file, data_type, skip_starts_with="#", preprocess_function=None, check_function=None):
+    """The original csv.DictReader parsing, kept as the reference."""
+    fields = data_type().dumpable_attributes
+    with open(input_file) as fh:
+        lines = fh.readlines()
+    if preprocess_function:
+        lines = [preprocess_function(line) for line in lines]
+    if check_function:
+        lines = [line for line in lines if check_function(line)]
+    objs = []
+    for data in csv.DictReader(lines, fieldnames=fields, delimiter="\t", quoting=csv.QUOTE_NONE):
+        if skip_starts_with and data[fields[0]].startswith(skip_starts_with):
+            continue
+        if data[fields[0]] == fields[0]:
+            continue
+        obj = data_type()
+        obj.set_with_dict(data)
+        objs.append(obj)
+    return objs
+
+
+@pytest.fixture
+def sat_file(tmp_path):
+    path = tmp_path / "test.sat"
+    with open(path, "w") as fw:
+        fw.write("# comment\n")
+        fw.write("\t".join(TRModel.dumpable_attributes) + "\n")
+        fw.writelines(str(obj) for obj in random_objects())
+        fw.write("\n")
+    return str(path)
+
+
+class TestScIterTabFile:
+    """Positional parsing gives the same objects as csv.DictReader."""
+
+    def test_same_as_dict_reader(self, sat_file):
+        objs = list(sc_iter_tab_file(sat_file, TRModel))
+        expected = dict_reader_objects(sat_file, TRModel)
+        assert len(objs) == 300
+        assert [obj.__dict__ for obj in objs] == [obj.__dict__ for obj in expected]
+
+    def test_stages(self, sat_file):
+        preprocess = lambda line: line.replace("chr", "scaffold_")
+        check = lambda line: "scaffold_2" not in line
+        objs = list(sc_iter_tab_file(sat_file, TRModel, preprocess_function=preprocess, check_function=check))
+        expected = dict_reader_objects(sat_file, TRModel, preprocess_function=preprocess, check_function=check)
+        assert len(objs) == 200
+        assert [obj.__dict__ for obj in objs] == [obj.__dict__ for obj in expected]
+        assert len(list(sc_iter_tab_file(sat_file, TRModel, remove_starts_with="test\t"))) == 0
+
+    def test_short_and_other_rows(self, tmp_path):
+        path = tmp_path / "classes.tab"
+        rows = [
+            ["hg38", "1", "7", "171", "3400", "0.38", "SAT", "ALPHA"],
+            ["hg38", "2", "8", "2", "120", "0.0", "SSR", "None", "None", "0.5"] + ["x"] * 14,
+        ]
+        path.write_text("".join("\t".join(row) + "\n" for row in rows))
+        objs = list(sc_iter_tab_file(str(path), TRsClassificationModel))
+        expected = dict_reader_objects(str(path), TRsClassificationModel)
+        assert [obj.__dict__ for obj in objs] == [obj.__dict__ for obj in expected]
+        assert objs[0].trf_consensus is None and objs[1].trf_family_prob == 0.5
+
+    def test_bad_value_raises(self, tmp_path):
+        obj = random_objects(n_lines=3)[0]
+        path = tmp_path / "bad.sat"
+        path.write_text(str(obj).replace(f"\t{obj.trf_l_ind}\t", "\tabc\t", 1))
+        with pytest.raises(ValueError, match="Failed to parse data"):
+            list(sc_iter_tab_file(str(path), TRModel))
+
+
+class TestScIterTabFileSorted:
+    """Objects come out as sorted(sc_iter_tab_file(...)) would order them."""
+
+    @pytest.mark.parametrize("shuffle", [True, False])
+    def test_same_as_sorted_list(self, tmp_path, shuffle):
+        objs = random_objects(seed=8)
+        rng = random.Random(8)
+        for obj in objs:
+            obj.trf_head = rng.choice(["chr10", "chr2", "chrX", "scaffold_1", "chr1"])
+        if shuffle:
+            rng.shuffle(objs)
+        else:
+            objs.sort(key=lambda obj: obj.trf_head)
+        path = tmp_path / "test.sat"
+        with open(path, "w", newline="") as fw:
+            fw.write("# comment\n")
+            fw.write("\t".join(TRModel.dumpable_attributes) + "\n")
+            for i, obj in enumerate(objs):
+                fw.write(str(obj).replace("\n", "\r\n") if i % 3 == 0 else str(obj))
+                if i % 50 == 0:
+                    fw.write("\n\r\n#skipped\n")
+        expected = sorted(sc_iter_tab_file(str(path), TRModel), key=lambda obj: obj.trf_head)
+        objs = list(sc_iter_tab_file_sorted(str(path), TRModel, "trf_head"))
+        assert len(objs) == 300
+        assert [obj.__dict__ for obj in objs] == [obj.__dict__ for obj in expected]
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.sat"
+        path.write_text("")
+        assert list(sc_iter_tab_file_sorted(str(path), TRModel, "trf_head")) == []
+
+    def test_spans(self, tmp_path):
+        objs = random_objects(seed=9, n_lines=100)
+        for i, obj in enumerate(objs):
+            obj.trf_head = f"chr{i // 10:02d}"
+        path = tmp_path / "test.sat"
+        with open(path, "w") as fw:
+            fw.write(objs[0].get_header_string())
+            fw.writelines(str(obj) for obj in objs)
+        assert sc_sorted_line_spans(str(path), TRModel, "trf_head") is None
+        path.write_text(objs[0].get_header_string() + "".join(str(obj) for obj in reversed(objs)))
+        starts, ends = sc_sorted_line_spans(str(path), TRModel, "trf_head")
+        # Parts of the spans, and byte ranges of several lines, read in order
+        expected = [obj.__dict__ for obj in sc_iter_tab_file_sorted(str(path), TRModel, "trf_head")]
+        parts = [sc_iter_tab_file_spans(str(path), TRModel, starts[a:b], ends[a:b]) for a, b in ((0, 40), (40, 100))]
+        assert [obj.__dict__ for part in parts for obj in part] == expected
+        size = os.path.getsize(path)
+        whole = list(sc_iter_tab_file_spans(str(path), TRModel, [0], [size]))
+        assert [obj.__dict__ for obj in whole] == [obj.__dict__ for obj in sc_iter_tab_file(str(path), TRModel)]
+
+
+@pytest.mark.slow
+class TestScIterTabFileBenchmark:
+    """Per-file throughput on a .sat against the DictReader parser."""
+
+    def test_throughput(self, tmp_path):
+        path = tmp_path / "big.sat"
+        with open(path, "w") as fw:
+            for seed in range(10):
+                fw.writelines(str(obj) for obj in random_objects(seed=seed, n_lines=3000))
+        megabytes = os.path.getsize(path) / 1e6
+
+        started = time.perf_counter()
+        expected = dict_reader_objects(str(path), TRModel)
+        reference_elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        n_objs = sum(1 for _ in sc_iter_tab_file(str(path), TRModel))
+        elapsed = time.perf_counter() - started
+
+        assert n_objs == len(expected)
+        print(
+            f"DictReader: {n_objs / reference_elapsed:,.0f} records/s, {megabytes / reference_elapsed:,.1f} MB/s; "
+            f"positional: {n_objs / elapsed:,.0f} records/s, {megabytes / elapsed:,.1f} MB/s"
+        )
+        assert elapsed < reference_elapsed
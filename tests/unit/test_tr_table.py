@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Unit tests for the columnar tandem repeat table (core_functions/io/tr_table.py)
+
+import os
+import random
+import time
+
+import numpy as np
+import pytest
+
+from satellome.core_functions.exceptions import FileFormatError
+from satellome.core_functions.io import tr_table
+from satellome.core_functions.io.tr_table import TRTable
+from satellome.core_functions.models.trf_model import TRModel, parse_trf_block
+
+
+def random_objects(seed=4, n_lines=300):
+    rng = random.Random(seed)
+    objs = []
+    for head in ("chr1", "chr2", "chrX"):
+        lines = []
+        for _ in range(n_lines // 3):
+            period = rng.randint(1, 200)
+            unit = "".join(rng.choice("ACGT") for _ in range(period))
+            array = (unit * 50)[: rng.randint(period, 50 * period)]
+            l_ind = rng.randint(1, 10**7)
+            lines.append(
+                f"{l_ind} {l_ind + len(array) - 1} {period} {len(array) / period:.1f} {period} "
+                f"{rng.randint(50, 100)} 3 {rng.randint(50, 9000)} 25 25 25 25 1.95 {unit} {array}"
+            )
+        objs.extend(parse_trf_block(f"Sequence: {head}", lines))
+    for trf_id, obj in enumerate(objs, 1):
+        obj.project = "test"
+        obj.trf_id = trf_id
+        obj.trf_family = rng.choice(["ALPHA", "(AT)n", None])
+    # As read back from a .sat
+    return [TRModel.from_row(str(obj).rstrip("\n").split("\t")) for obj in objs]
+
+
+@pytest.fixture
+def sat_file(tmp_path):
+    path = tmp_path / "test.sat"
+    objs = random_objects()
+    with open(path, "w") as fw:
+        fw.write("\t".join(TRModel.dumpable_attributes) + "\n")
+        fw.writelines(str(obj) for obj in objs)
+    return str(path)
+
+
+def sat_objects(sat_file):
+    with open(sat_file) as fh:
+        next(fh)
+        return [TRModel.from_row(line.rstrip("\n").split("\t")) for line in fh]
+
+
+class TestTRTable:
+    """A table holds the same records as a list of TRModel objects."""
+
+    def test_rows_match_models(self, sat_file):
+        table = TRTable.from_sat(sat_file)
+        objs = sat_objects(sat_file)
+        assert len(table) == len(objs)
+        assert [str(row) for row in table] == [str(obj) for obj in objs]
+        assert table.row(5).get_gff3_string() == objs[5].get_gff3_string()
+        assert table.row(-1).trf_array == objs[-1].trf_array
+        assert table.row(3).trf_family == objs[3].trf_family
+
+    def test_columns(self, sat_file):
+        table = TRTable.from_sat(sat_file)
+        objs = sat_objects(sat_file)
+        assert table["trf_l_ind"].dtype == np.int64
+        assert table["trf_l_ind"].tolist() == [obj.trf_l_ind for obj in objs]
+        assert table["trf_pmatch"].tolist() == [obj.trf_pmatch for obj in objs]
+        assert table["trf_head"].tolist() == [obj.trf_head for obj in objs]
+        assert table["trf_consensus"].tolist() == [obj.trf_consensus for obj in objs]
+        assert table.categories("trf_head") == ["chr1", "chr2", "chrX"]
+
+    def test_filter(self, sat_file):
+        table = TRTable.from_sat(sat_file)
+        objs = sat_objects(sat_file)
+        mask = (table["trf_array_length"] > 1000) & table.isin("trf_family", ["ALPHA", None])
+        large = table.filter(mask)
+        expected = [
+            obj for obj in objs if obj.trf_array_length > 1000 and obj.trf_family in ("ALPHA", None)
+        ]
+        assert 0 < len(large) < len(table)
+        assert [str(row) for row in large] == [str(obj) for obj in expected]
+
+    def test_groupby(self, sat_file):
+        table = TRTable.from_sat(sat_file)
+        objs = sat_objects(sat_file)
+        groups = dict(table.groupby("trf_family"))
+        assert set(groups) == {"ALPHA", "(AT)n", None}
+        for family, group in groups.items():
+            assert [str(row) for row in group] == [str(obj) for obj in objs if obj.trf_family == family]
+        by_chrom = [(chrom, len(group)) for chrom, group in table.groupby("trf_head")]
+        assert by_chrom == [("chr1", 100), ("chr2", 100), ("chrX", 100)]
+
+    def test_objects_round_trip(self):
+        objs = random_objects(n_lines=30)
+        table = TRTable.from_objects(objs)
+        assert [str(obj) for obj in table.to_objects()] == [str(obj) for obj in objs]
+
+    def test_view_is_read_only(self, sat_file):
+        row = TRTable.from_sat(sat_file).row(0)
+        with pytest.raises(AttributeError):
+            row.trf_l_ind = 1
+        assert not hasattr(row, "trf_unknown")
+
+    def test_legacy_rows(self, tmp_path):
+        obj = random_objects(n_lines=3)[0]
+        legacy = {attr: getattr(obj, attr) for attr in TRModel.dumpable_attributes}
+        path = tmp_path / "legacy.sat"
+        path.write_text("\t".join(str(legacy.get(attr)) for attr in TRModel.legacy_dumpable_attributes) + "\n")
+        assert str(TRTable.from_sat(str(path)).row(0)) == str(obj)
+
+    def test_bad_row(self, tmp_path):
+        path = tmp_path / "bad.sat"
+        path.write_text("a\tb\tc\n")
+        with pytest.raises(FileFormatError):
+            TRTable.from_sat(str(path))
+
+
+def same_tables(table, expected):
+    assert len(table) == len(expected)
+    for name in tr_table.FIELDS:
+        assert table[name].tolist() == expected[name].tolist()
+    assert table.categories("trf_head") == expected.categories("trf_head")
+
+
+class TestParallelLoad:
+    """Byte-range loading gives the same table as a sequential load."""
+
+    def test_same_as_sequential(self, sat_file, monkeypatch):
+        expected = TRTable.from_sat(sat_file)
+        monkeypatch.setattr(tr_table, "SAT_PARALLEL_MIN_BYTES", 0)
+        same_tables(TRTable.from_sat(sat_file, threads=3), expected)
+
+    def test_concat(self, sat_file):
+        table = TRTable.from_sat(sat_file)
+        parts = [table.take(np.arange(start, min(start + 70, len(table)))) for start in range(0, len(table), 70)]
+        same_tables(TRTable.concat(parts), table)
+        assert len(TRTable.concat([])) == 0
+
+
+@pytest.mark.slow
+class TestParallelLoadBenchmark:
+    """Load time of a large .sat with one and with several workers."""
+
+    def test_scaling(self, tmp_path):
+        workers = min(8, os.cpu_count() or 1)
+        if workers < 2:
+            pytest.skip("needs more than one CPU")
+        path = tmp_path / "big.sat"
+        with open(path, "w") as fw:
+            for seed in range(20):
+                fw.writelines(str(obj) for obj in random_objects(seed=seed, n_lines=3000))
+
+        started = time.perf_counter()
+        expected = TRTable.from_sat(str(path))
+        sequential_elapsed = time.perf_counter() - started
+        started = time.perf_counter()
+        table = TRTable.from_sat(str(path), threads=workers)
+        parallel_elapsed = time.perf_counter() - started
+
+        same_tables(table, expected)
+        print(f"{len(table):,} records: 1 worker {sequential_elapsed:.2f}s, {workers} workers {parallel_elapsed:.2f}s")
+        assert parallel_elapsed < sequential_elapsed
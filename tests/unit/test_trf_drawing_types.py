@@ -14,6 +14,8 @@ assert the concrete types and values, not merely "it ran".
 
 import logging
 
+import pytest
+
 from satellome.core_functions.trf_drawing import read_trf_file, _to_int
 
 
@@ -97,3 +99,41 @@ def test_to_int_coerces_and_surfaces_malformed(caplog):
     with caplog.at_level(logging.WARNING):
         assert _to_int("not-a-number") == 0
     assert any("not-a-number" in rec.message for rec in caplog.records)
+
+
+def test_parallel_read_matches_sequential(tmp_path, monkeypatch):
+    import satellome.core_functions.trf_drawing as trf_drawing
+
+    rows = [_row(trf_id=str(i), trf_head=f"chr{i % 3} x", trf_l_ind=str(i * 10)) for i in range(200)]
+    for has_header in (True, False):
+        path = tmp_path / f"test{has_header}.sat"
+        path.write_text(("#comment\n" + HEADER + "\n" if has_header else "") + "\n".join(rows) + "\n")
+        sequential = read_trf_file(str(path))
+        monkeypatch.setattr(trf_drawing, "SAT_PARALLEL_MIN_BYTES", 0)
+        assert read_trf_file(str(path), threads=3) == sequential
+        monkeypatch.undo()
+        assert [record["start"] for record in sequential] == [i * 10 for i in range(200)]
+
+
+@pytest.mark.parametrize("sample_size", [1999, 50])
+def test_clustering_selection_matches_dict_filter(tmp_path, monkeypatch, sample_size):
+    import random
+
+    import satellome.core_functions.trf_drawing as trf_drawing
+
+    rng = random.Random(sample_size)
+    rows = [
+        _row(trf_id=str(i), trf_head=f"chr{i % 3} x", trf_l_ind=str(i * 10),
+             trf_period=str(rng.randint(1, 12)), trf_array_length=str(rng.choice([500, 1000, 5000])))
+        for i in range(300)
+    ]
+    path = tmp_path / "test.sat"
+    path.write_text("#comment\n" + HEADER + "\n" + "\n".join(rows) + "\n")
+    monkeypatch.setattr(trf_drawing, "SAMPLE_SIZE_FOR_CLUSTERING", sample_size)
+
+    # The selection draw_all() used to make on read_trf_file() dicts
+    expected = [record for record in read_trf_file(str(path)) if float(record.get("period", 0)) > 5]
+    if len(expected) > sample_size:
+        expected = sorted(expected, key=lambda x: float(x.get("length", 0)), reverse=True)[:2000]
+    assert 0 < len(expected) < 300
+    assert trf_drawing.load_clustering_trs(str(path)) == expected
@@ -1,8 +1,15 @@
 """Unit tests for satellome.core_functions.models.trf_model module."""
 
+import random
+import time
+import tracemalloc
+
 import pytest
 from satellome.core_functions.models.trf_model import (
     clear_sequence,
+    CompactTRModel,
+    NetworkSliceModel,
+    parse_trf_block,
     TRModel,
     TRsClassificationModel,
 )
@@ -403,3 +410,182 @@ class TestTRsClassificationModel:
 
         result = model.network_head
         assert isinstance(result, str)
+
+
+def random_trf_lines(rng, n_lines, max_length=2000):
+    lines = []
+    for _ in range(n_lines):
+        period = rng.randint(1, 50)
+        unit = "".join(rng.choice("ACGT") for _ in range(period))
+        array = (unit * (max_length // period + 1))[: rng.randint(period, max_length)]
+        l_ind = rng.randint(1, 10**6)
+        pmatch = rng.randint(50, 100)
+        lines.append(
+            f"{l_ind} {l_ind + len(array) - 1} {period} {len(array) / period:.1f} {period} {pmatch} "
+            f"{rng.randint(0, 9)} {rng.randint(50, 9000)} 25 25 25 25 1.95 {unit} {array}"
+        )
+    return lines
+
+
+def same_objects(head, lines):
+    expected = []
+    for line in lines:
+        obj = TRModel()
+        obj.set_raw_trf(head, None, line)
+        expected.append(obj)
+    return [obj.__dict__ for obj in parse_trf_block(head, lines)] == [obj.__dict__ for obj in expected]
+
+
+class TestParseTrfBlock:
+    """parse_trf_block() gives the same objects as set_raw_trf()."""
+
+    def test_random_lines(self):
+        rng = random.Random(5)
+        assert same_objects("Sequence: chr1 test", random_trf_lines(rng, 200))
+
+    def test_irregular_lines(self):
+        lines = [
+            "10 20 2 5.0 2 95 5 100 0 50 0 50 1.5 at atatatatatat",
+            "10 20 2 5.0 2 95 5 100 0 50 0 50 1.5 AT ATAT-NNXAT",
+            "10 20 2 5.0 2 95 5 100 0 50 0 50 1.5 AT AT\tAT",
+            "10 20 2 5.0 2 95 5 100  0 50 0 50 1.5 AT ATAT",
+            "x 20 2 5.0 2 95 5 100 0 50 0 50 1.5 AT ATAT",
+            "10 20 2 5.0 2 95 5 100 0 50 0 50 1.5 AT",
+        ]
+        assert same_objects("Sequence: chr2", lines)
+
+    def test_unique_skips_identical_lines(self):
+        line = "10 20 2 5.0 2 95 5 100 0 50 0 50 1.5 AT ATATATATATA"
+        other = "10 20 2 5.0 2 90 5 100 0 50 0 50 1.5 AT ATATATATATA"
+        assert len(parse_trf_block("Sequence: chr1", [line, line, other])) == 3
+        assert len(parse_trf_block("Sequence: chr1", [line, line, other], unique=True)) == 2
+
+
+@pytest.mark.slow
+class TestParseTrfBlockBenchmark:
+    """Parse throughput of the bulk parser against set_raw_trf()."""
+
+    def test_throughput(self):
+        lines = random_trf_lines(random.Random(1), 5000, max_length=20000)
+        megabytes = sum(len(line) for line in lines) / 1e6
+
+        started = time.perf_counter()
+        for line in lines:
+            TRModel().set_raw_trf("Sequence: chr1", None, line)
+        line_elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        obj_set = parse_trf_block("Sequence: chr1", lines)
+        block_elapsed = time.perf_counter() - started
+
+        assert len(obj_set) == len(lines)
+        print(
+            f"set_raw_trf: {len(lines) / line_elapsed:,.0f} records/s, {megabytes / line_elapsed:,.1f} MB/s; "
+            f"parse_trf_block: {len(lines) / block_elapsed:,.0f} records/s, {megabytes / block_elapsed:,.1f} MB/s"
+        )
+        assert block_elapsed < line_elapsed / 2
+
+
+def sat_rows(n_lines=200, seed=9):
+    rows = []
+    for obj in parse_trf_block("Sequence: chr1 test", random_trf_lines(random.Random(seed), n_lines, 300)):
+        obj.project = "test"
+        obj.trf_id = len(rows) + 1
+        obj.trf_family = "ALPHA" if len(rows) % 3 else None
+        rows.append(str(obj).rstrip("\n").split("\t"))
+    return rows
+
+
+def object_fields(obj):
+    return [getattr(obj, attr) for attr in obj.dumpable_attributes]
+
+
+class TestFromRow:
+    """from_row() gives the same objects as set_with_list()."""
+
+    def test_same_as_set_with_list(self):
+        for row in sat_rows():
+            expected = TRModel()
+            expected.set_with_list(row)
+            assert TRModel.from_row(row).__dict__ == expected.__dict__
+            assert object_fields(CompactTRModel.from_row(row)) == object_fields(expected)
+
+    def test_legacy_row_falls_back(self):
+        row = sat_rows(1)[0]
+        legacy = dict(zip(TRModel.dumpable_attributes, row))
+        legacy_row = [legacy.get(attr, "None") for attr in TRModel.legacy_dumpable_attributes]
+        obj = CompactTRModel.from_row(legacy_row)
+        assert object_fields(obj) == object_fields(TRModel.from_row(row))
+
+    def test_wrong_length_raises(self):
+        with pytest.raises(ValueError):
+            CompactTRModel.from_row(["1", "2"])
+
+    def test_network_slice_gid(self):
+        row = ["7"] + sat_rows(1)[0]
+        obj = NetworkSliceModel.from_row(row)
+        assert obj.gid == 7
+        assert object_fields(obj)[1:] == object_fields(TRModel.from_row(row[1:]))
+
+
+class TestCompactTRModel:
+    """CompactTRModel keeps the TRModel API without an instance __dict__."""
+
+    def test_no_instance_dict(self):
+        obj = CompactTRModel()
+        assert not hasattr(obj, "__dict__")
+        with pytest.raises(AttributeError):
+            obj.unknown_field = 1
+
+    def test_same_output(self):
+        for row in sat_rows(50):
+            compact, regular = CompactTRModel.from_row(row), TRModel.from_row(row)
+            assert str(compact) == str(regular)
+            assert compact.get_gff3_string() == regular.get_gff3_string()
+            assert compact.get_fasta_repr() == regular.get_fasta_repr()
+            assert compact.trf_chr == regular.trf_chr
+
+    def test_raw_trf_and_overlap(self):
+        lines = [
+            "10 20 2 5.0 2 95 5 100 0 50 0 50 1.5 AT ATATATATATA",
+            "15 40 2 13.0 2 90 5 90 0 50 0 50 1.5 AT ATATATATATATATATATATATATAT",
+        ]
+        compact = [CompactTRModel(), CompactTRModel()]
+        regular = [TRModel(), TRModel()]
+        for objs in (compact, regular):
+            for obj, line in zip(objs, lines):
+                obj.set_raw_trf("Sequence: chr1", None, line)
+            objs[0].set_form_overlap(objs[1])
+        assert str(compact[0]) == str(regular[0])
+
+
+@pytest.mark.slow
+class TestFromRowBenchmark:
+    """Records/s and bytes/record of .sat row loading."""
+
+    def test_throughput_and_memory(self):
+        rows = sat_rows(20000, seed=3)
+
+        def set_with_list(row):
+            obj = TRModel()
+            obj.set_with_list(row)
+            return obj
+
+        results = {}
+        for name, make in [
+            ("TRModel.set_with_list", set_with_list),
+            ("TRModel.from_row", TRModel.from_row),
+            ("CompactTRModel.from_row", CompactTRModel.from_row),
+        ]:
+            started = time.perf_counter()
+            for row in rows:
+                make(row)
+            elapsed = time.perf_counter() - started
+            tracemalloc.start()
+            objs = [make(row) for row in rows]
+            used = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            results[name] = (len(rows) / elapsed, used / len(objs))
+            print(f"{name}: {results[name][0]:,.0f} records/s, {results[name][1]:,.0f} bytes/record")
+        assert results["CompactTRModel.from_row"][0] > results["TRModel.set_with_list"][0]
+        assert results["CompactTRModel.from_row"][1] < results["TRModel.set_with_list"][1]
@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Unit tests for overlap resolution of TRF calls (core_functions/io/trf_file.py)
+
+import random
+import time
+
+import numpy as np
+import pytest
+
+from satellome.core_functions.io.trf_file import TRFFileIO, join_overlapped
+from satellome.core_functions.models.trf_model import TRModel
+from satellome.core_functions.trf_embedings import KmerProfiles, count_kmers
+
+def nested_loop_filter(obj_set):
+    """The original quadratic _filter_obj_set, kept as the reference."""
+    n = len(obj_set)
+    obj_set.sort(key=lambda x: (x.trf_l_ind, x.trf_r_ind))
+    for a in range(0, n):
+        obj1 = obj_set[a]
+        if not obj1:
+            continue
+        for b in range(a + 1, n):
+            obj2 = obj_set[b]
+            if not obj2:
+                continue
+            if obj1.trf_l_ind == obj2.trf_l_ind and obj1.trf_r_ind == obj2.trf_r_ind:
+                if obj1.trf_pmatch >= obj2.trf_pmatch:
+                    obj_set[b] = None
+                else:
+                    obj_set[a] = None
+                continue
+            if obj1.trf_l_ind <= obj2.trf_l_ind and obj1.trf_r_ind >= obj2.trf_r_ind:
+                obj_set[b] = None
+                continue
+            if obj2.trf_l_ind <= obj1.trf_l_ind and obj2.trf_r_ind >= obj1.trf_r_ind:
+                obj_set[a] = None
+                continue
+            if obj1.trf_r_ind > obj2.trf_l_ind and obj1.trf_r_ind < obj2.trf_r_ind:
+                if join_overlapped(obj1, obj2, cutoff_distance=0.1):
+                    obj_set[b] = None
+                continue
+            if obj1.trf_r_ind < obj2.trf_l_ind:
+                break
+            if obj2.trf_r_ind < obj1.trf_l_ind:
+                break
+    return [a for a in obj_set if a is not None]
+
+
+def mutate(rng, seq, rate):
+    return "".join(rng.choice("ACGT") if rng.random() < rate else c for c in seq)
+
+
+def centromeric_region(rng, length):
+    """Alpha-satellite-like HORs interrupted by microsatellites and spacers."""
+    monomer = "".join(rng.choice("ACGT") for _ in range(171))
+    parts, size = [], 0
+    while size < length:
+        kind = rng.random()
+        if kind < 0.6:
+            hor = "".join(mutate(rng, monomer, 0.1) for _ in range(rng.randint(2, 12)))
+            part = mutate(rng, hor * rng.randint(2, 20), 0.02)
+        elif kind < 0.8:
+            unit = "".join(rng.choice("ACGT") for _ in range(rng.randint(1, 12)))
+            part = mutate(rng, unit * rng.randint(5, 200), 0.03)
+        else:
+            part = "".join(rng.choice("ACGT") for _ in range(rng.randint(50, 2000)))
+        parts.append(part)
+        size += len(part)
+    return "".join(parts)[:length]
+
+
+def trf_line(rng, seq, l_ind, r_ind, period, pmatch=None):
+    array = seq[l_ind - 1 : r_ind]
+    consensus = array[:period]
+    if pmatch is None:
+        pmatch = rng.randint(60, 100)
+    counts = [array.count(n) * 100 // len(array) for n in "ACGT"]
+    return (
+        f"{l_ind} {r_ind} {period} {len(array) / period:.1f} {period} {pmatch} "
+        f"{rng.randint(0, 10)} {rng.randint(50, 20000)} {' '.join(map(str, counts))} "
+        f"1.95 {consensus} {array}\n"
+    )
+
+
+def centromeric_calls(rng, seq, n_calls):
+    """TRF-like calls: nested periods, duplicates, shifted and chained overlaps."""
+    lines = []
+    length = len(seq)
+    while len(lines) < n_calls:
+        kind = rng.random()
+        period = rng.choice([2, 6, 171, 342, 1026, 2052])
+        span = min(rng.randint(2, 40) * period, length // 6)
+        l_ind = rng.randint(1, max(1, length - span))
+        r_ind = min(length, l_ind + span - 1)
+        lines.append(trf_line(rng, seq, l_ind, r_ind, period))
+        if kind < 0.1:
+            # Same interval with another period and score
+            lines.append(trf_line(rng, seq, l_ind, r_ind, rng.choice([171, 342]), rng.randint(60, 100)))
+        elif kind < 0.3:
+            # Array called again from a shifted phase
+            shift = rng.randint(1, max(1, (r_ind - l_ind) // 2))
+            r2 = min(length, r_ind + shift)
+            lines.append(trf_line(rng, seq, l_ind + shift, r2, period))
+        elif kind < 0.45:
+            # Nested call of a shorter period
+            l2 = rng.randint(l_ind, r_ind)
+            r2 = rng.randint(l2, r_ind)
+            lines.append(trf_line(rng, seq, l2, r2, rng.choice([2, 6, 171])))
+        elif kind < 0.55:
+            # Same start, longer array
+            r2 = min(length, r_ind + rng.randint(1, 500))
+            lines.append(trf_line(rng, seq, l_ind, r2, period))
+    return lines[:n_calls]
+
+
+def write_centromeric_dat(path, seed, n_blocks, length, n_calls):
+    rng = random.Random(seed)
+    with open(path, "w") as fw:
+        fw.write("Tandem Repeats Finder Program written by:\n\nGary Benson\n\n")
+        for block in range(n_blocks):
+            seq = centromeric_region(rng, length)
+            fw.write(f"Sequence: cen{block} synthetic centromere\n\n\n\n")
+            fw.write("Parameters: 2 5 7 80 10 50 2000\n\n\n")
+            fw.writelines(centromeric_calls(rng, seq, n_calls))
+
+
+def raw_blocks(path):
+    return [objs for _, objs in TRFFileIO().iter_raw(path)]
+
+
+def assert_same_filter(path):
+    reference = [nested_loop_filter(objs) for objs in raw_blocks(path)]
+    reader = TRFFileIO()
+    swept = [reader._filter_obj_set(objs) for objs in raw_blocks(path)]
+    assert [[str(obj) for obj in objs] for objs in swept] == [
+        [str(obj) for obj in objs] for objs in reference
+    ]
+    return reference
+
+
+class TestKmerProfiles:
+    """Cached and incrementally merged profiles equal freshly built vectors."""
+
+    def test_count_kmers_matches_create_vector(self):
+        rng = random.Random(1)
+        for seq in ["ACGTN" * 7, "AC", "acgtacgtnnacgt", "".join(rng.choice("ACGTN") for _ in range(500))]:
+            obj = TRModel()
+            obj.trf_array = seq
+            with np.errstate(divide="ignore", invalid="ignore"):
+                assert np.array_equal(KmerProfiles().get_vector(obj), obj.get_vector(), equal_nan=True)
+        assert count_kmers("ACGTR") is None
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_merge_updates_profile(self, seed):
+        rng = random.Random(seed)
+        seq = "".join(rng.choice("ACGT") for _ in range(3000))
+        l1, r1 = rng.randint(1, 1000), rng.randint(1001, 2000)
+        l2, r2 = rng.randint(l1 + 1, r1 - 1), rng.randint(r1 + 1, 3000)
+        obj1, obj2 = TRModel(), TRModel()
+        obj1.set_raw_trf("Sequence: chr1", None, trf_line(rng, seq, l1, r1, 10))
+        obj2.set_raw_trf("Sequence: chr1", None, trf_line(rng, seq, l2, r2, 10))
+        profiles = KmerProfiles()
+        profiles.get_vector(obj1)
+        profiles.get_vector(obj2)
+        left_length = len(obj1.trf_array)
+        obj1.set_form_overlap(obj2)
+        profiles.merge(obj1, obj2, left_length)
+        assert np.array_equal(profiles.get_vector(obj1), obj1.get_vector())
+
+
+class TestFilterObjSet:
+    """The sweep keeps and merges exactly what the nested loop did."""
+
+    @pytest.mark.parametrize("seed", [2026, 7])
+    def test_synthetic_centromeres(self, tmp_path, seed):
+        # No real TRF output ships with the tests; the synthetic calls mimic
+        # TRF's nested periods, duplicates, phase shifts and chained overlaps
+        path = tmp_path / "cen.dat"
+        write_centromeric_dat(path, seed, n_blocks=2, length=12000, n_calls=60)
+        reference = assert_same_filter(str(path))
+        objs = [obj for block in reference for obj in block]
+        assert any(obj.trf_joined for obj in objs)
+        assert sum(len(block) for block in raw_blocks(str(path))) > len(objs)
+
+    def test_identical_lines_skipped(self, tmp_path):
+        # iter_parse skips repeated data lines before filtering; the filter
+        # would have dropped them without affecting any other call
+        path = tmp_path / "cen.dat"
+        write_centromeric_dat(path, 3, n_blocks=2, length=12000, n_calls=80)
+        rng = random.Random(3)
+        lines = []
+        for line in path.read_text().split("\n"):
+            lines.append(line)
+            if line[:1].isdigit() and rng.random() < 0.3:
+                lines.append(line)
+        path.write_text("\n".join(lines))
+        reader = TRFFileIO()
+        expected, trf_id = [], 1
+        for _, objs in reader.iter_raw(str(path)):
+            objs, trf_id = reader.refine_obj_set(objs, trf_id=trf_id)
+            expected.append([str(obj) for obj in objs])
+        assert [[str(obj) for obj in objs] for objs in reader.iter_parse(str(path))] == expected
+
+    def test_edge_cases(self):
+        seq = "ACGTTGCA" * 200
+        rng = random.Random(0)
+        lines = [
+            trf_line(rng, seq, 10, 100, 8, 90),
+            trf_line(rng, seq, 10, 100, 8, 95),  # duplicate, higher pmatch
+            trf_line(rng, seq, 10, 300, 8),  # same start, longer
+            trf_line(rng, seq, 100, 150, 8),  # touches the first call
+            trf_line(rng, seq, 280, 600, 8),  # partial overlap, joined
+            trf_line(rng, seq, 300, 301, 2),  # nested
+            trf_line(rng, seq, 590, 900, 8),  # chained onto the merged call
+        ]
+        make = lambda: [TRModel() for _ in lines]
+        reference, swept = make(), make()
+        for objs in (reference, swept):
+            for obj, line in zip(objs, lines):
+                obj.set_raw_trf("Sequence: chr1", None, line)
+        reference = nested_loop_filter(reference)
+        swept = TRFFileIO()._filter_obj_set(swept)
+        assert [str(obj) for obj in swept] == [str(obj) for obj in reference]
+        assert [(obj.trf_l_ind, obj.trf_r_ind) for obj in swept] == [(10, 900)]
+
+
+@pytest.mark.slow
+class TestFilterObjSetBenchmark:
+    """A centromeric region with 100k overlapping calls."""
+
+    def test_100k_calls(self, tmp_path):
+        path = tmp_path / "cen.dat"
+        write_centromeric_dat(path, 7, n_blocks=1, length=3_000_000, n_calls=100_000)
+        (objs,) = raw_blocks(str(path))
+        assert len(objs) == 100_000
+
+        started = time.perf_counter()
+        kept = TRFFileIO()._filter_obj_set(objs)
+        elapsed = time.perf_counter() - started
+        assert 0 < len(kept) < 100_000
+        # The nested loop needs tens of minutes on this region
+        assert elapsed < 120
@@ -3,13 +3,27 @@
 Focus on CRITICAL coordinate restoration logic and filter functions.
 """
 
+import os
+import subprocess
+import sys
+
 import pytest
 from satellome.core_functions.tools.trf_tools import (
+    merge_sorted_sat_files,
     restore_coordinates_in_line,
+    sat_sort_key,
+    sort_sat_file,
+    _init_dat_parser,
+    _parse_dat_file,
     _filter_by_bottom_array_length,
     _filter_by_bottom_unit_length,
 )
 
+PARSER = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "src", "satellome", "steps", "trf_parse_raw.py",
+)
+
 
 class MockTRFObject:
     """Mock TRF object for testing filter functions."""
@@ -153,6 +167,16 @@ class TestRestoreCoordinatesInLine:
         expected = "some_long_scaffold_name\t1100\t1200\t2\t50.0\t95\t0\t0\t0\tAT\tATAT\n"
         assert result == expected
 
+    def test_restore_sat_row(self):
+        """Test parsed .sat rows: header in column 2, trf_id rebuilt."""
+        tail = "\t2\t25.0\t100\t0\t1.0\tAT\tATAT\t0.0\t0.0\t50\tNone\tNone\tNone\n"
+        line = "test\tchr1_100_149\tchr1 desc__5000_9000\t100\t149" + tail
+        result = restore_coordinates_in_line(line)
+        assert result == "test\tchr1_5100_5149\tchr1 desc\t5100\t5149" + tail
+
+        line = "test\tchr1_100_149\tchr1 desc\t100\t149" + tail
+        assert restore_coordinates_in_line(line) == line
+
     def test_tab_preservation(self):
         """Test that tabs are correctly preserved in output."""
         line = "chr1__1000_2000\t100\t200\t2\t50.0\t95\t0\t0\t0\tAT\tATAT\n"
@@ -370,3 +394,85 @@ class TestCoordinateRestorationEdgeCases:
         parts = result.split('\t')
         assert int(parts[1]) == 80932 + 127750000  # 208682932
         assert int(parts[2]) == 91887 + 127750000  # 208693887
+
+
+def write_dat(path, name, n_repeats, description="description"):
+    """Write a small TRF .dat file with n_repeats perfect arrays."""
+    units = ["AC", "TTAGGG", "GATTACA", "CCA"]
+    with open(path, "w") as fw:
+        fw.write("Tandem Repeats Finder Program\n\n")
+        fw.write(f"Sequence: {name} {description}\n\n\n\nParameters: 2 5 7 80 10 50 2000\n\n\n")
+        for i in range(n_repeats):
+            unit = units[i % len(units)]
+            array = unit * 40
+            start = 1 + i * 1000
+            end = start + len(array) - 1
+            fw.write(
+                f"{start} {end} {len(unit)} 40.0 {len(unit)} 100 0 {2 * len(array)} "
+                f"25 25 25 25 1.50 {unit} {array}\n"
+            )
+
+
+class TestParseDatFiles:
+    """The in-process parser writes the same .sat as trf_parse_raw.py."""
+
+    @pytest.mark.parametrize("warm", [False, True])
+    def test_matches_subprocess(self, tmp_path, warm):
+        if warm:
+            _init_dat_parser()
+        for i in range(5):
+            dat_file = str(tmp_path / f"{i}.fa.dat")
+            write_dat(dat_file, f"chr{i}", i + 1)
+            assert _parse_dat_file(dat_file, "test")[:2] == (dat_file, True)
+
+            expected = f"{dat_file}.expected.sat"
+            subprocess.run(
+                [sys.executable, PARSER, "-i", dat_file, "-o", expected, "-p", "test"], check=True
+            )
+            with open(f"{dat_file}.sat") as fh, open(expected) as fh_expected:
+                assert fh.read() == fh_expected.read()
+
+    def test_missing_file_reported(self, tmp_path):
+        result = _parse_dat_file(str(tmp_path / "missing.dat"), "test")
+        assert result[1] is False
+        assert "Error" in result[2]
+
+
+def sat_row(head, start, end):
+    return f"test\t{head}_{start}_{end}\t{head}\t{start}\t{end}\t2\t25.0\t100\t0\t1.0\tAT\tATAT\t0.0\t0.0\t50\tNone\tNone\tNone\n"
+
+
+class TestMergeSortedSatFiles:
+    """Sorted per-chunk .sat files merge into one sorted file."""
+
+    @pytest.mark.parametrize("fan_in", [2, 3, 256])
+    def test_merge(self, tmp_path, fan_in):
+        rows = [sat_row(f"chr{i % 3}", 1 + 100 * i, 50 + 100 * i) for i in range(40)]
+        sat_files = []
+        for k in range(7):
+            path = tmp_path / f"{k}.sat"
+            path.write_text("".join(sorted(rows[k::7], key=sat_sort_key)))
+            sat_files.append(str(path))
+
+        out = tmp_path / "merged.sat"
+        with open(out, "w") as fw:
+            assert merge_sorted_sat_files(sat_files, fw, fan_in=fan_in) == len(rows)
+        assert out.read_text() == "".join(sorted(rows, key=sat_sort_key))
+
+    def test_parsed_files_are_sorted(self, tmp_path):
+        path = tmp_path / "0.fa.dat"
+        write_dat(path, "chr1", 3, description="description__1000_5000")
+        _parse_dat_file(str(path), "test", restore=True)
+        with open(f"{path}.sat") as fh:
+            lines = fh.readlines()
+        assert lines == sorted(lines, key=sat_sort_key)
+        assert [line.split("\t")[1:5] for line in lines][0] == ["chr1_1001_1080", "chr1 description", "1001", "1080"]
+
+    @pytest.mark.parametrize("run_lines", [1, 3, 1000])
+    def test_sort_in_runs(self, tmp_path, run_lines):
+        rows = [sat_row(f"chr{i % 3}", 1 + 100 * (i * 7 % 40), 50 + 100 * (i * 7 % 40)) for i in range(40)]
+        path = tmp_path / "windows.sat"
+        path.write_text("".join(rows) + "\n")
+        assert sort_sat_file(str(path), run_lines=run_lines) == len(rows)
+        assert path.read_text() == "".join(sorted(rows, key=sat_sort_key))
+        assert os.listdir(tmp_path) == ["windows.sat"]
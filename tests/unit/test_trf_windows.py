@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Unit tests for windowed TRF runs (core_functions/tools/trf_tools.py)
+
+import os
+import random
+import stat
+import sys
+
+import pytest
+
+from satellome.core_functions.exceptions import ConfigurationError
+from satellome.core_functions.tools.result_cache import ResultCache
+from satellome.core_functions.tools.trf_tools import (
+    iter_trf_windows,
+    parse_window_head,
+    sat_sort_key,
+    trf_search_by_splitting,
+)
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+PARSER = os.path.join(SRC_DIR, "src", "satellome", "steps", "trf_parse_raw.py")
+
+# Stand-in for the trf binary: reports maximal perfect tandem runs (period
+# 1-10, >= 50 bp) in .dat format. Calls depend only on the local sequence,
+# like TRF, so a window sees the same arrays clipped to its edges.
+FAKE_TRF = '''#!{python}
+import sys
+
+fa_file = sys.argv[1]
+params = sys.argv[2:9]
+records = []
+with open(fa_file) as fh:
+    for line in fh:
+        line = line.strip()
+        if line.startswith(">"):
+            records.append([line[1:], []])
+        elif line:
+            records[-1][1].append(line)
+
+with open(fa_file + "." + ".".join(params) + ".dat", "w") as fw:
+    fw.write("Tandem Repeats Finder Program\\n\\n")
+    for head, parts in records:
+        seq = "".join(parts)
+        fw.write("Sequence: %s\\n\\n\\n\\nParameters: %s\\n\\n\\n" % (head, " ".join(params)))
+        calls = []
+        for p in range(1, 11):
+            i = 0
+            while i < len(seq) - p:
+                if seq[i] != seq[i + p]:
+                    i += 1
+                    continue
+                j = i
+                while j + p < len(seq) and seq[j] == seq[j + p]:
+                    j += 1
+                start, end = i, j + p
+                if end - start >= 50 and not any(s <= start and end <= e for s, e, _ in calls):
+                    calls.append((start, end, p))
+                i = j + 1
+        for start, end, p in sorted(calls):
+            length = end - start
+            fw.write("%d %d %d %.1f %d 100 0 %d 25 25 25 25 1.50 %s %s\\n" % (
+                start + 1, end, p, length / p, p, 2 * length, seq[start:start + p], seq[start:end]))
+'''
+
+
+def tandem(unit, start, end):
+    return (unit * ((end - start) // len(unit) + 1))[:end - start]
+
+
+@pytest.fixture
+def genome(tmp_path):
+    rng = random.Random(11)
+    seq = [rng.choice("ACGT") for _ in range(70000)]
+    arrays = [
+        (8000, 16500, "ACCTGAT"),   # longer than the overlap, cut by one window edge
+        (19500, 20800, "GTTCA"),    # ends inside an overlap
+        (21000, 21600, "TGA"),      # inside an overlap, seen whole by two windows
+        (23500, 25000, "CATG"),     # starts inside an overlap
+        (38000, 55000, "GATTCA"),   # spans three windows
+    ]
+    for start, end, unit in arrays:
+        seq[start:end] = tandem(unit, start, end)
+    small = [rng.choice("ACGT") for _ in range(5000)]
+    small[1000:1400] = tandem("AAGGT", 1000, 1400)
+    path = tmp_path / "genome.fa"
+    with open(path, "w") as fh:
+        fh.write(">chr1 long\n" + "".join(seq) + "\n>chr2\n" + "".join(small) + "\n")
+    return str(path)
+
+
+@pytest.fixture
+def fake_trf(tmp_path):
+    path = tmp_path / "trf"
+    path.write_text(FAKE_TRF.format(python=sys.executable))
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
+
+
+def read_sat(path):
+    with open(path) as fh:
+        return sorted(line for line in fh if not line.startswith("#"))
+
+
+class TestTrfWindows:
+    """Test window layout and header parsing."""
+
+    def test_windows_cover_sequence(self):
+        windows = list(iter_trf_windows(70000, 10000, 4000))
+        assert windows[0] == (0, 14000)
+        assert windows[-1] == (60000, 70000)
+        assert all(b[0] < a[1] for a, b in zip(windows, windows[1:]))
+        assert list(iter_trf_windows(5000, 10000, 4000)) == [(0, 5000)]
+
+    def test_parse_window_head(self):
+        assert parse_window_head("chr1 some text__100_200") == ("chr1 some text", 100, 200)
+        assert parse_window_head("scaffold_1") is None
+        assert parse_window_head("chr__x_y") is None
+
+    def test_overlap_checked_against_max_period(self, genome, tmp_path):
+        with pytest.raises(ConfigurationError):
+            trf_search_by_splitting(genome, wdir=str(tmp_path), window_size=10000, window_overlap=100)
+
+
+class TestWindowedTrfSearch:
+    """Windowed runs give the same .sat as whole-sequence runs."""
+
+    def test_same_as_whole_sequence(self, genome, fake_trf, tmp_path):
+        whole_dir = tmp_path / "whole"
+        windowed_dir = tmp_path / "windowed"
+        whole_dir.mkdir()
+        windowed_dir.mkdir()
+        common = dict(threads=2, project="test", trf_path=fake_trf, parser_program=PARSER, genome_size=75000)
+
+        whole = trf_search_by_splitting(genome, wdir=str(whole_dir), window_size=0, **common)
+        windowed = trf_search_by_splitting(
+            genome, wdir=str(windowed_dir), window_size=10000, window_overlap=4000, **common
+        )
+
+        expected = read_sat(whole)
+        assert len(expected) >= 6
+        assert read_sat(windowed) == expected
+
+    def test_output_sorted_by_position(self, genome, fake_trf, tmp_path):
+        common = dict(threads=2, project="test", trf_path=fake_trf, parser_program=PARSER, genome_size=75000)
+        pooled = trf_search_by_splitting(genome, wdir=str(tmp_path), window_size=10000, window_overlap=4000, **common)
+        with open(pooled) as fh:
+            rows = [line for line in fh if not line.startswith("#")]
+        assert rows == sorted(rows, key=sat_sort_key)
+        assert [row.split("\t")[2] for row in rows][-1] == "chr2"
+
+        subprocess_dir = tmp_path / "subprocess"
+        subprocess_dir.mkdir()
+        parsed = trf_search_by_splitting(
+            genome, wdir=str(subprocess_dir), window_size=10000, window_overlap=4000,
+            parser_subprocess=True, **common
+        )
+        with open(parsed) as fh:
+            assert [line for line in fh if not line.startswith("#")] == rows
+
+        # A single thread parses the chunks after TRF instead of alongside it
+        serial_dir = tmp_path / "serial"
+        serial_dir.mkdir()
+        serial = trf_search_by_splitting(
+            genome, wdir=str(serial_dir), window_size=10000, window_overlap=4000,
+            **dict(common, threads=1)
+        )
+        with open(serial) as fh:
+            assert [line for line in fh if not line.startswith("#")] == rows
+
+
+# Logs every call and fails for the chunk named in FAKE_TRF_FAIL
+FLAKY_TRF = '''#!{python}
+import os
+import sys
+
+chunk = os.path.basename(sys.argv[1])
+with open({log!r}, "a") as fh:
+    fh.write(chunk + "\\n")
+if chunk == os.environ.get("FAKE_TRF_FAIL"):
+    sys.exit(1)
+os.execv({trf!r}, [{trf!r}] + sys.argv[1:])
+'''
+
+
+class TestResumeTrfSearch:
+    """A rerun after a failed chunk only runs that chunk again."""
+
+    def test_resume_after_failure(self, genome, fake_trf, tmp_path, monkeypatch):
+        log = tmp_path / "calls.log"
+        flaky = tmp_path / "flaky_trf"
+        flaky.write_text(FLAKY_TRF.format(python=sys.executable, log=str(log), trf=fake_trf))
+        flaky.chmod(flaky.stat().st_mode | stat.S_IEXEC)
+        common = dict(
+            threads=2, project="test", trf_path=str(flaky), parser_program=PARSER,
+            genome_size=75000, window_size=10000, window_overlap=4000,
+        )
+        run_dir = tmp_path / "run"
+        run_dir.mkdir()
+
+        monkeypatch.setenv("FAKE_TRF_FAIL", "window_2.fa")
+        with pytest.raises(RuntimeError):
+            trf_search_by_splitting(genome, wdir=str(run_dir), **common)
+        first_calls = log.read_text().split()
+        assert len(set(first_calls)) > 2
+        assert (run_dir / "genome.trf_work" / "chunks.journal").exists()
+
+        log.unlink()
+        monkeypatch.delenv("FAKE_TRF_FAIL")
+        resumed = trf_search_by_splitting(genome, wdir=str(run_dir), **common)
+        assert log.read_text().split() == ["window_2.fa"]
+        assert not (run_dir / "genome.trf_work").exists()
+
+        fresh_dir = tmp_path / "fresh"
+        fresh_dir.mkdir()
+        fresh = trf_search_by_splitting(genome, wdir=str(fresh_dir), **common)
+        with open(resumed) as fh, open(fresh) as fh_fresh:
+            assert fh.read() == fh_fresh.read()
+
+
+class TestResultCacheTrfSearch:
+    """A new haplotype only runs TRF on sequences not seen before."""
+
+    def test_haplotype_reuses_cached_sequences(self, genome, fake_trf, tmp_path):
+        log = tmp_path / "calls.log"
+        logged = tmp_path / "logged_trf"
+        logged.write_text(FLAKY_TRF.format(python=sys.executable, log=str(log), trf=fake_trf))
+        logged.chmod(logged.stat().st_mode | stat.S_IEXEC)
+        common = dict(
+            threads=2, project="test", trf_path=str(logged), parser_program=PARSER,
+            genome_size=75000, window_size=10000, window_overlap=4000,
+        )
+        cache = ResultCache(str(tmp_path / "cache"))
+        first_dir = tmp_path / "first"
+        first_dir.mkdir()
+        trf_search_by_splitting(genome, wdir=str(first_dir), result_cache=cache, **common)
+
+        with open(genome) as fh:
+            text = fh.read()
+        haplotype = tmp_path / "haplotype.fa"
+        haplotype.write_text(text.replace(">chr2\n", ">chr2\nACGT" + "GATC" * 30))
+        log.unlink()
+        cached_dir = tmp_path / "cached"
+        cached_dir.mkdir()
+        cached = trf_search_by_splitting(str(haplotype), wdir=str(cached_dir), result_cache=cache, **common)
+        assert log.read_text().split() == ["0.fa"]
+        assert cache.hits == 7
+
+        fresh_dir = tmp_path / "fresh"
+        fresh_dir.mkdir()
+        fresh = trf_search_by_splitting(str(haplotype), wdir=str(fresh_dir), **common)
+        assert read_sat(cached) == read_sat(fresh)